@@ -1,14 +1,29 @@
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 import logging
 
 # Import routers
-from .routes import movies, producers, genres, box_office, actors, crew, languages
+from .routes import movies, producers, genres, box_office, actors, crew, languages, search, analytics, ingest, export, audit, forecast, graph, diagnostics
+import asyncio
+from database import async_connection
+from database.connection import get_pool_stats
+from database.metrics import query_metrics
+from .utils.cache import response_cache
+from .utils.diagnostics import DIAGNOSIS_ID_HEADER, diagnostics_middleware
+from .utils.metrics import render_prometheus, timing_middleware
+from .utils.pagination import NEXT_CURSOR_HEADER
+from .services import analytics_service, audit_archive
+from .services.audit_pipeline import audit_pipeline
+from config import get_settings
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+settings = get_settings()
+background_tasks = []
+
 # Create FastAPI app
 app = FastAPI(
     title="Indian Cinema DBMS Backend",
@@ -23,8 +38,15 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag", "Last-Modified", DIAGNOSIS_ID_HEADER],
 )
 
+# Per-route latency, status counts and slow-query attribution
+app.middleware("http")(timing_middleware)
+
+# Opt-in profiling and EXPLAIN capture (X-Diagnose header or DIAGNOSTICS_SAMPLE_RATE)
+app.middleware("http")(diagnostics_middleware)
+
 # Include routers
 app.include_router(movies.router, prefix="/api", tags=["movies"])
 app.include_router(producers.router, prefix="/api", tags=["producers"])
@@ -33,6 +55,34 @@ app.include_router(box_office.router, prefix="/api", tags=["box-office"])
 app.include_router(actors.router)
 app.include_router(crew.router)
 app.include_router(languages.router)
+app.include_router(search.router)
+app.include_router(analytics.router)
+app.include_router(ingest.router)
+app.include_router(export.router)
+app.include_router(audit.router)
+app.include_router(forecast.router)
+app.include_router(graph.router)
+app.include_router(diagnostics.router)
+
+@app.on_event("startup")
+async def startup_event():
+    """Start the materialized-analytics refresher, audit pipeline writer and audit archiver"""
+    if settings.ANALYTICS_REFRESH_INTERVAL > 0:
+        background_tasks.append(asyncio.create_task(
+            analytics_service.run_summary_refresher(settings.ANALYTICS_REFRESH_INTERVAL)))
+    if settings.AUDIT_MAINTENANCE_INTERVAL > 0:
+        background_tasks.append(asyncio.create_task(
+            audit_archive.run_archiver(settings.AUDIT_MAINTENANCE_INTERVAL)))
+    background_tasks.append(asyncio.create_task(
+        audit_pipeline.run(settings.AUDIT_FLUSH_INTERVAL)))
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background tasks, flush pending audit events and drain the database thread pool"""
+    for task in background_tasks:
+        task.cancel()
+    await audit_pipeline.flush()
+    async_connection.shutdown()
 
 @app.get("/")
 async def root():
@@ -44,6 +94,36 @@ async def health_check():
     """Health check endpoint"""
     return {"status": "healthy", "service": "Indian Cinema DBMS Backend"}
 
+@app.get("/health/pool")
+async def pool_stats():
+    """Connection pool usage, churn and acquire-latency histogram"""
+    return get_pool_stats()
+
+@app.get("/health/cache")
+async def cache_stats():
+    """Read-through cache size and per-namespace hit/miss/eviction counters"""
+    return response_cache.stats()
+
+@app.get("/health/audit")
+async def audit_stats():
+    """Audit pipeline queue depth, delivery counters and flush latency"""
+    return audit_pipeline.stats()
+
+@app.get("/health/queries")
+async def query_stats(limit: int = 20):
+    """Normalized statements by total time spent"""
+    return query_metrics.top(limit)
+
+@app.get("/health/slow-queries")
+async def slow_queries():
+    """Most recent statements over SLOW_QUERY_THRESHOLD_MS, newest first"""
+    return {"threshold_ms": query_metrics.slow_threshold_ms, "queries": query_metrics.slow_queries()}
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics():
+    """Request, query and pool metrics in the Prometheus text format"""
+    return PlainTextResponse(render_prometheus(), media_type="text/plain; version=0.0.4")
+
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    uvicorn.run(app, host="0.0.0.0", port=8000)
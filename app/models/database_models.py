@@ -162,6 +162,25 @@ class BoxOffice(BoxOfficeBase):
     class Config:
         from_attributes = True
 
+class BoxOfficeDailyBase(BaseModel):
+    day: date
+    domestic: float = Field(0, ge=0)
+    intl: float = Field(0, ge=0)
+    screens: Optional[int] = Field(None, gt=0)
+
+class BoxOfficeDaily(BoxOfficeDailyBase):
+    movie_id: int
+
+class ForecastInput(BaseModel):
+    ref: Optional[str] = Field(None, max_length=100, description="Caller's identifier, echoed back")
+    budget: Optional[float] = Field(None, ge=0)
+    language_id: Optional[int] = None
+    release_date: Optional[date] = None
+    genre_ids: List[int] = []
+    actor_ids: List[int] = []
+    release_screens: Optional[int] = Field(None, gt=0)
+    opening_weekend: Optional[float] = Field(None, ge=0)
+
 # Actor models
 class ActorBase(BaseModel):
     name: str = Field(..., min_length=1, max_length=100)
@@ -1,10 +1,18 @@
 """
 Actor management routes
 """
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Depends, Response
 from typing import List, Optional
 from app.models.database_models import Actor, ActorCreate
-from database.connection import execute_query, call_procedure
+from database.async_connection import execute_query, call_procedure
+from database.unit_of_work import AsyncUnitOfWork, get_unit_of_work
+from app.utils.cache import invalidate
+from app.utils.conditional import conditional, table_version
+from app.utils.pagination import keyset_condition, paginate
+from app.services.audit_pipeline import audit_pipeline
+from app.services.graph_service import collaboration_graph
+from app.services.search_service import fulltext_condition, search_index
+from app.utils.validators import http_error
 import logging
 
 router = APIRouter(prefix="/api/actors", tags=["actors"])
@@ -12,11 +20,14 @@ logger = logging.getLogger(__name__)
 
 
 @router.get("", response_model=List[Actor])
+@conditional(table_version("ACTORS"))
 async def get_actors(
+    response: Response,
     name: Optional[str] = Query(None, description="Filter by actor name"),
     gender: Optional[str] = Query(None, description="Filter by gender"),
     limit: int = Query(100, ge=1, le=1000),
-    offset: int = Query(0, ge=0)
+    offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page")
 ):
     """Get all actors with optional filters"""
     try:
@@ -24,29 +35,39 @@ async def get_actors(
         params = []
 
         if name:
-            query += " AND name LIKE %s"
-            params.append(f"%{name}%")
+            condition, name_params = fulltext_condition(("name",), name)
+            query += f" AND {condition}"
+            params.extend(name_params)
 
         if gender:
             query += " AND gender = %s"
             params.append(gender)
 
+        if cursor:
+            condition, cursor_params = keyset_condition(("actor_id",), cursor)
+            query += f" AND {condition}"
+            params.extend(cursor_params)
+            offset = 0
+
         query += " ORDER BY actor_id DESC LIMIT %s OFFSET %s"
-        params.extend([limit, offset])
+        params.extend([limit + 1, offset])
 
-        result = execute_query(query, tuple(params), fetch=True)
-        return result if result else []
+        result = await execute_query(query, tuple(params), fetch=True)
+        return paginate(result, limit, response, ("actor_id",)) if result else []
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching actors: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/{actor_id}", response_model=Actor)
+@conditional()
 async def get_actor(actor_id: int):
     """Get a single actor by ID"""
     try:
         query = "SELECT * FROM ACTORS WHERE actor_id = %s"
-        result = execute_query(query, (actor_id,), fetch=True)
+        result = await execute_query(query, (actor_id,), fetch=True)
 
         if not result:
             raise HTTPException(status_code=404, detail="Actor not found")
@@ -60,7 +81,7 @@ async def get_actor(actor_id: int):
 
 
 @router.post("", status_code=201)
-async def create_actor(actor: ActorCreate):
+async def create_actor(actor: ActorCreate, uow: AsyncUnitOfWork = Depends(get_unit_of_work)):
     """Create a new actor"""
     try:
         query = """
@@ -76,25 +97,26 @@ async def create_actor(actor: ActorCreate):
             actor.email
         )
 
-        execute_query(query, params, fetch=False)
-
-        # Get the last inserted ID
-        result = execute_query("SELECT LAST_INSERT_ID() as actor_id", fetch=True)
-        actor_id = result[0]['actor_id']
+        result = await uow.execute(query, params, fetch=False)
+        await uow.commit()
+        actor_id = result["last_id"]
 
+        search_index.mark_dirty("actor", actor_id)
+        await audit_pipeline.activity("CREATE", "ACTORS", actor_id,
+                                      f"New actor added: {actor.name} | Popularity: {actor.popularity_score}")
         return {"actor_id": actor_id, "message": "Actor created successfully"}
     except Exception as e:
         logger.error(f"Error creating actor: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+        raise http_error(e)
 
 
 @router.put("/{actor_id}")
-async def update_actor(actor_id: int, actor: ActorCreate):
+async def update_actor(actor_id: int, actor: ActorCreate, uow: AsyncUnitOfWork = Depends(get_unit_of_work)):
     """Update an existing actor"""
     try:
         # Check if actor exists
-        check_query = "SELECT actor_id FROM ACTORS WHERE actor_id = %s"
-        existing = execute_query(check_query, (actor_id,), fetch=True)
+        check_query = "SELECT actor_id FROM ACTORS WHERE actor_id = %s FOR UPDATE"
+        existing = await uow.execute(check_query, (actor_id,), fetch=True)
 
         if not existing:
             raise HTTPException(status_code=404, detail="Actor not found")
@@ -133,31 +155,39 @@ async def update_actor(actor_id: int, actor: ActorCreate):
         params.append(actor_id)
         query = f"UPDATE ACTORS SET {', '.join(update_fields)} WHERE actor_id = %s"
 
-        execute_query(query, tuple(params), fetch=False)
+        await uow.execute(query, tuple(params), fetch=False)
+        await uow.commit()
 
+        invalidate("movie_details")
+        search_index.mark_dirty("actor", actor_id)
+        collaboration_graph.mark_dirty("actor", actor_id)
         return {"message": "Actor updated successfully"}
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Error updating actor {actor_id}: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+        raise http_error(e)
 
 
 @router.delete("/{actor_id}")
-async def delete_actor(actor_id: int):
+async def delete_actor(actor_id: int, uow: AsyncUnitOfWork = Depends(get_unit_of_work)):
     """Delete an actor"""
     try:
         # Check if actor exists
-        check_query = "SELECT actor_id FROM ACTORS WHERE actor_id = %s"
-        existing = execute_query(check_query, (actor_id,), fetch=True)
+        check_query = "SELECT actor_id FROM ACTORS WHERE actor_id = %s FOR UPDATE"
+        existing = await uow.execute(check_query, (actor_id,), fetch=True)
 
         if not existing:
             raise HTTPException(status_code=404, detail="Actor not found")
 
         # Delete actor
         query = "DELETE FROM ACTORS WHERE actor_id = %s"
-        execute_query(query, (actor_id,), fetch=False)
+        await uow.execute(query, (actor_id,), fetch=False)
+        await uow.commit()
 
+        invalidate("movie_details")
+        search_index.mark_dirty("actor", actor_id)
+        collaboration_graph.mark_dirty("actor", actor_id)
         return {"message": "Actor deleted successfully"}
     except HTTPException:
         raise
@@ -175,7 +205,7 @@ async def get_actor_filmography(actor_id: int):
         WHERE actor_id = %s
         ORDER BY release_date DESC
         """
-        result = execute_query(query, (actor_id,), fetch=True)
+        result = await execute_query(query, (actor_id,), fetch=True)
 
         return result if result else []
     except Exception as e:
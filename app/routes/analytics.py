@@ -0,0 +1,148 @@
+"""
+Analytics routes
+"""
+from fastapi import APIRouter, HTTPException, Query
+from typing import Optional
+from app.services import analytics_service
+from app.services.analytics_service import GROUPINGS, METRICS, analytics_snapshot
+from database.async_connection import run_in_executor
+import logging
+
+router = APIRouter(prefix="/api/analytics", tags=["analytics"])
+logger = logging.getLogger(__name__)
+
+
+@router.get("/summary")
+async def get_summary(
+    top_n: int = Query(10, ge=1, le=50, description="Size of the top-N lists"),
+    recent_n: int = Query(5, ge=0, le=50, description="Number of recent movies")
+):
+    """Everything the dashboard needs in one pre-aggregated response"""
+    try:
+        return await analytics_service.get_dashboard_summary(top_n=top_n, recent_n=recent_n)
+    except Exception as e:
+        logger.error(f"Error building analytics summary: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/languages")
+async def get_language_summary():
+    """Movie count, budget, collection and rating per language"""
+    try:
+        return await analytics_service.language_summary()
+    except Exception as e:
+        logger.error(f"Error fetching language summary: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/top-actors")
+async def get_top_actors(limit: int = Query(10, ge=1, le=100)):
+    """Actors ranked by popularity with their filmography"""
+    try:
+        return await analytics_service.top_actors(limit)
+    except Exception as e:
+        logger.error(f"Error fetching top actors: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/producers/{producer_id}")
+async def get_producer_stats(producer_id: int):
+    """Aggregate box-office performance of one producer"""
+    try:
+        stats = await analytics_service.producer_stats(producer_id)
+    except Exception as e:
+        logger.error(f"Error fetching producer stats: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+    if not stats:
+        raise HTTPException(status_code=404, detail="Producer not found")
+    return stats
+
+
+def _check_metric(metric):
+    if metric not in METRICS:
+        raise HTTPException(status_code=400,
+                            detail=f"Unknown metric: {metric}; expected one of {', '.join(METRICS)}")
+
+
+@router.get("/rankings")
+async def get_rankings(
+    metric: str = Query("total_collection", description="Column to rank by"),
+    k: int = Query(10, ge=1, le=1000),
+    ascending: bool = Query(False, description="Lowest first"),
+    language_id: Optional[int] = None,
+    year: Optional[int] = None,
+    genre_id: Optional[int] = None
+):
+    """Top-K movies by a box-office or profit metric, optionally filtered"""
+    _check_metric(metric)
+    try:
+        await run_in_executor(analytics_snapshot.ensure_fresh)
+        return analytics_snapshot.top(metric, k, ascending=ascending, language_id=language_id,
+                                      year=year, genre_id=genre_id)
+    except Exception as e:
+        logger.error(f"Error ranking movies by {metric}: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/distribution")
+async def get_distribution(
+    metric: str = Query("profit_percentage"),
+    bins: int = Query(10, ge=1, le=100, description="Histogram buckets"),
+    language_id: Optional[int] = None,
+    year: Optional[int] = None,
+    genre_id: Optional[int] = None
+):
+    """Mean, spread, percentiles and histogram of a metric"""
+    _check_metric(metric)
+    try:
+        await run_in_executor(analytics_snapshot.ensure_fresh)
+        return analytics_snapshot.distribution(metric, bins=bins, language_id=language_id,
+                                               year=year, genre_id=genre_id)
+    except Exception as e:
+        logger.error(f"Error computing {metric} distribution: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/groups/{by}")
+async def get_group_stats(by: str, metric: str = Query("total_collection")):
+    """Per-language, per-year or per-genre statistics of a metric"""
+    if by not in GROUPINGS:
+        raise HTTPException(status_code=404, detail=f"Unknown grouping: {by}")
+    _check_metric(metric)
+    try:
+        await run_in_executor(analytics_snapshot.ensure_fresh)
+        return analytics_snapshot.group_stats(metric, by)
+    except Exception as e:
+        logger.error(f"Error grouping {metric} by {by}: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/movies/{movie_id}")
+async def get_movie_standing(movie_id: int):
+    """Where a movie ranks on every metric, overall and within its language"""
+    try:
+        await run_in_executor(analytics_snapshot.ensure_fresh)
+        standing = analytics_snapshot.standing(movie_id)
+    except Exception as e:
+        logger.error(f"Error computing standing of movie {movie_id}: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+    if not standing:
+        raise HTTPException(status_code=404, detail="Movie not found")
+    return standing
+
+
+@router.get("/snapshot")
+async def snapshot_stats():
+    """Size and freshness of the in-process analytics snapshot"""
+    return analytics_snapshot.stats()
+
+
+@router.post("/refresh")
+async def refresh_summaries(full: bool = Query(False, description="Rebuild every summary row")):
+    """Drain the summary refresh queue now instead of waiting for the refresher"""
+    try:
+        refreshed = await analytics_service.refresh_summaries(full=full)
+        return {"refreshed": refreshed}
+    except Exception as e:
+        logger.error(f"Error refreshing summaries: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
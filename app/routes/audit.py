@@ -0,0 +1,64 @@
+"""
+Audit history routes (live partitions and archives)
+"""
+from fastapi import APIRouter, HTTPException, Query
+from datetime import datetime
+from typing import Optional
+from app.services import audit_archive
+from database.async_connection import run_in_executor
+import logging
+
+router = APIRouter(prefix="/api/audit", tags=["audit"])
+logger = logging.getLogger(__name__)
+
+
+@router.post("/maintenance")
+async def run_audit_maintenance():
+    """Create upcoming audit partitions and archive expired ones now"""
+    try:
+        report = await run_in_executor(audit_archive.run_maintenance)
+    except Exception as e:
+        logger.error(f"Audit maintenance failed: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+    if report is None:
+        return {"skipped": True, "detail": "Audit maintenance is already running"}
+    return report
+
+
+@router.get("/{log}")
+async def get_audit_history(
+    log: str,
+    movie_id: Optional[int] = None,
+    box_id: Optional[int] = None,
+    operation_type: Optional[str] = None,
+    user_id: Optional[int] = None,
+    action: Optional[str] = None,
+    table_name: Optional[str] = None,
+    record_id: Optional[int] = None,
+    since: Optional[datetime] = Query(None, description="Inclusive lower bound"),
+    until: Optional[datetime] = Query(None, description="Exclusive upper bound"),
+    limit: int = Query(100, ge=1, le=1000)
+):
+    """Newest-first movie-audit, box-office-audit or activity-log rows.
+
+    Rows that have been archived out of the database are read back from
+    the archive files, so the result does not depend on retention.
+    """
+    if log not in audit_archive.AUDIT_LOGS:
+        raise HTTPException(status_code=404, detail=f"Unknown audit log: {log}")
+    columns = audit_archive.AUDIT_LOGS[log][3]
+    given = {"movie_id": movie_id, "box_id": box_id, "operation_type": operation_type,
+             "user_id": user_id, "action": action, "table_name": table_name,
+             "record_id": record_id}
+    unsupported = [name for name, value in given.items() if value is not None and name not in columns]
+    if unsupported:
+        raise HTTPException(status_code=400,
+                            detail=f"Cannot filter {log} by {', '.join(unsupported)}")
+
+    try:
+        return await run_in_executor(
+            audit_archive.query_history, log,
+            {name: given[name] for name in columns}, since, until, limit)
+    except Exception as e:
+        logger.error(f"Error reading {log}: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
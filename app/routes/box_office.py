@@ -1,18 +1,30 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Depends, Query, Response
 from typing import List, Optional
-from ..models.database_models import BoxOffice, BoxOfficeCreate
-from database.connection import execute_query, call_procedure
+from datetime import date
+from ..models.database_models import BoxOffice, BoxOfficeCreate, BoxOfficeDailyBase
+from database.async_connection import execute_query, call_procedure
+from database.unit_of_work import AsyncUnitOfWork, get_unit_of_work
+from ..utils.cache import cached, invalidate
+from ..utils.conditional import conditional, table_version
+from ..utils.pagination import keyset_condition, paginate
+from ..utils.validators import http_error
+from ..services import analytics_service, movie_service, timeseries_service
+from ..services.audit_pipeline import audit_pipeline
+from ..services.graph_service import collaboration_graph
 
 router = APIRouter()
 
 @router.get("/box-office", response_model=List[BoxOffice])
+@conditional(table_version("BOX_OFFICE"))
 async def get_box_office_records(
-    skip: int = 0,
-    limit: int = 100,
+    response: Response,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
     movie_id: Optional[int] = None,
     collection_status: Optional[str] = None
 ):
-    """Get all box office records with optional filtering"""
+    """Get all box office records with optional filtering (keyset via `cursor`)"""
     query = """
     SELECT bo.box_id, bo.movie_id, bo.domestic_collection, bo.intl_collection,
            bo.opening_weekend, bo.total_collection, bo.profit_margin,
@@ -30,16 +42,36 @@ async def get_box_office_records(
         query += " AND bo.collection_status = %s"
         params.append(collection_status)
 
-    query += " ORDER BY bo.created_at DESC LIMIT %s OFFSET %s"
-    params.extend([limit, skip])
+    if cursor:
+        condition, cursor_params = keyset_condition(("bo.created_at", "bo.box_id"), cursor)
+        query += f" AND {condition}"
+        params.extend(cursor_params)
+        skip = 0
 
+    query += " ORDER BY bo.created_at DESC, bo.box_id DESC LIMIT %s OFFSET %s"
+    params.extend([limit + 1, skip])
+
+    try:
+        records = await execute_query(query, tuple(params))
+        return paginate(records, limit, response, ("created_at", "box_id"))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/box-office:batch", response_model=dict)
+async def get_box_office_batch(movie_ids: str):
+    """Box office records for many movies, keyed by movie_id"""
+    try:
+        ids = movie_service.parse_ids(movie_ids)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     try:
-        records = execute_query(query, tuple(params))
-        return records
+        found = await movie_service.get_box_office(ids)
+        return movie_service.batch_response(ids, found)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/box-office/{box_id}", response_model=BoxOffice)
+@conditional()
 async def get_box_office_record(box_id: int):
     """Get a specific box office record by ID"""
     query = """
@@ -52,7 +84,7 @@ async def get_box_office_record(box_id: int):
     """
 
     try:
-        record = execute_query(query, (box_id,))
+        record = await execute_query(query, (box_id,))
         if not record:
             raise HTTPException(status_code=404, detail="Box office record not found")
         return record[0]
@@ -62,18 +94,10 @@ async def get_box_office_record(box_id: int):
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/box-office", response_model=dict)
-async def create_box_office_record(box_office: BoxOfficeCreate):
+async def create_box_office_record(box_office: BoxOfficeCreate, uow: AsyncUnitOfWork = Depends(get_unit_of_work)):
     """Create a new box office record"""
-    # Check if movie exists
-    movie_exists = execute_query("SELECT movie_id FROM MOVIES WHERE movie_id = %s", (box_office.movie_id,))
-    if not movie_exists:
-        raise HTTPException(status_code=404, detail="Movie not found")
-
-    # Check if box office record already exists for this movie
-    existing_record = execute_query("SELECT box_id FROM BOX_OFFICE WHERE movie_id = %s", (box_office.movie_id,))
-    if existing_record:
-        raise HTTPException(status_code=400, detail="Box office record already exists for this movie")
-
+    # A missing movie (foreign key) or an existing record (uq_box_office_movie)
+    # is rejected by the INSERT itself and mapped by http_error
     query = """
     INSERT INTO BOX_OFFICE (movie_id, domestic_collection, intl_collection,
                            opening_weekend, profit_margin, release_screens,
@@ -82,7 +106,7 @@ async def create_box_office_record(box_office: BoxOfficeCreate):
     """
 
     try:
-        result = execute_query(query, (
+        result = await uow.execute(query, (
             box_office.movie_id,
             box_office.domestic_collection,
             box_office.intl_collection,
@@ -92,16 +116,23 @@ async def create_box_office_record(box_office: BoxOfficeCreate):
             box_office.collection_status,
             box_office.updated_by
         ), fetch=False)
+        await uow.commit()
+        if audit_pipeline.app_audits:
+            await audit_pipeline.box_office("INSERT", box_office.movie_id, box_id=result["last_id"],
+                                            new=box_office.model_dump())
+        invalidate("movie_box_office", "movie_details", entity=box_office.movie_id)
+        analytics_service.invalidate_summary(box_office.movie_id)
+        collaboration_graph.mark_dirty("movie", box_office.movie_id)
 
         return {"box_id": result["last_id"], "message": "Box office record created successfully"}
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        raise http_error(e)
 
 @router.put("/box-office/{box_id}", response_model=dict)
-async def update_box_office_record(box_id: int, box_office: BoxOfficeCreate):
+async def update_box_office_record(box_id: int, box_office: BoxOfficeCreate, uow: AsyncUnitOfWork = Depends(get_unit_of_work)):
     """Update an existing box office record"""
     # Check if record exists
-    existing_record = execute_query("SELECT box_id FROM BOX_OFFICE WHERE box_id = %s", (box_id,))
+    existing_record = await uow.execute("SELECT box_id, movie_id FROM BOX_OFFICE WHERE box_id = %s FOR UPDATE", (box_id,))
     if not existing_record:
         raise HTTPException(status_code=404, detail="Box office record not found")
 
@@ -133,32 +164,42 @@ async def update_box_office_record(box_id: int, box_office: BoxOfficeCreate):
 
     update_fields.append("updated_by = %s")
     params.append(box_office.updated_by)
-    update_fields.append("updated_at = CURRENT_TIMESTAMP")
+    update_fields.append("updated_at = CURRENT_TIMESTAMP(6)")
     params.append(box_id)
 
     query = f"UPDATE BOX_OFFICE SET {', '.join(update_fields)} WHERE box_id = %s"
 
     try:
-        execute_query(query, tuple(params), fetch=False)
+        await uow.execute(query, tuple(params), fetch=False)
+        await uow.commit()
+        invalidate("movie_box_office", "movie_details", entity=existing_record[0]["movie_id"])
+        analytics_service.invalidate_summary(existing_record[0]["movie_id"])
+        collaboration_graph.mark_dirty("movie", existing_record[0]["movie_id"])
         return {"message": "Box office record updated successfully"}
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        raise http_error(e)
 
 @router.delete("/box-office/{box_id}", response_model=dict)
-async def delete_box_office_record(box_id: int):
+async def delete_box_office_record(box_id: int, uow: AsyncUnitOfWork = Depends(get_unit_of_work)):
     """Delete a box office record"""
     # Check if record exists
-    existing_record = execute_query("SELECT box_id FROM BOX_OFFICE WHERE box_id = %s", (box_id,))
+    existing_record = await uow.execute("SELECT box_id, movie_id FROM BOX_OFFICE WHERE box_id = %s FOR UPDATE", (box_id,))
     if not existing_record:
         raise HTTPException(status_code=404, detail="Box office record not found")
 
     try:
-        execute_query("DELETE FROM BOX_OFFICE WHERE box_id = %s", (box_id,), fetch=False)
+        await uow.execute("DELETE FROM BOX_OFFICE WHERE box_id = %s", (box_id,), fetch=False)
+        await uow.commit()
+        invalidate("movie_box_office", "movie_details", entity=existing_record[0]["movie_id"])
+        analytics_service.invalidate_summary(existing_record[0]["movie_id"])
+        collaboration_graph.mark_dirty("movie", existing_record[0]["movie_id"])
         return {"message": "Box office record deleted successfully"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/movies/{movie_id}/box-office", response_model=BoxOffice)
+@conditional()
+@cached("movie_box_office", key="movie_id")
 async def get_movie_box_office(movie_id: int):
     """Get box office record for a specific movie"""
     query = """
@@ -171,7 +212,7 @@ async def get_movie_box_office(movie_id: int):
     """
 
     try:
-        record = execute_query(query, (movie_id,))
+        record = await execute_query(query, (movie_id,))
         if not record:
             raise HTTPException(status_code=404, detail="Box office record not found for this movie")
         return record[0]
@@ -180,45 +221,62 @@ async def get_movie_box_office(movie_id: int):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/box-office/{movie_id}/timeseries", response_model=dict)
+@cached("box_office_timeseries", key="movie_id")
+async def get_box_office_timeseries(
+    movie_id: int,
+    granularity: str = Query("day", description="day, week (Friday to Thursday) or month"),
+    since: Optional[date] = None,
+    until: Optional[date] = Query(None, description="Exclusive")
+):
+    """Daily, weekly or monthly collections with a running total"""
+    if granularity not in timeseries_service.GRANULARITIES:
+        raise HTTPException(status_code=400, detail=f"Unsupported granularity: {granularity}")
+    if since and until and since >= until:
+        raise HTTPException(status_code=400, detail="since must be before until")
+
+    try:
+        points = await timeseries_service.get_timeseries(movie_id, granularity, since, until)
+        if not points and not await execute_query("SELECT movie_id FROM MOVIES WHERE movie_id = %s", (movie_id,)):
+            raise HTTPException(status_code=404, detail="Movie not found")
+        return {"movie_id": movie_id, "granularity": granularity, "points": points}
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/box-office/{movie_id}/timeseries", response_model=dict)
+async def add_box_office_timeseries(movie_id: int, points: List[BoxOfficeDailyBase],
+                                    uow: AsyncUnitOfWork = Depends(get_unit_of_work)):
+    """Record daily collections for a movie; re-reported days are replaced"""
+    if not points:
+        raise HTTPException(status_code=400, detail="No data points")
+    if len(points) > timeseries_service.MAX_POINTS:
+        raise HTTPException(status_code=400,
+                            detail=f"At most {timeseries_service.MAX_POINTS} data points per request")
+
+    try:
+        await uow.execute_many(timeseries_service.UPSERT_SQL, [
+            (movie_id, point.day, point.domestic, point.intl, point.screens) for point in points
+        ])
+        await uow.commit()
+        invalidate("box_office_timeseries", entity=movie_id)
+        return {"movie_id": movie_id, "days": len(points), "message": "Collections recorded successfully"}
+    except Exception as e:
+        raise http_error(e)
+
 @router.get("/analytics/top-movies", response_model=List[dict])
-async def get_top_movies_by_collection(limit: int = 10):
+async def get_top_movies_by_collection(limit: int = Query(10, ge=1, le=100)):
     """Get top movies by total collection"""
-    query = """
-    SELECT m.title, l.language_name, m.release_date, bo.total_collection,
-           bo.domestic_collection, bo.intl_collection, m.budget,
-           ROUND(((bo.total_collection - m.budget) / m.budget * 100), 2) AS profit_percentage,
-           m.imdb_rating
-    FROM MOVIES m
-    JOIN LANGUAGES l ON m.language_id = l.language_id
-    JOIN BOX_OFFICE bo ON m.movie_id = bo.movie_id
-    WHERE bo.total_collection IS NOT NULL
-    ORDER BY bo.total_collection DESC
-    LIMIT %s
-    """
-
     try:
-        movies = execute_query(query, (limit,))
-        return movies
+        return await analytics_service.top_movies_by_collection(limit)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/analytics/profit-analysis", response_model=List[dict])
-async def get_profit_analysis(limit: int = 10):
+async def get_profit_analysis(limit: int = Query(10, ge=1, le=100)):
     """Get movies with highest profit margins"""
-    query = """
-    SELECT m.title, m.budget, bo.total_collection,
-           (bo.total_collection - m.budget) AS net_profit,
-           ROUND(((bo.total_collection - m.budget) / m.budget * 100), 2) AS profit_percentage,
-           bo.opening_weekend, bo.release_screens, bo.profit_margin
-    FROM MOVIES m
-    JOIN BOX_OFFICE bo ON m.movie_id = bo.movie_id
-    WHERE m.budget > 0 AND bo.total_collection IS NOT NULL
-    ORDER BY profit_percentage DESC
-    LIMIT %s
-    """
-
     try:
-        analysis = execute_query(query, (limit,))
-        return analysis
+        return await analytics_service.top_profitable_movies(limit)
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
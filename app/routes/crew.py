@@ -1,10 +1,17 @@
 """
 Production Crew management routes
 """
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Depends, Response
 from typing import List, Optional
 from app.models.database_models import ProductionCrew, ProductionCrewCreate
-from database.connection import execute_query
+from database.async_connection import execute_query
+from database.unit_of_work import AsyncUnitOfWork, get_unit_of_work
+from app.utils.cache import invalidate
+from app.utils.pagination import keyset_condition, paginate
+from app.services.audit_pipeline import audit_pipeline
+from app.services.graph_service import collaboration_graph
+from app.services.search_service import fulltext_condition, search_index
+from app.utils.validators import http_error
 import logging
 
 router = APIRouter(prefix="/api/crew", tags=["crew"])
@@ -13,10 +20,12 @@ logger = logging.getLogger(__name__)
 
 @router.get("", response_model=List[ProductionCrew])
 async def get_crew_members(
+    response: Response,
     name: Optional[str] = Query(None, description="Filter by crew member name"),
     role: Optional[str] = Query(None, description="Filter by role"),
     limit: int = Query(100, ge=1, le=1000),
-    offset: int = Query(0, ge=0)
+    offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page")
 ):
     """Get all crew members with optional filters"""
     try:
@@ -24,18 +33,27 @@ async def get_crew_members(
         params = []
 
         if name:
-            query += " AND name LIKE %s"
-            params.append(f"%{name}%")
+            condition, name_params = fulltext_condition(("name",), name)
+            query += f" AND {condition}"
+            params.extend(name_params)
 
         if role:
             query += " AND role = %s"
             params.append(role)
 
+        if cursor:
+            condition, cursor_params = keyset_condition(("crew_id",), cursor)
+            query += f" AND {condition}"
+            params.extend(cursor_params)
+            offset = 0
+
         query += " ORDER BY crew_id DESC LIMIT %s OFFSET %s"
-        params.extend([limit, offset])
+        params.extend([limit + 1, offset])
 
-        result = execute_query(query, tuple(params), fetch=True)
-        return result if result else []
+        result = await execute_query(query, tuple(params), fetch=True)
+        return paginate(result, limit, response, ("crew_id",)) if result else []
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching crew members: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -46,7 +64,7 @@ async def get_crew_member(crew_id: int):
     """Get a single crew member by ID"""
     try:
         query = "SELECT * FROM PRODUCTION_CREW WHERE crew_id = %s"
-        result = execute_query(query, (crew_id,), fetch=True)
+        result = await execute_query(query, (crew_id,), fetch=True)
 
         if not result:
             raise HTTPException(status_code=404, detail="Crew member not found")
@@ -60,7 +78,7 @@ async def get_crew_member(crew_id: int):
 
 
 @router.post("", status_code=201)
-async def create_crew_member(crew: ProductionCrewCreate):
+async def create_crew_member(crew: ProductionCrewCreate, uow: AsyncUnitOfWork = Depends(get_unit_of_work)):
     """Create a new crew member"""
     try:
         query = """
@@ -75,25 +93,26 @@ async def create_crew_member(crew: ProductionCrewCreate):
             crew.email
         )
 
-        execute_query(query, params, fetch=False)
-
-        # Get the last inserted ID
-        result = execute_query("SELECT LAST_INSERT_ID() as crew_id", fetch=True)
-        crew_id = result[0]['crew_id']
+        result = await uow.execute(query, params, fetch=False)
+        await uow.commit()
+        crew_id = result["last_id"]
 
+        search_index.mark_dirty("crew", crew_id)
+        await audit_pipeline.activity("CREATE", "PRODUCTION_CREW", crew_id,
+                                      f"New crew member added: {crew.name} | Role: {crew.role.value} | Experience: {crew.experience_years} years")
         return {"crew_id": crew_id, "message": "Crew member created successfully"}
     except Exception as e:
         logger.error(f"Error creating crew member: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+        raise http_error(e)
 
 
 @router.put("/{crew_id}")
-async def update_crew_member(crew_id: int, crew: ProductionCrewCreate):
+async def update_crew_member(crew_id: int, crew: ProductionCrewCreate, uow: AsyncUnitOfWork = Depends(get_unit_of_work)):
     """Update an existing crew member"""
     try:
         # Check if crew member exists
-        check_query = "SELECT crew_id FROM PRODUCTION_CREW WHERE crew_id = %s"
-        existing = execute_query(check_query, (crew_id,), fetch=True)
+        check_query = "SELECT crew_id FROM PRODUCTION_CREW WHERE crew_id = %s FOR UPDATE"
+        existing = await uow.execute(check_query, (crew_id,), fetch=True)
 
         if not existing:
             raise HTTPException(status_code=404, detail="Crew member not found")
@@ -128,31 +147,39 @@ async def update_crew_member(crew_id: int, crew: ProductionCrewCreate):
         params.append(crew_id)
         query = f"UPDATE PRODUCTION_CREW SET {', '.join(update_fields)} WHERE crew_id = %s"
 
-        execute_query(query, tuple(params), fetch=False)
+        await uow.execute(query, tuple(params), fetch=False)
+        await uow.commit()
 
+        invalidate("movie_details")
+        search_index.mark_dirty("crew", crew_id)
+        collaboration_graph.mark_dirty("crew", crew_id)
         return {"message": "Crew member updated successfully"}
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Error updating crew member {crew_id}: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+        raise http_error(e)
 
 
 @router.delete("/{crew_id}")
-async def delete_crew_member(crew_id: int):
+async def delete_crew_member(crew_id: int, uow: AsyncUnitOfWork = Depends(get_unit_of_work)):
     """Delete a crew member"""
     try:
         # Check if crew member exists
-        check_query = "SELECT crew_id FROM PRODUCTION_CREW WHERE crew_id = %s"
-        existing = execute_query(check_query, (crew_id,), fetch=True)
+        check_query = "SELECT crew_id FROM PRODUCTION_CREW WHERE crew_id = %s FOR UPDATE"
+        existing = await uow.execute(check_query, (crew_id,), fetch=True)
 
         if not existing:
             raise HTTPException(status_code=404, detail="Crew member not found")
 
         # Delete crew member
         query = "DELETE FROM PRODUCTION_CREW WHERE crew_id = %s"
-        execute_query(query, (crew_id,), fetch=False)
+        await uow.execute(query, (crew_id,), fetch=False)
+        await uow.commit()
 
+        invalidate("movie_details")
+        search_index.mark_dirty("crew", crew_id)
+        collaboration_graph.mark_dirty("crew", crew_id)
         return {"message": "Crew member deleted successfully"}
     except HTTPException:
         raise
@@ -170,7 +197,7 @@ async def get_crew_projects(crew_id: int):
         WHERE crew_id = %s
         ORDER BY crew_id
         """
-        result = execute_query(query, (crew_id,), fetch=True)
+        result = await execute_query(query, (crew_id,), fetch=True)
 
         return result if result else []
     except Exception as e:
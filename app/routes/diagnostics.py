@@ -0,0 +1,37 @@
+"""
+Request diagnostics admin routes (profiles and EXPLAIN ANALYZE plans)
+"""
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+from config import get_settings
+from database.diagnostics import diagnostics
+from app.utils.diagnostics import require_diagnostics_access
+
+router = APIRouter(prefix="/api/admin/diagnostics", tags=["diagnostics"],
+                   dependencies=[Depends(require_diagnostics_access)])
+settings = get_settings()
+
+
+@router.get("")
+async def list_diagnoses():
+    """Recent diagnosed requests, newest first"""
+    return {
+        "sample_rate": settings.DIAGNOSTICS_SAMPLE_RATE,
+        "explain_threshold_ms": diagnostics.explain_threshold_ms,
+        "diagnoses": diagnostics.recent(),
+    }
+
+
+@router.get("/{diagnosis_id}")
+async def get_diagnosis(
+    diagnosis_id: int,
+    format: str = Query("json", pattern="^(json|folded)$"),
+    limit: int = Query(25, ge=1, le=500)
+):
+    """Profile, statements and plans of one request; format=folded for flame graphs"""
+    diagnosis = diagnostics.get(diagnosis_id)
+    if diagnosis is None:
+        raise HTTPException(status_code=404, detail=f"Diagnosis {diagnosis_id} not found or expired")
+    if format == "folded":
+        return PlainTextResponse(diagnosis.folded())
+    return diagnosis.report(limit)
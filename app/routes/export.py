@@ -0,0 +1,108 @@
+"""
+Streaming export routes
+"""
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from datetime import date, datetime
+from decimal import Decimal
+import csv
+import io
+import json
+from database.async_connection import stream_query
+from app.utils.serialization import json_default
+import logging
+
+router = APIRouter(prefix="/api/export", tags=["export"])
+logger = logging.getLogger(__name__)
+
+# dataset -> query; every export is ordered by primary key
+EXPORTS = {
+    "movies": """
+        SELECT movie_id, title, release_date, language_id, duration, certification,
+               budget, ott_rights_value, poster_url, plot_summary, imdb_rating,
+               producer_id, created_by, created_at, updated_at
+        FROM MOVIES ORDER BY movie_id""",
+    "box-office": """
+        SELECT box_id, movie_id, domestic_collection, intl_collection, opening_weekend,
+               total_collection, profit_margin, release_screens, collection_status,
+               updated_by, created_at, updated_at
+        FROM BOX_OFFICE ORDER BY box_id""",
+    "cast": """
+        SELECT mc.cast_id, mc.movie_id, m.title, mc.actor_id, a.name AS actor_name,
+               mc.role_name, mc.role_type, mc.screen_time_minutes, mc.created_at
+        FROM MOVIE_CAST mc
+        JOIN MOVIES m ON mc.movie_id = m.movie_id
+        JOIN ACTORS a ON mc.actor_id = a.actor_id
+        ORDER BY mc.cast_id""",
+    "crew": """
+        SELECT mc.movie_crew_id, mc.movie_id, m.title, mc.crew_id, pc.name AS crew_name,
+               pc.role, mc.role_description, mc.created_at
+        FROM MOVIE_CREW mc
+        JOIN MOVIES m ON mc.movie_id = m.movie_id
+        JOIN PRODUCTION_CREW pc ON mc.crew_id = pc.crew_id
+        ORDER BY mc.movie_crew_id""",
+    "movie-audit": "SELECT * FROM MOVIE_AUDIT ORDER BY audit_id",
+    "box-office-audit": "SELECT * FROM BOX_OFFICE_AUDIT ORDER BY audit_id",
+    "activity-log": "SELECT * FROM ACTIVITY_LOG ORDER BY log_id",
+}
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+def _ndjson_chunk(rows):
+    return "".join(json.dumps(row, default=json_default, ensure_ascii=False) + "\n"
+                   for row in rows)
+
+
+def _csv_chunk(rows, header):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(rows[0].keys())
+    writer.writerows([[json_default(v) if isinstance(v, (datetime, date, Decimal)) else v
+                       for v in row.values()] for row in rows])
+    return buffer.getvalue()
+
+
+@router.get("/{dataset}")
+async def export_dataset(
+    dataset: str,
+    format: str = Query("ndjson", description="ndjson or csv"),
+    batch_size: int = Query(1000, ge=100, le=10000)
+):
+    """Stream a whole table as NDJSON or CSV with bounded memory"""
+    if dataset not in EXPORTS:
+        raise HTTPException(status_code=404, detail=f"Unknown export: {dataset}")
+    if format not in MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail=f"Unsupported format: {format}")
+
+    # A slow download must not tie up a pooled connection; at most
+    # DB_DEDICATED_STREAMS exports run at once, later ones wait here
+    batches = stream_query(EXPORTS[dataset], batch_size=batch_size, dedicated=True)
+    # Fetch the first batch up front so query errors still produce a 500
+    try:
+        first = await batches.__anext__()
+    except StopAsyncIteration:
+        first = []
+    except Exception as e:
+        logger.error(f"Error exporting {dataset}: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    async def body():
+        if not first:
+            return
+        if format == "csv":
+            yield _csv_chunk(first, header=True)
+            async for batch in batches:
+                yield _csv_chunk(batch, header=False)
+        else:
+            yield _ndjson_chunk(first)
+            async for batch in batches:
+                yield _ndjson_chunk(batch)
+
+    extension = "csv" if format == "csv" else "ndjson"
+    return StreamingResponse(
+        body(),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{dataset}.{extension}"'},
+    )
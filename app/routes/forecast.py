@@ -0,0 +1,127 @@
+"""
+Collection forecasting routes
+"""
+from fastapi import APIRouter, HTTPException, Query
+from typing import List, Optional
+import time
+from app.models.database_models import ForecastInput
+from app.services import forecast_service
+from app.services.forecast_service import FeatureBatch, forecast_registry
+from config import get_settings
+from database.async_connection import run_in_executor
+import logging
+
+router = APIRouter(prefix="/api/forecast", tags=["forecast"])
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+def _model(version):
+    model = forecast_registry.get(version)
+    if model is None:
+        detail = f"Forecast model v{version} not found" if version is not None \
+            else "No forecast model has been trained yet"
+        raise HTTPException(status_code=404, detail=detail)
+    return model
+
+
+@router.post("/train")
+async def train_model(
+    alpha: Optional[float] = Query(None, gt=0, description="Ridge penalty (default FORECAST_ALPHA)"),
+    activate: bool = Query(True, description="Serve the new version immediately")
+):
+    """Train a new model version on every movie with box office figures"""
+    try:
+        model = await run_in_executor(forecast_registry.train, alpha, activate)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Forecast training failed: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+    return model.describe()
+
+
+@router.get("/models")
+async def list_models():
+    """Cached model versions, newest first, and the active version"""
+    try:
+        return await run_in_executor(forecast_registry.versions)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/models/{version}/activate")
+async def activate_model(version: int):
+    """Serve an earlier (or later) cached version"""
+    model = await run_in_executor(forecast_registry.activate, version)
+    if model is None:
+        raise HTTPException(status_code=404, detail=f"Forecast model v{version} not found")
+    return model.describe()
+
+
+@router.post("/predict")
+async def predict(inputs: List[ForecastInput], version: Optional[int] = None):
+    """Score a batch of (possibly unsaved) movies in one call"""
+    if len(inputs) > settings.FORECAST_MAX_BATCH:
+        raise HTTPException(status_code=413,
+                            detail=f"At most {settings.FORECAST_MAX_BATCH} movies per request")
+    model = await run_in_executor(_model, version)
+
+    def score():
+        batch = FeatureBatch.from_inputs(inputs, forecast_service.cast_popularity(inputs))
+        keys = [{"ref": item.ref} for item in inputs]
+        return forecast_service.predictions(model, batch, keys)
+
+    try:
+        start = time.perf_counter()
+        results = await run_in_executor(score)
+    except Exception as e:
+        logger.error(f"Forecast scoring failed: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+    return {"version": model.version, "count": len(results),
+            "elapsed_ms": round((time.perf_counter() - start) * 1000, 2),
+            "predictions": results}
+
+
+@router.get("/upcoming")
+async def forecast_upcoming(
+    limit: int = Query(1000, ge=1, le=10000),
+    version: Optional[int] = None
+):
+    """Forecasts for movies that have no box office figures yet"""
+    model = await run_in_executor(_model, version)
+
+    def score():
+        rows, batch = forecast_service.load_upcoming(limit)
+        keys = [{"movie_id": row["movie_id"], "title": row["title"]} for row in rows]
+        return forecast_service.predictions(model, batch, keys)
+
+    try:
+        results = await run_in_executor(score)
+    except Exception as e:
+        logger.error(f"Forecasting upcoming movies failed: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+    return {"version": model.version, "count": len(results), "predictions": results}
+
+
+@router.get("/movies/{movie_id}")
+async def forecast_movie(movie_id: int, version: Optional[int] = None):
+    """Forecast for one movie, alongside its actual collection if known"""
+    model = await run_in_executor(_model, version)
+
+    def score():
+        rows, batch = forecast_service.load_movie(movie_id)
+        if not rows:
+            return None
+        keys = [{"movie_id": movie_id, "title": rows[0]["title"],
+                 "actual_collection": rows[0]["total_collection"]}]
+        return forecast_service.predictions(model, batch, keys)[0]
+
+    try:
+        result = await run_in_executor(score)
+    except Exception as e:
+        logger.error(f"Forecasting movie {movie_id} failed: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+    if result is None:
+        raise HTTPException(status_code=404, detail="Movie not found")
+    return {"version": model.version, **result}
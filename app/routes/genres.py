@@ -1,14 +1,17 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query, Depends
 from typing import List, Optional
 from ..models.database_models import Genre, GenreCreate
-from database.connection import execute_query
+from database.async_connection import execute_query
+from database.unit_of_work import AsyncUnitOfWork, get_unit_of_work
+from ..utils.cache import cached, invalidate
 
 router = APIRouter()
 
 @router.get("/genres", response_model=List[Genre])
+@cached("genres")
 async def get_genres(
-    skip: int = 0,
-    limit: int = 100,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
     genre_name: Optional[str] = None
 ):
     """Get all genres with optional filtering"""
@@ -27,12 +30,13 @@ async def get_genres(
     params.extend([limit, skip])
 
     try:
-        genres = execute_query(query, tuple(params))
+        genres = await execute_query(query, tuple(params))
         return genres
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/genres/{genre_id}", response_model=Genre)
+@cached("genre", key="genre_id")
 async def get_genre(genre_id: int):
     """Get a specific genre by ID"""
     query = """
@@ -42,7 +46,7 @@ async def get_genre(genre_id: int):
     """
 
     try:
-        genre = execute_query(query, (genre_id,))
+        genre = await execute_query(query, (genre_id,))
         if not genre:
             raise HTTPException(status_code=404, detail="Genre not found")
         return genre[0]
@@ -60,16 +64,17 @@ async def create_genre(genre: GenreCreate):
     """
 
     try:
-        result = execute_query(query, (genre.genre_name, genre.description), fetch=False)
+        result = await execute_query(query, (genre.genre_name, genre.description), fetch=False)
+        invalidate("genres")
         return {"genre_id": result["last_id"], "message": "Genre created successfully"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.put("/genres/{genre_id}", response_model=dict)
-async def update_genre(genre_id: int, genre: GenreCreate):
+async def update_genre(genre_id: int, genre: GenreCreate, uow: AsyncUnitOfWork = Depends(get_unit_of_work)):
     """Update an existing genre"""
     # Check if genre exists
-    existing_genre = execute_query("SELECT genre_id FROM GENRES WHERE genre_id = %s", (genre_id,))
+    existing_genre = await uow.execute("SELECT genre_id FROM GENRES WHERE genre_id = %s FOR UPDATE", (genre_id,))
     if not existing_genre:
         raise HTTPException(status_code=404, detail="Genre not found")
 
@@ -91,21 +96,27 @@ async def update_genre(genre_id: int, genre: GenreCreate):
     query = f"UPDATE GENRES SET {', '.join(update_fields)} WHERE genre_id = %s"
 
     try:
-        execute_query(query, tuple(params), fetch=False)
+        await uow.execute(query, tuple(params), fetch=False)
+        await uow.commit()
+        invalidate("genres", "movie_details")
+        invalidate("genre", entity=genre_id)
         return {"message": "Genre updated successfully"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.delete("/genres/{genre_id}", response_model=dict)
-async def delete_genre(genre_id: int):
+async def delete_genre(genre_id: int, uow: AsyncUnitOfWork = Depends(get_unit_of_work)):
     """Delete a genre"""
     # Check if genre exists
-    existing_genre = execute_query("SELECT genre_id FROM GENRES WHERE genre_id = %s", (genre_id,))
+    existing_genre = await uow.execute("SELECT genre_id FROM GENRES WHERE genre_id = %s FOR UPDATE", (genre_id,))
     if not existing_genre:
         raise HTTPException(status_code=404, detail="Genre not found")
 
     try:
-        execute_query("DELETE FROM GENRES WHERE genre_id = %s", (genre_id,), fetch=False)
+        await uow.execute("DELETE FROM GENRES WHERE genre_id = %s", (genre_id,), fetch=False)
+        await uow.commit()
+        invalidate("genres", "movie_details")
+        invalidate("genre", entity=genre_id)
         return {"message": "Genre deleted successfully"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
@@ -0,0 +1,95 @@
+"""
+Collaboration graph routes
+"""
+from fastapi import APIRouter, HTTPException, Query
+from typing import Optional
+from app.services.graph_service import KINDS, MAX_PATH_DEPTH, ROLES, collaboration_graph
+from database.async_connection import run_in_executor
+import logging
+
+router = APIRouter(prefix="/api/graph", tags=["graph"])
+logger = logging.getLogger(__name__)
+
+
+def _check_kind(kind):
+    if kind not in KINDS:
+        raise HTTPException(status_code=404, detail=f"Unknown person type: {kind}")
+
+
+def _check_role(role):
+    if role is not None and role not in ROLES:
+        raise HTTPException(status_code=400,
+                            detail=f"Unknown role: {role}; expected one of {', '.join(ROLES)}")
+
+
+@router.get("/pairs")
+async def get_top_pairs(
+    role_a: str = Query("Director", description="'actor' or a crew role"),
+    role_b: str = Query("Music Director", description="'actor' or a crew role"),
+    by: str = Query("gross", pattern="^(gross|movies)$"),
+    min_movies: int = Query(1, ge=1),
+    limit: int = Query(20, ge=1, le=200)
+):
+    """Pairs who worked together most, e.g. director x music director by combined gross"""
+    _check_role(role_a)
+    _check_role(role_b)
+    try:
+        await run_in_executor(collaboration_graph.ensure_fresh)
+        return await run_in_executor(collaboration_graph.top_pairs, role_a, role_b, by, limit, min_movies)
+    except Exception as e:
+        logger.error(f"Error ranking {role_a} x {role_b} pairs: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/path")
+async def get_collaboration_path(
+    from_type: str = Query("actor"),
+    from_id: int = Query(...),
+    to_type: str = Query("actor"),
+    to_id: int = Query(...),
+    via: Optional[str] = Query(None, description="Only pass through people with this role"),
+    max_depth: int = Query(6, ge=1, le=MAX_PATH_DEPTH)
+):
+    """Shortest chain of shared movies linking two people"""
+    _check_kind(from_type)
+    _check_kind(to_type)
+    _check_role(via)
+    try:
+        await run_in_executor(collaboration_graph.ensure_fresh)
+        result = await run_in_executor(collaboration_graph.path, (from_type, from_id),
+                                       (to_type, to_id), role=via, max_depth=max_depth)
+    except Exception as e:
+        logger.error(f"Error finding path {from_type}:{from_id} -> {to_type}:{to_id}: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+    if result is None:
+        raise HTTPException(status_code=404,
+                            detail=f"No collaboration path within {max_depth} movies")
+    return result
+
+
+@router.get("/stats")
+async def graph_stats():
+    """Size and freshness of the in-process collaboration graph"""
+    return collaboration_graph.stats()
+
+
+@router.get("/{kind}/{person_id}/collaborators")
+async def get_collaborators(
+    kind: str,
+    person_id: int,
+    role: Optional[str] = Query(None, description="Only collaborators with this role, e.g. 'actor'"),
+    limit: int = Query(20, ge=1, le=200)
+):
+    """Frequent co-stars and collaborators of an actor or crew member"""
+    _check_kind(kind)
+    _check_role(role)
+    try:
+        await run_in_executor(collaboration_graph.ensure_fresh)
+        result = await run_in_executor(collaboration_graph.collaborators, kind, person_id,
+                                       role=role, limit=limit)
+    except Exception as e:
+        logger.error(f"Error fetching collaborators of {kind} {person_id}: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+    if result is None:
+        raise HTTPException(status_code=404, detail=f"No credits found for {kind} {person_id}")
+    return result
@@ -0,0 +1,94 @@
+"""
+Bulk ingest routes
+"""
+from fastapi import APIRouter, HTTPException, Query, Request
+from typing import Optional
+import asyncio
+import io
+from app.services import analytics_service
+from app.services.ingest_service import BULK_ENTITIES, DEFAULT_BATCH_SIZE, FORMATS, load_file
+from app.services.graph_service import collaboration_graph
+from app.services.search_service import search_index
+from app.utils.cache import invalidate
+from database.async_connection import run_in_executor
+import logging
+
+router = APIRouter(prefix="/api/bulk", tags=["bulk"])
+logger = logging.getLogger(__name__)
+
+# kind -> search index kind refreshed after the load
+SEARCH_KINDS = {"movies": "movie", "actors": "actor", "crew": "crew"}
+# kinds that change the collaboration graph's credits or movie grosses
+GRAPH_KINDS = {"cast", "movie-crew", "box-office"}
+
+
+class RequestBody(io.RawIOBase):
+    """Blocking file over a request's body stream, read as it arrives.
+
+    For the loader's executor thread: each read waits for the next chunk
+    on the event loop, so the body is never held whole.
+    """
+
+    def __init__(self, request, loop):
+        self._chunks = request.stream()
+        self._loop = loop
+        self._buffer = b""
+
+    def readable(self):
+        return True
+
+    async def _next_chunk(self):
+        try:
+            return await self._chunks.__anext__()
+        except StopAsyncIteration:
+            return None
+
+    def readinto(self, b):
+        while not self._buffer:
+            chunk = asyncio.run_coroutine_threadsafe(self._next_chunk(), self._loop).result()
+            if chunk is None:
+                return 0
+            self._buffer = memoryview(chunk)
+        n = min(len(b), len(self._buffer))
+        b[:n] = self._buffer[:n]
+        self._buffer = self._buffer[n:]
+        return n
+
+
+@router.post("/{kind}")
+async def bulk_load(
+    kind: str,
+    request: Request,
+    format: Optional[str] = Query(None, description="csv or jsonl (default: from Content-Type)"),
+    batch_size: int = Query(DEFAULT_BATCH_SIZE, ge=1, le=10000),
+    dry_run: bool = Query(False, description="Validate only, write nothing")
+):
+    """Load a CSV or JSONL body of movies, actors, crew, box-office, box-office-daily, cast or movie-crew rows.
+
+    Rows are validated and inserted in batches; invalid rows are reported
+    with their line number and do not abort the load.
+    """
+    if kind not in BULK_ENTITIES:
+        raise HTTPException(status_code=404, detail=f"Unknown entity: {kind}")
+    if format is None:
+        format = "csv" if "csv" in request.headers.get("content-type", "") else "jsonl"
+    if format not in FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unsupported format: {format}")
+
+    body = io.BufferedReader(RequestBody(request, asyncio.get_running_loop()))
+    try:
+        report = await run_in_executor(load_file, kind, body, format, batch_size, dry_run)
+    except Exception as e:
+        logger.error(f"Bulk load of {kind} failed: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    if report["inserted"] and not dry_run:
+        analytics_service.invalidate_summary()
+        invalidate("movie_details", "movie_box_office", "box_office_timeseries")
+        if kind in SEARCH_KINDS:
+            search_index.expire()
+        if kind in GRAPH_KINDS:
+            collaboration_graph.expire()
+    logger.info(f"Bulk load of {kind}: {report['inserted']}/{report['rows']} rows "
+                f"in {report['elapsed_s']}s ({report['rows_per_sec']} rows/s)")
+    return report
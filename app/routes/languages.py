@@ -1,10 +1,12 @@
 """
 Language management routes
 """
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Depends
 from typing import List, Optional
 from app.models.database_models import Language, LanguageCreate
-from database.connection import execute_query
+from database.async_connection import execute_query
+from database.unit_of_work import AsyncUnitOfWork, get_unit_of_work
+from app.utils.cache import cached, invalidate
 import logging
 
 router = APIRouter(prefix="/api/languages", tags=["languages"])
@@ -12,6 +14,7 @@ logger = logging.getLogger(__name__)
 
 
 @router.get("", response_model=List[Language])
+@cached("languages")
 async def get_languages(
     limit: int = Query(100, ge=1, le=1000),
     offset: int = Query(0, ge=0)
@@ -19,7 +22,7 @@ async def get_languages(
     """Get all languages"""
     try:
         query = "SELECT * FROM LANGUAGES ORDER BY language_name LIMIT %s OFFSET %s"
-        result = execute_query(query, (limit, offset), fetch=True)
+        result = await execute_query(query, (limit, offset), fetch=True)
         return result if result else []
     except Exception as e:
         logger.error(f"Error fetching languages: {e}")
@@ -27,11 +30,12 @@ async def get_languages(
 
 
 @router.get("/{language_id}", response_model=Language)
+@cached("language", key="language_id")
 async def get_language(language_id: int):
     """Get a single language by ID"""
     try:
         query = "SELECT * FROM LANGUAGES WHERE language_id = %s"
-        result = execute_query(query, (language_id,), fetch=True)
+        result = await execute_query(query, (language_id,), fetch=True)
 
         if not result:
             raise HTTPException(status_code=404, detail="Language not found")
@@ -45,15 +49,14 @@ async def get_language(language_id: int):
 
 
 @router.post("", status_code=201)
-async def create_language(language: LanguageCreate):
+async def create_language(language: LanguageCreate, uow: AsyncUnitOfWork = Depends(get_unit_of_work)):
     """Create a new language"""
     try:
         query = "INSERT INTO LANGUAGES (language_name) VALUES (%s)"
-        execute_query(query, (language.language_name,), fetch=False)
-
-        # Get the last inserted ID
-        result = execute_query("SELECT LAST_INSERT_ID() as language_id", fetch=True)
-        language_id = result[0]['language_id']
+        result = await uow.execute(query, (language.language_name,), fetch=False)
+        await uow.commit()
+        language_id = result["last_id"]
+        invalidate("languages")
 
         return {"language_id": language_id, "message": "Language created successfully"}
     except Exception as e:
@@ -62,18 +65,21 @@ async def create_language(language: LanguageCreate):
 
 
 @router.put("/{language_id}")
-async def update_language(language_id: int, language: LanguageCreate):
+async def update_language(language_id: int, language: LanguageCreate, uow: AsyncUnitOfWork = Depends(get_unit_of_work)):
     """Update an existing language"""
     try:
         # Check if language exists
-        check_query = "SELECT language_id FROM LANGUAGES WHERE language_id = %s"
-        existing = execute_query(check_query, (language_id,), fetch=True)
+        check_query = "SELECT language_id FROM LANGUAGES WHERE language_id = %s FOR UPDATE"
+        existing = await uow.execute(check_query, (language_id,), fetch=True)
 
         if not existing:
             raise HTTPException(status_code=404, detail="Language not found")
 
         query = "UPDATE LANGUAGES SET language_name = %s WHERE language_id = %s"
-        execute_query(query, (language.language_name, language_id), fetch=False)
+        await uow.execute(query, (language.language_name, language_id), fetch=False)
+        await uow.commit()
+        invalidate("languages", "movie_details")
+        invalidate("language", entity=language_id)
 
         return {"message": "Language updated successfully"}
     except HTTPException:
@@ -84,19 +90,22 @@ async def update_language(language_id: int, language: LanguageCreate):
 
 
 @router.delete("/{language_id}")
-async def delete_language(language_id: int):
+async def delete_language(language_id: int, uow: AsyncUnitOfWork = Depends(get_unit_of_work)):
     """Delete a language"""
     try:
         # Check if language exists
-        check_query = "SELECT language_id FROM LANGUAGES WHERE language_id = %s"
-        existing = execute_query(check_query, (language_id,), fetch=True)
+        check_query = "SELECT language_id FROM LANGUAGES WHERE language_id = %s FOR UPDATE"
+        existing = await uow.execute(check_query, (language_id,), fetch=True)
 
         if not existing:
             raise HTTPException(status_code=404, detail="Language not found")
 
         # Delete language
         query = "DELETE FROM LANGUAGES WHERE language_id = %s"
-        execute_query(query, (language_id,), fetch=False)
+        await uow.execute(query, (language_id,), fetch=False)
+        await uow.commit()
+        invalidate("languages")
+        invalidate("language", entity=language_id)
 
         return {"message": "Language deleted successfully"}
     except HTTPException:
@@ -1,19 +1,49 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Query, Depends, Response
 from typing import List, Optional
-from ..models.database_models import Movie, MovieCreate, MovieStatistics
-from database.connection import execute_query, call_procedure
+from ..models.database_models import Movie, MovieCastBase, MovieCreate, MovieCrewBase, MovieStatistics
+from database.async_connection import execute_query, call_procedure, call_procedure_results
+from database.unit_of_work import AsyncUnitOfWork, get_unit_of_work
+from ..utils.cache import cached, invalidate
+from ..utils.conditional import conditional, table_version
+from ..utils.pagination import keyset_condition, paginate
+from ..utils.validators import http_error
+from ..services import movie_service
+from ..services.analytics_service import invalidate_summary
+from ..services.audit_pipeline import audit_pipeline
+from ..services.graph_service import collaboration_graph
+from ..services.search_service import fulltext_condition, search_index
 
 router = APIRouter()
 
 @router.get("/movies", response_model=List[Movie])
+@conditional(table_version("MOVIES"))
 async def get_movies(
-    skip: int = 0,
-    limit: int = 100,
+    response: Response,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
     title: Optional[str] = None,
     language_id: Optional[int] = None,
-    producer_id: Optional[int] = None
+    producer_id: Optional[int] = None,
+    ids: Optional[str] = None
 ):
-    """Get all movies with optional filtering"""
+    """Get all movies with optional filtering.
+
+    Pass the X-Next-Cursor header of the previous page as `cursor` for
+    keyset pagination; `skip` is kept for legacy offset paging. `ids`
+    (comma-separated) fetches exactly those movies, in that order.
+    """
+    if ids:
+        try:
+            movie_ids = movie_service.parse_ids(ids)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        try:
+            found = await movie_service.get_movies(movie_ids)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+        return [found[i] for i in movie_ids if i in found]
+
     query = """
     SELECT m.movie_id, m.title, m.release_date, m.language_id, m.duration,
            m.certification, m.budget, m.ott_rights_value, m.poster_url,
@@ -25,8 +55,9 @@ async def get_movies(
     params = []
 
     if title:
-        query += " AND m.title LIKE %s"
-        params.append(f"%{title}%")
+        condition, title_params = fulltext_condition(("m.title",), title)
+        query += f" AND {condition}"
+        params.extend(title_params)
     if language_id:
         query += " AND m.language_id = %s"
         params.append(language_id)
@@ -34,16 +65,37 @@ async def get_movies(
         query += " AND m.producer_id = %s"
         params.append(producer_id)
 
-    query += " ORDER BY m.created_at DESC LIMIT %s OFFSET %s"
-    params.extend([limit, skip])
+    if cursor:
+        condition, cursor_params = keyset_condition(("m.created_at", "m.movie_id"), cursor)
+        query += f" AND {condition}"
+        params.extend(cursor_params)
+        skip = 0
+
+    query += " ORDER BY m.created_at DESC, m.movie_id DESC LIMIT %s OFFSET %s"
+    params.extend([limit + 1, skip])
+
+    try:
+        movies = await execute_query(query, tuple(params))
+        return paginate(movies, limit, response, ("created_at", "movie_id"))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/movies/details:batch", response_model=dict)
+async def get_movie_details_batch(ids: str):
+    """Details (movie, cast, crew) for many movies, keyed by movie_id"""
     try:
-        movies = execute_query(query, tuple(params))
-        return movies
+        movie_ids = movie_service.parse_ids(ids)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    try:
+        found = await movie_service.get_movie_details(movie_ids)
+        return movie_service.batch_response(movie_ids, found)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/movies/{movie_id}", response_model=Movie)
+@conditional()
+@cached("movie", key="movie_id")
 async def get_movie(movie_id: int):
     """Get a specific movie by ID"""
     query = """
@@ -56,7 +108,7 @@ async def get_movie(movie_id: int):
     """
 
     try:
-        movie = execute_query(query, (movie_id,))
+        movie = await execute_query(query, (movie_id,))
         if not movie:
             raise HTTPException(status_code=404, detail="Movie not found")
         return movie[0]
@@ -69,8 +121,9 @@ async def get_movie(movie_id: int):
 async def create_movie(movie: MovieCreate):
     """Create a new movie"""
     try:
-        # Use stored procedure to create movie
-        result = call_procedure("sp_add_movie", (
+        # Use stored procedure to create movie; the last two arguments are
+        # its OUT parameters (p_movie_id, p_message)
+        _, args = await call_procedure_results("sp_add_movie", (
             movie.title,
             movie.release_date,
             movie.language_id,
@@ -81,23 +134,32 @@ async def create_movie(movie: MovieCreate):
             movie.plot_summary,
             movie.imdb_rating,
             movie.producer_id,
-            movie.created_by
+            movie.created_by,
+            None,
+            None
         ))
-
-        if result and len(result) > 0:
-            movie_id = result[0][0] if len(result[0]) > 0 else None
-            return {"movie_id": movie_id, "message": "Movie created successfully"}
-        else:
-            raise HTTPException(status_code=500, detail="Failed to create movie")
-
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+    movie_id, message = args[-2], args[-1]
+    if not movie_id or movie_id < 0:
+        raise HTTPException(status_code=500, detail=message or "Failed to create movie")
+
+    if audit_pipeline.app_audits:
+        # sp_add_movie also created the pending BOX_OFFICE row
+        await audit_pipeline.movie("INSERT", movie_id, new=movie.model_dump(), reason="Movie Created")
+        await audit_pipeline.box_office("INSERT", movie_id)
+    invalidate_summary(movie_id)
+    search_index.mark_dirty("movie", movie_id)
+    return {"movie_id": movie_id, "message": "Movie created successfully"}
+
 @router.put("/movies/{movie_id}", response_model=dict)
-async def update_movie(movie_id: int, movie: MovieCreate):
+async def update_movie(movie_id: int, movie: MovieCreate, uow: AsyncUnitOfWork = Depends(get_unit_of_work)):
     """Update an existing movie"""
-    # Check if movie exists
-    existing_movie = execute_query("SELECT movie_id FROM MOVIES WHERE movie_id = %s", (movie_id,))
+    # Check if movie exists (and lock it until the update commits)
+    existing_movie = await uow.execute(
+        "SELECT movie_id, title, budget, release_date FROM MOVIES WHERE movie_id = %s FOR UPDATE",
+        (movie_id,))
     if not existing_movie:
         raise HTTPException(status_code=404, detail="Movie not found")
 
@@ -142,63 +204,121 @@ async def update_movie(movie_id: int, movie: MovieCreate):
     if not update_fields:
         raise HTTPException(status_code=400, detail="No fields to update")
 
-    update_fields.append("updated_at = CURRENT_TIMESTAMP")
+    update_fields.append("updated_at = CURRENT_TIMESTAMP(6)")
     params.append(movie_id)
 
     query = f"UPDATE MOVIES SET {', '.join(update_fields)} WHERE movie_id = %s"
 
     try:
-        execute_query(query, tuple(params), fetch=False)
+        await uow.execute(query, tuple(params), fetch=False)
+        await uow.commit()
+        if audit_pipeline.app_audits:
+            await _audit_movie_update(movie_id, existing_movie[0], movie)
+        invalidate("movie", "movie_details", "movie_box_office", entity=movie_id)
+        invalidate_summary(movie_id)
+        search_index.mark_dirty("movie", movie_id)
+        collaboration_graph.mark_dirty("movie", movie_id)
         return {"message": "Movie updated successfully"}
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        raise http_error(e)
+
+async def _audit_movie_update(movie_id, old, movie):
+    """MOVIE_AUDIT row for an update, when title, budget or release date changed"""
+    new = {
+        "title": movie.title if movie.title is not None else old["title"],
+        "budget": movie.budget if movie.budget is not None else old["budget"],
+        "release_date": movie.release_date if movie.release_date is not None else old["release_date"],
+    }
+    changed = (new["title"] != old["title"] or new["release_date"] != old["release_date"]
+               or (new["budget"] is None) != (old["budget"] is None)
+               or (new["budget"] is not None and float(new["budget"]) != float(old["budget"])))
+    if changed:
+        await audit_pipeline.movie("UPDATE", movie_id, old=old, new=new)
 
 @router.delete("/movies/{movie_id}", response_model=dict)
-async def delete_movie(movie_id: int):
+async def delete_movie(movie_id: int, uow: AsyncUnitOfWork = Depends(get_unit_of_work)):
     """Delete a movie"""
     # Check if movie exists
-    existing_movie = execute_query("SELECT movie_id FROM MOVIES WHERE movie_id = %s", (movie_id,))
+    existing_movie = await uow.execute(
+        "SELECT movie_id, title, budget, release_date FROM MOVIES WHERE movie_id = %s FOR UPDATE",
+        (movie_id,))
     if not existing_movie:
         raise HTTPException(status_code=404, detail="Movie not found")
 
     try:
-        execute_query("DELETE FROM MOVIES WHERE movie_id = %s", (movie_id,), fetch=False)
+        await uow.execute("DELETE FROM MOVIES WHERE movie_id = %s", (movie_id,), fetch=False)
+        await uow.commit()
+        if audit_pipeline.app_audits:
+            await audit_pipeline.movie("DELETE", movie_id, old=existing_movie[0], reason="Movie Deleted")
+        invalidate("movie", "movie_details", "movie_box_office", "box_office_timeseries", entity=movie_id)
+        invalidate_summary(movie_id)
+        search_index.mark_dirty("movie", movie_id)
+        collaboration_graph.mark_dirty("movie", movie_id)
         return {"message": "Movie deleted successfully"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/movies/{movie_id}/details", response_model=dict)
+@cached("movie_details", key="movie_id")
 async def get_movie_details(movie_id: int):
     """Get detailed movie information including cast and crew"""
     try:
-        # Use stored procedure to get movie details
-        result = call_procedure("sp_get_movie_details", (movie_id,))
+        found = await movie_service.get_movie_details([movie_id])
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
 
-        if not result or len(result) == 0:
-            raise HTTPException(status_code=404, detail="Movie not found")
+    if movie_id not in found:
+        raise HTTPException(status_code=404, detail="Movie not found")
+    return found[movie_id]
 
-        # The stored procedure returns 3 result sets: movie info, cast, crew
-        movie_info = result[0] if len(result) > 0 else []
-        cast_info = result[1] if len(result) > 1 else []
-        crew_info = result[2] if len(result) > 2 else []
+@router.post("/movie-cast", response_model=dict, status_code=201)
+async def add_movie_cast(cast: MovieCastBase, uow: AsyncUnitOfWork = Depends(get_unit_of_work)):
+    """Add an actor to a movie's cast"""
+    # Duplicates, bad values and unknown movie/actor ids are rejected by
+    # the table constraints and mapped by http_error
+    query = """
+    INSERT INTO MOVIE_CAST (movie_id, actor_id, role_name, role_type, screen_time_minutes)
+    VALUES (%s, %s, %s, %s, %s)
+    """
+    try:
+        result = await uow.execute(query, (
+            cast.movie_id,
+            cast.actor_id,
+            cast.role_name,
+            cast.role_type.value,
+            cast.screen_time_minutes
+        ), fetch=False)
+        await uow.commit()
+    except Exception as e:
+        raise http_error(e)
 
-        return {
-            "movie": movie_info[0] if movie_info else {},
-            "cast": cast_info,
-            "crew": crew_info
-        }
+    invalidate("movie_details", entity=cast.movie_id)
+    collaboration_graph.mark_dirty("movie", cast.movie_id)
+    return {"cast_id": result["last_id"], "message": "Cast member added successfully"}
 
-    except HTTPException:
-        raise
+@router.post("/movie-crew", response_model=dict, status_code=201)
+async def add_movie_crew(crew: MovieCrewBase, uow: AsyncUnitOfWork = Depends(get_unit_of_work)):
+    """Add a crew member to a movie"""
+    query = """
+    INSERT INTO MOVIE_CREW (movie_id, crew_id, role_description)
+    VALUES (%s, %s, %s)
+    """
+    try:
+        result = await uow.execute(query, (crew.movie_id, crew.crew_id, crew.role_description), fetch=False)
+        await uow.commit()
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        raise http_error(e)
+
+    invalidate("movie_details", entity=crew.movie_id)
+    collaboration_graph.mark_dirty("movie", crew.movie_id)
+    return {"movie_crew_id": result["last_id"], "message": "Crew member added successfully"}
 
 @router.get("/movies/{movie_id}/profit-analysis", response_model=dict)
 async def get_profit_analysis(movie_id: int):
     """Get profit analysis for a movie"""
     try:
         # Use stored procedure to get profit analysis
-        result = call_procedure("sp_get_profit_analysis", (movie_id,))
+        result = await call_procedure("sp_get_profit_analysis", (movie_id,))
 
         if not result or len(result) == 0:
             raise HTTPException(status_code=404, detail="Movie not found")
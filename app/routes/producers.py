@@ -1,19 +1,25 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query, Depends, Response
 from typing import List, Optional
 from ..models.database_models import Producer, ProducerCreate
-from database.connection import execute_query
+from database.async_connection import execute_query
+from database.unit_of_work import AsyncUnitOfWork, get_unit_of_work
+from ..utils.cache import cached, invalidate
+from ..utils.pagination import keyset_condition, paginate
+from ..services.search_service import fulltext_condition, search_index
 
 router = APIRouter()
 
 @router.get("/producers", response_model=List[Producer])
 async def get_producers(
-    skip: int = 0,
-    limit: int = 100,
+    response: Response,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
     name: Optional[str] = None,
     company: Optional[str] = None,
     region: Optional[str] = None
 ):
-    """Get all producers with optional filtering"""
+    """Get all producers with optional filtering (keyset via `cursor`)"""
     query = """
     SELECT p.producer_id, p.name, p.company, p.phone, p.email,
            p.start_date, p.region, p.created_by, p.created_at
@@ -23,25 +29,34 @@ async def get_producers(
     params = []
 
     if name:
-        query += " AND p.name LIKE %s"
-        params.append(f"%{name}%")
+        condition, name_params = fulltext_condition(("p.name",), name)
+        query += f" AND {condition}"
+        params.extend(name_params)
     if company:
-        query += " AND p.company LIKE %s"
-        params.append(f"%{company}%")
+        condition, company_params = fulltext_condition(("p.company",), company)
+        query += f" AND {condition}"
+        params.extend(company_params)
     if region:
         query += " AND p.region LIKE %s"
         params.append(f"%{region}%")
 
-    query += " ORDER BY p.created_at DESC LIMIT %s OFFSET %s"
-    params.extend([limit, skip])
+    if cursor:
+        condition, cursor_params = keyset_condition(("p.created_at", "p.producer_id"), cursor)
+        query += f" AND {condition}"
+        params.extend(cursor_params)
+        skip = 0
+
+    query += " ORDER BY p.created_at DESC, p.producer_id DESC LIMIT %s OFFSET %s"
+    params.extend([limit + 1, skip])
 
     try:
-        producers = execute_query(query, tuple(params))
-        return producers
+        producers = await execute_query(query, tuple(params))
+        return paginate(producers, limit, response, ("created_at", "producer_id"))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/producers/{producer_id}", response_model=Producer)
+@cached("producer", key="producer_id")
 async def get_producer(producer_id: int):
     """Get a specific producer by ID"""
     query = """
@@ -52,7 +67,7 @@ async def get_producer(producer_id: int):
     """
 
     try:
-        producer = execute_query(query, (producer_id,))
+        producer = await execute_query(query, (producer_id,))
         if not producer:
             raise HTTPException(status_code=404, detail="Producer not found")
         return producer[0]
@@ -70,7 +85,7 @@ async def create_producer(producer: ProducerCreate):
     """
 
     try:
-        result = execute_query(query, (
+        result = await execute_query(query, (
             producer.name,
             producer.company,
             producer.phone,
@@ -80,15 +95,16 @@ async def create_producer(producer: ProducerCreate):
             producer.created_by
         ), fetch=False)
 
+        search_index.mark_dirty("producer", result["last_id"])
         return {"producer_id": result["last_id"], "message": "Producer created successfully"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.put("/producers/{producer_id}", response_model=dict)
-async def update_producer(producer_id: int, producer: ProducerCreate):
+async def update_producer(producer_id: int, producer: ProducerCreate, uow: AsyncUnitOfWork = Depends(get_unit_of_work)):
     """Update an existing producer"""
     # Check if producer exists
-    existing_producer = execute_query("SELECT producer_id FROM PRODUCERS WHERE producer_id = %s", (producer_id,))
+    existing_producer = await uow.execute("SELECT producer_id FROM PRODUCERS WHERE producer_id = %s FOR UPDATE", (producer_id,))
     if not existing_producer:
         raise HTTPException(status_code=404, detail="Producer not found")
 
@@ -122,21 +138,45 @@ async def update_producer(producer_id: int, producer: ProducerCreate):
     query = f"UPDATE PRODUCERS SET {', '.join(update_fields)} WHERE producer_id = %s"
 
     try:
-        execute_query(query, tuple(params), fetch=False)
+        await uow.execute(query, tuple(params), fetch=False)
+        # Movie details show the producer's name and company
+        movie_ids = []
+        if producer.name is not None or producer.company is not None:
+            movie_ids = await _producer_movie_ids(uow, producer_id)
+        await uow.commit()
+        invalidate("producer", entity=producer_id)
+        for movie_id in movie_ids:
+            invalidate("movie_details", entity=movie_id)
+        search_index.mark_dirty("producer", producer_id)
         return {"message": "Producer updated successfully"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+async def _producer_movie_ids(uow, producer_id):
+    rows = await uow.execute("SELECT movie_id FROM MOVIES WHERE producer_id = %s FOR UPDATE",
+                             (producer_id,))
+    return [row["movie_id"] for row in rows]
+
 @router.delete("/producers/{producer_id}", response_model=dict)
-async def delete_producer(producer_id: int):
+async def delete_producer(producer_id: int, uow: AsyncUnitOfWork = Depends(get_unit_of_work)):
     """Delete a producer"""
     # Check if producer exists
-    existing_producer = execute_query("SELECT producer_id FROM PRODUCERS WHERE producer_id = %s", (producer_id,))
+    existing_producer = await uow.execute("SELECT producer_id FROM PRODUCERS WHERE producer_id = %s FOR UPDATE", (producer_id,))
     if not existing_producer:
         raise HTTPException(status_code=404, detail="Producer not found")
 
     try:
-        execute_query("DELETE FROM PRODUCERS WHERE producer_id = %s", (producer_id,), fetch=False)
+        # Clear the link ourselves: ON DELETE SET NULL would leave the movies'
+        # updated_at (and so their ETags) unchanged
+        movie_ids = await _producer_movie_ids(uow, producer_id)
+        await uow.execute("UPDATE MOVIES SET producer_id = NULL WHERE producer_id = %s",
+                          (producer_id,), fetch=False)
+        await uow.execute("DELETE FROM PRODUCERS WHERE producer_id = %s", (producer_id,), fetch=False)
+        await uow.commit()
+        invalidate("producer", entity=producer_id)
+        for movie_id in movie_ids:
+            invalidate("movie", "movie_details", entity=movie_id)
+        search_index.mark_dirty("producer", producer_id)
         return {"message": "Producer deleted successfully"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
@@ -0,0 +1,41 @@
+"""
+Unified search routes
+"""
+from fastapi import APIRouter, HTTPException, Query
+from typing import Optional
+from app.services.search_service import search_index, ENTITY_SOURCES
+from database.async_connection import run_in_executor
+import logging
+
+router = APIRouter(prefix="/api/search", tags=["search"])
+logger = logging.getLogger(__name__)
+
+
+@router.get("")
+async def search(
+    q: str = Query(..., min_length=1, description="Search text"),
+    types: Optional[str] = Query(None, description="Comma-separated subset of movie,actor,crew,producer"),
+    limit: int = Query(20, ge=1, le=100),
+    prefix: bool = Query(True, description="Also match words starting with each term")
+):
+    """Ranked, prefix- and transliteration-tolerant search across entities"""
+    kinds = None
+    if types:
+        kinds = {t.strip() for t in types.split(",") if t.strip()}
+        unknown = kinds - set(ENTITY_SOURCES)
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown search types: {', '.join(sorted(unknown))}")
+
+    try:
+        await run_in_executor(search_index.ensure_fresh)
+        results = await run_in_executor(search_index.search, q, kinds=kinds, limit=limit, prefix=prefix)
+        return {"query": q, "count": len(results), "results": results}
+    except Exception as e:
+        logger.error(f"Error searching for {q!r}: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/stats")
+async def search_stats():
+    """Size and freshness of the in-process search index"""
+    return search_index.stats()
@@ -0,0 +1,578 @@
+"""
+Analytics service
+
+Server-side aggregation for the dashboard. Per-movie, per-language,
+per-producer and per-actor aggregates live in the materialized *_SUMMARY
+tables; triggers queue changed keys and ``run_summary_refresher`` drains the
+queue every ANALYTICS_REFRESH_INTERVAL seconds via sp_refresh_summaries, so
+analytics reads never re-run the multi-way GROUP BY joins. The dashboard
+summary is read from those tables on a single pooled connection and cached
+for ANALYTICS_SUMMARY_TTL seconds; writes and refreshes invalidate it.
+
+Per-movie rankings and statistics (net profit, profit percentage, ROI,
+percentiles, z-scores, per-language/year/genre breakdowns) are answered
+from ``AnalyticsSnapshot``, a columnar NumPy copy of MOVIES, LANGUAGES,
+BOX_OFFICE and MOVIE_GENRES held in process. Every statistic is a
+vectorized pass over the columns. Writes mark movies dirty and only those
+rows are reloaded before the next read; the whole snapshot is reloaded
+after ANALYTICS_SNAPSHOT_TTL seconds to pick up changes made outside this
+process.
+"""
+import asyncio
+import threading
+import time
+import numpy as np
+from config import get_settings
+from database import connection
+from database.async_connection import call_procedure, execute_query, run_in_executor
+from database.unit_of_work import UnitOfWork
+import logging
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Totals roll up the (small) per-language summary rather than scanning movies
+TOTALS_SQL = """
+SELECT COALESCE(SUM(total_movies), 0) AS total_movies,
+       COALESCE(SUM(rated_movies), 0) AS rated_movies,
+       ROUND(SUM(avg_rating * rated_movies) / NULLIF(SUM(rated_movies), 0), 1) AS avg_rating,
+       COALESCE(SUM(total_budget), 0) AS total_budget,
+       COALESCE(SUM(total_collection), 0) AS total_collection,
+       (SELECT COUNT(*) FROM PRODUCERS) AS total_producers,
+       (SELECT COUNT(*) FROM ACTORS) AS total_actors,
+       (SELECT COUNT(*) FROM PRODUCTION_CREW) AS total_crew
+FROM LANGUAGE_SUMMARY
+"""
+
+BY_LANGUAGE_SQL = """
+SELECT language_id, language_name,
+       total_movies AS movie_count,
+       COALESCE(total_collection, 0) AS total_collection,
+       avg_collection, highest_collection, avg_rating
+FROM LANGUAGE_SUMMARY
+ORDER BY total_collection DESC
+"""
+
+BY_GENRE_SQL = """
+SELECT g.genre_id, g.genre_name, COUNT(mg.movie_id) AS movie_count
+FROM GENRES g
+LEFT JOIN MOVIE_GENRES mg ON g.genre_id = mg.genre_id
+GROUP BY g.genre_id, g.genre_name
+ORDER BY movie_count DESC
+"""
+
+TOP_BY_COLLECTION_SQL = """
+SELECT movie_id, title, language_name, release_date, total_collection,
+       domestic_collection, intl_collection, budget, profit_percentage, imdb_rating
+FROM MOVIE_SUMMARY
+WHERE total_collection IS NOT NULL
+ORDER BY total_collection DESC
+LIMIT %s
+"""
+
+TOP_PROFITABLE_SQL = """
+SELECT movie_id, title, budget, total_collection, net_profit, profit_percentage,
+       opening_weekend, release_screens, profit_margin
+FROM MOVIE_SUMMARY
+WHERE profit_percentage IS NOT NULL
+ORDER BY profit_percentage DESC
+LIMIT %s
+"""
+
+TOP_ACTORS_SQL = """
+SELECT actor_id, name, gender, popularity_score, movie_count, movies
+FROM ACTOR_SUMMARY
+ORDER BY popularity_score DESC, actor_id DESC
+LIMIT %s
+"""
+
+PRODUCER_STATS_SQL = """
+SELECT producer_id, name, company, total_movies, avg_rating, total_collection,
+       total_budget, net_profit, highest_grosser, refreshed_at
+FROM PRODUCER_SUMMARY
+WHERE producer_id = %s
+"""
+
+RECENT_MOVIES_SQL = """
+SELECT m.movie_id, m.title, m.release_date, l.language_name, m.budget, m.imdb_rating
+FROM MOVIES m
+JOIN LANGUAGES l ON m.language_id = l.language_id
+ORDER BY m.created_at DESC, m.movie_id DESC
+LIMIT %s
+"""
+
+_summary_cache = {}
+_summary_lock = threading.Lock()
+
+
+def _load_summary(top_n, recent_n):
+    uow = UnitOfWork()
+    try:
+        summary = {
+            "totals": uow.fetch_one(TOTALS_SQL),
+            "by_language": uow.execute(BY_LANGUAGE_SQL),
+            "by_genre": uow.execute(BY_GENRE_SQL),
+            "top_by_collection": uow.execute(TOP_BY_COLLECTION_SQL, (top_n,)),
+            "top_profitable": uow.execute(TOP_PROFITABLE_SQL, (top_n,)),
+            "recent_movies": uow.execute(RECENT_MOVIES_SQL, (recent_n,)),
+        }
+    finally:
+        uow.close()
+    summary["generated_at"] = time.time()
+    return summary
+
+
+async def get_dashboard_summary(top_n=10, recent_n=5):
+    """Dashboard totals, breakdowns and top-N lists, cached briefly"""
+    key = (top_n, recent_n)
+    with _summary_lock:
+        cached = _summary_cache.get(key)
+    if cached and cached[0] > time.monotonic():
+        return cached[1]
+
+    summary = await run_in_executor(_load_summary, top_n, recent_n)
+    with _summary_lock:
+        _summary_cache[key] = (time.monotonic() + settings.ANALYTICS_SUMMARY_TTL, summary)
+    return summary
+
+
+def _clear_summary_cache():
+    with _summary_lock:
+        _summary_cache.clear()
+
+
+def invalidate_summary(movie_id=None):
+    """Drop cached summaries after a write that changes the aggregates.
+
+    The snapshot reloads `movie_id` before its next read, or everything
+    when no movie is given (bulk loads).
+    """
+    _clear_summary_cache()
+    if movie_id is None:
+        analytics_snapshot.expire()
+    else:
+        analytics_snapshot.mark_dirty(movie_id)
+
+
+async def top_movies_by_collection(limit):
+    await run_in_executor(analytics_snapshot.ensure_fresh)
+    return analytics_snapshot.top("total_collection", limit, fields=TOP_BY_COLLECTION_FIELDS)
+
+
+async def top_profitable_movies(limit):
+    await run_in_executor(analytics_snapshot.ensure_fresh)
+    return analytics_snapshot.top("profit_percentage", limit, fields=TOP_PROFITABLE_FIELDS)
+
+
+async def language_summary():
+    return await execute_query(BY_LANGUAGE_SQL)
+
+
+async def top_actors(limit):
+    return await execute_query(TOP_ACTORS_SQL, (limit,))
+
+
+async def producer_stats(producer_id):
+    rows = await execute_query(PRODUCER_STATS_SQL, (producer_id,))
+    return rows[0] if rows else None
+
+
+async def refresh_summaries(full=False):
+    """Recompute queued summary rows (or every row if `full`)"""
+    procedure = "sp_rebuild_summaries" if full else "sp_refresh_summaries"
+    result = await call_procedure(procedure, ())
+    refreshed = result[0]["refreshed"] if result else 0
+    if refreshed:
+        _clear_summary_cache()
+    return refreshed
+
+
+async def run_summary_refresher(interval):
+    """Background loop bounding summary staleness to `interval` seconds"""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            refreshed = await refresh_summaries()
+            if refreshed:
+                logger.info(f"Refreshed {refreshed} queued summary rows")
+        except Exception as e:
+            logger.error(f"Summary refresh failed: {e}")
+
+
+# ---- in-memory snapshot ----------------------------------------------
+
+SNAPSHOT_SQL = """
+SELECT m.movie_id, m.title, m.release_date, m.language_id, l.language_name,
+       m.budget, m.imdb_rating, bo.domestic_collection, bo.intl_collection,
+       bo.total_collection, bo.opening_weekend, bo.release_screens, bo.profit_margin
+FROM MOVIES m
+LEFT JOIN LANGUAGES l ON m.language_id = l.language_id
+LEFT JOIN BOX_OFFICE bo ON m.movie_id = bo.movie_id
+"""
+
+SNAPSHOT_GENRES_SQL = """
+SELECT mg.movie_id, mg.genre_id, g.genre_name
+FROM MOVIE_GENRES mg
+JOIN GENRES g ON mg.genre_id = g.genre_id
+"""
+
+# Nullable numeric columns, stored as float64 with NaN for NULL
+NUMERIC_COLUMNS = ("budget", "imdb_rating", "domestic_collection", "intl_collection",
+                   "total_collection", "opening_weekend", "release_screens", "profit_margin")
+INTEGER_COLUMNS = {"release_screens"}
+
+# Columns that can be ranked and summarized; net_profit, roi and
+# profit_percentage are derived (NULL without box office or a budget)
+METRICS = ("total_collection", "domestic_collection", "intl_collection", "budget",
+           "net_profit", "profit_percentage", "roi", "imdb_rating", "opening_weekend")
+
+GROUPINGS = ("language", "year", "genre")
+
+MOVIE_FIELDS = ("movie_id", "title", "language_name", "release_date") + NUMERIC_COLUMNS + \
+    ("net_profit", "profit_percentage", "roi")
+
+TOP_BY_COLLECTION_FIELDS = ("movie_id", "title", "language_name", "release_date",
+                            "total_collection", "domestic_collection", "intl_collection",
+                            "budget", "profit_percentage", "imdb_rating")
+
+TOP_PROFITABLE_FIELDS = ("movie_id", "title", "budget", "total_collection", "net_profit",
+                         "profit_percentage", "opening_weekend", "release_screens",
+                         "profit_margin")
+
+PERCENTILES = (10, 25, 50, 75, 90, 99)
+
+
+def _columns(rows):
+    """Column arrays for snapshot rows, with the derived profit columns"""
+    columns = {
+        "movie_id": np.array([row["movie_id"] for row in rows], dtype=np.int64),
+        "language_id": np.array([row["language_id"] for row in rows], dtype=np.int64),
+        "year": np.array([row["release_date"].year if row["release_date"] else -1
+                          for row in rows], dtype=np.int64),
+        "title": np.array([row["title"] for row in rows], dtype=object),
+        "language_name": np.array([row["language_name"] for row in rows], dtype=object),
+        "release_date": np.array([row["release_date"] for row in rows], dtype=object),
+    }
+    for name in NUMERIC_COLUMNS:
+        columns[name] = np.array([np.nan if row[name] is None else float(row[name])
+                                  for row in rows], dtype=np.float64)
+
+    budget = columns["budget"]
+    columns["net_profit"] = columns["total_collection"] - budget
+    with np.errstate(divide="ignore", invalid="ignore"):
+        columns["roi"] = np.where(budget > 0, columns["net_profit"] / budget, np.nan)
+    columns["profit_percentage"] = np.round(columns["roi"] * 100, 2)
+    return columns
+
+
+def _value(value, integer=False):
+    """NumPy scalar -> JSON-friendly Python value (NaN -> None)"""
+    if isinstance(value, (float, np.floating)):
+        if np.isnan(value):
+            return None
+        return int(value) if integer else round(float(value), 4)
+    if isinstance(value, np.integer):
+        return int(value)
+    return value
+
+
+class _Frame:
+    """One immutable snapshot generation; readers never see it change"""
+
+    def __init__(self, columns, genre_movie, genre_id, genre_names):
+        order = np.argsort(columns["movie_id"], kind="stable")
+        self.columns = {name: values[order] for name, values in columns.items()}
+        self.movie_ids = self.columns["movie_id"]
+        self.genre_movie = genre_movie
+        self.genre_id = genre_id
+        self.genre_names = genre_names
+        # Movies x metrics, so per-metric statistics are one reduction
+        self.metrics = np.column_stack([self.columns[name] for name in METRICS]) \
+            if len(self.movie_ids) else np.empty((0, len(METRICS)))
+
+    def position(self, movie_id):
+        index = int(np.searchsorted(self.movie_ids, movie_id))
+        if index < len(self.movie_ids) and self.movie_ids[index] == movie_id:
+            return index
+        return None
+
+    def positions(self, movie_ids):
+        """Snapshot rows of the given movies (check the ids if some may be missing)"""
+        return np.searchsorted(self.movie_ids, movie_ids)
+
+    def mask(self, language_id=None, year=None, genre_id=None):
+        mask = np.ones(len(self.movie_ids), dtype=bool)
+        if language_id is not None:
+            mask &= self.columns["language_id"] == language_id
+        if year is not None:
+            mask &= self.columns["year"] == year
+        if genre_id is not None:
+            mask &= np.isin(self.movie_ids, self.genre_movie[self.genre_id == genre_id])
+        return mask
+
+    def row(self, index, fields=MOVIE_FIELDS):
+        return {name: _value(self.columns[name][index], name in INTEGER_COLUMNS)
+                for name in fields}
+
+
+def _genre_arrays(rows):
+    return (np.array([row["movie_id"] for row in rows], dtype=np.int64),
+            np.array([row["genre_id"] for row in rows], dtype=np.int64),
+            {row["genre_id"]: row["genre_name"] for row in rows})
+
+
+class AnalyticsSnapshot:
+    """Thread-safe columnar copy of the movie analytics data with incremental updates"""
+
+    def __init__(self, ttl=300):
+        self.ttl = ttl
+        self._lock = threading.RLock()
+        self._frame = _Frame(_columns([]), *_genre_arrays([]))
+        self._dirty = set()
+        self._built_at = None
+        self._rebuilding = False
+        self._rebuilt = threading.Condition(self._lock)
+
+    # ---- maintenance -------------------------------------------------
+
+    def rebuild(self):
+        """Reload every movie from the database.
+
+        The new frame is built without the lock and swapped in under it.
+        """
+        start = time.perf_counter()
+        with self._lock:
+            pending, self._dirty = self._dirty, set()
+        try:
+            rows = connection.execute_query(SNAPSHOT_SQL)
+            genres = connection.execute_query(SNAPSHOT_GENRES_SQL)
+        except Exception:
+            self._restore_dirty(pending)
+            raise
+        frame = _Frame(_columns(rows), *_genre_arrays(genres))
+        with self._lock:
+            self._frame = frame
+            self._built_at = time.monotonic()
+        logger.info(f"Analytics snapshot rebuilt: {len(rows)} movies "
+                    f"in {time.perf_counter() - start:.2f}s")
+
+    def mark_dirty(self, movie_id):
+        """Schedule a movie to be reloaded before the next read"""
+        if movie_id is None:
+            return
+        with self._lock:
+            self._dirty.add(movie_id)
+
+    def expire(self):
+        """Force a full rebuild before the next read (after bulk loads)"""
+        with self._lock:
+            self._built_at = None
+
+    def _restore_dirty(self, ids):
+        """Put back movies whose reload failed so the next read retries them"""
+        with self._lock:
+            self._dirty.update(ids)
+
+    def _apply_dirty(self):
+        with self._lock:
+            ids = list(self._dirty)
+            self._dirty.clear()
+        if not ids:
+            return
+        placeholders = ", ".join(["%s"] * len(ids))
+        try:
+            rows = connection.execute_query(
+                f"{SNAPSHOT_SQL} WHERE m.movie_id IN ({placeholders})", tuple(ids))
+            genres = connection.execute_query(
+                f"{SNAPSHOT_GENRES_SQL} WHERE mg.movie_id IN ({placeholders})", tuple(ids))
+        except Exception:
+            self._restore_dirty(ids)
+            raise
+        changed = np.array(ids, dtype=np.int64)
+        new_columns = _columns(rows)
+        new_movie, new_genre, new_names = _genre_arrays(genres)
+
+        with self._lock:
+            old = self._frame
+            keep = ~np.isin(old.movie_ids, changed)
+            keep_genres = ~np.isin(old.genre_movie, changed)
+            self._frame = _Frame(
+                {name: np.concatenate([values[keep], new_columns[name]])
+                 for name, values in old.columns.items()},
+                np.concatenate([old.genre_movie[keep_genres], new_movie]),
+                np.concatenate([old.genre_id[keep_genres], new_genre]),
+                {**old.genre_names, **new_names})
+
+    def ensure_fresh(self):
+        """Rebuild if stale, otherwise apply pending incremental updates.
+
+        Only one caller rebuilds at a time; the others read the current
+        frame, or wait for the first build if there is none yet.
+        """
+        with self._rebuilt:
+            stale = self._built_at is None or time.monotonic() - self._built_at > self.ttl
+            if self._rebuilding:
+                # Leave dirty ids alone: the swap would discard them
+                self._rebuilt.wait_for(
+                    lambda: not self._rebuilding or len(self._frame.movie_ids))
+                return
+            if stale:
+                self._rebuilding = True
+        if stale:
+            try:
+                self.rebuild()
+            finally:
+                with self._rebuilt:
+                    self._rebuilding = False
+                    self._rebuilt.notify_all()
+            return
+        self._apply_dirty()
+
+    # ---- querying ----------------------------------------------------
+
+    def top(self, metric, k=10, ascending=False, fields=MOVIE_FIELDS, **filters):
+        """Top-`k` movies by `metric`, skipping movies where it is NULL"""
+        frame = self._frame
+        candidates = np.flatnonzero(frame.mask(**filters) & ~np.isnan(frame.columns[metric]))
+        values = frame.columns[metric][candidates]
+        if not ascending:
+            values = -values
+        if k < len(candidates):
+            # O(n) selection of the k best; only those are sorted
+            best = np.argpartition(values, k - 1)[:k]
+            candidates, values = candidates[best], values[best]
+        order = np.lexsort((frame.movie_ids[candidates], values))
+        return [{"rank": rank, **frame.row(index, fields)}
+                for rank, index in enumerate(candidates[order], start=1)]
+
+    def distribution(self, metric, bins=10, **filters):
+        """Count, moments, percentiles and a histogram of `metric`"""
+        frame = self._frame
+        values = frame.columns[metric][frame.mask(**filters)]
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return {"metric": metric, "count": 0}
+        counts, edges = np.histogram(values, bins=bins)
+        return {
+            "metric": metric,
+            "count": int(len(values)),
+            "sum": _value(values.sum()),
+            "mean": _value(values.mean()),
+            "std": _value(values.std()),
+            "min": _value(values.min()),
+            "max": _value(values.max()),
+            "percentiles": {f"p{q}": _value(v)
+                            for q, v in zip(PERCENTILES, np.percentile(values, PERCENTILES))},
+            "histogram": [{"from": _value(lo), "to": _value(hi), "count": int(n)}
+                          for lo, hi, n in zip(edges[:-1], edges[1:], counts)],
+        }
+
+    def group_stats(self, metric, by):
+        """Per-language, per-year or per-genre statistics of `metric`"""
+        frame = self._frame
+        if by == "genre":
+            positions = np.minimum(frame.positions(frame.genre_movie), len(frame.movie_ids) - 1)
+            linked = frame.movie_ids[positions] == frame.genre_movie if len(frame.movie_ids) \
+                else np.zeros(len(frame.genre_movie), dtype=bool)
+            keys = frame.genre_id[linked]
+            values = frame.columns[metric][positions[linked]]
+        else:
+            column = "language_id" if by == "language" else "year"
+            known = frame.columns[column] >= 0
+            keys = frame.columns[column][known]
+            values = frame.columns[metric][known]
+            names = frame.columns["language_name"][known]
+
+        groups, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+        if by == "genre":
+            labels = [frame.genre_names[g] for g in groups.tolist()]
+        elif by == "language":
+            labels = names[first].tolist()
+        else:
+            labels = groups.tolist()
+
+        movies = np.bincount(inverse, minlength=len(groups))
+        valid = ~np.isnan(values)
+        inverse, values = inverse[valid], values[valid]
+        counts = np.bincount(inverse, minlength=len(groups))
+        present = counts > 0
+        sums = np.where(present, np.bincount(inverse, weights=values, minlength=len(groups)), np.nan)
+        squares = np.bincount(inverse, weights=values * values, minlength=len(groups))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            means = sums / counts
+            stds = np.sqrt(np.maximum(squares / counts - means * means, 0))
+
+        # Values sorted within each group give min, median and max by offset;
+        # empty groups point at the trailing NaN
+        ordered = np.append(values[np.lexsort((values, inverse))], np.nan)
+        starts = np.cumsum(counts) - counts
+
+        def at(offsets):
+            return ordered[np.where(present, starts + offsets, len(ordered) - 1)]
+
+        mins, maxs = at(0), at(counts - 1)
+        medians = (at((counts - 1) // 2) + at(counts // 2)) / 2
+
+        result = [
+            {by: int(groups[i]), "label": labels[i],
+             "movies": int(movies[i]), "count": int(counts[i]),
+             "sum": _value(sums[i]), "mean": _value(means[i]), "std": _value(stds[i]),
+             "min": _value(mins[i]), "median": _value(medians[i]), "max": _value(maxs[i])}
+            for i in range(len(groups))
+        ]
+        result.sort(key=lambda group: (group["sum"] is None, -(group["sum"] or 0)))
+        return result
+
+    def standing(self, movie_id):
+        """A movie's metrics with rank, percentile and z-score overall and within its language"""
+        frame = self._frame
+        index = frame.position(movie_id)
+        if index is None:
+            return None
+        own = frame.metrics[index]
+        same_language = frame.columns["language_id"] == frame.columns["language_id"][index]
+
+        def compare(matrix):
+            valid = ~np.isnan(matrix)
+            counts = valid.sum(axis=0)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                means = np.nansum(matrix, axis=0) / counts
+                stds = np.sqrt(np.nansum((matrix - means) ** 2, axis=0) / counts)
+                rank = (matrix > own).sum(axis=0) + 1
+                percentile = (matrix <= own).sum(axis=0) / counts * 100
+                z_scores = np.where(stds > 0, (own - means) / stds, 0.0)
+            return counts, rank, percentile, z_scores
+
+        overall = compare(frame.metrics)
+        language = compare(frame.metrics[same_language])
+        metrics = {}
+        for column, name in enumerate(METRICS):
+            if np.isnan(own[column]):
+                metrics[name] = None
+                continue
+            metrics[name] = {
+                "value": _value(own[column]),
+                "rank": int(overall[1][column]), "of": int(overall[0][column]),
+                "percentile": _value(overall[2][column]), "z_score": _value(overall[3][column]),
+                "language_rank": int(language[1][column]),
+                "language_percentile": _value(language[2][column]),
+                "language_z_score": _value(language[3][column]),
+            }
+        genres = np.unique(frame.genre_id[frame.genre_movie == movie_id])
+        return {**frame.row(index), "genres": [frame.genre_names[g] for g in genres.tolist()],
+                "metrics": metrics}
+
+    def stats(self):
+        with self._lock:
+            frame = self._frame
+            return {
+                "movies": int(len(frame.movie_ids)),
+                "genre_links": int(len(frame.genre_movie)),
+                "bytes": int(sum(values.nbytes for values in frame.columns.values())
+                             + frame.metrics.nbytes),
+                "pending_updates": len(self._dirty),
+                "age_s": round(time.monotonic() - self._built_at, 1) if self._built_at else None,
+            }
+
+
+analytics_snapshot = AnalyticsSnapshot(ttl=settings.ANALYTICS_SNAPSHOT_TTL)
@@ -0,0 +1,308 @@
+"""
+Audit partition maintenance, archival and history reads
+
+MOVIE_AUDIT, BOX_OFFICE_AUDIT and ACTIVITY_LOG are RANGE-partitioned by
+month (see 01_create_tables.sql). ``run_maintenance`` keeps
+AUDIT_PARTITION_PREMAKE_MONTHS months of partitions, counted from the
+current month, split off p_future (months the partitions fell behind on go
+into one catch-up partition) and moves every partition that ended more
+than AUDIT_RETENTION_MONTHS ago out of the database:
+
+1. the partition is swapped into an unpartitioned staging table with
+   EXCHANGE PARTITION and dropped. Both are metadata operations, so the
+   live table is never scanned or held locked for long;
+2. the staging table is streamed to
+   ``<AUDIT_ARCHIVE_DIR>/<TABLE>/<partition>.ndjson.gz`` with a
+   ``.meta.json`` sidecar (row count, first and last timestamp) and then
+   dropped.
+
+A staging table left behind by an interrupted run is exported first on the
+next run. Every API worker runs the archiver; the MySQL named lock
+``audit_maintenance`` lets one run at a time and the others skip.
+``query_history`` reads the live table and, when it returns
+fewer rows than asked for, the archive files whose time span overlaps the
+request, so callers see one newest-first history.
+"""
+import asyncio
+import glob
+import gzip
+import json
+import os
+from datetime import datetime
+from config import get_settings
+from database import connection
+from database.async_connection import run_in_executor
+from app.utils.serialization import json_default
+import logging
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# log -> (table, id column, time column, filterable columns)
+AUDIT_LOGS = {
+    "movie-audit": ("MOVIE_AUDIT", "audit_id", "modified_at",
+                    ("movie_id", "operation_type")),
+    "box-office-audit": ("BOX_OFFICE_AUDIT", "audit_id", "modified_at",
+                         ("movie_id", "box_id", "operation_type")),
+    "activity-log": ("ACTIVITY_LOG", "log_id", "action_timestamp",
+                     ("user_id", "action", "table_name", "record_id")),
+}
+
+PARTITIONS_SQL = """
+SELECT PARTITION_NAME AS name, TABLE_ROWS AS approx_rows,
+       IF(PARTITION_DESCRIPTION = 'MAXVALUE', NULL,
+          FROM_UNIXTIME(PARTITION_DESCRIPTION)) AS upper_bound
+FROM INFORMATION_SCHEMA.PARTITIONS
+WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+ORDER BY PARTITION_ORDINAL_POSITION
+"""
+
+STAGING_SQL = """
+SELECT TABLE_NAME AS name FROM INFORMATION_SCHEMA.TABLES
+WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME LIKE %s
+ORDER BY TABLE_NAME
+"""
+
+# Named lock held for a maintenance run, like sp_refresh_summaries' summary_refresh
+MAINTENANCE_LOCK = "audit_maintenance"
+
+
+def _month_start(value):
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def _add_months(value, months):
+    index = value.year * 12 + value.month - 1 + months
+    return value.replace(year=index // 12, month=index % 12 + 1)
+
+
+def _staging_table(table, partition):
+    return f"{table}_archive_{partition}"
+
+
+def _partition_ddl(name, upper_bound):
+    if upper_bound is None:
+        return f"PARTITION {name} VALUES LESS THAN MAXVALUE"
+    return (f"PARTITION {name} VALUES LESS THAN "
+            f"(UNIX_TIMESTAMP('{upper_bound:%Y-%m-%d %H:%M:%S}'))")
+
+
+def partitions(table):
+    """Partitions of `table` in order; empty if it is not partitioned"""
+    rows = connection.execute_query(PARTITIONS_SQL, (table,))
+    return [row for row in rows if row["name"]]
+
+
+def future_partitions_sql(table, parts, now, months):
+    """ALTER TABLE adding partitions through `months` months after `now`'s month.
+
+    Returns (statement, new partition names), or (None, []) if none are
+    missing. If the last bounded partition ends before the current month,
+    the gap gets one catch-up partition rather than a partition per month.
+    """
+    bounded = [part["upper_bound"] for part in parts if part["upper_bound"] is not None]
+    current = _month_start(now)
+    last = bounded[-1] if bounded else current
+    target = _add_months(current, months + 1)
+    new = []
+    if last < current:
+        new.append(_partition_ddl(f"p{last:%Y%m}", current))
+        last = current
+    while last < target:
+        upper = _add_months(last, 1)
+        new.append(_partition_ddl(f"p{last:%Y%m}", upper))
+        last = upper
+    if not new:
+        return None, []
+
+    if parts[-1]["upper_bound"] is None:
+        catch_all = parts[-1]["name"]
+        sql = (f"ALTER TABLE {table} REORGANIZE PARTITION {catch_all} INTO "
+               f"({', '.join(new + [_partition_ddl(catch_all, None)])})")
+    else:
+        sql = f"ALTER TABLE {table} ADD PARTITION ({', '.join(new)})"
+    return sql, [ddl.split()[1] for ddl in new]
+
+
+def ensure_future_partitions(table, parts, now, months):
+    """Split partitions for the next `months` months off the MAXVALUE partition"""
+    sql, created = future_partitions_sql(table, parts, now, months)
+    if sql:
+        connection.execute_query(sql, fetch=False)
+    return created
+
+
+def _archive_path(table, partition):
+    directory = os.path.join(settings.AUDIT_ARCHIVE_DIR, table)
+    os.makedirs(directory, exist_ok=True)
+    base = os.path.join(directory, partition)
+    suffix = 1
+    path = base
+    while os.path.exists(f"{path}.ndjson.gz"):
+        suffix += 1
+        path = f"{base}-{suffix}"
+    return path
+
+
+def export_staging(table, staging, partition):
+    """Stream a staging table to a gzipped NDJSON archive, then drop it"""
+    _, id_column, time_column, _ = next(spec for spec in AUDIT_LOGS.values() if spec[0] == table)
+    path = _archive_path(table, partition)
+    rows, first, last = 0, None, None
+    with gzip.open(f"{path}.ndjson.gz.tmp", "wt", encoding="utf-8") as f:
+        for batch in connection.stream_query(
+                f"SELECT * FROM {staging} ORDER BY {time_column}, {id_column}"):
+            f.write("".join(json.dumps(row, default=json_default, ensure_ascii=False) + "\n"
+                            for row in batch))
+            rows += len(batch)
+            first = first or batch[0][time_column]
+            last = batch[-1][time_column]
+
+    if rows:
+        os.replace(f"{path}.ndjson.gz.tmp", f"{path}.ndjson.gz")
+        meta = {"table": table, "partition": partition, "rows": rows,
+                "file": os.path.basename(f"{path}.ndjson.gz"),
+                "first": first, "last": last, "archived_at": datetime.now()}
+        with open(f"{path}.meta.json", "w", encoding="utf-8") as f:
+            json.dump(meta, f, default=json_default, indent=2)
+    else:
+        os.remove(f"{path}.ndjson.gz.tmp")
+    connection.execute_query(f"DROP TABLE {staging}", fetch=False)
+    return {"partition": partition, "rows": rows, "file": f"{path}.ndjson.gz" if rows else None}
+
+
+def archive_partition(table, partition):
+    """Detach one partition in O(1) and export it"""
+    staging = _staging_table(table, partition)
+    connection.execute_query(f"CREATE TABLE {staging} LIKE {table}", fetch=False)
+    connection.execute_query(f"ALTER TABLE {staging} REMOVE PARTITIONING", fetch=False)
+    connection.execute_query(
+        f"ALTER TABLE {table} EXCHANGE PARTITION {partition} WITH TABLE {staging} "
+        f"WITHOUT VALIDATION", fetch=False)
+    connection.execute_query(f"ALTER TABLE {table} DROP PARTITION {partition}", fetch=False)
+    return export_staging(table, staging, partition)
+
+
+def run_maintenance(now=None, retention_months=None, premake_months=None):
+    """Create upcoming partitions and archive expired ones for every audit table.
+
+    Returns None without doing anything if another process holds the
+    maintenance lock.
+    """
+    lock = connection.connection_pool.connect_unpooled()
+    try:
+        cursor = lock.cursor()
+        cursor.execute("SELECT GET_LOCK(%s, 0)", (MAINTENANCE_LOCK,))
+        if cursor.fetchone()[0] != 1:
+            logger.info("Audit maintenance is already running elsewhere; skipping")
+            return None
+        try:
+            return _maintain(now, retention_months, premake_months)
+        finally:
+            cursor.execute("DO RELEASE_LOCK(%s)", (MAINTENANCE_LOCK,))
+    finally:
+        lock.close()
+
+
+def _maintain(now, retention_months, premake_months):
+    now = now or datetime.now()
+    retention_months = settings.AUDIT_RETENTION_MONTHS if retention_months is None else retention_months
+    premake_months = settings.AUDIT_PARTITION_PREMAKE_MONTHS if premake_months is None else premake_months
+    cutoff = _add_months(_month_start(now), -retention_months)
+    report = {}
+
+    for table, _, _, _ in AUDIT_LOGS.values():
+        parts = partitions(table)
+        if not parts:
+            logger.warning(f"{table} is not partitioned; skipping audit maintenance")
+            continue
+        result = report[table] = {"created": [], "archived": []}
+
+        # Finish exports an interrupted run left in staging tables
+        prefix = _staging_table(table, "").replace("_", "\\_")
+        for row in connection.execute_query(STAGING_SQL, (prefix + "%",)):
+            partition = row["name"][len(_staging_table(table, "")):]
+            result["archived"].append(export_staging(table, row["name"], partition))
+
+        result["created"] = ensure_future_partitions(table, parts, now, premake_months)
+        if result["created"]:
+            parts = partitions(table)
+        if retention_months > 0:
+            # Never drop the last bounded partition; rows below it need a home
+            bounded = [part for part in parts if part["upper_bound"] is not None]
+            for part in bounded[:-1]:
+                if part["upper_bound"] <= cutoff:
+                    result["archived"].append(archive_partition(table, part["name"]))
+
+        for archived in result["archived"]:
+            if archived["rows"]:
+                logger.info(f"Archived {archived['rows']} {table} rows from {archived['partition']}")
+    return report
+
+
+async def run_archiver(interval):
+    """Background loop running audit maintenance every `interval` seconds"""
+    while True:
+        try:
+            await run_in_executor(run_maintenance)
+        except Exception as e:
+            logger.error(f"Audit maintenance failed: {e}")
+        await asyncio.sleep(interval)
+
+
+def _normalize(row):
+    """Live rows in the same JSON shape as archived ones"""
+    return json.loads(json.dumps(row, default=json_default))
+
+
+def _archived_history(table, id_column, time_column, filters, since, until, limit):
+    metas = []
+    for path in glob.glob(os.path.join(settings.AUDIT_ARCHIVE_DIR, table, "*.meta.json")):
+        with open(path, encoding="utf-8") as f:
+            meta = json.load(f)
+        if (since and meta["last"] < since) or (until and meta["first"] >= until):
+            continue
+        metas.append((meta, os.path.join(os.path.dirname(path), meta["file"])))
+
+    rows = []
+    # Newest archive first; stop once older files cannot be needed
+    for meta, path in sorted(metas, key=lambda item: item[0]["last"], reverse=True):
+        if len(rows) >= limit and meta["last"] < rows[limit - 1][time_column]:
+            break
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                row = json.loads(line)
+                if any(row.get(column) != value for column, value in filters.items()):
+                    continue
+                if (since and row[time_column] < since) or (until and row[time_column] >= until):
+                    continue
+                rows.append(row)
+        rows.sort(key=lambda row: (row[time_column], row[id_column]), reverse=True)
+        del rows[limit:]
+    return rows
+
+
+def query_history(log, filters, since=None, until=None, limit=100):
+    """Newest-first audit rows from the live table, then from archives"""
+    table, id_column, time_column, _ = AUDIT_LOGS[log]
+    filters = {column: value for column, value in filters.items() if value is not None}
+    conditions = [f"{column} = %s" for column in filters]
+    params = list(filters.values())
+    if since:
+        conditions.append(f"{time_column} >= %s")
+        params.append(since)
+    if until:
+        conditions.append(f"{time_column} < %s")
+        params.append(until)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    rows = connection.execute_query(
+        f"SELECT * FROM {table} {where} ORDER BY {time_column} DESC, {id_column} DESC LIMIT %s",
+        tuple(params) + (limit,))
+    rows = [_normalize(row) for row in rows]
+
+    if len(rows) < limit:
+        rows += _archived_history(table, id_column, time_column, filters,
+                                  since.isoformat() if since else None,
+                                  until.isoformat() if until else None,
+                                  limit - len(rows))
+    return rows
@@ -0,0 +1,539 @@
+"""
+Asynchronous, batched audit and activity-log pipeline
+
+ACTIVITY_LOG rows for API writes are always recorded here. With
+AUDIT_MODE=async, MOVIE_AUDIT and BOX_OFFICE_AUDIT are recorded here too:
+pooled connections set @app_audit, which the audit triggers check and skip,
+and the handlers call ``audit_pipeline.movie(...)`` / ``.box_office(...)``
+after their transaction commits. Other clients (and bulk loads) still get
+the in-transaction trigger audits.
+
+Events go into an in-process queue. ``AuditPipeline.run`` flushes it every
+AUDIT_FLUSH_INTERVAL seconds, or as soon as AUDIT_BATCH_SIZE events are
+pending, with one multi-row INSERT per table, off the request path. Event
+times are captured when the event is recorded, not when it is written.
+
+Delivery is at-least-once. Every event is appended to a journal file by a
+writer thread that group-commits whatever has been recorded since its last
+write (one write, flush and optional fsync), so the event loop never
+touches the file; the recording call returns once its event is journalled.
+A flush rotates the journal into a numbered segment and deletes the
+segment only once all of its events are committed. After a crash the
+remaining journal and segments are replayed on the next start, so rows may
+be written twice but are not lost: a process crash loses nothing that was
+acknowledged, and with AUDIT_SPILL_FSYNC neither does a power failure.
+While the journal cannot be written (errors are logged) events are held
+in memory only. Rows the database rejects outright (e.g. the box office
+audit of a movie deleted before it was written) are dropped and counted
+rather than blocking the queue.
+
+Each process keeps its own journal, AUDIT_SPILL_PATH suffixed with its
+pid, next to a lock file it holds while it runs; on start, a process
+adopts the journals of processes whose lock is free (they have exited), so
+uvicorn workers never replay each other's live journals.
+"""
+import asyncio
+import glob
+import json
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from config import get_settings
+from database.async_connection import run_in_executor
+from database.unit_of_work import UnitOfWork
+from mysql.connector.errors import DataError, IntegrityError
+import logging
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# table -> columns written per event (the last one is the event time)
+EVENT_COLUMNS = {
+    "MOVIE_AUDIT": ("movie_id", "old_title", "new_title", "old_budget", "new_budget",
+                    "old_release_date", "new_release_date", "modified_by",
+                    "modification_reason", "operation_type", "modified_at"),
+    "BOX_OFFICE_AUDIT": ("box_id", "movie_id", "old_domestic", "new_domestic", "old_intl",
+                         "new_intl", "old_margin", "new_margin", "modified_by",
+                         "operation_type", "modified_at"),
+    "ACTIVITY_LOG": ("user_id", "action", "table_name", "record_id", "details",
+                     "action_timestamp"),
+}
+
+INSERT_SQL = {
+    table: f"INSERT INTO {table} ({', '.join(columns)}) "
+           f"VALUES ({', '.join(['%s'] * len(columns))})"
+    for table, columns in EVENT_COLUMNS.items()
+}
+
+# Upper bounds (milliseconds) of the flush-latency histogram buckets
+FLUSH_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+def _try_lock(f):
+    """Take an exclusive lock on open file `f` without waiting; False if another holder has it"""
+    try:
+        if fcntl:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+        return True
+    except OSError:
+        return False
+
+
+def _resolve(future):
+    if not future.done():
+        future.set_result(None)
+
+
+class AuditPipeline:
+    """In-process queue of audit/activity rows with a batched background writer"""
+
+    def __init__(self, batch_size=500, spill_path=None, fsync=False, app_audits=False):
+        self.batch_size = batch_size
+        self.app_audits = app_audits  # MOVIE_AUDIT / BOX_OFFICE_AUDIT come from the API
+        self.spill_path = spill_path or None
+        self.fsync = fsync
+        self._pending = deque()
+        self._segments = deque()  # (segment path or None, events) awaiting write
+        self._lock = threading.Lock()
+        self._journal_ready = threading.Condition(self._lock)
+        self._journal_lock = threading.Lock()  # held while the journal file is written or rotated
+        self._journal_writer = None
+        self._unjournaled = []
+        self._sequence = 0  # events recorded into the journal queue
+        self._journaled_through = 0  # last sequence the journal holds
+        self._journal_waiters = []  # (sequence, future) of recording calls
+        self._journal_failing = False  # last journal write failed; nobody waits
+        self._flush_lock = None
+        self._wakeup = None
+        self._journal = None
+        self._journal_path = None  # this process's journal, once claimed
+        self._lock_file = None
+        self._leftovers = []  # segments a previous process with our pid left behind
+        self._next_segment = 0
+        self._recovered = False
+
+        self.recorded = 0
+        self.written = 0
+        self.rejected = 0
+        self.replayed = 0
+        self.failed_flushes = 0
+        self.max_depth = 0
+        self._flushes = 0
+        self._flush_sum_ms = 0.0
+        self._flush_max_ms = 0.0
+        self._flush_last_ms = None
+        self._flush_buckets = [0] * (len(FLUSH_BUCKETS_MS) + 1)
+
+    # --- recording -------------------------------------------------------
+
+    def record(self, table, **values):
+        """Queue one row for `table` (call from the event loop); return its journal sequence
+
+        Never waits on the database or the disk; await ``_journaled`` with
+        the sequence to wait until the event is in the journal.
+        """
+        columns = EVENT_COLUMNS[table]
+        values.setdefault(columns[-1], datetime.now())
+        event = {"table": table, "row": values}
+        sequence = None
+        with self._lock:
+            if self.spill_path:
+                self._unjournaled.append(event)
+                self._sequence += 1
+                sequence = self._sequence
+                self._journal_ready.notify()
+                if self._journal_writer is None:
+                    self._journal_writer = threading.Thread(
+                        target=self._run_journal_writer, name="audit-journal", daemon=True)
+                    self._journal_writer.start()
+            self._pending.append(event)
+            self.recorded += 1
+            self.max_depth = max(self.max_depth, self.depth)
+        if len(self._pending) >= self.batch_size and self._wakeup is not None:
+            self._wakeup.set()
+        return sequence
+
+    async def activity(self, action, table_name, record_id, details, user_id=1):
+        sequence = self.record("ACTIVITY_LOG", user_id=user_id, action=action,
+                               table_name=table_name, record_id=record_id, details=details)
+        await self._journaled(sequence)
+
+    async def movie(self, operation, movie_id, old=None, new=None, reason=None):
+        """MOVIE_AUDIT row; `old` / `new` hold title, budget and release_date"""
+        old, new = old or {}, new or {}
+        sequence = self.record("MOVIE_AUDIT", movie_id=movie_id,
+                               old_title=old.get("title"), new_title=new.get("title"),
+                               old_budget=old.get("budget"), new_budget=new.get("budget"),
+                               old_release_date=old.get("release_date"),
+                               new_release_date=new.get("release_date"),
+                               modified_by="System", modification_reason=reason,
+                               operation_type=operation)
+        await self._journaled(sequence)
+
+    async def box_office(self, operation, movie_id, box_id=None, new=None):
+        """BOX_OFFICE_AUDIT row; a missing box_id is looked up by movie when written"""
+        new = new or {}
+        sequence = self.record("BOX_OFFICE_AUDIT", box_id=box_id, movie_id=movie_id,
+                               new_domestic=new.get("domestic_collection"),
+                               new_intl=new.get("intl_collection"),
+                               new_margin=new.get("profit_margin"),
+                               modified_by="System", operation_type=operation)
+        await self._journaled(sequence)
+
+    @property
+    def depth(self):
+        """Events recorded but not yet committed"""
+        return len(self._pending) + sum(len(events) for _, events in self._segments)
+
+    # --- journal ---------------------------------------------------------
+
+    def _segment_path(self, number):
+        return f"{self.spill_path}.{os.getpid()}.{number:06d}"
+
+    def _owned_segments(self, owner):
+        prefix = f"{self.spill_path}.{owner}."
+        return sorted(path for path in glob.glob(glob.escape(prefix) + "*")
+                      if path[len(prefix):].isdigit())
+
+    def _claim(self):
+        """Lock this process's journal (journal lock held); set aside what an earlier holder left"""
+        if self._journal_path is not None:
+            return
+        owner = os.getpid()
+        os.makedirs(os.path.dirname(os.path.abspath(self.spill_path)), exist_ok=True)
+        lock_path = f"{self.spill_path}.{owner}.lock"
+        while True:
+            lock_file = open(lock_path, "a")
+            if not _try_lock(lock_file):
+                lock_file.close()
+                raise OSError(f"Audit journal {self.spill_path}.{owner} is locked by another pipeline")
+            try:
+                if os.stat(lock_path).st_ino == os.fstat(lock_file.fileno()).st_ino:
+                    break
+            except FileNotFoundError:
+                pass
+            # Removed by a recover() that took it for an exited process's; start over
+            lock_file.close()
+        # An exited process that had our pid; its files are replayed by recover()
+        self._leftovers = self._owned_segments(owner)
+        self._next_segment = int(self._leftovers[-1].rsplit(".", 1)[1]) + 1 if self._leftovers else 0
+        journal_path = f"{self.spill_path}.{owner}"
+        if os.path.exists(journal_path):
+            self._leftovers.append(self._segment_path(self._next_segment))
+            self._next_segment += 1
+            os.replace(journal_path, self._leftovers[-1])
+        self._lock_file, self._journal_path = lock_file, journal_path
+
+    def _append_journal(self, events, sync=True):
+        """Append `events` to the journal in one write (journal lock held)"""
+        if not events:
+            return
+        if self._journal is None:
+            self._claim()
+            self._journal = open(self._journal_path, "a", encoding="utf-8")
+        self._journal.write("".join(json.dumps(event, default=str) + "\n" for event in events))
+        self._journal.flush()
+        if self.fsync and sync:
+            os.fsync(self._journal.fileno())
+
+    async def _journaled(self, sequence):
+        """Wait until the event `record` numbered `sequence` is in the journal"""
+        if sequence is None:
+            return
+        with self._lock:
+            if sequence <= self._journaled_through or self._journal_failing:
+                return
+            future = asyncio.get_running_loop().create_future()
+            self._journal_waiters.append((sequence, future))
+        await future
+
+    def _release_waiters(self, through):
+        with self._lock:
+            self._journaled_through = max(self._journaled_through, through)
+            ready = [future for sequence, future in self._journal_waiters if sequence <= through]
+            self._journal_waiters = [(sequence, future) for sequence, future in self._journal_waiters
+                                     if sequence > through]
+        for future in ready:
+            try:
+                future.get_loop().call_soon_threadsafe(_resolve, future)
+            except RuntimeError:
+                pass  # the waiting loop has closed
+
+    def _drain_journal_locked(self):
+        with self._lock:
+            events, self._unjournaled = self._unjournaled, []
+            through = self._sequence
+        try:
+            self._append_journal(events)
+        except OSError:
+            with self._lock:
+                self._unjournaled[:0] = events
+            raise
+        self._release_waiters(through)
+
+    def _drain_journal(self):
+        with self._journal_lock:
+            self._drain_journal_locked()
+
+    def _run_journal_writer(self):
+        while True:
+            with self._journal_ready:
+                self._journal_ready.wait_for(lambda: self._unjournaled)
+                through = self._sequence
+            try:
+                self._drain_journal()
+                self._journal_failing = False
+            except OSError as e:
+                # The events stay queued for the database; only their crash safety is lost
+                logger.error(f"Audit journal write failed: {e}")
+                self._journal_failing = True
+                self._release_waiters(through)
+                time.sleep(1)
+
+    def _rotate(self):
+        """Move everything pending into a segment (journal file included); blocking"""
+        journal = None
+        through = None
+        with self._journal_lock:
+            if self.spill_path:
+                # The writer thread may be behind; the segment must hold every event
+                self._drain_journal_locked()
+            with self._lock:
+                if not self._pending:
+                    return
+                path = None
+                if self.spill_path:
+                    # Events recorded since the drain above, written without an
+                    # fsync so record() is not kept waiting on the disk
+                    stragglers, self._unjournaled = self._unjournaled, []
+                    through = self._sequence
+                    try:
+                        self._append_journal(stragglers, sync=False)
+                    except OSError:
+                        self._unjournaled[:0] = stragglers
+                        self._journal_ready.notify()
+                        raise
+                    if self._journal is not None:
+                        journal, self._journal = self._journal, None
+                        path = self._segment_path(self._next_segment)
+                        self._next_segment += 1
+                        os.replace(self._journal_path, path)
+                self._segments.append((path, list(self._pending)))
+                self._pending.clear()
+            if journal is not None:
+                if self.fsync:
+                    os.fsync(journal.fileno())
+                journal.close()
+        if through is not None:
+            self._release_waiters(through)
+
+    def _adopt(self, owner):
+        """Rename the journal and segments `owner` left behind into ours; return the new paths"""
+        paths = []
+        journal_path = f"{self.spill_path}.{owner}"
+        for path in self._owned_segments(owner) + [journal_path]:
+            target = self._segment_path(self._next_segment)
+            try:
+                os.replace(path, target)
+            except FileNotFoundError:
+                continue
+            self._next_segment += 1
+            paths.append(target)
+        return paths
+
+    def recover(self):
+        """Queue the journals and segments that exited processes left unwritten"""
+        if self._recovered or not self.spill_path:
+            return
+        self._recovered = True
+        with self._journal_lock:
+            self._claim()
+            paths = list(self._leftovers)
+            prefix = f"{self.spill_path}."
+            for lock_path in sorted(glob.glob(glob.escape(prefix) + "*.lock")):
+                owner = lock_path[len(prefix):-len(".lock")]
+                if not owner.isdigit() or int(owner) == os.getpid():
+                    continue
+                try:
+                    lock_file = open(lock_path, "a")
+                except OSError:
+                    continue
+                try:
+                    if not _try_lock(lock_file):
+                        continue  # a live worker's journal
+                    paths.extend(self._adopt(owner))
+                finally:
+                    lock_file.close()
+                try:
+                    os.remove(lock_path)
+                except OSError:
+                    pass
+
+        for path in paths:
+            events = []
+            with open(path, encoding="utf-8") as f:
+                for line_no, line in enumerate(f, 1):
+                    try:
+                        events.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        # A torn last line from a crash mid-write
+                        logger.warning(f"Skipping unreadable audit event {path}:{line_no}")
+            with self._lock:
+                self._segments.append((path, events))
+            self.replayed += len(events)
+        if self.replayed:
+            logger.info(f"Replaying {self.replayed} audit events from {len(paths)} journal segments")
+
+    # --- writing ---------------------------------------------------------
+
+    def _resolve_box_ids(self, uow, events):
+        movie_ids = {e["row"]["movie_id"] for e in events
+                     if e["table"] == "BOX_OFFICE_AUDIT" and e["row"].get("box_id") is None}
+        if not movie_ids:
+            return
+        rows = uow.execute(
+            f"SELECT movie_id, box_id FROM BOX_OFFICE WHERE movie_id IN "
+            f"({', '.join(['%s'] * len(movie_ids))})", tuple(movie_ids))
+        box_ids = {row["movie_id"]: row["box_id"] for row in rows}
+        for event in events:
+            if event["table"] == "BOX_OFFICE_AUDIT" and event["row"].get("box_id") is None:
+                event["row"]["box_id"] = box_ids.get(event["row"]["movie_id"])
+
+    @staticmethod
+    def _values(event):
+        row = event["row"]
+        return tuple(row.get(column) for column in EVENT_COLUMNS[event["table"]])
+
+    def _write(self, events):
+        """Insert `events` in one transaction; return (written, rejected)"""
+        uow = UnitOfWork()
+        try:
+            self._resolve_box_ids(uow, events)
+            by_table = {}
+            for event in events:
+                by_table.setdefault(event["table"], []).append(self._values(event))
+            try:
+                for table, rows in by_table.items():
+                    uow.execute_many(INSERT_SQL[table], rows)
+                uow.commit()
+                return len(events), 0
+            except (IntegrityError, DataError) as err:
+                uow.rollback()
+                logger.info(f"Audit batch of {len(events)} rejected ({err}); retrying row by row")
+
+            # Keep the good rows, drop the ones the database will never accept
+            written = 0
+            for event in events:
+                uow.execute("SAVEPOINT audit_row", fetch=False)
+                try:
+                    uow.execute(INSERT_SQL[event["table"]], self._values(event), fetch=False)
+                    written += 1
+                except (IntegrityError, DataError) as err:
+                    uow.execute("ROLLBACK TO SAVEPOINT audit_row", fetch=False)
+                    logger.warning(f"Dropping {event['table']} event {event['row']}: {err.msg}")
+            uow.commit()
+            return written, len(events) - written
+        finally:
+            uow.close()
+
+    def _record_flush(self, elapsed_ms):
+        for i, bound in enumerate(FLUSH_BUCKETS_MS):
+            if elapsed_ms <= bound:
+                self._flush_buckets[i] += 1
+                break
+        else:
+            self._flush_buckets[-1] += 1
+        self._flushes += 1
+        self._flush_sum_ms += elapsed_ms
+        self._flush_max_ms = max(self._flush_max_ms, elapsed_ms)
+        self._flush_last_ms = elapsed_ms
+
+    async def flush(self):
+        """Write everything recorded so far; on a database error keep it for the next flush"""
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        async with self._flush_lock:
+            try:
+                await run_in_executor(self._rotate)
+            except OSError as e:
+                # Pending events stay queued; segments already rotated are still written
+                logger.error(f"Audit journal rotation failed: {e}")
+            while self._segments:
+                path, events = self._segments[0]
+                while events:
+                    batch = events[:self.batch_size]
+                    start = time.perf_counter()
+                    try:
+                        written, rejected = await run_in_executor(self._write, batch)
+                    except Exception as e:
+                        self.failed_flushes += 1
+                        logger.error(f"Audit flush failed ({self.depth} events kept): {e}")
+                        return
+                    self._record_flush((time.perf_counter() - start) * 1000)
+                    with self._lock:
+                        del events[:len(batch)]
+                    self.written += written
+                    self.rejected += rejected
+                with self._lock:
+                    self._segments.popleft()
+                if path:
+                    os.remove(path)
+
+    async def run(self, interval):
+        """Background writer: replay leftovers, then flush every `interval` seconds or when a batch fills"""
+        self._wakeup = asyncio.Event()
+        self.recover()
+        while True:
+            await self.flush()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    def stats(self):
+        """Queue depth, delivery counters and flush-latency histogram"""
+        with self._lock:
+            oldest = self._segments[0][1][0] if self._segments and self._segments[0][1] else (
+                self._pending[0] if self._pending else None)
+            cumulative = []
+            running = 0
+            for bound, count in zip(FLUSH_BUCKETS_MS + ("+Inf",), self._flush_buckets):
+                running += count
+                cumulative.append({"le_ms": bound, "count": running})
+            return {
+                "mode": "async" if self.app_audits else "trigger",
+                "queue_depth": self.depth,
+                "max_queue_depth": self.max_depth,
+                "segments": len(self._segments),
+                "oldest_event": oldest["row"][EVENT_COLUMNS[oldest["table"]][-1]] if oldest else None,
+                "recorded": self.recorded,
+                "written": self.written,
+                "rejected": self.rejected,
+                "replayed": self.replayed,
+                "failed_flushes": self.failed_flushes,
+                "batch_size": self.batch_size,
+                "flush_count": self._flushes,
+                "flush_last_ms": round(self._flush_last_ms, 3) if self._flush_last_ms is not None else None,
+                "flush_avg_ms": round(self._flush_sum_ms / self._flushes, 3) if self._flushes else 0.0,
+                "flush_max_ms": round(self._flush_max_ms, 3),
+                "flush_histogram": cumulative,
+            }
+
+
+audit_pipeline = AuditPipeline(
+    batch_size=settings.AUDIT_BATCH_SIZE,
+    spill_path=settings.AUDIT_SPILL_PATH,
+    fsync=settings.AUDIT_SPILL_FSYNC,
+    app_audits=settings.AUDIT_MODE == "async",
+)
@@ -0,0 +1,445 @@
+"""
+Collection forecasting
+
+Predicts a movie's total collection from what is known before release:
+budget, language, genres, release month, the cast's popularity_score and,
+once announced, release screens and opening weekend. The model is a ridge
+regression on log(total collection), fitted in closed form with NumPy on
+every movie that has box office figures, so training takes milliseconds
+to seconds on a CPU and needs no extra dependencies.
+
+Features are built column-wise for a whole batch: numeric features are
+log-scaled where skewed, missing values are imputed with the training mean
+plus a missing-indicator column, and language, genre and month become
+one-hot blocks over the vocabulary seen in training. Scoring a batch is a
+single matrix product.
+
+Trained models are versioned and kept in memory by ``ForecastRegistry``
+(the newest FORECAST_MAX_VERSIONS) and written as JSON under
+FORECAST_MODEL_DIR, so a restarted worker serves the same active version
+without retraining.
+"""
+import glob
+import json
+import os
+import threading
+import time
+from datetime import datetime
+import numpy as np
+from config import get_settings
+from database import connection
+import logging
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+FEATURES_SQL = """
+SELECT m.movie_id, m.title, m.budget, m.language_id, MONTH(m.release_date) AS release_month,
+       bo.total_collection, bo.opening_weekend, bo.release_screens,
+       c.cast_count, c.cast_popularity_mean, c.cast_popularity_max
+FROM MOVIES m
+LEFT JOIN BOX_OFFICE bo ON m.movie_id = bo.movie_id
+LEFT JOIN (
+    SELECT mc.movie_id, COUNT(*) AS cast_count,
+           AVG(a.popularity_score) AS cast_popularity_mean,
+           MAX(a.popularity_score) AS cast_popularity_max
+    FROM MOVIE_CAST mc
+    JOIN ACTORS a ON mc.actor_id = a.actor_id
+    GROUP BY mc.movie_id
+) c ON m.movie_id = c.movie_id
+"""
+
+TRAINING_WHERE = "WHERE bo.total_collection > 0"
+# Every movie gets a 'pending' BOX_OFFICE row on insert, so "no figures yet"
+# is that row still pending or empty rather than a missing row
+UPCOMING_WHERE = """
+WHERE (bo.box_id IS NULL OR bo.collection_status = 'pending' OR COALESCE(bo.total_collection, 0) = 0)
+ORDER BY m.release_date IS NULL, m.release_date, m.movie_id LIMIT %s
+"""
+
+GENRES_SQL = "SELECT movie_id, genre_id FROM MOVIE_GENRES"
+
+POPULARITY_SQL = "SELECT actor_id, popularity_score FROM ACTORS WHERE actor_id IN ({placeholders})"
+
+NUMERIC_FEATURES = ("budget", "opening_weekend", "release_screens", "cast_count",
+                    "cast_popularity_mean", "cast_popularity_max")
+LOG_FEATURES = {"budget", "opening_weekend", "release_screens"}
+
+MIN_TRAINING_ROWS = 20
+HOLDOUT_FRACTION = 0.2
+# Standard normal quantile for the 10th/90th percentile band
+Z_80 = 1.2816
+
+
+class FeatureBatch:
+    """Column arrays for a batch of movies, in the layout the model expects"""
+
+    def __init__(self, numeric, language_id, release_month, genre_rows, genre_ids):
+        self.numeric = numeric              # name -> float64 (NaN = unknown)
+        self.language_id = language_id      # int64, -1 = unknown
+        self.release_month = release_month  # int64, 0 = unknown
+        self.genre_rows = genre_rows        # (row index, genre id) pairs
+        self.genre_ids = genre_ids
+
+    def __len__(self):
+        return len(self.language_id)
+
+    def take(self, rows):
+        """Sub-batch of the given row indices"""
+        remap = np.full(len(self), -1, dtype=np.int64)
+        remap[rows] = np.arange(len(rows))
+        kept = remap[self.genre_rows] >= 0
+        return FeatureBatch({name: values[rows] for name, values in self.numeric.items()},
+                            self.language_id[rows], self.release_month[rows],
+                            remap[self.genre_rows[kept]], self.genre_ids[kept])
+
+    @classmethod
+    def from_rows(cls, rows, genres):
+        """Batch from FEATURES_SQL rows and (movie_id, genre_id) rows"""
+        numeric = {name: np.array([np.nan if row[name] is None else float(row[name]) for row in rows],
+                                  dtype=np.float64)
+                   for name in NUMERIC_FEATURES}
+        movie_ids = np.array([row["movie_id"] for row in rows], dtype=np.int64)
+        genre_movies = np.array([row["movie_id"] for row in genres], dtype=np.int64)
+        order = np.argsort(movie_ids)
+        index = np.minimum(np.searchsorted(movie_ids, genre_movies, sorter=order), len(movie_ids) - 1) \
+            if len(movie_ids) else np.zeros(len(genre_movies), dtype=np.int64)
+        matched = movie_ids[order[index]] == genre_movies if len(movie_ids) \
+            else np.zeros(len(genre_movies), dtype=bool)
+        return cls(numeric,
+                   np.array([row["language_id"] for row in rows], dtype=np.int64),
+                   np.array([row["release_month"] or 0 for row in rows], dtype=np.int64),
+                   order[index[matched]],
+                   np.array([row["genre_id"] for row in genres], dtype=np.int64)[matched])
+
+    @classmethod
+    def from_inputs(cls, inputs, popularity):
+        """Batch from API inputs; `popularity` maps actor_id -> popularity_score"""
+        numeric = {name: np.array([np.nan if getattr(item, name, None) is None
+                                   else float(getattr(item, name)) for item in inputs],
+                                  dtype=np.float64)
+                   for name in ("budget", "opening_weekend", "release_screens")}
+
+        # Cast aggregates over all (row, actor) pairs at once
+        cast_rows = np.array([i for i, item in enumerate(inputs) for _ in item.actor_ids], dtype=np.int64)
+        scores = np.array([np.nan if popularity.get(actor_id) is None else float(popularity[actor_id])
+                           for item in inputs for actor_id in item.actor_ids], dtype=np.float64)
+        known = ~np.isnan(scores)
+        numeric["cast_count"] = np.bincount(cast_rows, minlength=len(inputs)).astype(np.float64)
+        counts = np.bincount(cast_rows[known], minlength=len(inputs))
+        sums = np.bincount(cast_rows[known], weights=scores[known], minlength=len(inputs))
+        peaks = np.full(len(inputs), -np.inf)
+        np.maximum.at(peaks, cast_rows[known], scores[known])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            numeric["cast_popularity_mean"] = np.where(counts > 0, sums / counts, np.nan)
+        numeric["cast_popularity_max"] = np.where(counts > 0, peaks, np.nan)
+        numeric["cast_count"][numeric["cast_count"] == 0] = np.nan
+
+        return cls(numeric,
+                   np.array([item.language_id if item.language_id is not None else -1
+                             for item in inputs], dtype=np.int64),
+                   np.array([item.release_date.month if item.release_date else 0
+                             for item in inputs], dtype=np.int64),
+                   np.array([i for i, item in enumerate(inputs) for _ in item.genre_ids], dtype=np.int64),
+                   np.array([g for item in inputs for g in item.genre_ids], dtype=np.int64))
+
+
+def _one_hot(matrix, offset, rows, values, vocabulary):
+    """Set matrix[rows, offset + position of value in vocabulary] for known values"""
+    if not len(vocabulary) or not len(values):
+        return
+    index = np.minimum(np.searchsorted(vocabulary, values), len(vocabulary) - 1)
+    known = vocabulary[index] == values
+    matrix[rows[known], offset + index[known]] = 1.0
+
+
+class ForecastModel:
+    """Ridge regression on log(total collection) with its feature transform"""
+
+    def __init__(self, version=None, alpha=1.0):
+        self.version = version
+        self.alpha = alpha
+        self.trained_at = None
+        self.fill = None
+        self.languages = np.empty(0, dtype=np.int64)
+        self.genres = np.empty(0, dtype=np.int64)
+        self.center = None
+        self.scale = None
+        self.weights = None
+        self.intercept = 0.0
+        self.residual_std = 0.0
+        self.metrics = {}
+
+    @property
+    def feature_names(self):
+        return ([f"log_{name}" if name in LOG_FEATURES else name for name in NUMERIC_FEATURES]
+                + [f"{name}_missing" for name in NUMERIC_FEATURES]
+                + [f"language_{l}" for l in self.languages.tolist()]
+                + [f"genre_{g}" for g in self.genres.tolist()]
+                + [f"month_{m}" for m in range(1, 13)])
+
+    def _numeric(self, batch):
+        columns = [np.log1p(batch.numeric[name]) if name in LOG_FEATURES else batch.numeric[name]
+                   for name in NUMERIC_FEATURES]
+        return np.column_stack(columns) if len(batch) else np.empty((0, len(NUMERIC_FEATURES)))
+
+    def design(self, batch):
+        """Unscaled design matrix: imputed numerics, missing flags and one-hot blocks"""
+        numeric = self._numeric(batch)
+        missing = np.isnan(numeric)
+        width = 2 * len(NUMERIC_FEATURES) + len(self.languages) + len(self.genres) + 12
+        matrix = np.zeros((len(batch), width))
+        matrix[:, :len(NUMERIC_FEATURES)] = np.where(missing, self.fill, numeric)
+        matrix[:, len(NUMERIC_FEATURES):2 * len(NUMERIC_FEATURES)] = missing
+
+        offset = 2 * len(NUMERIC_FEATURES)
+        rows = np.arange(len(batch))
+        _one_hot(matrix, offset, rows, batch.language_id, self.languages)
+        offset += len(self.languages)
+        _one_hot(matrix, offset, batch.genre_rows, batch.genre_ids, self.genres)
+        offset += len(self.genres)
+        months = batch.release_month > 0
+        matrix[rows[months], offset + batch.release_month[months] - 1] = 1.0
+        return matrix
+
+    def fit(self, batch, target):
+        """Fit on a batch with known total collections"""
+        with np.errstate(invalid="ignore"):
+            fill = np.nanmean(self._numeric(batch), axis=0)
+        self.fill = np.where(np.isnan(fill), 0.0, fill)
+        self.languages = np.unique(batch.language_id[batch.language_id >= 0])
+        self.genres = np.unique(batch.genre_ids)
+
+        matrix = self.design(batch)
+        self.center = matrix.mean(axis=0)
+        scale = matrix.std(axis=0)
+        self.scale = np.where(scale > 0, scale, 1.0)
+        scaled = (matrix - self.center) / self.scale
+        y = np.log1p(target)
+        self.intercept = float(y.mean())
+        gram = scaled.T @ scaled + self.alpha * np.eye(scaled.shape[1])
+        self.weights = np.linalg.solve(gram, scaled.T @ (y - self.intercept))
+        self.residual_std = float(np.std(y - self._log_predict(batch)))
+        self.trained_at = datetime.now()
+        return self
+
+    def _log_predict(self, batch):
+        return (self.design(batch) - self.center) / self.scale @ self.weights + self.intercept
+
+    def predict(self, batch):
+        """Predicted total collection with a 10th-90th percentile band"""
+        log_prediction = self._log_predict(batch)
+        band = Z_80 * self.residual_std
+        return (np.expm1(log_prediction),
+                np.expm1(log_prediction - band),
+                np.expm1(log_prediction + band))
+
+    def describe(self, top=10):
+        weights = self.weights if self.weights is not None else np.empty(0)
+        strongest = np.argsort(-np.abs(weights))[:top]
+        names = self.feature_names
+        return {
+            "version": self.version,
+            "alpha": self.alpha,
+            "trained_at": self.trained_at.isoformat() if self.trained_at else None,
+            "features": len(weights),
+            "metrics": self.metrics,
+            "top_features": [{"feature": names[i], "weight": round(float(weights[i]), 4)}
+                             for i in strongest],
+        }
+
+    def to_dict(self):
+        return {
+            "version": self.version, "alpha": self.alpha,
+            "trained_at": self.trained_at.isoformat(), "fill": self.fill.tolist(),
+            "languages": self.languages.tolist(), "genres": self.genres.tolist(),
+            "center": self.center.tolist(), "scale": self.scale.tolist(),
+            "weights": self.weights.tolist(), "intercept": self.intercept,
+            "residual_std": self.residual_std, "metrics": self.metrics,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        model = cls(version=data["version"], alpha=data["alpha"])
+        model.trained_at = datetime.fromisoformat(data["trained_at"])
+        model.fill = np.array(data["fill"])
+        model.languages = np.array(data["languages"], dtype=np.int64)
+        model.genres = np.array(data["genres"], dtype=np.int64)
+        model.center = np.array(data["center"])
+        model.scale = np.array(data["scale"])
+        model.weights = np.array(data["weights"])
+        model.intercept = data["intercept"]
+        model.residual_std = data["residual_std"]
+        model.metrics = data["metrics"]
+        return model
+
+
+def _evaluate(model, batch, target):
+    predicted = model.predict(batch)[0]
+    y, log_predicted = np.log1p(target), np.log1p(predicted)
+    total = np.sum((y - y.mean()) ** 2)
+    errors = np.abs(predicted - target) / target
+    return {
+        "r2_log": round(float(1 - np.sum((y - log_predicted) ** 2) / total), 4) if total > 0 else None,
+        "mape": round(float(errors.mean()) * 100, 2),
+        "median_ape": round(float(np.median(errors)) * 100, 2),
+    }
+
+
+def train_model(batch, target, alpha=1.0, version=None, seed=0):
+    """Fit with a holdout evaluation, then refit on every row"""
+    if len(batch) < MIN_TRAINING_ROWS:
+        raise ValueError(f"Need at least {MIN_TRAINING_ROWS} movies with box office figures "
+                         f"to train, found {len(batch)}")
+    start = time.perf_counter()
+    order = np.random.default_rng(seed).permutation(len(batch))
+    split = int(len(batch) * (1 - HOLDOUT_FRACTION))
+    train, test = order[:split], order[split:]
+    holdout = ForecastModel(alpha=alpha).fit(batch.take(train), target[train])
+    metrics = _evaluate(holdout, batch.take(test), target[test])
+
+    model = ForecastModel(version=version, alpha=alpha).fit(batch, target)
+    # Holdout residuals give an honest prediction band
+    residuals = np.log1p(target[test]) - holdout._log_predict(batch.take(test))
+    model.residual_std = float(np.std(residuals))
+    model.metrics = {**metrics, "rows": len(batch), "holdout_rows": len(test),
+                     "train_s": round(time.perf_counter() - start, 4)}
+    return model
+
+
+def load_training_batch():
+    rows = connection.execute_query(f"{FEATURES_SQL} {TRAINING_WHERE}")
+    genres = connection.execute_query(GENRES_SQL)
+    batch = FeatureBatch.from_rows(rows, genres)
+    return batch, np.array([float(row["total_collection"]) for row in rows])
+
+
+def load_upcoming(limit):
+    """Movies without box office figures, soonest release first"""
+    rows = connection.execute_query(f"{FEATURES_SQL} {UPCOMING_WHERE}", (limit,))
+    return rows, FeatureBatch.from_rows(rows, _genres_of(rows))
+
+
+def load_movie(movie_id):
+    rows = connection.execute_query(f"{FEATURES_SQL} WHERE m.movie_id = %s", (movie_id,))
+    return rows, FeatureBatch.from_rows(rows, _genres_of(rows))
+
+
+def _genres_of(rows):
+    if not rows:
+        return []
+    placeholders = ", ".join(["%s"] * len(rows))
+    return connection.execute_query(f"{GENRES_SQL} WHERE movie_id IN ({placeholders})",
+                                    tuple(row["movie_id"] for row in rows))
+
+
+def cast_popularity(inputs):
+    """actor_id -> popularity_score for every actor named in a batch of inputs"""
+    actor_ids = sorted({actor_id for item in inputs for actor_id in item.actor_ids})
+    if not actor_ids:
+        return {}
+    rows = connection.execute_query(
+        POPULARITY_SQL.format(placeholders=", ".join(["%s"] * len(actor_ids))), tuple(actor_ids))
+    return {row["actor_id"]: row["popularity_score"] for row in rows}
+
+
+def predictions(model, batch, keys):
+    """Scored rows for a batch; `keys` holds the identifying fields per row"""
+    predicted, low, high = model.predict(batch)
+    return [{**key, "predicted_collection": round(float(p), 2),
+             "low": round(float(lo), 2), "high": round(float(hi), 2)}
+            for key, p, lo, hi in zip(keys, predicted, low, high)]
+
+
+class ForecastRegistry:
+    """Versioned in-memory model cache backed by JSON files"""
+
+    def __init__(self, model_dir, max_versions=5):
+        self.model_dir = model_dir
+        self.max_versions = max_versions
+        self._lock = threading.RLock()
+        self._models = {}
+        self._active = None
+        self._loaded = False
+
+    def _path(self, version):
+        return os.path.join(self.model_dir, f"forecast-v{version:04d}.json")
+
+    def _load(self):
+        """Read saved models once, on first use"""
+        with self._lock:
+            if self._loaded:
+                return
+            self._loaded = True
+            for path in sorted(glob.glob(os.path.join(self.model_dir, "forecast-v*.json")))[-self.max_versions:]:
+                try:
+                    with open(path, encoding="utf-8") as f:
+                        model = ForecastModel.from_dict(json.load(f))
+                except (OSError, ValueError, KeyError) as e:
+                    logger.warning(f"Skipping unreadable forecast model {path}: {e}")
+                    continue
+                self._models[model.version] = model
+            active_path = os.path.join(self.model_dir, "ACTIVE")
+            if os.path.exists(active_path):
+                with open(active_path, encoding="utf-8") as f:
+                    active = int(f.read().strip() or 0)
+                self._active = active if active in self._models else None
+            if self._active is None and self._models:
+                self._active = max(self._models)
+
+    def _save(self, model):
+        os.makedirs(self.model_dir, exist_ok=True)
+        with open(f"{self._path(model.version)}.tmp", "w", encoding="utf-8") as f:
+            json.dump(model.to_dict(), f)
+        os.replace(f"{self._path(model.version)}.tmp", self._path(model.version))
+
+    def _save_active(self):
+        with open(os.path.join(self.model_dir, "ACTIVE"), "w", encoding="utf-8") as f:
+            f.write(str(self._active))
+
+    def train(self, alpha=None, activate=True):
+        """Train a new version on the current database and register it"""
+        self._load()
+        batch, target = load_training_batch()
+        model = train_model(batch, target, settings.FORECAST_ALPHA if alpha is None else alpha)
+        # Numbering, saving and registering happen together so concurrent
+        # trainings never share a version or overwrite each other's file
+        with self._lock:
+            version = model.version = max(self._models, default=0) + 1
+            self._save(model)
+            self._models[version] = model
+            for old in sorted(self._models)[:-self.max_versions]:
+                if old != self._active:
+                    del self._models[old]
+                    if os.path.exists(self._path(old)):
+                        os.remove(self._path(old))
+            if activate or self._active is None:
+                self._active = version
+                self._save_active()
+        logger.info(f"Trained forecast model v{version} on {model.metrics['rows']} movies "
+                    f"in {model.metrics['train_s']}s (MAPE {model.metrics['mape']}%)")
+        return model
+
+    def get(self, version=None):
+        """The requested or active model, or None"""
+        self._load()
+        with self._lock:
+            return self._models.get(self._active if version is None else version)
+
+    def activate(self, version):
+        self._load()
+        with self._lock:
+            if version not in self._models:
+                return None
+            self._active = version
+            self._save_active()
+            return self._models[version]
+
+    def versions(self):
+        self._load()
+        with self._lock:
+            return {"active": self._active,
+                    "models": [self._models[v].describe() for v in sorted(self._models, reverse=True)]}
+
+
+forecast_registry = ForecastRegistry(settings.FORECAST_MODEL_DIR, settings.FORECAST_MAX_VERSIONS)
@@ -0,0 +1,413 @@
+"""
+Collaboration graph
+
+Actors and crew members are linked through the movies they share. The
+graph is held in process as two CSR (compressed sparse row) adjacency
+arrays over the bipartite person-movie credit graph: ``person -> movies``
+and ``movie -> people``. Person-person edges are never materialized; a
+neighbourhood is two array gathers followed by a ``bincount``, and
+collaboration paths are a breadth-first search that expands a whole
+frontier per step. Pair rankings (e.g. director x music director by
+combined gross) are computed per generation of the graph and cached until
+the next change.
+
+Writes mark a movie, actor or crew member dirty and only their credits are
+reloaded before the next query; the graph is rebuilt after GRAPH_TTL
+seconds to pick up changes made outside this process.
+"""
+import threading
+import time
+import numpy as np
+from app.models.database_models import CrewRole
+from config import get_settings
+from database import connection
+import logging
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+KINDS = ("actor", "crew")
+# Role of every person: actors are "actor", crew members their PRODUCTION_CREW role
+ROLES = ("actor",) + tuple(role.value for role in CrewRole)
+
+CAST_SQL = """
+SELECT 'actor' AS kind, mc.actor_id AS person_id, a.name, 'actor' AS role, mc.movie_id
+FROM MOVIE_CAST mc
+JOIN ACTORS a ON mc.actor_id = a.actor_id
+"""
+
+CREW_SQL = """
+SELECT 'crew' AS kind, mcr.crew_id AS person_id, pc.name, pc.role, mcr.movie_id
+FROM MOVIE_CREW mcr
+JOIN PRODUCTION_CREW pc ON mcr.crew_id = pc.crew_id
+"""
+
+MOVIES_SQL = """
+SELECT m.movie_id, m.title, bo.total_collection
+FROM MOVIES m
+LEFT JOIN BOX_OFFICE bo ON m.movie_id = bo.movie_id
+"""
+
+# dirty kind -> (credit queries to reload, column they are filtered on)
+RELOADS = {
+    "movie": ((CAST_SQL, "mc.movie_id"), (CREW_SQL, "mcr.movie_id")),
+    "actor": ((CAST_SQL, "mc.actor_id"),),
+    "crew": ((CREW_SQL, "mcr.crew_id"),),
+}
+
+MAX_PATH_DEPTH = 8
+
+
+def _csr(rows, columns, size):
+    """Row pointer and column arrays of the sparse matrix with entries (rows, columns)"""
+    order = np.argsort(rows, kind="stable")
+    pointer = np.zeros(size + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=size), out=pointer[1:])
+    return pointer, columns[order]
+
+
+def _gather(pointer, columns, rows):
+    """Concatenated adjacency lists of `rows`, and the position in `rows` each entry came from"""
+    starts = pointer[rows]
+    lengths = pointer[rows + 1] - starts
+    ends = np.cumsum(lengths)
+    offsets = np.repeat(starts - (ends - lengths), lengths) + np.arange(ends[-1] if len(ends) else 0)
+    return columns[offsets], np.repeat(np.arange(len(rows)), lengths)
+
+
+class _Graph:
+    """One immutable generation of the credit graph"""
+
+    def __init__(self, credit_person, credit_movie, person_role, movie_gross):
+        self.credit_person = credit_person
+        self.credit_movie = credit_movie
+        self.person_role = person_role
+        self.movie_gross = movie_gross
+        self.person_movies = _csr(credit_person, credit_movie, len(person_role))
+        self.movie_people = _csr(credit_movie, credit_person, len(movie_gross))
+        self.pairs = {}
+
+
+class CollaborationGraph:
+    """Thread-safe in-memory person-movie graph with incremental updates
+
+    People and movies get a permanent index the first time they are seen;
+    deleted ones simply lose their credits.
+    """
+
+    def __init__(self, ttl=600):
+        self.ttl = ttl
+        self._lock = threading.RLock()
+        self._people = {}          # (kind, id) -> person index
+        self._person_keys = []     # person index -> (kind, id)
+        self._person_names = []
+        self._person_roles = []
+        self._movies = {}          # movie_id -> movie index
+        self._movie_ids = []
+        self._movie_titles = []
+        self._movie_gross = []
+        self._graph = _Graph(np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64),
+                             np.empty(0, dtype=np.int8), np.empty(0))
+        self._dirty = {kind: set() for kind in RELOADS}
+        self._built_at = None
+        self._rebuilding = False
+        self._rebuilt = threading.Condition(self._lock)
+
+    # ---- maintenance -------------------------------------------------
+
+    def _person(self, row):
+        key = (row["kind"], row["person_id"])
+        index = self._people.get(key)
+        role = ROLES.index(row["role"]) if row["role"] in ROLES else ROLES.index("Other")
+        if index is None:
+            index = self._people[key] = len(self._person_keys)
+            self._person_keys.append(key)
+            self._person_names.append(row["name"])
+            self._person_roles.append(role)
+        else:
+            self._person_names[index] = row["name"]
+            self._person_roles[index] = role
+        return index
+
+    def _movie(self, row):
+        index = self._movies.get(row["movie_id"])
+        if index is None:
+            index = self._movies[row["movie_id"]] = len(self._movie_ids)
+            self._movie_ids.append(row["movie_id"])
+            self._movie_titles.append(row["title"])
+            self._movie_gross.append(row["total_collection"])
+        else:
+            self._movie_titles[index] = row["title"]
+            self._movie_gross[index] = row["total_collection"]
+        return index
+
+    def _credits(self, rows):
+        """Person and movie index arrays for credit rows (movies already registered)"""
+        return (np.array([self._person(row) for row in rows], dtype=np.int64),
+                np.array([self._movies[row["movie_id"]] for row in rows], dtype=np.int64))
+
+    def _attributes(self):
+        """Role of every person and gross of every movie, as the next generation sees them"""
+        gross = np.array([np.nan if value is None else float(value) for value in self._movie_gross],
+                         dtype=np.float64)
+        return np.array(self._person_roles, dtype=np.int8), gross
+
+    def _publish(self, credit_person, credit_movie):
+        self._graph = _Graph(credit_person, credit_movie, *self._attributes())
+
+    def rebuild(self):
+        """Reload every credit from the database.
+
+        The queries and the CSR arrays run without the lock; it is held to
+        register people and movies and to swap the new generation in.
+        """
+        start = time.perf_counter()
+        with self._lock:
+            pending, self._dirty = self._dirty, {kind: set() for kind in RELOADS}
+        try:
+            movies = connection.execute_query(MOVIES_SQL)
+            credits = connection.execute_query(CAST_SQL) + connection.execute_query(CREW_SQL)
+        except Exception:
+            self._restore_dirty(pending)
+            raise
+        # Person and movie indexes are never reused, so a reader still holding
+        # the previous generation resolves the same names
+        with self._lock:
+            for row in movies:
+                self._movie(row)
+            existing = {row["movie_id"] for row in movies}
+            credits = [row for row in credits if row["movie_id"] in existing]
+            credit_person, credit_movie = self._credits(credits)
+            person_role, movie_gross = self._attributes()
+        graph = _Graph(credit_person, credit_movie, person_role, movie_gross)
+        with self._lock:
+            self._graph = graph
+            self._built_at = time.monotonic()
+        logger.info(f"Collaboration graph rebuilt: {len(self._person_keys)} people, "
+                    f"{len(credits)} credits in {time.perf_counter() - start:.2f}s")
+
+    def mark_dirty(self, kind, key):
+        """Schedule a movie's, actor's or crew member's credits to be reloaded before the next query"""
+        if key is None:
+            return
+        with self._lock:
+            self._dirty[kind].add(key)
+
+    def expire(self):
+        """Force a full rebuild before the next query (after bulk loads)"""
+        with self._lock:
+            self._built_at = None
+
+    def _restore_dirty(self, pending):
+        """Put back keys whose reload failed so the next query retries them"""
+        with self._lock:
+            for kind, ids in pending.items():
+                self._dirty[kind].update(ids)
+
+    def _apply_dirty(self):
+        with self._lock:
+            pending = {kind: list(ids) for kind, ids in self._dirty.items() if ids}
+            for ids in self._dirty.values():
+                ids.clear()
+        if not pending:
+            return
+
+        loaded = []
+        try:
+            for kind, ids in pending.items():
+                placeholders = ", ".join(["%s"] * len(ids))
+                for sql, column in RELOADS[kind]:
+                    loaded += connection.execute_query(f"{sql} WHERE {column} IN ({placeholders})", tuple(ids))
+            movie_ids = set(pending.get("movie", ())) | {row["movie_id"] for row in loaded}
+            placeholders = ", ".join(["%s"] * len(movie_ids))
+            movies = connection.execute_query(
+                f"{MOVIES_SQL} WHERE m.movie_id IN ({placeholders})", tuple(movie_ids)) if movie_ids else []
+        except Exception:
+            self._restore_dirty(pending)
+            raise
+
+        with self._lock:
+            graph = self._graph
+            for row in movies:
+                self._movie(row)
+            # Credits of everything reloaded are replaced wholesale
+            stale = np.zeros(len(graph.credit_person), dtype=bool)
+            for kind, ids in pending.items():
+                if kind == "movie":
+                    indexes = [self._movies[i] for i in ids if i in self._movies]
+                    stale |= np.isin(graph.credit_movie, indexes)
+                else:
+                    indexes = [self._people[(kind, i)] for i in ids if (kind, i) in self._people]
+                    stale |= np.isin(graph.credit_person, indexes)
+            existing = {row["movie_id"] for row in movies}
+            people, movies = self._credits([row for row in loaded if row["movie_id"] in existing])
+            self._publish(np.concatenate([graph.credit_person[~stale], people]),
+                          np.concatenate([graph.credit_movie[~stale], movies]))
+
+    def ensure_fresh(self):
+        """Rebuild if stale, otherwise apply pending incremental updates.
+
+        Only one caller rebuilds at a time; the others query the current
+        generation, or wait for the first build if there is none yet.
+        """
+        with self._rebuilt:
+            stale = self._built_at is None or time.monotonic() - self._built_at > self.ttl
+            if self._rebuilding:
+                # Leave dirty keys alone: the swap would discard them
+                self._rebuilt.wait_for(
+                    lambda: not self._rebuilding or len(self._graph.credit_person))
+                return
+            if stale:
+                self._rebuilding = True
+        if stale:
+            try:
+                self.rebuild()
+            finally:
+                with self._rebuilt:
+                    self._rebuilding = False
+                    self._rebuilt.notify_all()
+            return
+        self._apply_dirty()
+
+    # ---- querying ----------------------------------------------------
+
+    def _describe(self, index):
+        kind, person_id = self._person_keys[index]
+        return {"type": kind, "id": person_id, "name": self._person_names[index],
+                "role": ROLES[self._person_roles[index]]}
+
+    def _movie_summary(self, index):
+        return {"movie_id": self._movie_ids[index], "title": self._movie_titles[index]}
+
+    def person(self, kind, person_id):
+        """Person index of an actor or crew member, or None if they have no credits"""
+        return self._people.get((kind, person_id))
+
+    def collaborators(self, kind, person_id, role=None, limit=20):
+        """People who share the most movies with a person, by shared count then combined gross"""
+        graph = self._graph
+        index = self.person(kind, person_id)
+        if index is None or index >= len(graph.person_role):
+            return None
+        pointer, movies = graph.person_movies
+        own = movies[pointer[index]:pointer[index + 1]]
+        people, source = _gather(*graph.movie_people, own)
+        keep = people != index
+        if role is not None:
+            keep &= graph.person_role[people] == ROLES.index(role)
+        people, shared = people[keep], own[source[keep]]
+        if not len(people):
+            return []
+
+        found, inverse = np.unique(people, return_inverse=True)
+        counts = np.bincount(inverse)
+        gross = np.bincount(inverse, weights=np.nan_to_num(graph.movie_gross[shared]))
+        best = np.lexsort((found, -gross, -counts))[:limit]
+        return [{**self._describe(found[i]), "shared_movies": int(counts[i]),
+                 "combined_gross": round(float(gross[i]), 2)} for i in best]
+
+    def path(self, source, target, role=None, max_depth=6):
+        """Shortest chain of shared movies between two people, or None.
+
+        Breadth-first over people; every step expands the whole frontier
+        with two gathers. `role` restricts the intermediate people.
+        """
+        graph = self._graph
+        start, goal = self.person(*source), self.person(*target)
+        people_count = len(graph.person_role)
+        if start is None or goal is None or start >= people_count or goal >= people_count:
+            return None
+        if start == goal:
+            return {"degrees": 0, "path": [self._describe(start)]}
+
+        via_person = np.full(people_count, -1, dtype=np.int64)   # person reached through movie
+        via_movie = np.full(len(graph.movie_gross), -1, dtype=np.int64)  # movie reached from person
+        seen_people = np.zeros(people_count, dtype=bool)
+        seen_movies = np.zeros(len(graph.movie_gross), dtype=bool)
+        seen_people[start] = True
+        frontier = np.array([start], dtype=np.int64)
+        allowed = graph.person_role == ROLES.index(role) if role is not None else None
+
+        for depth in range(1, max_depth + 1):
+            movies, source_rows = _gather(*graph.person_movies, frontier)
+            fresh = ~seen_movies[movies]
+            movies, first = np.unique(movies[fresh], return_index=True)
+            via_movie[movies] = frontier[source_rows[fresh][first]]
+            seen_movies[movies] = True
+
+            people, source_rows = _gather(*graph.movie_people, movies)
+            fresh = ~seen_people[people]
+            people, first = np.unique(people[fresh], return_index=True)
+            via_person[people] = movies[source_rows[fresh][first]]
+            seen_people[people] = True
+            if seen_people[goal]:
+                break
+            frontier = people if allowed is None else people[allowed[people]]
+            if not len(frontier):
+                return None
+        else:
+            return None
+
+        chain = [self._describe(goal)]
+        current = goal
+        while current != start:
+            movie = via_person[current]
+            current = via_movie[movie]
+            chain += [self._movie_summary(movie), self._describe(current)]
+        return {"degrees": depth, "path": chain[::-1]}
+
+    def _pairs(self, graph, role_a, role_b):
+        """Every (a, b) pair credited on the same movie with its movie count and combined gross"""
+        key = (role_a, role_b)
+        if key in graph.pairs:
+            return graph.pairs[key]
+        code_a, code_b = ROLES.index(role_a), ROLES.index(role_b)
+        roles = graph.person_role[graph.credit_person]
+        a_people, a_movies = graph.credit_person[roles == code_a], graph.credit_movie[roles == code_a]
+        b_order = np.argsort(graph.credit_movie[roles == code_b], kind="stable")
+        b_people = graph.credit_person[roles == code_b][b_order]
+        b_movies = graph.credit_movie[roles == code_b][b_order]
+
+        # Cross every a-credit with the b-credits of the same movie
+        lo = np.searchsorted(b_movies, a_movies, side="left")
+        hi = np.searchsorted(b_movies, a_movies, side="right")
+        counts = hi - lo
+        ends = np.cumsum(counts)
+        b_index = np.repeat(lo - (ends - counts), counts) + np.arange(ends[-1] if len(ends) else 0)
+        first, second = np.repeat(a_people, counts), b_people[b_index]
+        movie = np.repeat(a_movies, counts)
+        keep = first < second if code_a == code_b else first != second
+        first, second, movie = first[keep], second[keep], movie[keep]
+
+        size = len(graph.person_role)
+        found, inverse = np.unique(first * size + second, return_inverse=True)
+        result = (found // size, found % size, np.bincount(inverse),
+                  np.bincount(inverse, weights=np.nan_to_num(graph.movie_gross[movie])))
+        graph.pairs[key] = result
+        return result
+
+    def top_pairs(self, role_a, role_b, by="gross", limit=20, min_movies=1):
+        """Pairs of people in two roles ranked by combined gross or number of movies together"""
+        graph = self._graph
+        first, second, counts, gross = self._pairs(graph, role_a, role_b)
+        eligible = np.flatnonzero(counts >= min_movies)
+        primary, secondary = (gross, counts) if by == "gross" else (counts, gross)
+        best = eligible[np.lexsort((-secondary[eligible], -primary[eligible]))][:limit]
+        return [{"first": self._describe(first[i]), "second": self._describe(second[i]),
+                 "movies": int(counts[i]), "combined_gross": round(float(gross[i]), 2)}
+                for i in best]
+
+    def stats(self):
+        with self._lock:
+            graph = self._graph
+            return {
+                "people": len(graph.person_role),
+                "movies": len(graph.movie_gross),
+                "credits": int(len(graph.credit_person)),
+                "cached_pair_rankings": len(graph.pairs),
+                "pending_updates": sum(len(ids) for ids in self._dirty.values()),
+                "age_s": round(time.monotonic() - self._built_at, 1) if self._built_at else None,
+            }
+
+
+collaboration_graph = CollaborationGraph(ttl=settings.GRAPH_TTL)
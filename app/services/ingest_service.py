@@ -0,0 +1,253 @@
+"""
+Bulk ingest service
+
+Shared by ``POST /api/bulk/{kind}`` and ``scripts/import_data.py``. Records
+are parsed incrementally from CSV or JSONL, validated with the same
+Pydantic models as the per-row endpoints, and written with multi-row
+``executemany`` INSERTs, one transaction per batch (kinds with side rows
+insert their own rows one at a time, so each reports its id). A batch that fails in
+the database is retried row by row behind savepoints so that one bad row
+(duplicate, missing foreign key, trigger rejection) is reported instead of
+aborting the load.
+"""
+import csv
+import io
+import json
+import time
+from pydantic import ValidationError
+from app.models.database_models import (
+    ActorCreate, BoxOfficeCreate, BoxOfficeDaily, MovieCastBase, MovieCreate, MovieCrewBase,
+    ProductionCrewCreate,
+)
+from app.utils.validators import constraint_error
+from database.connection import APP_AUDIT_VARIABLES
+from database.unit_of_work import UnitOfWork
+import mysql.connector
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 1000
+MAX_REPORTED_ERRORS = 100
+FORMATS = ("csv", "jsonl")
+
+# kind -> (model, table, columns, ON DUPLICATE KEY clause)
+BULK_ENTITIES = {
+    "movies": (MovieCreate, "MOVIES",
+               ("title", "release_date", "language_id", "duration", "certification",
+                "budget", "ott_rights_value", "poster_url", "plot_summary",
+                "imdb_rating", "producer_id", "created_by"), None),
+    "actors": (ActorCreate, "ACTORS",
+               ("name", "gender", "date_of_birth", "nationality",
+                "popularity_score", "email"), None),
+    "crew": (ProductionCrewCreate, "PRODUCTION_CREW",
+             ("name", "role", "specialty", "experience_years", "email"), None),
+    # Movies get a pending BOX_OFFICE row on creation, so collections upsert
+    "box-office": (BoxOfficeCreate, "BOX_OFFICE",
+                   ("movie_id", "domestic_collection", "intl_collection",
+                    "opening_weekend", "profit_margin", "release_screens",
+                    "collection_status", "updated_by"),
+                   "domestic_collection = VALUES(domestic_collection), "
+                   "intl_collection = VALUES(intl_collection), "
+                   "opening_weekend = VALUES(opening_weekend), "
+                   "profit_margin = VALUES(profit_margin), "
+                   "release_screens = VALUES(release_screens), "
+                   "collection_status = VALUES(collection_status), "
+                   "updated_by = VALUES(updated_by)"),
+    # Daily trade figures; re-reported days replace the earlier figures
+    "box-office-daily": (BoxOfficeDaily, "BOX_OFFICE_DAILY",
+                         ("movie_id", "day", "domestic", "intl", "screens"),
+                         "domestic = VALUES(domestic), intl = VALUES(intl), "
+                         "screens = VALUES(screens)"),
+    "cast": (MovieCastBase, "MOVIE_CAST",
+             ("movie_id", "actor_id", "role_name", "role_type", "screen_time_minutes"), None),
+    "movie-crew": (MovieCrewBase, "MOVIE_CREW",
+                   ("movie_id", "crew_id", "role_description"), None),
+}
+
+
+def _insert_sql(kind):
+    _, table, columns, on_duplicate = BULK_ENTITIES[kind]
+    sql = (f"INSERT INTO {table} ({', '.join(columns)}) "
+           f"VALUES ({', '.join(['%s'] * len(columns))})")
+    if on_duplicate:
+        sql += f" ON DUPLICATE KEY UPDATE {on_duplicate}"
+    return sql
+
+
+def _after_movies(uow, created):
+    """Side rows sp_add_movie creates for every movie"""
+    uow.execute_many(
+        "INSERT INTO MOVIE_STATISTICS (movie_id, average_rating) VALUES (%s, %s)",
+        [(movie_id, row["imdb_rating"]) for movie_id, row in created])
+    uow.execute_many(
+        "INSERT INTO BOX_OFFICE (movie_id, collection_status) VALUES (%s, 'pending')",
+        [(movie_id,) for movie_id, _ in created])
+    uow.execute_many(
+        "INSERT INTO ACTIVITY_LOG (user_id, action, table_name, record_id, details) "
+        "VALUES (%s, 'CREATE', 'MOVIES', %s, %s)",
+        [(row["created_by"], movie_id, f"Movie bulk-imported: {row['title']}")
+         for movie_id, row in created])
+
+
+def _activity(table, details):
+    """After-insert hook writing the ACTIVITY_LOG rows the API audit pipeline would"""
+    def after_insert(uow, created):
+        uow.execute_many(
+            "INSERT INTO ACTIVITY_LOG (user_id, action, table_name, record_id, details) "
+            "VALUES (1, 'CREATE', %s, %s, %s)",
+            [(table, record_id, details(row)) for record_id, row in created])
+    return after_insert
+
+
+AFTER_INSERT = {
+    "movies": _after_movies,
+    "actors": _activity("ACTORS", lambda row: (
+        f"New actor added: {row['name']} | Popularity: {row['popularity_score']}")),
+    "crew": _activity("PRODUCTION_CREW", lambda row: (
+        f"New crew member added: {row['name']} | Role: {row['role']} | "
+        f"Experience: {row['experience_years']} years")),
+}
+
+
+def iter_records(stream, fmt):
+    """Yield (line number, record) pairs from a text stream, one at a time.
+
+    Empty CSV cells become None. A JSONL line that is not valid JSON yields
+    a ValueError in place of the record so the loader can report it.
+    """
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, {key.strip(): (value if value != "" else None)
+                                    for key, value in row.items() if key}
+    elif fmt == "jsonl":
+        for line_no, line in enumerate(stream, 1):
+            if not line.strip():
+                continue
+            try:
+                yield line_no, json.loads(line)
+            except json.JSONDecodeError as e:
+                yield line_no, ValueError(f"Invalid JSON: {e.msg}")
+    else:
+        raise ValueError(f"Unsupported format: {fmt}")
+
+
+def _validation_message(error):
+    if isinstance(error, ValidationError):
+        return "; ".join(f"{'.'.join(str(p) for p in e['loc'])}: {e['msg']}"
+                         for e in error.errors())
+    return str(error)
+
+
+class BulkLoader:
+    """Validate and insert records of one kind in chunked transactions"""
+
+    def __init__(self, kind, batch_size=DEFAULT_BATCH_SIZE, dry_run=False,
+                 max_errors=MAX_REPORTED_ERRORS):
+        if kind not in BULK_ENTITIES:
+            raise ValueError(f"Unknown entity: {kind}")
+        self.kind = kind
+        self.model, _, self.columns, _ = BULK_ENTITIES[kind]
+        self.sql = _insert_sql(kind)
+        self.after_insert = AFTER_INSERT.get(kind)
+        self.batch_size = batch_size
+        self.dry_run = dry_run
+        self.max_errors = max_errors
+        self.report = {"kind": kind, "rows": 0, "inserted": 0, "failed": 0,
+                       "batches": 0, "errors": []}
+
+    def _fail(self, line_no, message):
+        self.report["failed"] += 1
+        if len(self.report["errors"]) < self.max_errors:
+            self.report["errors"].append({"line": line_no, "error": message})
+
+    def _values(self, row):
+        return tuple(row[column] for column in self.columns)
+
+    def _flush(self, uow, batch):
+        self.report["batches"] += 1
+        if self.dry_run:
+            self.report["inserted"] += len(batch)
+            return
+        try:
+            if self.after_insert:
+                # A multi-row INSERT's AUTO_INCREMENT ids need not be consecutive
+                # (innodb_autoinc_lock_mode=2), so only single-row INSERTs say
+                # which id each record got
+                created = [(uow.execute(self.sql, self._values(row), fetch=False)["last_id"], row)
+                           for _, row in batch]
+                self.after_insert(uow, created)
+            else:
+                uow.execute_many(self.sql, [self._values(row) for _, row in batch])
+            uow.commit()
+            self.report["inserted"] += len(batch)
+            return
+        except mysql.connector.Error as err:
+            uow.rollback()
+            logger.info(f"Batch of {len(batch)} {self.kind} failed ({err}); retrying row by row")
+
+        for line_no, row in batch:
+            uow.execute("SAVEPOINT bulk_row", fetch=False)
+            try:
+                result = uow.execute(self.sql, self._values(row), fetch=False)
+                if self.after_insert:
+                    self.after_insert(uow, [(result["last_id"], row)])
+                self.report["inserted"] += 1
+            except mysql.connector.Error as err:
+                uow.execute("ROLLBACK TO SAVEPOINT bulk_row", fetch=False)
+                mapped = constraint_error(err)
+                self._fail(line_no, mapped[1] if mapped else err.msg)
+        uow.commit()
+
+    def load(self, records):
+        """Consume (line number, record) pairs and return the load report"""
+        start = time.perf_counter()
+        uow = UnitOfWork()
+        batch = []
+        try:
+            if APP_AUDIT_VARIABLES and not self.dry_run:
+                # Bulk loads keep the in-transaction audit triggers: they are
+                # already batched, and an upsert cannot tell the pipeline
+                # which rows were inserted
+                uow.execute("SET @app_audit = NULL", fetch=False)
+            for line_no, raw in records:
+                self.report["rows"] += 1
+                if isinstance(raw, Exception):
+                    self._fail(line_no, str(raw))
+                    continue
+                try:
+                    if not isinstance(raw, dict):
+                        raise ValueError("Record must be an object")
+                    row = self.model(**raw).model_dump(mode="json")
+                except (ValidationError, ValueError, TypeError) as e:
+                    self._fail(line_no, _validation_message(e))
+                    continue
+                batch.append((line_no, row))
+                if len(batch) >= self.batch_size:
+                    self._flush(uow, batch)
+                    batch = []
+            if batch:
+                self._flush(uow, batch)
+        finally:
+            if APP_AUDIT_VARIABLES and uow.connection is not None:
+                try:
+                    uow.execute("SET @app_audit = %s", (APP_AUDIT_VARIABLES["app_audit"],), fetch=False)
+                except mysql.connector.Error:
+                    uow.connection.invalidate()
+                    uow.connection = None
+            uow.close()
+
+        elapsed = time.perf_counter() - start
+        self.report["elapsed_s"] = round(elapsed, 3)
+        self.report["rows_per_sec"] = round(self.report["rows"] / elapsed, 1) if elapsed else None
+        return self.report
+
+
+def load_file(kind, binary_file, fmt, batch_size=DEFAULT_BATCH_SIZE, dry_run=False):
+    """Stream a (binary) CSV/JSONL file into the database"""
+    text = io.TextIOWrapper(binary_file, encoding="utf-8-sig", newline="")
+    try:
+        return BulkLoader(kind, batch_size=batch_size, dry_run=dry_run).load(iter_records(text, fmt))
+    finally:
+        text.detach()
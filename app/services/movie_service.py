@@ -0,0 +1,132 @@
+"""
+Movie service
+
+Batched loaders behind the multi-get and detail endpoints. Every loader
+resolves a list of ids with a single ``WHERE ... IN (...)`` query and
+returns rows keyed by id, so a page that needs many movies costs one
+round-trip instead of one request per id.
+"""
+import json
+from database.async_connection import execute_query
+
+MAX_BATCH_IDS = 200
+
+MOVIES_SQL = """
+SELECT m.movie_id, m.title, m.release_date, m.language_id, m.duration,
+       m.certification, m.budget, m.ott_rights_value, m.poster_url,
+       m.plot_summary, m.imdb_rating, m.producer_id, m.created_by,
+       m.created_at, m.updated_at
+FROM MOVIES m
+WHERE m.movie_id IN ({ids})
+"""
+
+# One statement per batch: the movie columns sp_get_movie_details returns
+# (and the ones the UI needs), with cast and crew folded into JSON arrays by
+# correlated JSON_ARRAYAGG subqueries (MySQL 5.7.22+). The status is inlined
+# instead of calling fn_get_movie_status, which re-reads MOVIES/BOX_OFFICE.
+MOVIE_DETAILS_SQL = """
+SELECT m.movie_id, m.title, m.release_date, m.language_id, l.language_name,
+       m.duration, m.certification, m.budget, m.ott_rights_value, m.poster_url,
+       m.plot_summary, m.imdb_rating, m.producer_id, p.name AS producer_name,
+       p.company AS producer_company,
+       (SELECT GROUP_CONCAT(g.genre_name ORDER BY g.genre_name SEPARATOR ', ')
+        FROM MOVIE_GENRES mg JOIN GENRES g ON mg.genre_id = g.genre_id
+        WHERE mg.movie_id = m.movie_id) AS genres,
+       CASE
+           WHEN m.release_date IS NULL THEN 'Not Scheduled'
+           WHEN m.release_date > CURDATE() THEN 'Upcoming'
+           WHEN m.release_date = CURDATE() THEN 'Releasing Today'
+           WHEN bo.box_id IS NULL THEN 'Released (Collection Pending)'
+           ELSE 'Released'
+       END AS movie_status,
+       m.created_at, m.updated_at,
+       (SELECT JSON_ARRAYAGG(JSON_OBJECT(
+                   'actor_id', a.actor_id, 'name', a.name, 'gender', a.gender,
+                   'popularity_score', a.popularity_score, 'role_name', mc.role_name,
+                   'role_type', mc.role_type, 'screen_time_minutes', mc.screen_time_minutes))
+        FROM MOVIE_CAST mc JOIN ACTORS a ON mc.actor_id = a.actor_id
+        WHERE mc.movie_id = m.movie_id) AS cast_json,
+       (SELECT JSON_ARRAYAGG(JSON_OBJECT(
+                   'crew_id', pc.crew_id, 'name', pc.name, 'role', pc.role,
+                   'specialty', pc.specialty, 'experience_years', pc.experience_years,
+                   'role_description', mc.role_description))
+        FROM MOVIE_CREW mc JOIN PRODUCTION_CREW pc ON mc.crew_id = pc.crew_id
+        WHERE mc.movie_id = m.movie_id) AS crew_json
+FROM MOVIES m
+LEFT JOIN LANGUAGES l ON m.language_id = l.language_id
+LEFT JOIN PRODUCERS p ON m.producer_id = p.producer_id
+LEFT JOIN BOX_OFFICE bo ON m.movie_id = bo.movie_id
+WHERE m.movie_id IN ({ids})
+"""
+
+BOX_OFFICE_SQL = """
+SELECT bo.box_id, bo.movie_id, bo.domestic_collection, bo.intl_collection,
+       bo.opening_weekend, bo.total_collection, bo.profit_margin,
+       bo.release_screens, bo.collection_status, bo.updated_by,
+       bo.created_at, bo.updated_at
+FROM BOX_OFFICE bo
+WHERE bo.movie_id IN ({ids})
+"""
+
+
+def parse_ids(raw, limit=MAX_BATCH_IDS):
+    """Parse a comma-separated id list, dropping duplicates but keeping order"""
+    ids = []
+    for part in (raw or "").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if not part.isdigit() or int(part) <= 0:
+            raise ValueError(f"Invalid id: {part}")
+        if int(part) not in ids:
+            ids.append(int(part))
+    if not ids:
+        raise ValueError("No ids given")
+    if len(ids) > limit:
+        raise ValueError(f"At most {limit} ids per request")
+    return ids
+
+
+def _in(sql, ids):
+    return sql.format(ids=", ".join(["%s"] * len(ids))), tuple(ids)
+
+
+def _keyed(rows, key):
+    return {row[key]: row for row in rows}
+
+
+def _json_list(value):
+    # JSON columns arrive as str (pure Python) or bytes (C extension)
+    return json.loads(value) if value else []
+
+
+def _details(row):
+    cast = _json_list(row.pop("cast_json"))
+    crew = _json_list(row.pop("crew_json"))
+    return {"movie": row, "cast": cast, "crew": crew}
+
+
+async def get_movies(ids):
+    """Movie rows for `ids`, keyed by movie_id"""
+    rows = await execute_query(*_in(MOVIES_SQL, ids))
+    return _keyed(rows, "movie_id")
+
+
+async def get_movie_details(ids):
+    """Movie, cast and crew for `ids` keyed by movie_id, in one query"""
+    rows = await execute_query(*_in(MOVIE_DETAILS_SQL, ids))
+    return {row["movie_id"]: _details(row) for row in rows}
+
+
+async def get_box_office(movie_ids):
+    """Box office rows for `movie_ids`, keyed by movie_id"""
+    rows = await execute_query(*_in(BOX_OFFICE_SQL, movie_ids))
+    return _keyed(rows, "movie_id")
+
+
+def batch_response(ids, found):
+    """``{"items": {id: ...}, "missing": [...]}`` in request order"""
+    return {
+        "items": {str(i): found[i] for i in ids if i in found},
+        "missing": [i for i in ids if i not in found],
+    }
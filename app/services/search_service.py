@@ -0,0 +1,322 @@
+"""
+Search service
+
+Two pieces:
+
+* ``fulltext_condition`` turns a user's filter term into a boolean-mode
+  ``MATCH ... AGAINST`` prefix query so the name/title filters on the list
+  endpoints use the FULLTEXT indexes instead of a ``LIKE '%term%'`` scan.
+
+* ``SearchIndex`` is an in-process inverted index over movie titles/plots,
+  actor and crew names and producer names/companies that backs
+  ``/api/search``. It ranks with TF-IDF and field weights, matches prefixes,
+  and folds common romanisation variants of Indian-language titles
+  ("Baahubali"/"Bahubali", "Dhoom"/"Dhum") onto the same phonetic key.
+  Writes mark entities dirty and they are reloaded just before the next
+  search; the whole index is rebuilt after SEARCH_INDEX_TTL seconds to
+  pick up changes made outside this process.
+"""
+import bisect
+import math
+import re
+import threading
+import time
+import unicodedata
+from collections import defaultdict
+from config import get_settings
+from database import connection
+import logging
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# InnoDB ignores words shorter than innodb_ft_min_token_size (default 3)
+FT_MIN_TOKEN_SIZE = 3
+
+# InnoDB's default stopword list; a required (+) stopword matches nothing
+FT_STOPWORDS = {
+    "a", "about", "an", "are", "as", "at", "be", "by", "com", "de", "en",
+    "for", "from", "how", "i", "in", "is", "it", "la", "of", "on", "or",
+    "that", "the", "this", "to", "was", "what", "when", "where", "who",
+    "will", "with", "und", "www",
+}
+
+_BOOLEAN_OPERATORS = re.compile(r'[+\-><()~*"@]+')
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def fulltext_condition(columns, term):
+    """WHERE fragment for a prefix full-text match of `term` on `columns`.
+
+    `columns` must be exactly the column list of a FULLTEXT index. Terms
+    made only of words too short for the index fall back to a prefix LIKE,
+    which can still use the ordinary B-tree index on the first column.
+    """
+    words = [w for w in _BOOLEAN_OPERATORS.sub(" ", term).split()
+             if len(w) >= FT_MIN_TOKEN_SIZE and w.lower() not in FT_STOPWORDS]
+    if not words:
+        return f"{columns[0]} LIKE %s", [f"{term.strip()}%"]
+    against = " ".join(f"+{w}*" for w in words)
+    return f"MATCH({', '.join(columns)}) AGAINST (%s IN BOOLEAN MODE)", [against]
+
+
+# Ordered rewrite rules folding common romanisation variants together
+_PHONETIC_RULES = [
+    (re.compile(r"ee"), "i"),
+    (re.compile(r"oo|ou"), "u"),
+    (re.compile(r"ie$"), "i"),
+    (re.compile(r"y$"), "i"),
+    (re.compile(r"ph"), "f"),
+    (re.compile(r"w"), "v"),
+    (re.compile(r"z"), "j"),
+    (re.compile(r"q|ck"), "k"),
+    (re.compile(r"x"), "ks"),
+    (re.compile(r"([kgcjtdpbs])h"), r"\1"),
+    (re.compile(r"(.)\1+"), r"\1"),
+]
+
+
+def normalize(text):
+    """Case-fold and strip diacritics, returning the list of word tokens"""
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return _TOKEN.findall(stripped)
+
+
+def phonetic_key(token):
+    """Collapse transliteration variants of a (Latin-script) token"""
+    if not token.isascii():
+        return token
+    for pattern, replacement in _PHONETIC_RULES:
+        token = pattern.sub(replacement, token)
+    return token
+
+
+# kind -> (SQL, id column, label column, {column: field weight})
+ENTITY_SOURCES = {
+    "movie": ("SELECT movie_id, title, plot_summary FROM MOVIES",
+              "movie_id", "title", {"title": 3.0, "plot_summary": 1.0}),
+    "actor": ("SELECT actor_id, name FROM ACTORS",
+              "actor_id", "name", {"name": 3.0}),
+    "crew": ("SELECT crew_id, name, role FROM PRODUCTION_CREW",
+             "crew_id", "name", {"name": 3.0}),
+    "producer": ("SELECT producer_id, name, company FROM PRODUCERS",
+                 "producer_id", "name", {"name": 3.0, "company": 1.0}),
+}
+
+EXACT_WEIGHT = 1.0
+PHONETIC_WEIGHT = 0.8
+PREFIX_WEIGHT = 0.6
+
+
+class SearchIndex:
+    """Thread-safe in-memory inverted index with incremental updates"""
+
+    def __init__(self, ttl=300):
+        self.ttl = ttl
+        self._lock = threading.RLock()
+        self._docs = {}                       # (kind, id) -> (label, {term: weight})
+        self._postings = defaultdict(dict)    # term -> {(kind, id): weight}
+        self._phonetic = defaultdict(set)     # phonetic key -> {term}
+        self._sorted_terms = []
+        self._terms_dirty = False
+        self._dirty = defaultdict(set)        # kind -> {id}
+        self._built_at = None
+        self._rebuilding = False
+        self._rebuilt = threading.Condition(self._lock)
+
+    # ---- maintenance -------------------------------------------------
+
+    def _add(self, kind, doc_id, row):
+        _, id_column, label_column, fields = ENTITY_SOURCES[kind]
+        weights = defaultdict(float)
+        for column, field_weight in fields.items():
+            for token in normalize(row.get(column) or ""):
+                weights[token] += field_weight
+        key = (kind, doc_id)
+        self._docs[key] = (row.get(label_column), dict(weights))
+        for term, weight in weights.items():
+            if term not in self._postings:
+                self._terms_dirty = True
+            self._postings[term][key] = weight
+            self._phonetic[phonetic_key(term)].add(term)
+
+    def _remove(self, kind, doc_id):
+        key = (kind, doc_id)
+        doc = self._docs.pop(key, None)
+        if doc is None:
+            return
+        for term in doc[1]:
+            postings = self._postings.get(term)
+            if postings is None:
+                continue
+            postings.pop(key, None)
+            if not postings:
+                del self._postings[term]
+                self._phonetic[phonetic_key(term)].discard(term)
+                self._terms_dirty = True
+
+    def rebuild(self):
+        """Reload every searchable entity from the database.
+
+        The queries and the new postings run without the lock; only the
+        swap takes it, so searches keep answering from the old index.
+        """
+        start = time.perf_counter()
+        with self._lock:
+            pending, self._dirty = self._dirty, defaultdict(set)
+        try:
+            loaded = {kind: connection.execute_query(sql)
+                      for kind, (sql, _, _, _) in ENTITY_SOURCES.items()}
+        except Exception:
+            self._restore_dirty(pending)
+            raise
+        fresh = SearchIndex(self.ttl)
+        for kind, rows in loaded.items():
+            id_column = ENTITY_SOURCES[kind][1]
+            for row in rows:
+                fresh._add(kind, row[id_column], row)
+        with self._lock:
+            self._docs = fresh._docs
+            self._postings = fresh._postings
+            self._phonetic = fresh._phonetic
+            self._terms_dirty = True
+            self._built_at = time.monotonic()
+        logger.info(f"Search index rebuilt: {len(fresh._docs)} documents "
+                    f"in {time.perf_counter() - start:.2f}s")
+
+    def mark_dirty(self, kind, doc_id):
+        """Schedule an entity to be reloaded before the next search"""
+        if doc_id is None:
+            return
+        with self._lock:
+            self._dirty[kind].add(doc_id)
+
+    def expire(self):
+        """Force a full rebuild before the next search (after bulk loads)"""
+        with self._lock:
+            self._built_at = None
+
+    def _restore_dirty(self, pending):
+        """Put back ids whose reload failed so the next search retries them"""
+        with self._lock:
+            for kind, ids in pending.items():
+                self._dirty[kind].update(ids)
+
+    def _apply_dirty(self):
+        with self._lock:
+            pending = {kind: ids for kind, ids in self._dirty.items() if ids}
+            self._dirty.clear()
+        for kind in list(pending):
+            ids = pending[kind]
+            sql, id_column, _, _ = ENTITY_SOURCES[kind]
+            placeholders = ", ".join(["%s"] * len(ids))
+            try:
+                rows = connection.execute_query(
+                    f"{sql} WHERE {id_column} IN ({placeholders})", tuple(ids))
+            except Exception:
+                self._restore_dirty(pending)
+                raise
+            del pending[kind]
+            with self._lock:
+                for doc_id in ids:
+                    self._remove(kind, doc_id)
+                for row in rows:
+                    self._add(kind, row[id_column], row)
+
+    def ensure_fresh(self):
+        """Rebuild if stale, otherwise apply pending incremental updates.
+
+        Only one caller rebuilds at a time; the others carry on with the
+        current index, or wait for the first build if there is none yet.
+        """
+        with self._rebuilt:
+            stale = self._built_at is None or time.monotonic() - self._built_at > self.ttl
+            if self._rebuilding:
+                # Leave dirty ids alone: the swap would discard them
+                self._rebuilt.wait_for(lambda: not self._rebuilding or self._docs)
+                return
+            if stale:
+                self._rebuilding = True
+        if stale:
+            try:
+                self.rebuild()
+            finally:
+                with self._rebuilt:
+                    self._rebuilding = False
+                    self._rebuilt.notify_all()
+            return
+        self._apply_dirty()
+
+    # ---- querying ----------------------------------------------------
+
+    def _terms_with_prefix(self, prefix):
+        if self._terms_dirty:
+            self._sorted_terms = sorted(self._postings)
+            self._terms_dirty = False
+        start = bisect.bisect_left(self._sorted_terms, prefix)
+        for term in self._sorted_terms[start:]:
+            if not term.startswith(prefix):
+                break
+            yield term
+
+    def _idf(self, term):
+        return math.log(1 + len(self._docs) / (1 + len(self._postings.get(term, ()))))
+
+    def _match_token(self, token, prefix):
+        """Best score per document for one query token"""
+        candidates = {token: EXACT_WEIGHT}
+        for term in self._phonetic.get(phonetic_key(token), ()):
+            candidates.setdefault(term, PHONETIC_WEIGHT)
+        if prefix and len(token) >= 2:
+            for term in self._terms_with_prefix(token):
+                candidates.setdefault(term, PREFIX_WEIGHT)
+
+        scores = {}
+        for term, match_weight in candidates.items():
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = self._idf(term)
+            for key, field_weight in postings.items():
+                score = match_weight * idf * field_weight
+                if score > scores.get(key, 0.0):
+                    scores[key] = score
+        return scores
+
+    def search(self, text, kinds=None, limit=20, prefix=True):
+        """Rank documents matching every token of `text`"""
+        tokens = normalize(text)
+        if not tokens:
+            return []
+        with self._lock:
+            combined = None
+            for token in tokens:
+                scores = self._match_token(token, prefix)
+                if kinds:
+                    scores = {k: v for k, v in scores.items() if k[0] in kinds}
+                if combined is None:
+                    combined = scores
+                else:
+                    combined = {k: combined[k] + v for k, v in scores.items() if k in combined}
+                if not combined:
+                    return []
+
+            ranked = sorted(combined.items(), key=lambda item: item[1], reverse=True)[:limit]
+            return [
+                {"type": kind, "id": doc_id, "label": self._docs[(kind, doc_id)][0],
+                 "score": round(score, 4)}
+                for (kind, doc_id), score in ranked
+            ]
+
+    def stats(self):
+        with self._lock:
+            return {
+                "documents": len(self._docs),
+                "terms": len(self._postings),
+                "pending_updates": sum(len(ids) for ids in self._dirty.values()),
+                "age_s": round(time.monotonic() - self._built_at, 1) if self._built_at else None,
+            }
+
+
+search_index = SearchIndex(ttl=settings.SEARCH_INDEX_TTL)
@@ -0,0 +1,76 @@
+"""
+Box office time series
+
+Daily trade figures live in BOX_OFFICE_DAILY, clustered by (movie_id, day).
+A movie's history is one contiguous primary-key range, so day/week/month
+rollups and the running total are computed by a single range scan: the
+inner query groups the days into periods and a window function accumulates
+the totals; periods before the requested window are only summed into the
+running total. Weeks start on Friday, the usual release day.
+"""
+from datetime import date, timedelta
+from database.async_connection import execute_query
+
+GRANULARITIES = {
+    "day": "day",
+    "week": "DATE_SUB(day, INTERVAL MOD(WEEKDAY(day) + 3, 7) DAY)",
+    "month": "DATE_SUB(day, INTERVAL DAYOFMONTH(day) - 1 DAY)",
+}
+
+MAX_POINTS = 5000
+
+UPSERT_SQL = """
+INSERT INTO BOX_OFFICE_DAILY (movie_id, day, domestic, intl, screens)
+VALUES (%s, %s, %s, %s, %s)
+ON DUPLICATE KEY UPDATE domestic = VALUES(domestic), intl = VALUES(intl),
+                        screens = VALUES(screens)
+"""
+
+TIMESERIES_SQL = """
+SELECT period_start, domestic, intl, total, screens, days, running_total
+FROM (
+    SELECT {bucket} AS period_start,
+           SUM(domestic) AS domestic,
+           SUM(intl) AS intl,
+           SUM(domestic + intl) AS total,
+           MAX(screens) AS screens,
+           COUNT(*) AS days,
+           SUM(SUM(domestic + intl)) OVER (ORDER BY {bucket}) AS running_total
+    FROM BOX_OFFICE_DAILY
+    WHERE movie_id = %s AND day < %s
+    GROUP BY {bucket}
+) periods
+WHERE period_start >= %s
+ORDER BY period_start
+"""
+
+
+def period_start(day, granularity):
+    """First day of the period containing `day` (mirrors GRANULARITIES)"""
+    if granularity == "week":
+        return day - timedelta(days=(day.weekday() + 3) % 7)
+    if granularity == "month":
+        return day.replace(day=1)
+    return day
+
+
+def next_period(start, granularity):
+    if granularity == "week":
+        return start + timedelta(days=7)
+    if granularity == "month":
+        return (start.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return start + timedelta(days=1)
+
+
+async def get_timeseries(movie_id, granularity="day", since=None, until=None):
+    """Periods overlapping [since, until), in full, oldest first.
+
+    Each point has the period's domestic/intl/total collections, peak
+    screens, the number of reported days and the running total since the
+    first reported day.
+    """
+    first = period_start(since, granularity) if since else date.min
+    end = next_period(period_start(until - timedelta(days=1), granularity), granularity) \
+        if until else date.max
+    return await execute_query(
+        TIMESERIES_SQL.format(bucket=GRANULARITIES[granularity]), (movie_id, end, first))
@@ -0,0 +1,173 @@
+"""
+In-process read-through cache
+
+Reference data (languages, genres, producers) and single-movie lookups are
+read far more often than they change. GET handlers opt in with ``@cached``;
+entries expire after a TTL and the least recently used ones are evicted
+once CACHE_MAX_ENTRIES is reached. Write handlers call ``invalidate`` for
+the namespaces/entities they touch, so a worker never serves its own stale
+writes; other uvicorn workers converge within the TTL. A load that an
+invalidation overtakes (read before a write commits, stored after) is
+returned but not cached.
+"""
+import functools
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from config import get_settings
+
+settings = get_settings()
+
+
+class TTLCache:
+    """Thread-safe TTL + LRU cache with namespace/entity invalidation"""
+
+    def __init__(self, max_entries=2048, ttl=300):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()            # key -> (expires_at, value)
+        self._tags = defaultdict(set)            # (namespace, entity) -> {key}
+        self._counters = defaultdict(lambda: defaultdict(int))  # namespace -> counter -> n
+        self._loads = {}                         # load id -> tag, for loads in flight
+        self._next_load = 0
+
+    # Keys are (namespace, entity, args); entity may be None
+    def _tag(self, key):
+        return key[0], key[1]
+
+    def _drop(self, key):
+        self._entries.pop(key, None)
+        tag = self._tag(key)
+        keys = self._tags.get(tag)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._tags[tag]
+
+    def get(self, key):
+        """Return (hit, value)"""
+        namespace = key[0]
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._counters[namespace]["misses"] += 1
+                return False, None
+            if entry[0] <= time.monotonic():
+                self._drop(key)
+                self._counters[namespace]["expirations"] += 1
+                self._counters[namespace]["misses"] += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self._counters[namespace]["hits"] += 1
+            return True, entry[1]
+
+    def begin_load(self, key):
+        """Register a load of `key`; pass the returned id to ``set`` or ``end_load``"""
+        with self._lock:
+            self._next_load += 1
+            self._loads[self._next_load] = self._tag(key)
+            return self._next_load
+
+    def end_load(self, load):
+        with self._lock:
+            self._loads.pop(load, None)
+
+    def set(self, key, value, ttl=None, load=None):
+        """Store `value`; skipped if `load` was invalidated since ``begin_load``"""
+        with self._lock:
+            if load is not None and self._loads.pop(load, None) is None:
+                self._counters[key[0]]["stale_loads"] += 1
+                return
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (time.monotonic() + (ttl or self.ttl), value)
+            self._tags[self._tag(key)].add(key)
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self._counters[oldest[0]]["evictions"] += 1
+
+    def invalidate(self, namespace, entity=None):
+        """Drop one entity's entries, or the whole namespace if `entity` is None"""
+        with self._lock:
+            if entity is None:
+                tags = [tag for tag in self._tags if tag[0] == namespace]
+            else:
+                tags = [(namespace, entity)]
+            dropped = 0
+            for tag in tags:
+                for key in list(self._tags.get(tag, ())):
+                    self._drop(key)
+                    dropped += 1
+            self._counters[namespace]["invalidations"] += dropped
+            # Loads that read before this write must not store what they read
+            for load, tag in list(self._loads.items()):
+                if tag[0] == namespace and (entity is None or tag[1] == entity):
+                    del self._loads[load]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+            self._loads.clear()
+
+    def stats(self):
+        with self._lock:
+            namespaces = {}
+            for namespace, counters in self._counters.items():
+                lookups = counters["hits"] + counters["misses"]
+                namespaces[namespace] = {
+                    "hits": counters["hits"],
+                    "misses": counters["misses"],
+                    "evictions": counters["evictions"],
+                    "expirations": counters["expirations"],
+                    "invalidations": counters["invalidations"],
+                    "stale_loads": counters["stale_loads"],
+                    "hit_ratio": round(counters["hits"] / lookups, 3) if lookups else None,
+                }
+            return {
+                "enabled": settings.CACHE_ENABLED,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl": self.ttl,
+                "namespaces": namespaces,
+            }
+
+
+response_cache = TTLCache(max_entries=settings.CACHE_MAX_ENTRIES, ttl=settings.CACHE_TTL)
+
+
+def cached(namespace, key=None, ttl=None):
+    """Opt a GET handler into the read-through cache.
+
+    `key` names the path parameter identifying the entity so writes can
+    invalidate just that entity; the remaining arguments (query params)
+    become part of the cache key. Exceptions such as 404s are not cached.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            if not settings.CACHE_ENABLED:
+                return await func(*args, **kwargs)
+            cache_key = (namespace, kwargs.get(key) if key else None,
+                         tuple(sorted(kwargs.items())))
+            hit, value = response_cache.get(cache_key)
+            if hit:
+                return value
+            load = response_cache.begin_load(cache_key)
+            try:
+                value = await func(*args, **kwargs)
+            except BaseException:
+                response_cache.end_load(load)
+                raise
+            response_cache.set(cache_key, value, ttl=ttl, load=load)
+            return value
+        return wrapper
+    return decorator
+
+
+def invalidate(*namespaces, entity=None):
+    """Invalidate `entity` (or everything) in each of `namespaces`"""
+    for namespace in namespaces:
+        response_cache.invalidate(namespace, entity)
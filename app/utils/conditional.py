@@ -0,0 +1,130 @@
+"""
+HTTP conditional requests (ETag / Last-Modified / 304)
+
+``@conditional`` adds validators to a GET handler and answers
+``If-None-Match`` / ``If-Modified-Since`` with 304 Not Modified.
+
+* Single-entity handlers derive the validators from the ``updated_at`` of
+  the row they return (usually a read-through cache hit), so a 304 skips
+  serialization and the payload.
+* List handlers pass ``version_query``: the table's ``MAX(updated_at)``
+  (microsecond precision, read from the end of an index) and its last
+  delete from ``TABLE_DELETIONS``. Both are single index lookups and run
+  *before* the handler, so a 304 skips the full query as well. The ETag
+  also covers the query string, so each page/filter has its own validator.
+
+MySQL TIMESTAMPs come back as naive datetimes in the session time zone;
+they are labelled GMT as-is, which is consistent for round-tripping our
+own Last-Modified values.
+"""
+import functools
+import hashlib
+import inspect
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from fastapi import Request, Response
+from database.async_connection import execute_query
+
+
+def make_etag(*parts):
+    digest = hashlib.sha1(repr(parts).encode()).hexdigest()[:20]
+    return f'W/"{digest}"'
+
+
+def _http_date(value):
+    if not isinstance(value, datetime):
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc).replace(microsecond=0), usegmt=True)
+
+
+def is_not_modified(request, etag, last_modified):
+    """Evaluate the request preconditions (If-None-Match wins, RFC 7232)"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return etag.removeprefix("W/") in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        return parsedate_to_datetime(last_modified) <= since
+    return False
+
+
+def _validator_headers(etag, last_modified):
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if last_modified:
+        headers["Last-Modified"] = last_modified
+    return headers
+
+
+def conditional(version_query=None):
+    """Make a GET handler honour conditional requests.
+
+    `version_query(**kwargs)` returns ``(sql, params)`` selecting
+    ``last_modified`` and ``last_deleted``; without it the validators come
+    from the ``updated_at`` of the returned row.
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+        wants_request = "request" in signature.parameters
+        wants_response = "response" in signature.parameters
+        extra = []
+        if not wants_request:
+            extra.append(inspect.Parameter("request", inspect.Parameter.KEYWORD_ONLY, annotation=Request))
+        if not wants_response:
+            extra.append(inspect.Parameter("response", inspect.Parameter.KEYWORD_ONLY, annotation=Response))
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            request = kwargs["request"] if wants_request else kwargs.pop("request")
+            response = kwargs["response"] if wants_response else kwargs.pop("response")
+            params = {k: v for k, v in kwargs.items() if k not in ("request", "response")}
+
+            if version_query is not None:
+                sql, sql_params = version_query(**params)
+                rows = await execute_query(sql, sql_params)
+                version = rows[0] if rows else {}
+                changed = [value for value in (version.get("last_modified"), version.get("last_deleted"))
+                           if value is not None]
+                last_modified = _http_date(max(changed)) if changed else None
+                etag = make_etag(request.url.path, str(request.url.query),
+                                 version.get("last_modified"), version.get("last_deleted"))
+                headers = _validator_headers(etag, last_modified)
+                if is_not_modified(request, etag, last_modified):
+                    return Response(status_code=304, headers=headers)
+                result = await func(*args, **kwargs)
+                response.headers.update(headers)
+                return result
+
+            result = await func(*args, **kwargs)
+            updated_at = result.get("updated_at") if isinstance(result, dict) else None
+            if updated_at is None:
+                return result
+            last_modified = _http_date(updated_at)
+            etag = make_etag(request.url.path, updated_at)
+            headers = _validator_headers(etag, last_modified)
+            if is_not_modified(request, etag, last_modified):
+                return Response(status_code=304, headers=headers)
+            response.headers.update(headers)
+            return result
+
+        wrapper.__signature__ = signature.replace(
+            parameters=list(signature.parameters.values()) + extra)
+        return wrapper
+    return decorator
+
+
+def table_version(table):
+    """``version_query`` for list endpoints over `table` (needs an updated_at
+    index and the tr_*_deleted trigger stamping TABLE_DELETIONS)"""
+    sql = (f"SELECT (SELECT MAX(updated_at) FROM {table}) AS last_modified, "
+           f"(SELECT deleted_at FROM TABLE_DELETIONS WHERE table_name = %s) AS last_deleted")
+    return lambda **_: (sql, (table,))
@@ -0,0 +1,60 @@
+"""
+Opt-in request diagnostics
+
+With DIAGNOSTICS_ENABLED, a request is diagnosed (profiled, with plans of
+its slow statements captured; see ``database.diagnostics``) when it sends
+an ``X-Diagnose`` header or is picked by DIAGNOSTICS_SAMPLE_RATE. If
+DIAGNOSTICS_TOKEN is set, the header must carry it; otherwise any
+non-empty value other than "0" turns diagnosis on. The response names the
+stored diagnosis in ``X-Diagnosis-Id``.
+"""
+import hmac
+import random
+from fastapi import Header, HTTPException
+from config import get_settings
+from database.diagnostics import current_diagnosis, diagnostics
+from .metrics import route_template
+
+settings = get_settings()
+
+DIAGNOSE_HEADER = "X-Diagnose"
+DIAGNOSIS_ID_HEADER = "X-Diagnosis-Id"
+
+
+def authorized(value):
+    """Whether an X-Diagnose header value may turn on diagnostics"""
+    if not settings.DIAGNOSTICS_ENABLED or not value:
+        return False
+    if settings.DIAGNOSTICS_TOKEN:
+        return hmac.compare_digest(value.encode(), settings.DIAGNOSTICS_TOKEN.encode())
+    return value != "0"
+
+
+def require_diagnostics_access(x_diagnose: str = Header(None)):
+    """Dependency guarding the diagnostics admin routes"""
+    if not settings.DIAGNOSTICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Diagnostics are disabled")
+    if settings.DIAGNOSTICS_TOKEN and not authorized(x_diagnose):
+        raise HTTPException(status_code=403, detail=f"Missing or invalid {DIAGNOSE_HEADER} token")
+
+
+async def diagnostics_middleware(request, call_next):
+    """Profile flagged requests and capture plans of their slow statements"""
+    if not settings.DIAGNOSTICS_ENABLED or request.url.path.startswith("/api/admin/diagnostics"):
+        return await call_next(request)
+    flagged = authorized(request.headers.get(DIAGNOSE_HEADER))
+    if not flagged and not (settings.DIAGNOSTICS_SAMPLE_RATE
+                            and random.random() < settings.DIAGNOSTICS_SAMPLE_RATE):
+        return await call_next(request)
+
+    diagnosis = diagnostics.begin(request.method, route_template(request), request.url.path)
+    token = current_diagnosis.set(diagnosis)
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        response.headers[DIAGNOSIS_ID_HEADER] = str(diagnosis.id)
+        return response
+    finally:
+        diagnostics.end(diagnosis, status)
+        current_diagnosis.reset(token)
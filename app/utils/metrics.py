@@ -0,0 +1,154 @@
+"""
+Request timing and Prometheus exposition
+
+``timing_middleware`` times every request under its route template (so
+/api/movies/1 and /api/movies/2 share one series) and records status
+codes and in-flight requests. It also publishes the template in
+``database.metrics.current_route`` so slow statements can be traced back to
+the endpoint that issued them. ``render_prometheus`` writes these series,
+the per-statement query series and the connection-pool counters in the
+Prometheus text format served on /metrics.
+"""
+import threading
+import time
+from collections import defaultdict
+from starlette.routing import Match
+from config import get_settings
+from database.connection import get_pool_stats
+from database.metrics import Histogram, current_route, query_metrics
+
+settings = get_settings()
+
+UNMATCHED_ROUTE = "unmatched"
+# Keep label values readable in Prometheus UIs; the fingerprint keeps them unique
+STATEMENT_LABEL_MAX = 200
+
+
+class RequestMetrics:
+    """Thread-safe per-route latency and status counters"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._latency = defaultdict(Histogram)   # (method, route) -> Histogram
+        self._responses = defaultdict(int)       # (method, route, status) -> count
+        self.in_progress = 0
+
+    def start(self):
+        with self._lock:
+            self.in_progress += 1
+
+    def finish(self, method, route, status, elapsed):
+        with self._lock:
+            self.in_progress -= 1
+            self._latency[(method, route)].observe(elapsed)
+            self._responses[(method, route, status)] += 1
+
+    def snapshot(self):
+        with self._lock:
+            latency = {key: (histogram.cumulative(), histogram.sum, histogram.count)
+                       for key, histogram in self._latency.items()}
+            return latency, dict(self._responses), self.in_progress
+
+
+request_metrics = RequestMetrics()
+
+
+def route_template(request):
+    """Path template of the route that will serve `request`"""
+    for route in request.app.router.routes:
+        match, _ = route.matches(request.scope)
+        if match == Match.FULL:
+            return route.path
+    return UNMATCHED_ROUTE
+
+
+async def timing_middleware(request, call_next):
+    """Record latency and status per route template"""
+    if not settings.METRICS_ENABLED:
+        return await call_next(request)
+    route = route_template(request)
+    token = current_route.set(f"{request.method} {route}")
+    request_metrics.start()
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        request_metrics.finish(request.method, route, status, time.perf_counter() - start)
+        current_route.reset(token)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(**labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def _bound(value):
+    return "+Inf" if value == float("inf") else repr(float(value))
+
+
+def _histogram(lines, name, labels, cumulative, total, count):
+    for bound, running in cumulative:
+        lines.append(f"{name}_bucket{_labels(**labels, le=_bound(bound))} {running}")
+    lines.append(f"{name}_sum{_labels(**labels)} {total}")
+    lines.append(f"{name}_count{_labels(**labels)} {count}")
+
+
+def _header(lines, name, kind, text):
+    lines.append(f"# HELP {name} {text}")
+    lines.append(f"# TYPE {name} {kind}")
+
+
+def render_prometheus():
+    """Every request, query and pool series in the Prometheus text format"""
+    lines = []
+    latency, responses, in_progress = request_metrics.snapshot()
+
+    _header(lines, "http_requests_in_progress", "gauge", "Requests being served")
+    lines.append(f"http_requests_in_progress {in_progress}")
+    _header(lines, "http_request_duration_seconds", "histogram", "Request latency by route template")
+    for (method, route), (cumulative, total, count) in sorted(latency.items()):
+        _histogram(lines, "http_request_duration_seconds", {"method": method, "route": route},
+                   cumulative, total, count)
+    _header(lines, "http_requests_total", "counter", "Responses by route template and status code")
+    for (method, route, status), count in sorted(responses.items()):
+        lines.append(f"http_requests_total{_labels(method=method, route=route, status=status)} {count}")
+
+    series = query_metrics.snapshot()
+    _header(lines, "db_query_duration_seconds", "histogram", "Statement latency by normalized SQL")
+    for statement, values in series.items():
+        histogram = values["histogram"]
+        _histogram(lines, "db_query_duration_seconds",
+                   {"statement": statement[:STATEMENT_LABEL_MAX], "fingerprint": values["fingerprint"]},
+                   histogram.cumulative(), histogram.sum, histogram.count)
+    for name, key, text in (("db_query_rows_total", "rows", "Rows returned or affected by normalized SQL"),
+                            ("db_query_errors_total", "errors", "Failed executions by normalized SQL")):
+        _header(lines, name, "counter", text)
+        for statement, values in series.items():
+            labels = _labels(statement=statement[:STATEMENT_LABEL_MAX], fingerprint=values["fingerprint"])
+            lines.append(f"{name}{labels} {values[key]}")
+
+    pool = get_pool_stats()
+    _header(lines, "db_pool_connections", "gauge", "Pooled connections by state")
+    for state in ("in_use", "idle", "total"):
+        lines.append(f"db_pool_connections{_labels(state=state)} {pool[state]}")
+    _header(lines, "db_pool_waiting", "gauge", "Threads waiting for a connection")
+    lines.append(f"db_pool_waiting {pool['waiting']}")
+    for name, key, text in (("db_pool_timeouts_total", "timeouts", "Checkouts that timed out"),
+                            ("db_pool_created_total", "created", "Connections opened"),
+                            ("db_pool_closed_total", "closed", "Connections closed")):
+        _header(lines, name, "counter", text)
+        lines.append(f"{name} {pool[key]}")
+    _header(lines, "db_pool_acquire_seconds", "histogram", "Time to check out a pooled connection")
+    _histogram(lines, "db_pool_acquire_seconds", {},
+               [(float("inf") if b["le_ms"] == "+Inf" else b["le_ms"] / 1000, b["count"])
+                for b in pool["acquire_histogram"]],
+               pool["acquire_total_ms"] / 1000, pool["acquire_count"])
+    return "\n".join(lines) + "\n"
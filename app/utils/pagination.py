@@ -0,0 +1,77 @@
+"""
+Keyset (cursor) pagination helpers
+
+List endpoints order by a sort key plus the primary key as a tie-breaker.
+Instead of LIMIT/OFFSET, a client passes back the opaque cursor from the
+previous page and the query seeks straight to the next row through the
+matching composite index, so deep pages cost the same as the first one.
+The cursor for the next page is returned in the X-Next-Cursor header,
+leaving the response bodies unchanged for existing clients.
+"""
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from fastapi import HTTPException
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def _to_json(value):
+    if isinstance(value, datetime):
+        return value.isoformat(sep=" ")
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def encode_cursor(values):
+    """Encode the sort-key values of the last row into an opaque token"""
+    raw = json.dumps([_to_json(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor, size):
+    """Decode a cursor token, raising 400 if it is malformed"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+
+def keyset_condition(columns, cursor):
+    """Build the WHERE fragment that seeks past the cursor (descending order).
+
+    For columns (a, b) this is ``a < %s OR (a = %s AND b < %s)``, which MySQL
+    can answer with a range scan on a composite (a, b) index.
+    """
+    values = decode_cursor(cursor, len(columns))
+    clauses = []
+    params = []
+    for i, column in enumerate(columns):
+        parts = [f"{prev} = %s" for prev in columns[:i]] + [f"{column} < %s"]
+        clauses.append("(" + " AND ".join(parts) + ")")
+        params.extend(values[:i] + [values[i]])
+    return "(" + " OR ".join(clauses) + ")", params
+
+
+def paginate(rows, limit, response, keys):
+    """Trim the look-ahead row and advertise the cursor for the next page.
+
+    Queries fetch ``limit + 1`` rows; the extra row only tells us that
+    another page exists. A page that would be empty gets no cursor.
+    """
+    limit = max(limit, 0)
+    if len(rows) > limit:
+        rows = rows[:limit]
+        if rows:
+            last = rows[-1]
+            response.headers[NEXT_CURSOR_HEADER] = encode_cursor([last[key] for key in keys])
+    return rows
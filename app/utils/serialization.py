@@ -0,0 +1,16 @@
+"""
+JSON encoding of database rows (exports, audit archives)
+"""
+from datetime import date, datetime
+from decimal import Decimal
+
+
+def json_default(value):
+    """``json.dumps`` default: ISO dates, exact decimals, text bytes"""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (bytes, bytearray)):
+        return value.decode("utf-8", "replace")
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
@@ -0,0 +1,75 @@
+"""
+Database constraint errors -> API error messages
+
+Validation lives in named CHECK / UNIQUE / FOREIGN KEY constraints rather
+than BEFORE INSERT triggers. ``constraint_error`` turns the driver error
+for a violated constraint back into the message (and status code) the
+API has always returned for it.
+"""
+from fastapi import HTTPException
+import mysql.connector
+from mysql.connector import errorcode
+
+# constraint name -> (status, message)
+CONSTRAINT_MESSAGES = {
+    "uq_cast_movie_actor": (409, "Error: This actor is already added to this movie!"),
+    "uq_crew_movie_crew": (409, "Error: This crew member is already added to this movie!"),
+    "uq_box_office_movie": (400, "Box office record already exists for this movie"),
+    "chk_cast_screen_time": (400, "Error: Screen time cannot be negative!"),
+    "chk_cast_role_type": (400, "Error: Invalid role type! Must be Lead, Supporting, or Cameo."),
+    "chk_box_domestic": (400, "Error: Domestic collection cannot be negative!"),
+    "chk_box_intl": (400, "Error: International collection cannot be negative!"),
+    "chk_box_margin": (400, "Error: Profit margin must be between 0 and 100!"),
+    "chk_box_screens": (400, "Error: Release screens must be greater than 0!"),
+    "chk_daily_domestic": (400, "Error: Domestic collection cannot be negative!"),
+    "chk_daily_intl": (400, "Error: International collection cannot be negative!"),
+    "chk_daily_screens": (400, "Error: Screens must be greater than 0!"),
+    "chk_actor_popularity": (400, "Error: Popularity score must be between 0 and 10!"),
+    "chk_actor_name": (400, "Error: Actor name cannot be empty!"),
+    "chk_crew_experience": (400, "Error: Experience years cannot be negative!"),
+    "chk_crew_name": (400, "Error: Crew name cannot be empty!"),
+    "chk_crew_role": (400, "Error: Invalid crew role!"),
+    "chk_movie_title": (400, "Error: Movie title cannot be empty!"),
+    "chk_movie_duration": (400, "Error: Movie duration must be greater than 0!"),
+    "chk_movie_rating": (400, "Error: IMDB rating must be between 0 and 10!"),
+}
+
+# referenced column of a failed foreign key -> (status, message)
+FOREIGN_KEY_MESSAGES = {
+    "movie_id": (404, "Movie not found"),
+    "actor_id": (404, "Actor not found"),
+    "crew_id": (404, "Crew member not found"),
+    "language_id": (400, "Language not found"),
+    "producer_id": (400, "Producer not found"),
+}
+
+
+def constraint_error(err):
+    """Return (status, message) for a constraint violation, else None"""
+    if not isinstance(err, mysql.connector.Error):
+        return None
+    message = err.msg or ""
+    if err.errno in (errorcode.ER_DUP_ENTRY, errorcode.ER_CHECK_CONSTRAINT_VIOLATED):
+        for name, mapped in CONSTRAINT_MESSAGES.items():
+            if name in message:
+                return mapped
+        if err.errno == errorcode.ER_DUP_ENTRY:
+            return 409, message
+        return 400, message
+    if err.errno == errorcode.ER_NO_REFERENCED_ROW_2:
+        for column, mapped in FOREIGN_KEY_MESSAGES.items():
+            if f"FOREIGN KEY (`{column}`)" in message:
+                return mapped
+        return 400, message
+    if err.sqlstate == "45000":
+        # SIGNAL raised by a remaining validation trigger
+        return 400, message
+    return None
+
+
+def http_error(err):
+    """HTTPException for `err`: the mapped constraint message, else a 500"""
+    mapped = constraint_error(err)
+    if mapped:
+        return HTTPException(status_code=mapped[0], detail=mapped[1])
+    return HTTPException(status_code=500, detail=str(err))
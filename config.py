@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings
 from functools import lru_cache
+from typing import Optional
 
 class Settings(BaseSettings):
     DB_HOST: str
@@ -7,6 +8,45 @@ class Settings(BaseSettings):
     DB_USER: str
     DB_PASSWORD: str
     DB_NAME: str
+    DB_POOL_SIZE: int = 5
+    DB_POOL_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 10.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_RESET_SESSION: bool = True
+    DB_EXECUTOR_WORKERS: Optional[int] = None
+    DB_DEDICATED_STREAMS: int = 4
+    SEARCH_INDEX_TTL: int = 300
+    ANALYTICS_SUMMARY_TTL: int = 60
+    ANALYTICS_REFRESH_INTERVAL: int = 30
+    ANALYTICS_SNAPSHOT_TTL: int = 300
+    FORECAST_ALPHA: float = 1.0
+    FORECAST_MODEL_DIR: str = "data/models"
+    FORECAST_MAX_VERSIONS: int = 5
+    FORECAST_MAX_BATCH: int = 10000
+    GRAPH_TTL: int = 600
+    METRICS_ENABLED: bool = True
+    METRICS_MAX_STATEMENTS: int = 500
+    SLOW_QUERY_THRESHOLD_MS: float = 500
+    DIAGNOSTICS_ENABLED: bool = False
+    DIAGNOSTICS_TOKEN: str = ""
+    DIAGNOSTICS_SAMPLE_RATE: float = 0.0
+    DIAGNOSTICS_SAMPLE_INTERVAL_MS: float = 5
+    DIAGNOSTICS_EXPLAIN_THRESHOLD_MS: float = 200
+    DIAGNOSTICS_MAX_EXPLAINS: int = 5
+    DIAGNOSTICS_HISTORY: int = 50
+    CACHE_ENABLED: bool = True
+    CACHE_TTL: int = 300
+    CACHE_MAX_ENTRIES: int = 2048
+    AUDIT_MODE: str = "trigger"
+    AUDIT_BATCH_SIZE: int = 500
+    AUDIT_FLUSH_INTERVAL: float = 1.0
+    AUDIT_SPILL_PATH: str = "data/audit-journal.ndjson"
+    AUDIT_SPILL_FSYNC: bool = False
+    AUDIT_RETENTION_MONTHS: int = 12
+    AUDIT_PARTITION_PREMAKE_MONTHS: int = 3
+    AUDIT_ARCHIVE_DIR: str = "data/audit-archive"
+    AUDIT_MAINTENANCE_INTERVAL: int = 86400
     APP_HOST: str = "0.0.0.0"
     APP_PORT: int = 8000
     DEBUG: bool = False
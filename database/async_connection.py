@@ -0,0 +1,77 @@
+"""
+Async data-access layer
+
+mysql-connector is a blocking driver, so calling it from an ``async def``
+route freezes the event loop for the whole round-trip. These wrappers hand
+each query to a bounded thread pool and await the result instead, letting
+uvicorn keep serving other requests while MySQL works.
+"""
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from config import get_settings
+from database import connection
+from database.diagnostics import current_diagnosis
+import logging
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Never run more queries at once than the pool has connections to give out
+executor = ThreadPoolExecutor(
+    max_workers=settings.DB_EXECUTOR_WORKERS or (settings.DB_POOL_SIZE + settings.DB_POOL_MAX_OVERFLOW),
+    thread_name_prefix="db-worker"
+)
+
+# Units of work and streams keep a connection checked out while they await,
+# and need a worker again for their next statement. Capping them below the
+# pool size leaves a connection for plain queries, so workers blocked in a
+# checkout always get one back and can never all wait on held connections.
+held_connections = asyncio.Semaphore(
+    max(1, settings.DB_POOL_SIZE + settings.DB_POOL_MAX_OVERFLOW - 1))
+# Streams on their own connections (exports) hold them for as long as the
+# client takes to download; cap how many MySQL connections they may add
+dedicated_streams = asyncio.Semaphore(settings.DB_DEDICATED_STREAMS)
+
+async def run_in_executor(func, *args, **kwargs):
+    """Run a blocking database call on the DB thread pool"""
+    loop = asyncio.get_running_loop()
+    # Carry context variables (e.g. the current route for the slow-query log)
+    context = contextvars.copy_context()
+    diagnosis = current_diagnosis.get()
+    if diagnosis is not None:
+        # Let the sampling profiler see this worker thread while it runs for the request
+        return await loop.run_in_executor(executor, partial(context.run, diagnosis.run, func, *args, **kwargs))
+    return await loop.run_in_executor(executor, partial(context.run, func, *args, **kwargs))
+
+async def execute_query(query, params=None, fetch=True):
+    """Execute a query without blocking the event loop"""
+    return await run_in_executor(connection.execute_query, query, params, fetch)
+
+async def call_procedure(proc_name, params=None):
+    """Call a stored procedure without blocking the event loop"""
+    return await run_in_executor(connection.call_procedure, proc_name, params)
+
+async def call_procedure_results(proc_name, params=None):
+    """Call a stored procedure, keeping result sets and OUT arguments"""
+    return await run_in_executor(connection.call_procedure_results, proc_name, params)
+
+async def stream_query(query, params=None, batch_size=1000, dedicated=False):
+    """Async iterator over row batches of a server-side cursor (see
+    connection.stream_query for `dedicated`)"""
+    async with dedicated_streams if dedicated else held_connections:
+        batches = connection.stream_query(query, params, batch_size, dedicated)
+        try:
+            while True:
+                batch = await run_in_executor(next, batches, None)
+                if batch is None:
+                    break
+                yield batch
+        finally:
+            await run_in_executor(batches.close)
+
+def shutdown():
+    """Wait for in-flight queries and stop the DB thread pool"""
+    logger.info("Shutting down database executor")
+    executor.shutdown(wait=True)
@@ -1,16 +1,26 @@
+import time
 import mysql.connector
-from mysql.connector import pooling
 from config import get_settings
+from database.metrics import query_metrics
+from database.pool import ConnectionPool
 import logging
 
 settings = get_settings()
 logger = logging.getLogger(__name__)
 
-# Create connection pool
-connection_pool = pooling.MySQLConnectionPool(
-    pool_name="movie_db_pool",
-    pool_size=5,
-    pool_reset_session=True,
+# With AUDIT_MODE=async the API writes MOVIE_AUDIT / BOX_OFFICE_AUDIT through
+# the audit pipeline; the audit triggers skip connections with @app_audit set
+APP_AUDIT_VARIABLES = {"app_audit": 1} if settings.AUDIT_MODE == "async" else {}
+
+# Create connection pool (connections are opened lazily on first use)
+connection_pool = ConnectionPool(
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_POOL_MAX_OVERFLOW,
+    timeout=settings.DB_POOL_TIMEOUT,
+    recycle=settings.DB_POOL_RECYCLE,
+    pre_ping=settings.DB_POOL_PRE_PING,
+    reset_session=settings.DB_POOL_RESET_SESSION,
+    user_variables=APP_AUDIT_VARIABLES,
     host=settings.DB_HOST,
     port=settings.DB_PORT,
     user=settings.DB_USER,
@@ -34,14 +44,17 @@ def execute_query(query, params=None, fetch=True):
     cursor = None
     try:
         cursor = connection.cursor(dictionary=True)
-        cursor.execute(query, params or ())
-        
-        if fetch:
-            result = cursor.fetchall()
-            return result
-        else:
-            connection.commit()
-            return {"affected_rows": cursor.rowcount, "last_id": cursor.lastrowid}
+        with query_metrics.timed(query, params) as timing:
+            cursor.execute(query, params or ())
+
+            if fetch:
+                result = cursor.fetchall()
+                timing.rows = len(result)
+                return result
+            else:
+                connection.commit()
+                timing.rows = cursor.rowcount
+                return {"affected_rows": cursor.rowcount, "last_id": cursor.lastrowid}
     except mysql.connector.Error as err:
         logger.error(f"Database error: {err}")
         connection.rollback()
@@ -52,20 +65,28 @@ def execute_query(query, params=None, fetch=True):
         if connection:
             connection.close()
 
-def call_procedure(proc_name, params=None):
-    """Call a stored procedure"""
+def get_pool_stats():
+    """Live statistics for the connection pool"""
+    return connection_pool.stats()
+
+def call_procedure_results(proc_name, params=None):
+    """Call a stored procedure, keeping each result set separate.
+
+    Returns ``(result_sets, args)``: one list of rows per SELECT the
+    procedure ran, and the argument values after the call, so OUT/INOUT
+    parameters can be read by position.
+    """
     connection = get_db_connection()
     cursor = None
     try:
         cursor = connection.cursor(dictionary=True)
-        cursor.callproc(proc_name, params or ())
-        
-        # Fetch all result sets
-        results = []
-        for result in cursor.stored_results():
-            results.extend(result.fetchall())
-        
-        return results
+        with query_metrics.timed(f"CALL {proc_name}") as timing:
+            args = cursor.callproc(proc_name, params or ())
+            result_sets = [result.fetchall() for result in cursor.stored_results()]
+            timing.rows = sum(len(rows) for rows in result_sets)
+        if isinstance(args, dict):
+            args = list(args.values())
+        return result_sets, list(args or ())
     except mysql.connector.Error as err:
         logger.error(f"Procedure error: {err}")
         raise
@@ -73,4 +94,54 @@ def call_procedure(proc_name, params=None):
         if cursor:
             cursor.close()
         if connection:
-            connection.close()
\ No newline at end of file
+            connection.close()
+
+def call_procedure(proc_name, params=None):
+    """Call a stored procedure and return the rows of all its result sets"""
+    result_sets, _ = call_procedure_results(proc_name, params)
+    return [row for rows in result_sets for row in rows]
+
+def stream_query(query, params=None, batch_size=1000, dedicated=False):
+    """Yield lists of up to `batch_size` rows from an unbuffered cursor.
+
+    Rows stay on the server until fetched, so memory is bounded by one
+    batch. If the consumer stops early the connection still has unread
+    rows and is closed rather than returned to the pool. `dedicated`
+    streams over a new connection outside the pool, for consumers that
+    may take minutes (HTTP downloads).
+    """
+    connection = connection_pool.connect_unpooled() if dedicated else get_db_connection()
+    cursor = None
+    exhausted = False
+    # Time spent in the driver only, not in the consumer between batches
+    elapsed, total, failed = 0.0, 0, False
+    try:
+        cursor = connection.cursor(dictionary=True, buffered=False)
+        start = time.perf_counter()
+        cursor.execute(query, params or ())
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            elapsed += time.perf_counter() - start
+            if not rows:
+                exhausted = True
+                break
+            total += len(rows)
+            yield rows
+            start = time.perf_counter()
+    except mysql.connector.Error as err:
+        logger.error(f"Database error: {err}")
+        failed = True
+        raise
+    finally:
+        if query_metrics.enabled:
+            query_metrics.record(query, elapsed, total, error=failed, params=params)
+        if exhausted:
+            cursor.close()
+            connection.close()
+        elif dedicated:
+            try:
+                connection.close()
+            except mysql.connector.Error:
+                pass
+        else:
+            connection.invalidate()
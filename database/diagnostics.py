@@ -0,0 +1,329 @@
+"""
+Request diagnostics: sampling profiler and EXPLAIN ANALYZE capture
+
+A diagnosed request gets a ``Diagnosis`` in ``current_diagnosis`` for its
+whole lifetime. While any diagnosis is open, one sampler thread wakes every
+DIAGNOSTICS_SAMPLE_INTERVAL_MS, reads ``sys._current_frames()`` and counts
+the stacks of the threads working for each diagnosis: the event-loop thread
+(routing, validation, response serialization) and the DB worker threads
+running its queries (see ``async_connection.run_in_executor``). Requests
+that are not diagnosed pay nothing but a ContextVar lookup.
+
+Every statement a diagnosed request runs is listed with its timing. SELECT
+statements slower than DIAGNOSTICS_EXPLAIN_THRESHOLD_MS are re-run once
+under ``EXPLAIN ANALYZE`` on a separate connection after the fact, so the
+plan reflects the real row counts and loop timings. The last
+DIAGNOSTICS_HISTORY diagnoses are kept in memory.
+
+The event-loop thread is shared by every request being served, so its
+samples can include work done for concurrent requests.
+"""
+import itertools
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+from datetime import datetime
+from config import get_settings
+from database import connection
+from database.metrics import fingerprint, normalize, query_metrics
+import logging
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Diagnosis of the request being served; set by the diagnostics middleware
+current_diagnosis = ContextVar("current_diagnosis", default=None)
+
+MAX_STACK_DEPTH = 64
+# Bound the memory of one diagnosis if a long export is diagnosed
+MAX_SAMPLES = 20000
+MAX_QUERIES = 500
+EXPLAINABLE = re.compile(r"^\s*(SELECT|WITH)\b", re.IGNORECASE)
+# Re-running these would take row locks (and wait on other transactions)
+LOCKING_READ = re.compile(r"\bFOR\s+(UPDATE|SHARE)\b|\bLOCK\s+IN\s+SHARE\s+MODE\b", re.IGNORECASE)
+# Quoted strings and identifiers are matched whole so their contents are skipped
+SQL_TOKEN = re.compile(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"|`[^`]*`|[()]|\w+")
+# Leaf frame of an event loop with nothing to run (waiting on sockets)
+IDLE_LOOP_FRAME = "selectors.py:"
+
+
+def _frame_label(code):
+    # co_qualname is new in Python 3.11
+    return f"{os.path.basename(code.co_filename)}:{getattr(code, 'co_qualname', code.co_name)}"
+
+
+def _main_select(statement):
+    """End offset of the outermost SELECT keyword (after any CTEs), or None.
+
+    ``WITH ... UPDATE``/``DELETE`` have none, and EXPLAIN ANALYZE would
+    execute them.
+    """
+    depth = 0
+    for match in SQL_TOKEN.finditer(statement):
+        token = match.group()
+        if token == "(":
+            depth += 1
+        elif token == ")":
+            depth -= 1
+        elif depth == 0 and token.upper() == "SELECT":
+            return match.end()
+    return None
+
+
+def _explainable(statement):
+    return (EXPLAINABLE.match(statement) is not None and not LOCKING_READ.search(statement)
+            and _main_select(statement) is not None)
+
+
+def _stack(frame):
+    """Root-first tuple of frame labels"""
+    labels = []
+    while frame is not None and len(labels) < MAX_STACK_DEPTH:
+        labels.append(_frame_label(frame.f_code))
+        frame = frame.f_back
+    return tuple(reversed(labels))
+
+
+class Diagnosis:
+    """Samples, statements and plans collected for one request"""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, method, route, path):
+        self.id = next(self._ids)
+        self.method = method
+        self.route = route
+        self.path = path
+        self.started_at = datetime.now()
+        self.status = None
+        self.elapsed_ms = None
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+        self._threads = {}            # thread id -> "loop" or "db"
+        self._stacks = Counter()      # (role, stack) -> samples
+        self.samples = 0
+        self.idle_samples = 0
+        self.queries = []
+        self.plans = []
+        self._explained = set()
+        self.pending_plans = 0
+
+    def add_thread(self, thread_id, role):
+        with self._lock:
+            self._threads[thread_id] = role
+
+    def remove_thread(self, thread_id):
+        with self._lock:
+            self._threads.pop(thread_id, None)
+
+    def run(self, func, *args, **kwargs):
+        """Call `func` with the current thread sampled for this diagnosis"""
+        thread_id = threading.get_ident()
+        self.add_thread(thread_id, "db")
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self.remove_thread(thread_id)
+
+    def sample(self, frames):
+        with self._lock:
+            if self.samples >= MAX_SAMPLES:
+                return
+            for thread_id, role in self._threads.items():
+                frame = frames.get(thread_id)
+                if frame is None:
+                    continue
+                stack = _stack(frame)
+                self.samples += 1
+                if role == "loop" and stack and stack[-1].startswith(IDLE_LOOP_FRAME):
+                    self.idle_samples += 1
+                else:
+                    self._stacks[(role, stack)] += 1
+
+    def add_query(self, statement, elapsed, rows, error):
+        with self._lock:
+            if len(self.queries) < MAX_QUERIES:
+                self.queries.append({"statement": normalize(statement),
+                                     "elapsed_ms": round(elapsed * 1000, 2),
+                                     "rows": rows, "error": error})
+
+    def claim_plan(self, shape):
+        """True the first time a statement shape is picked for EXPLAIN"""
+        with self._lock:
+            if shape in self._explained or len(self._explained) >= settings.DIAGNOSTICS_MAX_EXPLAINS:
+                return False
+            self._explained.add(shape)
+            self.pending_plans += 1
+            return True
+
+    def add_plan(self, plan):
+        with self._lock:
+            self.plans.append(plan)
+            self.pending_plans -= 1
+
+    def finish(self, status):
+        self.status = status
+        self.elapsed_ms = round((time.perf_counter() - self._start) * 1000, 2)
+        with self._lock:
+            self._threads.clear()
+
+    def summary(self):
+        with self._lock:
+            db_ms = sum(query["elapsed_ms"] for query in self.queries)
+            return {
+                "id": self.id, "method": self.method, "route": self.route, "path": self.path,
+                "started_at": self.started_at.isoformat(timespec="milliseconds"),
+                "status": self.status, "elapsed_ms": self.elapsed_ms,
+                "db_ms": round(db_ms, 2), "queries": len(self.queries),
+                "samples": self.samples, "idle_samples": self.idle_samples, "plans": len(self.plans),
+                "pending_plans": self.pending_plans,
+            }
+
+    def report(self, limit=25):
+        """Summary plus hottest stacks and functions, every statement and the captured plans"""
+        with self._lock:
+            stacks = Counter(self._stacks)
+            queries = list(self.queries)
+            plans = list(self.plans)
+        # Percentages are of busy samples; an idle event loop is reported separately
+        total = sum(stacks.values()) or 1
+        own, inclusive, by_thread = Counter(), Counter(), Counter()
+        for (role, stack), count in stacks.items():
+            by_thread[role] += count
+            if stack:
+                own[stack[-1]] += count
+            for label in set(stack):
+                inclusive[label] += count
+        return {
+            **self.summary(),
+            "interval_ms": settings.DIAGNOSTICS_SAMPLE_INTERVAL_MS,
+            "samples_by_thread": dict(by_thread),
+            "hot_functions": [
+                {"function": label, "self": count, "total": inclusive[label],
+                 "self_pct": round(count * 100 / total, 1)}
+                for label, count in own.most_common(limit)
+            ],
+            "hot_stacks": [
+                {"thread": role, "samples": count, "pct": round(count * 100 / total, 1),
+                 "stack": list(stack)}
+                for (role, stack), count in stacks.most_common(limit)
+            ],
+            "statements": queries,
+            "explain": plans,
+        }
+
+    def folded(self):
+        """Stacks in the folded format read by flamegraph.pl and speedscope"""
+        with self._lock:
+            stacks = Counter(self._stacks)
+        return "".join(f"{role};{';'.join(stack)} {count}\n"
+                       for (role, stack), count in stacks.most_common())
+
+
+class SamplingProfiler:
+    """One background thread sampling the threads of every open diagnosis"""
+
+    def __init__(self, interval_ms):
+        self.interval = interval_ms / 1000
+        self._lock = threading.Lock()
+        self._active = set()
+        self._wake = threading.Event()
+        self._thread = None
+
+    def start(self, diagnosis):
+        with self._lock:
+            self._active.add(diagnosis)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="diagnostics-sampler", daemon=True)
+                self._thread.start()
+        self._wake.set()
+
+    def stop(self, diagnosis):
+        with self._lock:
+            self._active.discard(diagnosis)
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while True:
+            with self._lock:
+                active = list(self._active)
+                if not active:
+                    self._wake.clear()
+            if not active:
+                self._wake.wait()
+                continue
+            frames = sys._current_frames()
+            frames.pop(own_id, None)
+            for diagnosis in active:
+                diagnosis.sample(frames)
+            del frames
+            time.sleep(self.interval)
+
+
+class Diagnostics:
+    """Opens diagnoses, captures slow-statement plans and keeps the recent ones"""
+
+    def __init__(self, history, interval_ms, explain_threshold_ms):
+        self.explain_threshold_ms = explain_threshold_ms
+        self.profiler = SamplingProfiler(interval_ms)
+        self._history = deque(maxlen=history)
+        self._lock = threading.Lock()
+        self._explain_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="explain")
+
+    def begin(self, method, route, path):
+        diagnosis = Diagnosis(method, route, path)
+        diagnosis.add_thread(threading.get_ident(), "loop")
+        with self._lock:
+            self._history.append(diagnosis)
+        self.profiler.start(diagnosis)
+        return diagnosis
+
+    def end(self, diagnosis, status):
+        self.profiler.stop(diagnosis)
+        diagnosis.finish(status)
+
+    def get(self, diagnosis_id):
+        with self._lock:
+            return next((d for d in self._history if d.id == diagnosis_id), None)
+
+    def recent(self):
+        with self._lock:
+            return [diagnosis.summary() for diagnosis in reversed(self._history)]
+
+    def on_query(self, statement, params, elapsed, rows, error):
+        """query_metrics listener: note the statement and queue a plan if it was slow"""
+        diagnosis = current_diagnosis.get()
+        if diagnosis is None:
+            return
+        diagnosis.add_query(statement, elapsed, rows, error)
+        if (error or elapsed * 1000 < self.explain_threshold_ms
+                or not _explainable(statement) or not diagnosis.claim_plan(normalize(statement))):
+            return
+        self._explain_executor.submit(self._explain, diagnosis, statement, params, elapsed)
+
+    def _explain(self, diagnosis, statement, params, elapsed):
+        shape = normalize(statement)
+        plan = {"statement": shape, "fingerprint": fingerprint(shape),
+                "elapsed_ms": round(elapsed * 1000, 2)}
+        # EXPLAIN ANALYZE runs the query again; cap it so a bad plan can't hold a connection
+        timeout_ms = max(int(elapsed * 1000 * 2), 1000)
+        end = _main_select(statement)
+        hinted = f"{statement[:end]} /*+ MAX_EXECUTION_TIME({timeout_ms}) */{statement[end:]}"
+        try:
+            rows = connection.execute_query(f"EXPLAIN ANALYZE {hinted}", params)
+            plan["plan"] = "\n".join(str(value) for row in rows for value in row.values())
+        except Exception as e:
+            logger.warning(f"EXPLAIN ANALYZE failed for diagnosis {diagnosis.id}: {e}")
+            plan["error"] = str(e)
+        diagnosis.add_plan(plan)
+
+
+diagnostics = Diagnostics(history=settings.DIAGNOSTICS_HISTORY,
+                          interval_ms=settings.DIAGNOSTICS_SAMPLE_INTERVAL_MS,
+                          explain_threshold_ms=settings.DIAGNOSTICS_EXPLAIN_THRESHOLD_MS)
+query_metrics.add_listener(diagnostics.on_query)
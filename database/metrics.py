@@ -0,0 +1,224 @@
+"""
+Query latency instrumentation
+
+Every statement run through ``connection`` and ``UnitOfWork`` is timed
+with ``query_metrics.timed``. Statements are normalized (literals,
+placeholders and IN/VALUES lists folded to ``?``) so one series covers all
+executions of the same SQL shape, and each series keeps a latency
+histogram, a row count and an error count. At most METRICS_MAX_STATEMENTS
+shapes are tracked; later ones share the ``other`` series.
+
+Statements slower than SLOW_QUERY_THRESHOLD_MS are written to the
+``database.slow_query`` logger and kept in a short in-memory list, tagged
+with the route that issued them (see ``current_route``). Listeners added
+with ``add_listener`` see every timed statement with its parameters; the
+request diagnostics use this to capture query plans.
+"""
+import hashlib
+import re
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from functools import lru_cache
+from config import get_settings
+import logging
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+slow_query_logger = logging.getLogger("database.slow_query")
+
+# Upper bounds (seconds) of the latency histogram buckets, Prometheus style
+LATENCY_BUCKETS_S = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+OTHER_STATEMENT = "other"
+SLOW_QUERY_HISTORY = 100
+
+# Route template of the request being served; set by the timing middleware
+current_route = ContextVar("current_route", default=None)
+
+_STRING = re.compile(r"'(?:[^'\\]|\\.|'')*'|\"(?:[^\"\\]|\\.)*\"")
+_NUMBER = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|%s")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_VALUES_LIST = re.compile(r"(\(\?(?:, \?)*\))(?:\s*,\s*\1)+")
+_SPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=4096)
+def normalize(statement):
+    """One line per SQL shape: literals and placeholders become ?, lists collapse"""
+    text = _SPACE.sub(" ", statement).strip()
+    text = _STRING.sub("?", text)
+    text = _NUMBER.sub("?", text)
+    text = _PLACEHOLDER.sub("?", text)
+    text = _VALUES_LIST.sub(r"\1", text)
+    return _IN_LIST.sub("(?+)", text)
+
+
+def fingerprint(statement):
+    return hashlib.sha1(statement.encode()).hexdigest()[:12]
+
+
+class Histogram:
+    """Fixed-bucket latency histogram (not thread-safe; callers hold a lock)"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS_S):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        """(upper bound, cumulative count) pairs ending with +Inf"""
+        running = 0
+        result = []
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            running += count
+            result.append((bound, running))
+        return result
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the q-th quantile"""
+        if not self.count:
+            return None
+        target = q * self.count
+        for bound, running in self.cumulative():
+            if running >= target:
+                return bound
+        return float("inf")
+
+
+class _Timing:
+    __slots__ = ("rows",)
+
+    def __init__(self):
+        self.rows = 0
+
+
+class QueryMetrics:
+    """Thread-safe per-statement latency, row and error counters"""
+
+    def __init__(self, max_statements=500, slow_threshold_ms=500, enabled=True):
+        self.enabled = enabled
+        self.max_statements = max_statements
+        self.slow_threshold_ms = slow_threshold_ms
+        self._lock = threading.Lock()
+        self._series = {}   # normalized statement -> counters
+        self._slow = deque(maxlen=SLOW_QUERY_HISTORY)
+        self._listeners = []
+
+    def _get_series(self, statement):
+        series = self._series.get(statement)
+        if series is None:
+            if len(self._series) >= self.max_statements:
+                statement = OTHER_STATEMENT
+                series = self._series.get(statement)
+            if series is None:
+                series = self._series[statement] = {
+                    "fingerprint": fingerprint(statement), "histogram": Histogram(),
+                    "rows": 0, "errors": 0, "max_s": 0.0,
+                }
+        return series
+
+    def add_listener(self, listener):
+        """Call ``listener(statement, params, elapsed, rows, error)`` after every statement"""
+        self._listeners.append(listener)
+
+    def record(self, statement, elapsed, rows=0, error=False, params=None):
+        shape = normalize(statement)
+        with self._lock:
+            series = self._get_series(shape)
+            series["histogram"].observe(elapsed)
+            series["rows"] += rows or 0
+            series["max_s"] = max(series["max_s"], elapsed)
+            if error:
+                series["errors"] += 1
+        if self.slow_threshold_ms and elapsed * 1000 >= self.slow_threshold_ms:
+            entry = {"at": datetime.now().isoformat(timespec="milliseconds"),
+                     "elapsed_ms": round(elapsed * 1000, 2), "rows": rows, "error": error,
+                     "route": current_route.get(), "fingerprint": fingerprint(shape),
+                     "statement": shape}
+            with self._lock:
+                self._slow.append(entry)
+            slow_query_logger.warning(f"Slow query ({entry['elapsed_ms']} ms, {rows} rows, "
+                                      f"route {entry['route']}): {shape}")
+        for listener in self._listeners:
+            try:
+                listener(statement, params, elapsed, rows, error)
+            except Exception as e:
+                logger.error(f"Query listener failed: {e}")
+
+    @contextmanager
+    def timed(self, statement, params=None):
+        """Time the enclosed execution of `statement`; set ``.rows`` on the yielded object"""
+        timing = _Timing()
+        if not self.enabled:
+            yield timing
+            return
+        start = time.perf_counter()
+        try:
+            yield timing
+        except Exception:
+            self.record(statement, time.perf_counter() - start, timing.rows, error=True, params=params)
+            raise
+        self.record(statement, time.perf_counter() - start, timing.rows, params=params)
+
+    def snapshot(self):
+        """Copy of every series for exporters"""
+        with self._lock:
+            return {statement: {**series, "histogram": _copy(series["histogram"])}
+                    for statement, series in self._series.items()}
+
+    def slow_queries(self):
+        with self._lock:
+            return list(reversed(self._slow))
+
+    def top(self, limit=20):
+        """Statements by total time spent, for a quick look without Prometheus"""
+        rows = []
+        for statement, series in self.snapshot().items():
+            histogram = series["histogram"]
+            rows.append({
+                "statement": statement, "fingerprint": series["fingerprint"],
+                "calls": histogram.count, "total_ms": round(histogram.sum * 1000, 2),
+                "avg_ms": round(histogram.sum / histogram.count * 1000, 3) if histogram.count else 0.0,
+                "p95_le_ms": _ms(histogram.quantile(0.95)), "max_ms": round(series["max_s"] * 1000, 2),
+                "rows": series["rows"], "errors": series["errors"],
+            })
+        rows.sort(key=lambda row: row["total_ms"], reverse=True)
+        return rows[:limit]
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+            self._slow.clear()
+
+
+def _copy(histogram):
+    copy = Histogram(histogram.buckets)
+    copy.counts, copy.sum, copy.count = list(histogram.counts), histogram.sum, histogram.count
+    return copy
+
+
+def _ms(seconds):
+    if seconds is None:
+        return None
+    return "+Inf" if seconds == float("inf") else round(seconds * 1000, 2)
+
+
+query_metrics = QueryMetrics(max_statements=settings.METRICS_MAX_STATEMENTS,
+                             slow_threshold_ms=settings.SLOW_QUERY_THRESHOLD_MS,
+                             enabled=settings.METRICS_ENABLED)
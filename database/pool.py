@@ -0,0 +1,258 @@
+"""
+Configurable MySQL connection pool
+
+mysql-connector's built-in pool has a fixed size and raises as soon as it is
+empty. This pool adds overflow connections, waits up to a timeout for a free
+connection, recycles connections past a maximum lifetime, optionally pings
+idle connections before handing them out, and keeps live statistics so the
+pool can be sized from real traffic. ``user_variables`` are set on every new
+connection (and again after a session reset).
+"""
+import threading
+import time
+from collections import deque
+import mysql.connector
+from mysql.connector.errors import PoolError
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (milliseconds) of the acquire-latency histogram buckets
+ACQUIRE_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class PoolTimeoutError(PoolError):
+    """Raised when no connection became free within the acquire timeout"""
+
+
+class PooledConnection:
+    """Proxy around a raw connection; close() hands it back to the pool"""
+
+    def __init__(self, pool, raw, created_at):
+        self._pool = pool
+        self._raw = raw
+        self._created_at = created_at
+        self._returned = False
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+    def close(self):
+        """Return the connection to the pool instead of closing it"""
+        if not self._returned:
+            self._returned = True
+            self._pool.release(self)
+
+    def invalidate(self):
+        """Close the connection instead of pooling it (e.g. unread streamed rows)"""
+        if not self._returned:
+            self._returned = True
+            self._pool.release(self, discard=True)
+
+
+class ConnectionPool:
+    """Thread-safe connection pool with overflow, timeouts and statistics"""
+
+    def __init__(self, pool_size=5, max_overflow=5, timeout=10.0, recycle=1800,
+                 pre_ping=True, reset_session=True, user_variables=None, **connect_args):
+        self.pool_size = pool_size
+        self.max_overflow = max_overflow
+        self.timeout = timeout
+        self.recycle = recycle
+        self.pre_ping = pre_ping
+        self.reset_session = reset_session
+        self.user_variables = user_variables or {}
+        self.connect_args = connect_args
+
+        self._lock = threading.Condition()
+        self._idle = deque()  # (raw connection, created_at)
+        self._total = 0
+        self._in_use = 0
+        self._waiting = 0
+
+        self._created = 0
+        self._closed = 0
+        self._recycled = 0
+        self._ping_failures = 0
+        self._timeouts = 0
+        self._acquired = 0
+        self._acquire_buckets = [0] * (len(ACQUIRE_BUCKETS_MS) + 1)
+        self._acquire_sum_ms = 0.0
+
+    @property
+    def max_connections(self):
+        return self.pool_size + self.max_overflow
+
+    def connect_unpooled(self):
+        """A connection set up like the pooled ones but not counted by the
+        pool; the caller closes it"""
+        raw = mysql.connector.connect(**self.connect_args)
+        self._set_user_variables(raw)
+        return raw
+
+    def _set_user_variables(self, raw):
+        if self.user_variables:
+            cursor = raw.cursor()
+            try:
+                for name, value in self.user_variables.items():
+                    cursor.execute(f"SET @`{name}` = %s", (value,))
+            finally:
+                cursor.close()
+
+    def _connect(self):
+        raw = mysql.connector.connect(**self.connect_args)
+        self._set_user_variables(raw)
+        with self._lock:
+            self._created += 1
+        return raw
+
+    def _discard(self, raw):
+        try:
+            raw.close()
+        except mysql.connector.Error:
+            pass
+        with self._lock:
+            self._closed += 1
+
+    def _is_usable(self, raw, created_at):
+        """Check lifetime and (optionally) liveness of an idle connection"""
+        if self.recycle and time.monotonic() - created_at > self.recycle:
+            with self._lock:
+                self._recycled += 1
+            return False
+        if self.pre_ping:
+            try:
+                raw.ping(reconnect=False)
+            except mysql.connector.Error:
+                with self._lock:
+                    self._ping_failures += 1
+                return False
+        return True
+
+    def _record_acquire(self, elapsed_ms):
+        for i, bound in enumerate(ACQUIRE_BUCKETS_MS):
+            if elapsed_ms <= bound:
+                self._acquire_buckets[i] += 1
+                break
+        else:
+            self._acquire_buckets[-1] += 1
+        self._acquire_sum_ms += elapsed_ms
+        self._acquired += 1
+
+    def get_connection(self):
+        """Check out a connection, waiting up to `timeout` seconds for one"""
+        start = time.monotonic()
+        deadline = start + self.timeout
+
+        while True:
+            with self._lock:
+                while not self._idle and self._total >= self.max_connections:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._timeouts += 1
+                        raise PoolTimeoutError(
+                            f"No connection available within {self.timeout}s "
+                            f"({self._in_use} in use, {self._waiting} waiting)"
+                        )
+                    self._waiting += 1
+                    try:
+                        self._lock.wait(remaining)
+                    finally:
+                        self._waiting -= 1
+
+                if self._idle:
+                    raw, created_at = self._idle.pop()
+                    reused = True
+                else:
+                    # Reserve a slot now, connect outside the lock
+                    self._total += 1
+                    raw, created_at = None, None
+                    reused = False
+                self._in_use += 1
+
+            if reused:
+                if self._is_usable(raw, created_at):
+                    break
+                self._discard(raw)
+                with self._lock:
+                    self._total -= 1
+                    self._in_use -= 1
+                continue
+
+            try:
+                raw = self._connect()
+                created_at = time.monotonic()
+                break
+            except mysql.connector.Error:
+                with self._lock:
+                    self._total -= 1
+                    self._in_use -= 1
+                    self._lock.notify()
+                raise
+
+        with self._lock:
+            self._record_acquire((time.monotonic() - start) * 1000)
+        return PooledConnection(self, raw, created_at)
+
+    def release(self, conn, discard=False):
+        """Return a checked-out connection to the pool (or close it if `discard`)"""
+        raw = conn._raw
+        keep = not discard
+        if keep:
+            try:
+                if self.reset_session:
+                    raw.reset_session(user_variables=self.user_variables or None)
+                elif raw.in_transaction:
+                    raw.rollback()
+            except mysql.connector.Error as err:
+                logger.warning(f"Discarding connection that failed to reset: {err}")
+                keep = False
+
+        with self._lock:
+            self._in_use -= 1
+            # Overflow connections are closed once nobody is waiting for them
+            if keep and (self._total <= self.pool_size or self._waiting):
+                self._idle.append((raw, conn._created_at))
+                raw = None
+            else:
+                self._total -= 1
+            self._lock.notify()
+
+        if raw is not None:
+            self._discard(raw)
+
+    def close_all(self):
+        """Close every idle connection (checked-out ones close on release)"""
+        with self._lock:
+            idle = list(self._idle)
+            self._idle.clear()
+            self._total -= len(idle)
+        for raw, _ in idle:
+            self._discard(raw)
+
+    def stats(self):
+        """Snapshot of pool usage, churn and acquire latency"""
+        with self._lock:
+            cumulative = []
+            running = 0
+            for bound, count in zip(ACQUIRE_BUCKETS_MS + ("+Inf",), self._acquire_buckets):
+                running += count
+                cumulative.append({"le_ms": bound, "count": running})
+            return {
+                "pool_size": self.pool_size,
+                "max_overflow": self.max_overflow,
+                "total": self._total,
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+                "overflow_in_use": max(0, self._total - self.pool_size),
+                "waiting": self._waiting,
+                "created": self._created,
+                "closed": self._closed,
+                "recycled": self._recycled,
+                "ping_failures": self._ping_failures,
+                "timeouts": self._timeouts,
+                "acquire_count": self._acquired,
+                "acquire_avg_ms": round(self._acquire_sum_ms / self._acquired, 3) if self._acquired else 0.0,
+                "acquire_total_ms": round(self._acquire_sum_ms, 3),
+                "acquire_histogram": cumulative,
+            }
@@ -9,6 +9,7 @@
 -- DROP TABLE IF EXISTS ACTIVITY_LOG;
 -- DROP TABLE IF EXISTS MOVIE_AUDIT;
 -- DROP TABLE IF EXISTS BOX_OFFICE_AUDIT;
+-- DROP TABLE IF EXISTS BOX_OFFICE_DAILY;
 -- DROP TABLE IF EXISTS MOVIE_STATISTICS;
 -- DROP TABLE IF EXISTS MOVIE_CREW;
 -- DROP TABLE IF EXISTS PRODUCTION_CREW;
@@ -65,6 +66,11 @@ CREATE TABLE PRODUCERS (
 
 CREATE INDEX idx_producer_name ON PRODUCERS(name);
 CREATE INDEX idx_company ON PRODUCERS(company);
+-- Keyset pagination: ORDER BY created_at DESC, producer_id DESC
+CREATE INDEX idx_producer_created ON PRODUCERS(created_at, producer_id);
+-- Full-text search on name/company filters (replaces LIKE '%term%')
+CREATE FULLTEXT INDEX ft_producer_name ON PRODUCERS(name);
+CREATE FULLTEXT INDEX ft_producer_company ON PRODUCERS(company);
 
 
 -- ========================================================
@@ -117,26 +123,34 @@ CREATE TABLE MOVIES (
     title VARCHAR(200) NOT NULL,
     release_date DATE,
     language_id INT NOT NULL,
-    duration INT CHECK(duration > 0),
+    duration INT CONSTRAINT chk_movie_duration CHECK(duration > 0),
     certification VARCHAR(10),
     budget DECIMAL(15,2) CHECK(budget >= 0),
     ott_rights_value DECIMAL(15,2) CHECK(ott_rights_value >= 0),
     poster_url VARCHAR(500),
     plot_summary TEXT,
-    imdb_rating DECIMAL(3,1) CHECK(imdb_rating >= 0 AND imdb_rating <= 10),
+    imdb_rating DECIMAL(3,1) CONSTRAINT chk_movie_rating CHECK(imdb_rating >= 0 AND imdb_rating <= 10),
     producer_id INT,
     created_by INT,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP(6) DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6),
     FOREIGN KEY (producer_id) REFERENCES PRODUCERS(producer_id) ON DELETE SET NULL,
     FOREIGN KEY (language_id) REFERENCES LANGUAGES(language_id),
-    FOREIGN KEY (created_by) REFERENCES USERS(user_id) ON DELETE SET NULL
+    FOREIGN KEY (created_by) REFERENCES USERS(user_id) ON DELETE SET NULL,
+    CONSTRAINT chk_movie_title CHECK(TRIM(title) <> '')
 );
 
 CREATE INDEX idx_title ON MOVIES(title);
 CREATE INDEX idx_release_date ON MOVIES(release_date);
-CREATE INDEX idx_language ON MOVIES(language_id);
-CREATE INDEX idx_producer ON MOVIES(producer_id);
+-- Keyset pagination: ORDER BY created_at DESC, movie_id DESC (optionally filtered)
+CREATE INDEX idx_language ON MOVIES(language_id, created_at, movie_id);
+CREATE INDEX idx_producer ON MOVIES(producer_id, created_at, movie_id);
+CREATE INDEX idx_movie_created ON MOVIES(created_at, movie_id);
+-- List ETags: MAX(updated_at) read from the end of the index (microseconds,
+-- so two writes in one second still change it)
+CREATE INDEX idx_movie_updated ON MOVIES(updated_at);
+-- Full-text search on title filter (replaces LIKE '%term%')
+CREATE FULLTEXT INDEX ft_movie_title ON MOVIES(title);
 
 
 -- ========================================================
@@ -156,22 +170,29 @@ CREATE TABLE MOVIE_GENRES (
 -- ========================================================
 CREATE TABLE BOX_OFFICE (
     box_id INT PRIMARY KEY AUTO_INCREMENT,
-    movie_id INT UNIQUE NOT NULL,
-    domestic_collection DECIMAL(15,2) CHECK(domestic_collection >= 0),
-    intl_collection DECIMAL(15,2) CHECK(intl_collection >= 0),
+    movie_id INT NOT NULL,
+    domestic_collection DECIMAL(15,2) CONSTRAINT chk_box_domestic CHECK(domestic_collection >= 0),
+    intl_collection DECIMAL(15,2) CONSTRAINT chk_box_intl CHECK(intl_collection >= 0),
     opening_weekend DECIMAL(15,2) CHECK(opening_weekend >= 0),
     total_collection DECIMAL(15,2) AS (COALESCE(domestic_collection, 0) + COALESCE(intl_collection, 0)) STORED,
-    profit_margin DECIMAL(5,2) CHECK(profit_margin >= 0),
-    release_screens INT CHECK(release_screens > 0),
+    profit_margin DECIMAL(5,2) CONSTRAINT chk_box_margin CHECK(profit_margin >= 0 AND profit_margin <= 100),
+    release_screens INT CONSTRAINT chk_box_screens CHECK(release_screens > 0),
     collection_status VARCHAR(30) DEFAULT 'pending',
     updated_by INT,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP(6) DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6),
     FOREIGN KEY (movie_id) REFERENCES MOVIES(movie_id) ON DELETE CASCADE,
-    FOREIGN KEY (updated_by) REFERENCES USERS(user_id) ON DELETE SET NULL
+    FOREIGN KEY (updated_by) REFERENCES USERS(user_id) ON DELETE SET NULL,
+    CONSTRAINT uq_box_office_movie UNIQUE(movie_id)
 );
 
 CREATE INDEX idx_box_office_movie ON BOX_OFFICE(movie_id);
+-- Keyset pagination: ORDER BY created_at DESC, box_id DESC (optionally filtered)
+CREATE INDEX idx_box_office_created ON BOX_OFFICE(created_at, box_id);
+CREATE INDEX idx_box_office_status ON BOX_OFFICE(collection_status, created_at, box_id);
+-- List ETags: MAX(updated_at) read from the end of the index (microseconds,
+-- so two writes in one second still change it)
+CREATE INDEX idx_box_office_updated ON BOX_OFFICE(updated_at);
 
 
 -- ========================================================
@@ -183,13 +204,21 @@ CREATE TABLE ACTORS (
     gender VARCHAR(20),
     date_of_birth DATE,
     nationality VARCHAR(50),
-    popularity_score DECIMAL(3,1) CHECK(popularity_score >= 0 AND popularity_score <= 10),
+    popularity_score DECIMAL(3,1) CONSTRAINT chk_actor_popularity CHECK(popularity_score >= 0 AND popularity_score <= 10),
     email VARCHAR(100) UNIQUE,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+    updated_at TIMESTAMP(6) DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6),
+    CONSTRAINT chk_actor_name CHECK(TRIM(name) <> '')
 );
 
 CREATE INDEX idx_actor_name ON ACTORS(name);
+-- Keyset pagination by actor_id (the primary key is implicitly appended)
+CREATE INDEX idx_actor_gender ON ACTORS(gender);
+-- List ETags: MAX(updated_at) read from the end of the index (microseconds,
+-- so two writes in one second still change it)
+CREATE INDEX idx_actor_updated ON ACTORS(updated_at);
+-- Full-text search on name filter (replaces LIKE '%term%')
+CREATE FULLTEXT INDEX ft_actor_name ON ACTORS(name);
 
 
 -- ========================================================
@@ -201,12 +230,12 @@ CREATE TABLE MOVIE_CAST (
     actor_id INT NOT NULL,
     role_name VARCHAR(100),
     role_type VARCHAR(20),
-    screen_time_minutes INT CHECK(screen_time_minutes >= 0),
+    screen_time_minutes INT CONSTRAINT chk_cast_screen_time CHECK(screen_time_minutes >= 0),
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (movie_id) REFERENCES MOVIES(movie_id) ON DELETE CASCADE,
     FOREIGN KEY (actor_id) REFERENCES ACTORS(actor_id) ON DELETE CASCADE,
-    UNIQUE(movie_id, actor_id),
-    CHECK(role_type IN ('Lead', 'Supporting', 'Cameo'))
+    CONSTRAINT uq_cast_movie_actor UNIQUE(movie_id, actor_id),
+    CONSTRAINT chk_cast_role_type CHECK(role_type IN ('Lead', 'Supporting', 'Cameo'))
 );
 
 CREATE INDEX idx_cast_movie ON MOVIE_CAST(movie_id);
@@ -221,14 +250,17 @@ CREATE TABLE PRODUCTION_CREW (
     name VARCHAR(100) NOT NULL,
     role VARCHAR(100) NOT NULL,
     specialty VARCHAR(150),
-    experience_years INT CHECK(experience_years >= 0),
+    experience_years INT CONSTRAINT chk_crew_experience CHECK(experience_years >= 0),
     email VARCHAR(100) UNIQUE,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    CHECK(role IN ('Director', 'Cinematographer', 'Music Director', 'Editor', 'Producer', 'Writer', 'Choreographer', 'Other'))
+    CONSTRAINT chk_crew_name CHECK(TRIM(name) <> ''),
+    CONSTRAINT chk_crew_role CHECK(role IN ('Director', 'Cinematographer', 'Music Director', 'Editor', 'Producer', 'Writer', 'Choreographer', 'Other'))
 );
 
 CREATE INDEX idx_crew_name ON PRODUCTION_CREW(name);
 CREATE INDEX idx_crew_role ON PRODUCTION_CREW(role);
+-- Full-text search on name filter (replaces LIKE '%term%')
+CREATE FULLTEXT INDEX ft_crew_name ON PRODUCTION_CREW(name);
 
 
 -- ========================================================
@@ -242,7 +274,7 @@ CREATE TABLE MOVIE_CREW (
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (movie_id) REFERENCES MOVIES(movie_id) ON DELETE CASCADE,
     FOREIGN KEY (crew_id) REFERENCES PRODUCTION_CREW(crew_id) ON DELETE CASCADE,
-    UNIQUE(movie_id, crew_id)
+    CONSTRAINT uq_crew_movie_crew UNIQUE(movie_id, crew_id)
 );
 
 CREATE INDEX idx_movie_crew_movie ON MOVIE_CREW(movie_id);
@@ -267,11 +299,50 @@ CREATE TABLE MOVIE_STATISTICS (
 CREATE INDEX idx_stat_movie ON MOVIE_STATISTICS(movie_id);
 
 
+-- ========================================================
+-- SUPPORTING TABLE: BOX_OFFICE_DAILY - Daily Collections Time Series
+-- ========================================================
+-- One row per movie per day of trade figures (that day's collections,
+-- not running totals). The clustered (movie_id, day) key makes a movie's
+-- history one contiguous range: weekly/monthly rollups and running totals
+-- are a single index range scan (GET /api/box-office/{movie_id}/timeseries).
+-- Re-reported days are upserted, so loads are idempotent.
+CREATE TABLE BOX_OFFICE_DAILY (
+    movie_id INT NOT NULL,
+    day DATE NOT NULL,
+    domestic DECIMAL(15,2) NOT NULL DEFAULT 0 CONSTRAINT chk_daily_domestic CHECK(domestic >= 0),
+    intl DECIMAL(15,2) NOT NULL DEFAULT 0 CONSTRAINT chk_daily_intl CHECK(intl >= 0),
+    screens INT CONSTRAINT chk_daily_screens CHECK(screens > 0),
+    PRIMARY KEY (movie_id, day),
+    FOREIGN KEY (movie_id) REFERENCES MOVIES(movie_id) ON DELETE CASCADE
+);
+
+
+-- ========================================================
+-- AUDIT TABLES: monthly RANGE partitions
+-- ========================================================
+-- MOVIE_AUDIT, BOX_OFFICE_AUDIT and ACTIVITY_LOG are partitioned by month
+-- of their timestamp (pYYYYMM holds that month; p_history everything
+-- older, p_future everything newer). The monthly partitions depend on
+-- when the database is set up, so they are not listed here:
+-- scripts/setup_database.py and app/services/audit_archive.py split them
+-- off p_future from the current month on, keeping
+-- AUDIT_PARTITION_PREMAKE_MONTHS months ahead, and the archiver moves
+-- partitions older than AUDIT_RETENTION_MONTHS to gzipped NDJSON before
+-- dropping them. Partitioned InnoDB tables cannot have foreign keys and
+-- every unique key must include the partition column, hence the composite
+-- primary keys; audit history now also outlives the rows it describes. Existing databases: drop the audit foreign keys, then e.g.
+--   ALTER TABLE MOVIE_AUDIT DROP PRIMARY KEY,
+--       ADD PRIMARY KEY (audit_id, modified_at),
+--       MODIFY modified_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP;
+--   ALTER TABLE MOVIE_AUDIT PARTITION BY RANGE (UNIX_TIMESTAMP(modified_at)) (...);
+
+
 -- ========================================================
 -- AUDIT TABLE: MOVIE_AUDIT - Movie Modification Tracking
 -- ========================================================
 CREATE TABLE MOVIE_AUDIT (
-    audit_id INT PRIMARY KEY AUTO_INCREMENT,
+    audit_id INT AUTO_INCREMENT,
     movie_id INT NOT NULL,
     old_title VARCHAR(200),
     new_title VARCHAR(200),
@@ -281,10 +352,14 @@ CREATE TABLE MOVIE_AUDIT (
     new_release_date DATE,
     modified_by VARCHAR(100),
     modification_reason VARCHAR(255),
-    modified_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    modified_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
     operation_type VARCHAR(20),
-    FOREIGN KEY (movie_id) REFERENCES MOVIES(movie_id) ON DELETE CASCADE,
+    PRIMARY KEY (audit_id, modified_at),
     CHECK(operation_type IN ('INSERT', 'UPDATE', 'DELETE'))
+)
+PARTITION BY RANGE (UNIX_TIMESTAMP(modified_at)) (
+    PARTITION p_history VALUES LESS THAN (UNIX_TIMESTAMP('2026-01-01 00:00:00')),
+    PARTITION p_future VALUES LESS THAN MAXVALUE
 );
 
 CREATE INDEX idx_audit_movie ON MOVIE_AUDIT(movie_id);
@@ -295,7 +370,7 @@ CREATE INDEX idx_audit_date ON MOVIE_AUDIT(modified_at);
 -- AUDIT TABLE: BOX_OFFICE_AUDIT - Box Office Change Tracking
 -- ========================================================
 CREATE TABLE BOX_OFFICE_AUDIT (
-    audit_id INT PRIMARY KEY AUTO_INCREMENT,
+    audit_id INT AUTO_INCREMENT,
     box_id INT NOT NULL,
     movie_id INT NOT NULL,
     old_domestic DECIMAL(15,2),
@@ -305,10 +380,14 @@ CREATE TABLE BOX_OFFICE_AUDIT (
     old_margin DECIMAL(5,2),
     new_margin DECIMAL(5,2),
     modified_by VARCHAR(100),
-    modified_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    modified_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
     operation_type VARCHAR(20),
-    FOREIGN KEY (movie_id) REFERENCES MOVIES(movie_id) ON DELETE CASCADE,
+    PRIMARY KEY (audit_id, modified_at),
     CHECK(operation_type IN ('INSERT', 'UPDATE', 'DELETE'))
+)
+PARTITION BY RANGE (UNIX_TIMESTAMP(modified_at)) (
+    PARTITION p_history VALUES LESS THAN (UNIX_TIMESTAMP('2026-01-01 00:00:00')),
+    PARTITION p_future VALUES LESS THAN MAXVALUE
 );
 
 CREATE INDEX idx_box_audit_movie ON BOX_OFFICE_AUDIT(movie_id);
@@ -319,15 +398,119 @@ CREATE INDEX idx_box_audit_date ON BOX_OFFICE_AUDIT(modified_at);
 -- AUDIT TABLE: ACTIVITY_LOG - User Activity Tracking
 -- ========================================================
 CREATE TABLE ACTIVITY_LOG (
-    log_id INT PRIMARY KEY AUTO_INCREMENT,
+    log_id INT AUTO_INCREMENT,
     user_id INT,
     action VARCHAR(100) NOT NULL,
     table_name VARCHAR(50),
     record_id INT,
     details TEXT,
-    action_timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    FOREIGN KEY (user_id) REFERENCES USERS(user_id) ON DELETE SET NULL
+    action_timestamp TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (log_id, action_timestamp)
+)
+PARTITION BY RANGE (UNIX_TIMESTAMP(action_timestamp)) (
+    PARTITION p_history VALUES LESS THAN (UNIX_TIMESTAMP('2026-01-01 00:00:00')),
+    PARTITION p_future VALUES LESS THAN MAXVALUE
 );
 
 CREATE INDEX idx_activity_user ON ACTIVITY_LOG(user_id);
 CREATE INDEX idx_activity_timestamp ON ACTIVITY_LOG(action_timestamp);
+
+
+-- ========================================================
+-- TABLE_DELETIONS: Last delete per table
+-- ========================================================
+-- MAX(updated_at) moves on every insert and update but not when a row
+-- disappears; the list ETags also read this row, written by the
+-- tr_*_deleted triggers. Never written by the application directly.
+
+CREATE TABLE TABLE_DELETIONS (
+    table_name VARCHAR(64) PRIMARY KEY,
+    deleted_at TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6)
+);
+
+
+-- ========================================================
+-- SUMMARY TABLES: Materialized Analytics
+-- ========================================================
+-- Pre-aggregated copies of the analytics joins. Triggers only enqueue the
+-- affected keys into SUMMARY_REFRESH_QUEUE; sp_refresh_summaries recomputes
+-- just those rows (the API runs it every ANALYTICS_REFRESH_INTERVAL
+-- seconds), so analytics reads cost O(result) instead of a full GROUP BY.
+-- Never written by the application directly.
+
+CREATE TABLE SUMMARY_REFRESH_QUEUE (
+    entity VARCHAR(20) NOT NULL,
+    entity_id INT NOT NULL,
+    queued_at TIMESTAMP(6) DEFAULT CURRENT_TIMESTAMP(6),
+    PRIMARY KEY (entity, entity_id),
+    CHECK(entity IN ('movie', 'language', 'producer', 'actor'))
+);
+
+CREATE TABLE MOVIE_SUMMARY (
+    movie_id INT PRIMARY KEY,
+    title VARCHAR(200) NOT NULL,
+    language_id INT,
+    language_name VARCHAR(50),
+    producer_id INT,
+    producer_name VARCHAR(100),
+    release_date DATE,
+    budget DECIMAL(15,2),
+    total_collection DECIMAL(15,2),
+    domestic_collection DECIMAL(15,2),
+    intl_collection DECIMAL(15,2),
+    opening_weekend DECIMAL(15,2),
+    release_screens INT,
+    profit_margin DECIMAL(5,2),
+    net_profit DECIMAL(15,2),
+    profit_percentage DECIMAL(12,2),
+    imdb_rating DECIMAL(3,1),
+    actor_count INT NOT NULL DEFAULT 0,
+    refreshed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+);
+
+CREATE INDEX idx_ms_collection ON MOVIE_SUMMARY(total_collection);
+CREATE INDEX idx_ms_profit ON MOVIE_SUMMARY(profit_percentage);
+CREATE INDEX idx_ms_language ON MOVIE_SUMMARY(language_id);
+CREATE INDEX idx_ms_producer ON MOVIE_SUMMARY(producer_id);
+
+CREATE TABLE LANGUAGE_SUMMARY (
+    language_id INT PRIMARY KEY,
+    language_name VARCHAR(50) NOT NULL,
+    total_movies INT NOT NULL DEFAULT 0,
+    rated_movies INT NOT NULL DEFAULT 0,
+    total_budget DECIMAL(18,2),
+    total_collection DECIMAL(18,2),
+    avg_collection DECIMAL(15,2),
+    highest_collection DECIMAL(15,2),
+    avg_rating DECIMAL(4,2),
+    refreshed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+);
+
+CREATE INDEX idx_ls_collection ON LANGUAGE_SUMMARY(total_collection);
+
+CREATE TABLE PRODUCER_SUMMARY (
+    producer_id INT PRIMARY KEY,
+    name VARCHAR(100) NOT NULL,
+    company VARCHAR(150),
+    total_movies INT NOT NULL DEFAULT 0,
+    avg_rating DECIMAL(4,2),
+    total_collection DECIMAL(18,2),
+    total_budget DECIMAL(18,2),
+    net_profit DECIMAL(18,2),
+    highest_grosser DECIMAL(15,2),
+    refreshed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+);
+
+CREATE INDEX idx_ps_collection ON PRODUCER_SUMMARY(total_collection);
+
+CREATE TABLE ACTOR_SUMMARY (
+    actor_id INT PRIMARY KEY,
+    name VARCHAR(100) NOT NULL,
+    gender VARCHAR(20),
+    popularity_score DECIMAL(3,1),
+    movie_count INT NOT NULL DEFAULT 0,
+    movies TEXT,
+    refreshed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+);
+
+CREATE INDEX idx_as_popularity ON ACTOR_SUMMARY(popularity_score, actor_id);
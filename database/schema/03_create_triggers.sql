@@ -1,7 +1,7 @@
 -- =====================================================
 -- INDIAN MOVIE DATABASE - TRIGGERS
 -- =====================================================
--- File 3 of 3: TRIGGERS (10 Triggers)
+-- File 3 of 3: TRIGGERS (27 Triggers)
 -- Run this file AFTER creating all tables
 -- =====================================================
 
@@ -11,30 +11,33 @@ DELIMITER //
 -- TRIGGER 1: tr_movie_insert_audit
 -- Purpose: Automatically create audit log when movie is added
 -- Event: AFTER INSERT on MOVIES table
--- Action: Insert record into MOVIE_AUDIT
+-- Action: Insert record into MOVIE_AUDIT (skipped for API connections
+--         with @app_audit set: AUDIT_MODE=async writes it in batches)
 -- ========================================================
 CREATE TRIGGER tr_movie_insert_audit
 AFTER INSERT ON MOVIES
 FOR EACH ROW
 BEGIN
-    INSERT INTO MOVIE_AUDIT (
-        movie_id, 
-        new_title, 
-        new_budget, 
-        new_release_date, 
-        modified_by, 
-        modification_reason, 
-        operation_type
-    )
-    VALUES (
-        NEW.movie_id, 
-        NEW.title, 
-        NEW.budget, 
-        NEW.release_date, 
-        'System', 
-        'Movie Created', 
-        'INSERT'
-    );
+    IF @app_audit IS NULL THEN
+        INSERT INTO MOVIE_AUDIT (
+            movie_id, 
+            new_title, 
+            new_budget, 
+            new_release_date, 
+            modified_by, 
+            modification_reason, 
+            operation_type
+        )
+        VALUES (
+            NEW.movie_id, 
+            NEW.title, 
+            NEW.budget, 
+            NEW.release_date, 
+            'System', 
+            'Movie Created', 
+            'INSERT'
+        );
+    END IF;
 END //
 
 
@@ -49,7 +52,7 @@ CREATE TRIGGER tr_movie_update_audit
 AFTER UPDATE ON MOVIES
 FOR EACH ROW
 BEGIN
-    IF (OLD.title != NEW.title OR 
+    IF @app_audit IS NULL AND (OLD.title != NEW.title OR 
         OLD.budget != NEW.budget OR 
         OLD.release_date != NEW.release_date) THEN
         INSERT INTO MOVIE_AUDIT (
@@ -88,66 +91,31 @@ CREATE TRIGGER tr_movie_delete_audit
 BEFORE DELETE ON MOVIES
 FOR EACH ROW
 BEGIN
-    INSERT INTO MOVIE_AUDIT (
-        movie_id, 
-        old_title, 
-        old_budget, 
-        old_release_date, 
-        modified_by, 
-        modification_reason, 
-        operation_type
-    )
-    VALUES (
-        OLD.movie_id, 
-        OLD.title, 
-        OLD.budget, 
-        OLD.release_date, 
-        'System', 
-        'Movie Deleted', 
-        'DELETE'
-    );
-END //
-
-
--- ========================================================
--- TRIGGER 4: tr_box_office_validation
--- Purpose: Ensure data integrity for box office records
--- Event: BEFORE UPDATE on BOX_OFFICE table
--- Action: Validate values before update, raise errors if invalid
--- Validations: No negative collections, valid margins, valid screens
--- ========================================================
-CREATE TRIGGER tr_box_office_validation
-BEFORE UPDATE ON BOX_OFFICE
-FOR EACH ROW
-BEGIN
-    -- Check for negative domestic collection
-    IF NEW.domestic_collection < 0 THEN
-        SIGNAL SQLSTATE '45000'
-        SET MESSAGE_TEXT = 'Error: Domestic collection cannot be negative!';
-    END IF;
-    
-    -- Check for negative international collection
-    IF NEW.intl_collection < 0 THEN
-        SIGNAL SQLSTATE '45000'
-        SET MESSAGE_TEXT = 'Error: International collection cannot be negative!';
-    END IF;
-    
-    -- Check for invalid profit margin
-    IF NEW.profit_margin > 100 OR NEW.profit_margin < 0 THEN
-        SIGNAL SQLSTATE '45000'
-        SET MESSAGE_TEXT = 'Error: Profit margin must be between 0 and 100!';
-    END IF;
-    
-    -- Check for valid screens (must be greater than 0)
-    IF NEW.release_screens <= 0 THEN
-        SIGNAL SQLSTATE '45000'
-        SET MESSAGE_TEXT = 'Error: Release screens must be greater than 0!';
+    IF @app_audit IS NULL THEN
+        INSERT INTO MOVIE_AUDIT (
+            movie_id, 
+            old_title, 
+            old_budget, 
+            old_release_date, 
+            modified_by, 
+            modification_reason, 
+            operation_type
+        )
+        VALUES (
+            OLD.movie_id, 
+            OLD.title, 
+            OLD.budget, 
+            OLD.release_date, 
+            'System', 
+            'Movie Deleted', 
+            'DELETE'
+        );
     END IF;
 END //
 
 
 -- ========================================================
--- TRIGGER 5: tr_update_movie_stats
+-- TRIGGER 4: tr_update_movie_stats
 -- Purpose: Automatically update statistics when collections change
 -- Event: AFTER UPDATE on BOX_OFFICE table
 -- Action: Update MOVIE_STATISTICS table with new collection values
@@ -165,276 +133,461 @@ END //
 
 
 -- ========================================================
--- TRIGGER 6: tr_prevent_duplicate_cast
--- Purpose: Prevent adding same actor to movie twice
--- Event: BEFORE INSERT on MOVIE_CAST table
--- Action: Check for duplicate and raise error if found
+-- TRIGGER 5: tr_box_office_insert_audit
+-- Purpose: Create audit trail for box office insertions
+-- Event: AFTER INSERT on BOX_OFFICE table
+-- Action: Insert record into BOX_OFFICE_AUDIT
 -- ========================================================
-CREATE TRIGGER tr_prevent_duplicate_cast
-BEFORE INSERT ON MOVIE_CAST
+CREATE TRIGGER tr_box_office_insert_audit
+AFTER INSERT ON BOX_OFFICE
 FOR EACH ROW
 BEGIN
-    DECLARE v_count INT;
-    
-    -- Count existing cast entries for this movie and actor
-    SELECT COUNT(*) INTO v_count 
-    FROM MOVIE_CAST 
-    WHERE movie_id = NEW.movie_id 
-    AND actor_id = NEW.actor_id;
-    
-    -- Raise error if duplicate found
-    IF v_count > 0 THEN
-        SIGNAL SQLSTATE '45000'
-        SET MESSAGE_TEXT = 'Error: This actor is already added to this movie!';
+    IF @app_audit IS NULL THEN
+        INSERT INTO BOX_OFFICE_AUDIT (
+            box_id, 
+            movie_id, 
+            new_domestic, 
+            new_intl, 
+            new_margin, 
+            modified_by, 
+            operation_type
+        )
+        VALUES (
+            NEW.box_id, 
+            NEW.movie_id, 
+            NEW.domestic_collection, 
+            NEW.intl_collection, 
+            NEW.profit_margin, 
+            'System', 
+            'INSERT'
+        );
     END IF;
 END //
 
 
 -- ========================================================
--- TRIGGER 7: tr_prevent_duplicate_crew
--- Purpose: Prevent adding same crew member to movie twice
--- Event: BEFORE INSERT on MOVIE_CREW table
--- Action: Check for duplicate and raise error if found
+-- TRIGGER 6: tr_validate_actor_data
+-- Purpose: Ensure valid actor information on insert
+-- Event: BEFORE INSERT on ACTORS table
+-- Action: Reject birth dates in the future (CHECK constraints cannot
+--         use CURDATE(); score and name are constraints on ACTORS)
 -- ========================================================
-CREATE TRIGGER tr_prevent_duplicate_crew
-BEFORE INSERT ON MOVIE_CREW
+CREATE TRIGGER tr_validate_actor_data
+BEFORE INSERT ON ACTORS
 FOR EACH ROW
 BEGIN
-    DECLARE v_count INT;
-    
-    -- Count existing crew entries for this movie and crew member
-    SELECT COUNT(*) INTO v_count 
-    FROM MOVIE_CREW 
-    WHERE movie_id = NEW.movie_id 
-    AND crew_id = NEW.crew_id;
-    
-    -- Raise error if duplicate found
-    IF v_count > 0 THEN
+    -- Check for valid birth date (not in future)
+    IF NEW.date_of_birth > CURDATE() THEN
         SIGNAL SQLSTATE '45000'
-        SET MESSAGE_TEXT = 'Error: This crew member is already added to this movie!';
+        SET MESSAGE_TEXT = 'Error: Date of birth cannot be in the future!';
     END IF;
 END //
 
 
 -- ========================================================
--- TRIGGER 8: tr_box_office_insert_audit
--- Purpose: Create audit trail for box office insertions
+-- TRIGGER 7: tr_movie_summary_insert
+-- Purpose: Keep materialized analytics current for new movies
+-- Event: AFTER INSERT on MOVIES table
+-- Action: Queue the movie for sp_refresh_summaries
+-- ========================================================
+CREATE TRIGGER tr_movie_summary_insert
+AFTER INSERT ON MOVIES
+FOR EACH ROW
+BEGIN
+    INSERT INTO SUMMARY_REFRESH_QUEUE (entity, entity_id)
+    VALUES ('movie', NEW.movie_id)
+    ON DUPLICATE KEY UPDATE queued_at = CURRENT_TIMESTAMP(6);
+END //
+
+
+-- ========================================================
+-- TRIGGER 8: tr_movie_summary_update
+-- Purpose: Keep materialized analytics current when a movie changes
+-- Event: AFTER UPDATE on MOVIES table
+-- Action: Queue the movie (its old and new language/producer are
+--         expanded by the refresh); queue its cast on a title change
+-- ========================================================
+CREATE TRIGGER tr_movie_summary_update
+AFTER UPDATE ON MOVIES
+FOR EACH ROW
+BEGIN
+    INSERT INTO SUMMARY_REFRESH_QUEUE (entity, entity_id)
+    VALUES ('movie', NEW.movie_id)
+    ON DUPLICATE KEY UPDATE queued_at = CURRENT_TIMESTAMP(6);
+
+    -- Actor summaries list movie titles
+    IF NOT (NEW.title <=> OLD.title) THEN
+        INSERT INTO SUMMARY_REFRESH_QUEUE (entity, entity_id)
+        SELECT 'actor', actor_id FROM MOVIE_CAST WHERE movie_id = NEW.movie_id
+        ON DUPLICATE KEY UPDATE queued_at = CURRENT_TIMESTAMP(6);
+    END IF;
+END //
+
+
+-- ========================================================
+-- TRIGGER 9: tr_movie_summary_delete
+-- Purpose: Keep materialized analytics current when a movie is removed
+-- Event: BEFORE DELETE on MOVIES table
+-- Action: Queue the movie and its cast; cascaded MOVIE_CAST deletes
+--         do not fire triggers, so the cast is read before the delete
+-- ========================================================
+CREATE TRIGGER tr_movie_summary_delete
+BEFORE DELETE ON MOVIES
+FOR EACH ROW
+BEGIN
+    INSERT INTO SUMMARY_REFRESH_QUEUE (entity, entity_id)
+    VALUES ('movie', OLD.movie_id)
+    ON DUPLICATE KEY UPDATE queued_at = CURRENT_TIMESTAMP(6);
+
+    INSERT INTO SUMMARY_REFRESH_QUEUE (entity, entity_id)
+    SELECT 'actor', actor_id FROM MOVIE_CAST WHERE movie_id = OLD.movie_id
+    ON DUPLICATE KEY UPDATE queued_at = CURRENT_TIMESTAMP(6);
+END //
+
+
+-- ========================================================
+-- TRIGGER 10: tr_box_office_summary_insert
+-- Purpose: Keep materialized analytics current when collections change
 -- Event: AFTER INSERT on BOX_OFFICE table
--- Action: Insert record into BOX_OFFICE_AUDIT
+-- Action: Queue the movie for sp_refresh_summaries
 -- ========================================================
-CREATE TRIGGER tr_box_office_insert_audit
+CREATE TRIGGER tr_box_office_summary_insert
 AFTER INSERT ON BOX_OFFICE
 FOR EACH ROW
 BEGIN
-    INSERT INTO BOX_OFFICE_AUDIT (
-        box_id, 
-        movie_id, 
-        new_domestic, 
-        new_intl, 
-        new_margin, 
-        modified_by, 
-        operation_type
-    )
-    VALUES (
-        NEW.box_id, 
-        NEW.movie_id, 
-        NEW.domestic_collection, 
-        NEW.intl_collection, 
-        NEW.profit_margin, 
-        'System', 
-        'INSERT'
-    );
+    INSERT INTO SUMMARY_REFRESH_QUEUE (entity, entity_id)
+    VALUES ('movie', NEW.movie_id)
+    ON DUPLICATE KEY UPDATE queued_at = CURRENT_TIMESTAMP(6);
 END //
 
 
 -- ========================================================
--- TRIGGER 9: tr_validate_actor_data
--- Purpose: Ensure valid actor information on insert/update
--- Event: BEFORE INSERT on ACTORS table
--- Action: Validate popularity score, birth date, and name
+-- TRIGGER 11: tr_box_office_summary_update
+-- Purpose: Keep materialized analytics current when collections change
+-- Event: AFTER UPDATE on BOX_OFFICE table
+-- Action: Queue the movie for sp_refresh_summaries
 -- ========================================================
-CREATE TRIGGER tr_validate_actor_data
-BEFORE INSERT ON ACTORS
+CREATE TRIGGER tr_box_office_summary_update
+AFTER UPDATE ON BOX_OFFICE
 FOR EACH ROW
 BEGIN
-    -- Check for valid popularity score (0-10)
-    IF NEW.popularity_score < 0 OR NEW.popularity_score > 10 THEN
-        SIGNAL SQLSTATE '45000'
-        SET MESSAGE_TEXT = 'Error: Popularity score must be between 0 and 10!';
-    END IF;
-    
-    -- Check for valid birth date (not in future)
-    IF NEW.date_of_birth > CURDATE() THEN
-        SIGNAL SQLSTATE '45000'
-        SET MESSAGE_TEXT = 'Error: Date of birth cannot be in the future!';
-    END IF;
-    
-    -- Check for valid actor name (not empty)
-    IF LENGTH(TRIM(NEW.name)) = 0 THEN
-        SIGNAL SQLSTATE '45000'
-        SET MESSAGE_TEXT = 'Error: Actor name cannot be empty!';
+    INSERT INTO SUMMARY_REFRESH_QUEUE (entity, entity_id)
+    VALUES ('movie', NEW.movie_id)
+    ON DUPLICATE KEY UPDATE queued_at = CURRENT_TIMESTAMP(6);
+
+    IF NEW.movie_id <> OLD.movie_id THEN
+        INSERT INTO SUMMARY_REFRESH_QUEUE (entity, entity_id)
+        VALUES ('movie', OLD.movie_id)
+        ON DUPLICATE KEY UPDATE queued_at = CURRENT_TIMESTAMP(6);
     END IF;
 END //
 
 
 -- ========================================================
--- TRIGGER 10: tr_validate_crew_data
--- Purpose: Ensure valid crew information on insert
--- Event: BEFORE INSERT on PRODUCTION_CREW table
--- Action: Validate experience, name, and role
+-- TRIGGER 12: tr_box_office_summary_delete
+-- Purpose: Keep materialized analytics current when collections change
+-- Event: AFTER DELETE on BOX_OFFICE table
+-- Action: Queue the movie for sp_refresh_summaries
 -- ========================================================
-CREATE TRIGGER tr_validate_crew_data
-BEFORE INSERT ON PRODUCTION_CREW
+CREATE TRIGGER tr_box_office_summary_delete
+AFTER DELETE ON BOX_OFFICE
 FOR EACH ROW
 BEGIN
-    -- Check for valid experience years (non-negative)
-    IF NEW.experience_years < 0 THEN
-        SIGNAL SQLSTATE '45000'
-        SET MESSAGE_TEXT = 'Error: Experience years cannot be negative!';
-    END IF;
-    
-    -- Check for valid name (not empty)
-    IF LENGTH(TRIM(NEW.name)) = 0 THEN
-        SIGNAL SQLSTATE '45000'
-        SET MESSAGE_TEXT = 'Error: Crew name cannot be empty!';
-    END IF;
-    
-    -- Check for valid role (not empty)
-    IF LENGTH(TRIM(NEW.role)) = 0 THEN
-        SIGNAL SQLSTATE '45000'
-        SET MESSAGE_TEXT = 'Error: Crew role cannot be empty!';
-    END IF;
+    INSERT INTO SUMMARY_REFRESH_QUEUE (entity, entity_id)
+    VALUES ('movie', OLD.movie_id)
+    ON DUPLICATE KEY UPDATE queued_at = CURRENT_TIMESTAMP(6);
 END //
 
 
 -- ========================================================
--- ADDITIONAL TRIGGERS (Optional - Advanced)
+-- TRIGGER 13: tr_cast_summary_insert
+-- Purpose: Keep actor counts and filmographies current
+-- Event: AFTER INSERT on MOVIE_CAST table
+-- Action: Queue the movie and actor for sp_refresh_summaries
 -- ========================================================
+CREATE TRIGGER tr_cast_summary_insert
+AFTER INSERT ON MOVIE_CAST
+FOR EACH ROW
+BEGIN
+    INSERT INTO SUMMARY_REFRESH_QUEUE (entity, entity_id)
+    VALUES ('movie', NEW.movie_id), ('actor', NEW.actor_id)
+    ON DUPLICATE KEY UPDATE queued_at = CURRENT_TIMESTAMP(6);
+END //
+
 
 -- ========================================================
--- TRIGGER 11: tr_validate_movie_data
--- Purpose: Validate movie data before insertion
--- Event: BEFORE INSERT on MOVIES table
--- Action: Validate title, duration, and rating
+-- TRIGGER 14: tr_cast_summary_update
+-- Purpose: Keep actor counts and filmographies current
+-- Event: AFTER UPDATE on MOVIE_CAST table
+-- Action: Queue the movie and actor for sp_refresh_summaries
 -- ========================================================
-CREATE TRIGGER tr_validate_movie_data
-BEFORE INSERT ON MOVIES
+CREATE TRIGGER tr_cast_summary_update
+AFTER UPDATE ON MOVIE_CAST
 FOR EACH ROW
 BEGIN
-    -- Check for valid movie title (not empty)
-    IF LENGTH(TRIM(NEW.title)) = 0 THEN
-        SIGNAL SQLSTATE '45000'
-        SET MESSAGE_TEXT = 'Error: Movie title cannot be empty!';
-    END IF;
-    
-    -- Check for valid duration (positive)
-    IF NEW.duration IS NOT NULL AND NEW.duration <= 0 THEN
-        SIGNAL SQLSTATE '45000'
-        SET MESSAGE_TEXT = 'Error: Movie duration must be greater than 0!';
-    END IF;
-    
-    -- Check for valid IMDB rating (0-10)
-    IF NEW.imdb_rating IS NOT NULL AND (NEW.imdb_rating < 0 OR NEW.imdb_rating > 10) THEN
-        SIGNAL SQLSTATE '45000'
-        SET MESSAGE_TEXT = 'Error: IMDB rating must be between 0 and 10!';
-    END IF;
+    INSERT INTO SUMMARY_REFRESH_QUEUE (entity, entity_id)
+    VALUES ('movie', NEW.movie_id), ('actor', NEW.actor_id),
+           ('movie', OLD.movie_id), ('actor', OLD.actor_id)
+    ON DUPLICATE KEY UPDATE queued_at = CURRENT_TIMESTAMP(6);
 END //
 
 
 -- ========================================================
--- TRIGGER 12: tr_log_activity_on_actor_insert
--- Purpose: Log when new actor is added to system
+-- TRIGGER 15: tr_cast_summary_delete
+-- Purpose: Keep actor counts and filmographies current
+-- Event: AFTER DELETE on MOVIE_CAST table
+-- Action: Queue the movie and actor for sp_refresh_summaries
+-- ========================================================
+CREATE TRIGGER tr_cast_summary_delete
+AFTER DELETE ON MOVIE_CAST
+FOR EACH ROW
+BEGIN
+    INSERT INTO SUMMARY_REFRESH_QUEUE (entity, entity_id)
+    VALUES ('movie', OLD.movie_id), ('actor', OLD.actor_id)
+    ON DUPLICATE KEY UPDATE queued_at = CURRENT_TIMESTAMP(6);
+END //
+
+
+-- ========================================================
+-- TRIGGER 16: tr_actor_summary_insert
+-- Purpose: Add new actors to the materialized actor rankings
 -- Event: AFTER INSERT on ACTORS table
--- Action: Insert record into ACTIVITY_LOG
+-- Action: Queue the actor for sp_refresh_summaries
 -- ========================================================
-CREATE TRIGGER tr_log_activity_on_actor_insert
+CREATE TRIGGER tr_actor_summary_insert
 AFTER INSERT ON ACTORS
 FOR EACH ROW
 BEGIN
-    INSERT INTO ACTIVITY_LOG (
-        user_id, 
-        action, 
-        table_name, 
-        record_id, 
-        details
-    )
-    VALUES (
-        1, 
-        'CREATE', 
-        'ACTORS', 
-        NEW.actor_id, 
-        CONCAT('New actor added: ', NEW.name, ' | Popularity: ', NEW.popularity_score)
-    );
+    INSERT INTO SUMMARY_REFRESH_QUEUE (entity, entity_id)
+    VALUES ('actor', NEW.actor_id)
+    ON DUPLICATE KEY UPDATE queued_at = CURRENT_TIMESTAMP(6);
 END //
 
 
 -- ========================================================
--- TRIGGER 13: tr_log_activity_on_crew_insert
--- Purpose: Log when new crew member is added to system
--- Event: AFTER INSERT on PRODUCTION_CREW table
--- Action: Insert record into ACTIVITY_LOG
+-- TRIGGER 17: tr_actor_summary_update
+-- Purpose: Keep actor rankings current when name or popularity changes
+-- Event: AFTER UPDATE on ACTORS table
+-- Action: Queue the actor for sp_refresh_summaries
 -- ========================================================
-CREATE TRIGGER tr_log_activity_on_crew_insert
-AFTER INSERT ON PRODUCTION_CREW
+CREATE TRIGGER tr_actor_summary_update
+AFTER UPDATE ON ACTORS
 FOR EACH ROW
 BEGIN
-    INSERT INTO ACTIVITY_LOG (
-        user_id, 
-        action, 
-        table_name, 
-        record_id, 
-        details
-    )
-    VALUES (
-        1, 
-        'CREATE', 
-        'PRODUCTION_CREW', 
-        NEW.crew_id, 
-        CONCAT('New crew member added: ', NEW.name, ' | Role: ', NEW.role, ' | Experience: ', NEW.experience_years, ' years')
-    );
+    INSERT INTO SUMMARY_REFRESH_QUEUE (entity, entity_id)
+    VALUES ('actor', NEW.actor_id)
+    ON DUPLICATE KEY UPDATE queued_at = CURRENT_TIMESTAMP(6);
 END //
 
 
 -- ========================================================
--- TRIGGER 14: tr_validate_movie_cast
--- Purpose: Validate movie cast data before insertion
--- Event: BEFORE INSERT on MOVIE_CAST table
--- Action: Validate screen time is non-negative
+-- TRIGGER 18: tr_actor_summary_delete
+-- Purpose: Keep actor rankings and movie cast counts current
+-- Event: BEFORE DELETE on ACTORS table
+-- Action: Queue the actor and the movies it appeared in (cascaded
+--         MOVIE_CAST deletes do not fire triggers)
 -- ========================================================
-CREATE TRIGGER tr_validate_movie_cast
-BEFORE INSERT ON MOVIE_CAST
+CREATE TRIGGER tr_actor_summary_delete
+BEFORE DELETE ON ACTORS
 FOR EACH ROW
 BEGIN
-    -- Check for negative screen time
-    IF NEW.screen_time_minutes < 0 THEN
-        SIGNAL SQLSTATE '45000'
-        SET MESSAGE_TEXT = 'Error: Screen time cannot be negative!';
+    INSERT INTO SUMMARY_REFRESH_QUEUE (entity, entity_id)
+    VALUES ('actor', OLD.actor_id)
+    ON DUPLICATE KEY UPDATE queued_at = CURRENT_TIMESTAMP(6);
+
+    INSERT INTO SUMMARY_REFRESH_QUEUE (entity, entity_id)
+    SELECT 'movie', movie_id FROM MOVIE_CAST WHERE actor_id = OLD.actor_id
+    ON DUPLICATE KEY UPDATE queued_at = CURRENT_TIMESTAMP(6);
+END //
+
+
+-- ========================================================
+-- TRIGGER 19: tr_producer_summary_insert
+-- Purpose: Add new producers to the materialized producer stats
+-- Event: AFTER INSERT on PRODUCERS table
+-- Action: Queue the producer for sp_refresh_summaries
+-- ========================================================
+CREATE TRIGGER tr_producer_summary_insert
+AFTER INSERT ON PRODUCERS
+FOR EACH ROW
+BEGIN
+    INSERT INTO SUMMARY_REFRESH_QUEUE (entity, entity_id)
+    VALUES ('producer', NEW.producer_id)
+    ON DUPLICATE KEY UPDATE queued_at = CURRENT_TIMESTAMP(6);
+END //
+
+
+-- ========================================================
+-- TRIGGER 20: tr_producer_summary_update
+-- Purpose: Keep producer stats and movie summaries current on rename
+-- Event: AFTER UPDATE on PRODUCERS table
+-- Action: Queue the producer, and its movies if the name changed
+-- ========================================================
+CREATE TRIGGER tr_producer_summary_update
+AFTER UPDATE ON PRODUCERS
+FOR EACH ROW
+BEGIN
+    INSERT INTO SUMMARY_REFRESH_QUEUE (entity, entity_id)
+    VALUES ('producer', NEW.producer_id)
+    ON DUPLICATE KEY UPDATE queued_at = CURRENT_TIMESTAMP(6);
+
+    IF NOT (NEW.name <=> OLD.name) THEN
+        INSERT INTO SUMMARY_REFRESH_QUEUE (entity, entity_id)
+        SELECT 'movie', movie_id FROM MOVIES WHERE producer_id = NEW.producer_id
+        ON DUPLICATE KEY UPDATE queued_at = CURRENT_TIMESTAMP(6);
     END IF;
-    
-    -- Check for valid role type
-    IF NEW.role_type NOT IN ('Lead', 'Supporting', 'Cameo') THEN
-        SIGNAL SQLSTATE '45000'
-        SET MESSAGE_TEXT = 'Error: Invalid role type! Must be Lead, Supporting, or Cameo.';
+END //
+
+
+-- ========================================================
+-- TRIGGER 21: tr_producer_summary_delete
+-- Purpose: Keep movie summaries current when a producer is removed
+-- Event: BEFORE DELETE on PRODUCERS table
+-- Action: Queue the producer and its movies (ON DELETE SET NULL on
+--         MOVIES does not fire triggers)
+-- ========================================================
+CREATE TRIGGER tr_producer_summary_delete
+BEFORE DELETE ON PRODUCERS
+FOR EACH ROW
+BEGIN
+    INSERT INTO SUMMARY_REFRESH_QUEUE (entity, entity_id)
+    VALUES ('producer', OLD.producer_id)
+    ON DUPLICATE KEY UPDATE queued_at = CURRENT_TIMESTAMP(6);
+
+    INSERT INTO SUMMARY_REFRESH_QUEUE (entity, entity_id)
+    SELECT 'movie', movie_id FROM MOVIES WHERE producer_id = OLD.producer_id
+    ON DUPLICATE KEY UPDATE queued_at = CURRENT_TIMESTAMP(6);
+END //
+
+
+-- ========================================================
+-- TRIGGER 22: tr_language_summary_insert
+-- Purpose: Add new languages to the materialized language summary
+-- Event: AFTER INSERT on LANGUAGES table
+-- Action: Queue the language for sp_refresh_summaries
+-- ========================================================
+CREATE TRIGGER tr_language_summary_insert
+AFTER INSERT ON LANGUAGES
+FOR EACH ROW
+BEGIN
+    INSERT INTO SUMMARY_REFRESH_QUEUE (entity, entity_id)
+    VALUES ('language', NEW.language_id)
+    ON DUPLICATE KEY UPDATE queued_at = CURRENT_TIMESTAMP(6);
+END //
+
+
+-- ========================================================
+-- TRIGGER 23: tr_language_summary_update
+-- Purpose: Keep language names in the summaries current
+-- Event: AFTER UPDATE on LANGUAGES table
+-- Action: Queue the language and, on rename, its movies
+-- ========================================================
+CREATE TRIGGER tr_language_summary_update
+AFTER UPDATE ON LANGUAGES
+FOR EACH ROW
+BEGIN
+    INSERT INTO SUMMARY_REFRESH_QUEUE (entity, entity_id)
+    VALUES ('language', NEW.language_id)
+    ON DUPLICATE KEY UPDATE queued_at = CURRENT_TIMESTAMP(6);
+
+    IF NOT (NEW.language_name <=> OLD.language_name) THEN
+        INSERT INTO SUMMARY_REFRESH_QUEUE (entity, entity_id)
+        SELECT 'movie', movie_id FROM MOVIES WHERE language_id = NEW.language_id
+        ON DUPLICATE KEY UPDATE queued_at = CURRENT_TIMESTAMP(6);
     END IF;
 END //
 
+
+-- ========================================================
+-- TRIGGER 24: tr_movie_deleted
+-- Purpose: Change the movie and box office list ETags when a movie is removed
+-- Event: AFTER DELETE on MOVIES table
+-- Action: Stamp TABLE_DELETIONS; the cascaded BOX_OFFICE delete
+--         fires no trigger of its own
+-- ========================================================
+CREATE TRIGGER tr_movie_deleted
+AFTER DELETE ON MOVIES
+FOR EACH ROW
+BEGIN
+    INSERT INTO TABLE_DELETIONS (table_name)
+    VALUES ('MOVIES'), ('BOX_OFFICE')
+    ON DUPLICATE KEY UPDATE deleted_at = CURRENT_TIMESTAMP(6);
+END //
+
+
+-- ========================================================
+-- TRIGGER 25: tr_box_office_deleted
+-- Purpose: Change the box office list ETag when a row is removed
+-- Event: AFTER DELETE on BOX_OFFICE table
+-- Action: Stamp TABLE_DELETIONS
+-- ========================================================
+CREATE TRIGGER tr_box_office_deleted
+AFTER DELETE ON BOX_OFFICE
+FOR EACH ROW
+BEGIN
+    INSERT INTO TABLE_DELETIONS (table_name)
+    VALUES ('BOX_OFFICE')
+    ON DUPLICATE KEY UPDATE deleted_at = CURRENT_TIMESTAMP(6);
+END //
+
+
+-- ========================================================
+-- TRIGGER 26: tr_actor_deleted
+-- Purpose: Change the actor list ETag when an actor is removed
+-- Event: AFTER DELETE on ACTORS table
+-- Action: Stamp TABLE_DELETIONS
+-- ========================================================
+CREATE TRIGGER tr_actor_deleted
+AFTER DELETE ON ACTORS
+FOR EACH ROW
+BEGIN
+    INSERT INTO TABLE_DELETIONS (table_name)
+    VALUES ('ACTORS')
+    ON DUPLICATE KEY UPDATE deleted_at = CURRENT_TIMESTAMP(6);
+END //
+
+
+-- ========================================================
+-- TRIGGER 27: tr_producer_deleted
+-- Purpose: Change the movie list ETag when a producer is removed
+-- Event: AFTER DELETE on PRODUCERS table
+-- Action: Stamp TABLE_DELETIONS for MOVIES: ON DELETE SET NULL
+--         rewrites producer_id without touching updated_at
+-- ========================================================
+CREATE TRIGGER tr_producer_deleted
+AFTER DELETE ON PRODUCERS
+FOR EACH ROW
+BEGIN
+    INSERT INTO TABLE_DELETIONS (table_name)
+    VALUES ('MOVIES')
+    ON DUPLICATE KEY UPDATE deleted_at = CURRENT_TIMESTAMP(6);
+END //
+
 DELIMITER ;
 
 -- ========================================================
 -- TRIGGERS CREATED SUCCESSFULLY
 -- ========================================================
--- Core Triggers: 10
--- Additional Triggers: 4
--- Total Triggers: 14
+-- Core Triggers: 6
+-- Summary Refresh Triggers: 17
+-- List ETag Triggers: 4
+-- Total Triggers: 27
 -- ========================================================
 -- Trigger Categories:
 -- - Audit Logging: tr_movie_insert_audit, tr_movie_update_audit, 
---                  tr_movie_delete_audit, tr_box_office_insert_audit,
---                  tr_log_activity_on_actor_insert, 
---                  tr_log_activity_on_crew_insert
--- - Data Validation: tr_box_office_validation, tr_validate_actor_data,
---                    tr_validate_crew_data, tr_validate_movie_data,
---                    tr_validate_movie_cast
--- - Business Rules: tr_prevent_duplicate_cast, tr_prevent_duplicate_crew
+--                  tr_movie_delete_audit, tr_box_office_insert_audit
+-- - Data Validation: tr_validate_actor_data
 -- - Auto-update: tr_update_movie_stats
--- ========================================================
\ No newline at end of file
+-- - Summary Refresh Queue: tr_movie_summary_*, tr_box_office_summary_*,
+--                          tr_cast_summary_*, tr_actor_summary_*,
+--                          tr_producer_summary_*, tr_language_summary_*
+-- - List ETags: tr_movie_deleted, tr_box_office_deleted,
+--               tr_actor_deleted, tr_producer_deleted
+-- ========================================================
+-- Validation and duplicate checks are named constraints on the tables
+-- (see 01_create_tables.sql; the API maps them to messages in
+-- app/utils/validators.py). Actor/crew activity rows are written by the
+-- API's batched audit pipeline instead of per-row triggers. The audit
+-- triggers skip sessions with @app_audit set (API connections when
+-- AUDIT_MODE=async); the pipeline writes those audit rows in batches.
+-- ========================================================
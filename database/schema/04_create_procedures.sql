@@ -1,276 +1,4 @@
-NSERT INTO BOX_OFFICE (movie_id, collection_status) VALUES (p_movie_id, 'pending');
-    
-    INSERT INTO ACTIVITY_LOG (user_id, action, table_name, record_id, details)
-    VALUES (p_created_by, 'CREATE', 'MOVIES', p_movie_id, CONCAT('Movie added: ', p_title));
-    
-    COMMIT;
-END //
-
-
--- PROCEDURE 2: Update Box Office Collections
-CREATE PROCEDURE sp_update_box_office(
-    IN p_movie_id INT,
-    IN p_domestic DECIMAL(15,2),
-    IN p_intl DECIMAL(15,2),
-    IN p_opening_weekend DECIMAL(15,2),
-    IN p_profit_margin DECIMAL(5,2),
-    IN p_screens INT,
-    IN p_updated_by INT
-)
-BEGIN
-    DECLARE v_old_domestic DECIMAL(15,2);
-    DECLARE v_old_intl DECIMAL(15,2);
-    DECLARE v_old_margin DECIMAL(5,2);
-    DECLARE v_box_id INT;
-    DECLARE EXIT HANDLER FOR SQLEXCEPTION
-    BEGIN
-        ROLLBACK;
-        SELECT 'Error: Unable to update box office' AS error_message;
-    END;
-    
-    START TRANSACTION;
-    
-    SELECT box_id, domestic_collection, intl_collection, profit_margin 
-    INTO v_box_id, v_old_domestic, v_old_intl, v_old_margin
-    FROM BOX_OFFICE WHERE movie_id = p_movie_id;
-    
-    UPDATE BOX_OFFICE
-    SET domestic_collection = p_domestic,
-        intl_collection = p_intl,
-        opening_weekend = p_opening_weekend,
-        profit_margin = p_profit_margin,
-        release_screens = p_screens,
-        updated_by = p_updated_by,
-        collection_status = 'updated'
-    WHERE movie_id = p_movie_id;
-    
-    INSERT INTO BOX_OFFICE_AUDIT (box_id, movie_id, old_domestic, new_domestic, old_intl, new_intl, old_margin, new_margin, modified_by, operation_type)
-    VALUES (v_box_id, p_movie_id, v_old_domestic, p_domestic, v_old_intl, p_intl, v_old_margin, p_profit_margin, (SELECT username FROM USERS WHERE user_id = p_updated_by), 'UPDATE');
-    
-    INSERT INTO ACTIVITY_LOG (user_id, action, table_name, record_id, details)
-    VALUES (p_updated_by, 'UPDATE', 'BOX_OFFICE', p_movie_id, CONCAT('Box office updated: ', p_domestic, ' (Domestic), ', p_intl, ' (International)'));
-    
-    COMMIT;
-END //
-
-
--- PROCEDURE 3: Add Cast to Movie
-CREATE PROCEDURE sp_add_cast_to_movie(
-    IN p_movie_id INT,
-    IN p_actor_id INT,
-    IN p_role_name VARCHAR(100),
-    IN p_role_type VARCHAR(20),
-    IN p_screen_time INT
-)
-BEGIN
-    DECLARE EXIT HANDLER FOR SQLEXCEPTION
-    BEGIN
-        ROLLBACK;
-        SELECT 'Error: Unable to add cast' AS error_message;
-    END;
-    
-    START TRANSACTION;
-    
-    INSERT INTO MOVIE_CAST (movie_id, actor_id, role_name, role_type, screen_time_minutes)
-    VALUES (p_movie_id, p_actor_id, p_role_name, p_role_type, p_screen_time);
-    
-    COMMIT;
-END //
-
-
--- PROCEDURE 4: Get Movie Details (Nested Query - 3 result sets)
-CREATE PROCEDURE sp_get_movie_details(IN p_movie_id INT)
-BEGIN
-    SELECT 
-        m.movie_id,
-        m.title,
-        m.release_date,
-        l.language_name,
-        m.duration,
-        m.certification,
-        m.budget,
-        m.ott_rights_value,
-        m.imdb_rating,
-        p.name AS producer_name,
-        GROUP_CONCAT(DISTINCT g.genre_name SEPARATOR ', ') AS genres
-    FROM MOVIES m
-    LEFT JOIN LANGUAGES l ON m.language_id = l.language_id
-    LEFT JOIN PRODUCERS p ON m.producer_id = p.producer_id
-    LEFT JOIN MOVIE_GENRES mg ON m.movie_id = mg.movie_id
-    LEFT JOIN GENRES g ON mg.genre_id = g.genre_id
-    WHERE m.movie_id = p_movie_id
-    GROUP BY m.movie_id;
-    
-    SELECT 
-        a.actor_id,
-        a.name,
-        mc.role_name,
-        mc.role_type,
-        mc.screen_time_minutes
-    FROM MOVIE_CAST mc
-    JOIN ACTORS a ON mc.actor_id = a.actor_id
-    WHERE mc.movie_id = p_movie_id;
-    
-    SELECT 
-        pc.crew_id,
-        pc.name,
-        pc.role,
-        mc.role_description
-    FROM MOVIE_CREW mc
-    JOIN PRODUCTION_CREW pc ON mc.crew_id = pc.crew_id
-    WHERE mc.movie_id = p_movie_id;
-END //
-
-
--- PROCEDURE 5: Get Profit Analysis (Join Query)
-CREATE PROCEDURE sp_get_profit_analysis(IN p_movie_id INT)
-BEGIN
-    SELECT 
-        m.title,
-        m.budget,
-        bo.domestic_collection,
-        bo.intl_collection,
-        bo.total_collection,
-        (bo.total_collection - m.budget) AS net_profit,
-        ROUND(((bo.total_collection - m.budget) / m.budget * 100), 2) AS profit_percentage,
-        bo.opening_weekend,
-        bo.release_screens,
-        bo.profit_margin
-    FROM MOVIES m
-    LEFT JOIN BOX_OFFICE bo ON m.movie_id = bo.movie_id
-    WHERE m.movie_id = p_movie_id;
-END //
-
--- Procedure 1: Get Movie Analytics
-DELIMITER //
-
-DROP PROCEDURE IF EXISTS GetMovieAnalytics//
-
-CREATE PROCEDURE GetMovieAnalytics(IN movie_id_param INT)
-BEGIN
-    SELECT 
-        m.title,
-        m.budget,
-        b.total_collection,
-        (b.total_collection - m.budget) as profit,
-        CASE 
-            WHEN b.total_collection > m.budget THEN 'Profit'
-            ELSE 'Loss'
-        END as status,
-        m.imdb_rating,
-        GROUP_CONCAT(g.genre_name) as genres
-    FROM MOVIES m
-    LEFT JOIN BOX_OFFICE b ON m.movie_id = b.movie_id
-    LEFT JOIN MOVIE_GENRES mg ON m.movie_id = mg.movie_id
-    LEFT JOIN GENRES g ON mg.genre_id = g.genre_id
-    WHERE m.movie_id = movie_id_param
-    GROUP BY m.movie_id;
-END//
-
-DELIMITER ;
-
--- Procedure 2: Search Movies by Criteria
-DELIMITER //
-
-DROP PROCEDURE IF EXISTS SearchMovies//
-
-CREATE PROCEDURE SearchMovies(
-    IN search_title VARCHAR(200),
-    IN search_genre VARCHAR(50),
-    IN min_rating DECIMAL(3,1),
-    IN max_budget DECIMAL(15,2)
-)
-BEGIN
-    SELECT DISTINCT
-        m.movie_id,
-        m.title,
-        m.release_date,
-        m.imdb_rating,
-        m.budget,
-        p.name as producer_name,
-        GROUP_CONCAT(DISTINCT g.genre_name) as genres
-    FROM MOVIES m
-    LEFT JOIN PRODUCERS p ON m.producer_id = p.producer_id
-    LEFT JOIN MOVIE_GENRES mg ON m.movie_id = mg.movie_id
-    LEFT JOIN GENRES g ON mg.genre_id = g.genre_id
-    WHERE 
-        (search_title IS NULL OR m.title LIKE CONCAT('%', search_title, '%'))
-        AND (search_genre IS NULL OR g.genre_name = search_genre)
-        AND (min_rating IS NULL OR m.imdb_rating >= min_rating)
-        AND (max_budget IS NULL OR m.budget <= max_budget)
-    GROUP BY m.movie_id
-    ORDER BY m.imdb_rating DESC;
-END//
-
-DELIMITER ;
-
--- Procedure 3: Get Producer Statistics
-DELIMITER //
-
-DROP PROCEDURE IF EXISTS GetProducerStats//
-
-CREATE PROCEDURE GetProducerStats(IN producer_id_param INT)
-BEGIN
-    SELECT 
-        p.name,
-        p.company,
-        COUNT(m.movie_id) as total_movies,
-        AVG(m.imdb_rating) as avg_rating,
-        SUM(b.total_collection) as total_collection,
-        SUM(m.budget) as total_budget,
-        (SUM(b.total_collection) - SUM(m.budget)) as net_profit,
-        MAX(b.total_collection) as highest_grosser
-    FROM PRODUCERS p
-    LEFT JOIN MOVIES m ON p.producer_id = m.producer_id
-    LEFT JOIN BOX_OFFICE b ON m.movie_id = b.movie_id
-    WHERE p.producer_id = producer_id_param
-    GROUP BY p.producer_id;
-END//
-
-DELIMITER ;
-
--- Procedure 4: Add Movie with Genres (Transaction example)
-DELIMITER //
-
-DROP PROCEDURE IF EXISTS AddMovieWithGenres//
-
-CREATE PROCEDURE AddMovieWithGenres(
-    IN movie_title VARCHAR(200),
-    IN release_dt DATE,
-    IN lang VARCHAR(50),
-    IN dur INT,
-    IN cert VARCHAR(10),
-    IN budg DECIMAL(15,2),
-    IN rating DECIMAL(3,1),
-    IN prod_id INT,
-    IN genre_ids VARCHAR(100)  -- comma-separated genre IDs
-)
-BEGIN
-    DECLARE new_movie_id INT;
-    DECLARE genre_id_val INT;
-    DECLARE genre_pos INT;
-    DECLARE genre_list VARCHAR(100);
-    
-    DECLARE EXIT HANDLER FOR SQLEXCEPTION
-    BEGIN
-        ROLLBACK;
-        SIGNAL SQLSTATE '45000' SET MESSAGE_TEXT = 'Error adding movie';
-    END;
-    
-    START TRANSACTION;
-    
-    -- Insert movie
-    INSERT INTO MOVIES (title, release_date, language, duration, certification, 
-                       budget, imdb_rating, producer_id)
-    VALUES (movie_title, release_dt, lang, dur, cert, budg, rating, prod_id);
-    
-    SET new_movie_id = LAST_INSERT_ID();
-    
-    -- Insert genres
-    SET genre_list = CONCAT(genre_ids, ',');
-    
-    WHILE LENGTH(genre_list) > 0 DO
-        SET genre_pos = LOCATE(-- =====================================================
+-- =====================================================
 -- INDIAN MOVIE DATABASE - STORED PROCEDURES
 -- =====================================================
 -- File 1 of 3: STORED PROCEDURES (10 Procedures)
@@ -515,10 +243,18 @@ BEGIN
         p.name AS producer_name,
         p.company AS producer_company,
         GROUP_CONCAT(DISTINCT g.genre_name SEPARATOR ', ') AS genres,
-        fn_get_movie_status(m.movie_id) AS movie_status
+        -- Same rules as fn_get_movie_status, from the joined row
+        CASE
+            WHEN m.release_date IS NULL THEN 'Not Scheduled'
+            WHEN m.release_date > CURDATE() THEN 'Upcoming'
+            WHEN m.release_date = CURDATE() THEN 'Releasing Today'
+            WHEN bo.total_collection IS NULL THEN 'Released (Collection Pending)'
+            ELSE 'Released'
+        END AS movie_status
     FROM MOVIES m
     LEFT JOIN LANGUAGES l ON m.language_id = l.language_id
     LEFT JOIN PRODUCERS p ON m.producer_id = p.producer_id
+    LEFT JOIN BOX_OFFICE bo ON m.movie_id = bo.movie_id
     LEFT JOIN MOVIE_GENRES mg ON m.movie_id = mg.movie_id
     LEFT JOIN GENRES g ON mg.genre_id = g.genre_id
     WHERE m.movie_id = p_movie_id
@@ -568,7 +304,9 @@ BEGIN
         bo.intl_collection,
         bo.total_collection,
         (bo.total_collection - m.budget) AS net_profit,
-        fn_calculate_profit_percentage(m.budget, bo.total_collection) AS profit_percentage,
+        CASE WHEN m.budget = 0 OR m.budget IS NULL THEN 0
+             ELSE ROUND((bo.total_collection - m.budget) / m.budget * 100, 2)
+        END AS profit_percentage,
         bo.opening_weekend,
         bo.release_screens,
         bo.profit_margin,
@@ -591,18 +329,16 @@ END //
 -- ========================================================
 CREATE PROCEDURE sp_get_language_box_office_summary()
 BEGIN
+    -- Materialized by sp_refresh_summaries
     SELECT 
-        l.language_name,
-        COUNT(m.movie_id) AS total_movies,
-        SUM(m.budget) AS total_budget,
-        SUM(bo.total_collection) AS total_collection,
-        AVG(bo.total_collection) AS avg_collection,
-        MAX(bo.total_collection) AS highest_collection,
-        AVG(m.imdb_rating) AS avg_rating
-    FROM LANGUAGES l
-    LEFT JOIN MOVIES m ON l.language_id = m.language_id
-    LEFT JOIN BOX_OFFICE bo ON m.movie_id = bo.movie_id
-    GROUP BY l.language_id, l.language_name
+        language_name,
+        total_movies,
+        total_budget,
+        total_collection,
+        avg_collection,
+        highest_collection,
+        avg_rating
+    FROM LANGUAGE_SUMMARY
     ORDER BY total_collection DESC;
 END //
 
@@ -615,18 +351,16 @@ END //
 -- ========================================================
 CREATE PROCEDURE sp_get_top_actors(IN p_limit INT)
 BEGIN
+    -- Materialized by sp_refresh_summaries
     SELECT 
-        a.actor_id,
-        a.name,
-        a.gender,
-        a.popularity_score,
-        COUNT(DISTINCT mc.movie_id) AS movie_count,
-        GROUP_CONCAT(DISTINCT m.title SEPARATOR ', ') AS movies
-    FROM ACTORS a
-    LEFT JOIN MOVIE_CAST mc ON a.actor_id = mc.actor_id
-    LEFT JOIN MOVIES m ON mc.movie_id = m.movie_id
-    GROUP BY a.actor_id
-    ORDER BY a.popularity_score DESC
+        actor_id,
+        name,
+        gender,
+        popularity_score,
+        movie_count,
+        movies
+    FROM ACTOR_SUMMARY
+    ORDER BY popularity_score DESC, actor_id DESC
     LIMIT p_limit;
 END //
 
@@ -711,7 +445,137 @@ DELIMITER ;
 -- Total Procedures: 10
 -- Types: CRUD, Nested Queries, Join Queries, 
 --        Aggregate Queries, Analytical Queries
--- ========================================================',', genre_list);
+-- ========================================================
+
+-- Procedure 1: Get Movie Analytics
+DELIMITER //
+
+DROP PROCEDURE IF EXISTS GetMovieAnalytics//
+
+CREATE PROCEDURE GetMovieAnalytics(IN movie_id_param INT)
+BEGIN
+    SELECT 
+        m.title,
+        m.budget,
+        b.total_collection,
+        (b.total_collection - m.budget) as profit,
+        CASE 
+            WHEN b.total_collection > m.budget THEN 'Profit'
+            ELSE 'Loss'
+        END as status,
+        m.imdb_rating,
+        GROUP_CONCAT(g.genre_name) as genres
+    FROM MOVIES m
+    LEFT JOIN BOX_OFFICE b ON m.movie_id = b.movie_id
+    LEFT JOIN MOVIE_GENRES mg ON m.movie_id = mg.movie_id
+    LEFT JOIN GENRES g ON mg.genre_id = g.genre_id
+    WHERE m.movie_id = movie_id_param
+    GROUP BY m.movie_id;
+END//
+
+DELIMITER ;
+
+-- Procedure 2: Search Movies by Criteria
+DELIMITER //
+
+DROP PROCEDURE IF EXISTS SearchMovies//
+
+CREATE PROCEDURE SearchMovies(
+    IN search_title VARCHAR(200),
+    IN search_genre VARCHAR(50),
+    IN min_rating DECIMAL(3,1),
+    IN max_budget DECIMAL(15,2)
+)
+BEGIN
+    SELECT DISTINCT
+        m.movie_id,
+        m.title,
+        m.release_date,
+        m.imdb_rating,
+        m.budget,
+        p.name as producer_name,
+        GROUP_CONCAT(DISTINCT g.genre_name) as genres
+    FROM MOVIES m
+    LEFT JOIN PRODUCERS p ON m.producer_id = p.producer_id
+    LEFT JOIN MOVIE_GENRES mg ON m.movie_id = mg.movie_id
+    LEFT JOIN GENRES g ON mg.genre_id = g.genre_id
+    WHERE 
+        -- Prefix full-text match on ft_movie_title instead of a leading-wildcard LIKE
+        (search_title IS NULL OR MATCH(m.title) AGAINST (CONCAT(search_title, '*') IN BOOLEAN MODE))
+        AND (search_genre IS NULL OR g.genre_name = search_genre)
+        AND (min_rating IS NULL OR m.imdb_rating >= min_rating)
+        AND (max_budget IS NULL OR m.budget <= max_budget)
+    GROUP BY m.movie_id
+    ORDER BY m.imdb_rating DESC;
+END//
+
+DELIMITER ;
+
+-- Procedure 3: Get Producer Statistics
+DELIMITER //
+
+DROP PROCEDURE IF EXISTS GetProducerStats//
+
+CREATE PROCEDURE GetProducerStats(IN producer_id_param INT)
+BEGIN
+    -- Materialized by sp_refresh_summaries
+    SELECT 
+        name,
+        company,
+        total_movies,
+        avg_rating,
+        total_collection,
+        total_budget,
+        net_profit,
+        highest_grosser
+    FROM PRODUCER_SUMMARY
+    WHERE producer_id = producer_id_param;
+END//
+
+DELIMITER ;
+
+-- Procedure 4: Add Movie with Genres (Transaction example)
+DELIMITER //
+
+DROP PROCEDURE IF EXISTS AddMovieWithGenres//
+
+CREATE PROCEDURE AddMovieWithGenres(
+    IN movie_title VARCHAR(200),
+    IN release_dt DATE,
+    IN lang VARCHAR(50),
+    IN dur INT,
+    IN cert VARCHAR(10),
+    IN budg DECIMAL(15,2),
+    IN rating DECIMAL(3,1),
+    IN prod_id INT,
+    IN genre_ids VARCHAR(100)  -- comma-separated genre IDs
+)
+BEGIN
+    DECLARE new_movie_id INT;
+    DECLARE genre_id_val INT;
+    DECLARE genre_pos INT;
+    DECLARE genre_list VARCHAR(100);
+    
+    DECLARE EXIT HANDLER FOR SQLEXCEPTION
+    BEGIN
+        ROLLBACK;
+        SIGNAL SQLSTATE '45000' SET MESSAGE_TEXT = 'Error adding movie';
+    END;
+    
+    START TRANSACTION;
+    
+    -- Insert movie
+    INSERT INTO MOVIES (title, release_date, language, duration, certification, 
+                       budget, imdb_rating, producer_id)
+    VALUES (movie_title, release_dt, lang, dur, cert, budg, rating, prod_id);
+    
+    SET new_movie_id = LAST_INSERT_ID();
+    
+    -- Insert genres
+    SET genre_list = CONCAT(genre_ids, ',');
+    
+    WHILE LENGTH(genre_list) > 0 DO
+        SET genre_pos = LOCATE(',', genre_list);
         SET genre_id_val = CAST(SUBSTRING(genre_list, 1, genre_pos - 1) AS UNSIGNED);
         
         INSERT INTO MOVIE_GENRES (movie_id, genre_id)
@@ -726,3 +590,214 @@ DELIMITER ;
 END//
 
 DELIMITER ;
+
+
+-- ========================================================
+-- MATERIALIZED ANALYTICS REFRESH
+-- ========================================================
+-- Triggers enqueue changed keys into SUMMARY_REFRESH_QUEUE; these
+-- procedures recompute only the queued rows of MOVIE_SUMMARY,
+-- LANGUAGE_SUMMARY, PRODUCER_SUMMARY and ACTOR_SUMMARY.
+-- ========================================================
+
+DELIMITER //
+
+-- ========================================================
+-- PROCEDURE: sp_refresh_summaries
+-- Purpose: Drain SUMMARY_REFRESH_QUEUE incrementally
+-- Input: None
+-- Output: Number of queued keys processed (0 if another session
+--         is already refreshing)
+-- ========================================================
+DROP PROCEDURE IF EXISTS sp_refresh_summaries//
+
+CREATE PROCEDURE sp_refresh_summaries()
+BEGIN
+    DECLARE v_processed INT DEFAULT 0;
+
+    DECLARE EXIT HANDLER FOR SQLEXCEPTION
+    BEGIN
+        ROLLBACK;
+        DO RELEASE_LOCK('summary_refresh');
+        RESIGNAL;
+    END;
+
+    -- One refresher at a time across all API workers
+    IF GET_LOCK('summary_refresh', 0) = 1 THEN
+        -- Snapshot of the queue; rows re-queued while we run keep a newer
+        -- queued_at and survive the final delete
+        DROP TEMPORARY TABLE IF EXISTS tmp_refresh_queue;
+        CREATE TEMPORARY TABLE tmp_refresh_queue (
+            entity VARCHAR(20) NOT NULL,
+            entity_id INT NOT NULL,
+            queued_at TIMESTAMP(6) NOT NULL,
+            PRIMARY KEY (entity, entity_id)
+        );
+        INSERT INTO tmp_refresh_queue
+        SELECT entity, entity_id, queued_at FROM SUMMARY_REFRESH_QUEUE;
+        SET v_processed = ROW_COUNT();
+
+        -- Keys to recompute: the queue plus the old and new language and
+        -- producer of every queued movie
+        DROP TEMPORARY TABLE IF EXISTS tmp_refresh_keys;
+        CREATE TEMPORARY TABLE tmp_refresh_keys (
+            entity VARCHAR(20) NOT NULL,
+            entity_id INT NOT NULL,
+            PRIMARY KEY (entity, entity_id)
+        );
+        INSERT INTO tmp_refresh_keys
+        SELECT entity, entity_id FROM tmp_refresh_queue;
+
+        INSERT IGNORE INTO tmp_refresh_keys
+        SELECT 'language', ms.language_id
+        FROM tmp_refresh_queue q
+        JOIN MOVIE_SUMMARY ms ON q.entity = 'movie' AND ms.movie_id = q.entity_id
+        WHERE ms.language_id IS NOT NULL;
+
+        INSERT IGNORE INTO tmp_refresh_keys
+        SELECT 'producer', ms.producer_id
+        FROM tmp_refresh_queue q
+        JOIN MOVIE_SUMMARY ms ON q.entity = 'movie' AND ms.movie_id = q.entity_id
+        WHERE ms.producer_id IS NOT NULL;
+
+        INSERT IGNORE INTO tmp_refresh_keys
+        SELECT 'language', m.language_id
+        FROM tmp_refresh_queue q
+        JOIN MOVIES m ON q.entity = 'movie' AND m.movie_id = q.entity_id;
+
+        INSERT IGNORE INTO tmp_refresh_keys
+        SELECT 'producer', m.producer_id
+        FROM tmp_refresh_queue q
+        JOIN MOVIES m ON q.entity = 'movie' AND m.movie_id = q.entity_id
+        WHERE m.producer_id IS NOT NULL;
+
+        START TRANSACTION;
+
+        -- Movies first: language and producer rows aggregate MOVIE_SUMMARY
+        DELETE ms FROM MOVIE_SUMMARY ms
+        JOIN tmp_refresh_keys k ON k.entity = 'movie' AND k.entity_id = ms.movie_id;
+
+        INSERT INTO MOVIE_SUMMARY (
+            movie_id, title, language_id, language_name, producer_id, producer_name,
+            release_date, budget, total_collection, domestic_collection, intl_collection,
+            opening_weekend, release_screens, profit_margin, net_profit,
+            profit_percentage, imdb_rating, actor_count
+        )
+        SELECT
+            m.movie_id, m.title, m.language_id, l.language_name, m.producer_id, p.name,
+            m.release_date, m.budget, bo.total_collection, bo.domestic_collection,
+            bo.intl_collection, bo.opening_weekend, bo.release_screens, bo.profit_margin,
+            (bo.total_collection - m.budget),
+            CASE WHEN m.budget > 0
+                 THEN ROUND(((bo.total_collection - m.budget) / m.budget * 100), 2)
+            END,
+            m.imdb_rating,
+            (SELECT COUNT(*) FROM MOVIE_CAST mc WHERE mc.movie_id = m.movie_id)
+        FROM tmp_refresh_keys k
+        JOIN MOVIES m ON k.entity = 'movie' AND m.movie_id = k.entity_id
+        LEFT JOIN LANGUAGES l ON m.language_id = l.language_id
+        LEFT JOIN PRODUCERS p ON m.producer_id = p.producer_id
+        LEFT JOIN BOX_OFFICE bo ON m.movie_id = bo.movie_id;
+
+        DELETE ls FROM LANGUAGE_SUMMARY ls
+        JOIN tmp_refresh_keys k ON k.entity = 'language' AND k.entity_id = ls.language_id;
+
+        INSERT INTO LANGUAGE_SUMMARY (
+            language_id, language_name, total_movies, rated_movies, total_budget,
+            total_collection, avg_collection, highest_collection, avg_rating
+        )
+        SELECT
+            l.language_id, l.language_name,
+            COUNT(ms.movie_id), COUNT(ms.imdb_rating), SUM(ms.budget),
+            SUM(ms.total_collection), AVG(ms.total_collection),
+            MAX(ms.total_collection), AVG(ms.imdb_rating)
+        FROM tmp_refresh_keys k
+        JOIN LANGUAGES l ON k.entity = 'language' AND l.language_id = k.entity_id
+        LEFT JOIN MOVIE_SUMMARY ms ON ms.language_id = l.language_id
+        GROUP BY l.language_id, l.language_name;
+
+        DELETE ps FROM PRODUCER_SUMMARY ps
+        JOIN tmp_refresh_keys k ON k.entity = 'producer' AND k.entity_id = ps.producer_id;
+
+        INSERT INTO PRODUCER_SUMMARY (
+            producer_id, name, company, total_movies, avg_rating, total_collection,
+            total_budget, net_profit, highest_grosser
+        )
+        SELECT
+            p.producer_id, p.name, p.company,
+            COUNT(ms.movie_id), AVG(ms.imdb_rating), SUM(ms.total_collection),
+            SUM(ms.budget), (SUM(ms.total_collection) - SUM(ms.budget)),
+            MAX(ms.total_collection)
+        FROM tmp_refresh_keys k
+        JOIN PRODUCERS p ON k.entity = 'producer' AND p.producer_id = k.entity_id
+        LEFT JOIN MOVIE_SUMMARY ms ON ms.producer_id = p.producer_id
+        GROUP BY p.producer_id, p.name, p.company;
+
+        DELETE s FROM ACTOR_SUMMARY s
+        JOIN tmp_refresh_keys k ON k.entity = 'actor' AND k.entity_id = s.actor_id;
+
+        INSERT INTO ACTOR_SUMMARY (
+            actor_id, name, gender, popularity_score, movie_count, movies
+        )
+        SELECT
+            a.actor_id, a.name, a.gender, a.popularity_score,
+            COUNT(DISTINCT mc.movie_id),
+            GROUP_CONCAT(DISTINCT m.title SEPARATOR ', ')
+        FROM tmp_refresh_keys k
+        JOIN ACTORS a ON k.entity = 'actor' AND a.actor_id = k.entity_id
+        LEFT JOIN MOVIE_CAST mc ON a.actor_id = mc.actor_id
+        LEFT JOIN MOVIES m ON mc.movie_id = m.movie_id
+        GROUP BY a.actor_id, a.name, a.gender, a.popularity_score;
+
+        DELETE rq FROM SUMMARY_REFRESH_QUEUE rq
+        JOIN tmp_refresh_queue q
+          ON q.entity = rq.entity AND q.entity_id = rq.entity_id
+         AND q.queued_at = rq.queued_at;
+
+        COMMIT;
+
+        DROP TEMPORARY TABLE tmp_refresh_keys;
+        DROP TEMPORARY TABLE tmp_refresh_queue;
+        DO RELEASE_LOCK('summary_refresh');
+    END IF;
+
+    SELECT v_processed AS refreshed;
+END //
+
+
+-- ========================================================
+-- PROCEDURE: sp_rebuild_summaries
+-- Purpose: Queue every entity and refresh (initial load or repair)
+-- Input: None
+-- Output: Number of keys processed
+-- ========================================================
+DROP PROCEDURE IF EXISTS sp_rebuild_summaries//
+
+CREATE PROCEDURE sp_rebuild_summaries()
+BEGIN
+    -- Rows whose source entity no longer exists
+    DELETE FROM MOVIE_SUMMARY WHERE movie_id NOT IN (SELECT movie_id FROM MOVIES);
+    DELETE FROM LANGUAGE_SUMMARY WHERE language_id NOT IN (SELECT language_id FROM LANGUAGES);
+    DELETE FROM PRODUCER_SUMMARY WHERE producer_id NOT IN (SELECT producer_id FROM PRODUCERS);
+    DELETE FROM ACTOR_SUMMARY WHERE actor_id NOT IN (SELECT actor_id FROM ACTORS);
+
+    INSERT INTO SUMMARY_REFRESH_QUEUE (entity, entity_id)
+    SELECT 'movie', movie_id FROM MOVIES
+    ON DUPLICATE KEY UPDATE queued_at = CURRENT_TIMESTAMP(6);
+
+    INSERT INTO SUMMARY_REFRESH_QUEUE (entity, entity_id)
+    SELECT 'language', language_id FROM LANGUAGES
+    ON DUPLICATE KEY UPDATE queued_at = CURRENT_TIMESTAMP(6);
+
+    INSERT INTO SUMMARY_REFRESH_QUEUE (entity, entity_id)
+    SELECT 'producer', producer_id FROM PRODUCERS
+    ON DUPLICATE KEY UPDATE queued_at = CURRENT_TIMESTAMP(6);
+
+    INSERT INTO SUMMARY_REFRESH_QUEUE (entity, entity_id)
+    SELECT 'actor', actor_id FROM ACTORS
+    ON DUPLICATE KEY UPDATE queued_at = CURRENT_TIMESTAMP(6);
+
+    CALL sp_refresh_summaries();
+END //
+
+DELIMITER ;
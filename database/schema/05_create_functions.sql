@@ -38,6 +38,8 @@ END //
 -- Returns: VARCHAR(50)
 -- Statuses: Not Scheduled, Upcoming, Releasing Today, 
 --           Released (Collection Pending), Released
+-- Note: Single-movie lookups only; queries over many movies
+--       should read movie_status from vw_movie_financials
 -- ========================================================
 CREATE FUNCTION fn_get_movie_status(p_movie_id INT)
 RETURNS VARCHAR(50)
@@ -48,15 +50,12 @@ BEGIN
     DECLARE v_release_date DATE;
     DECLARE v_total_collection DECIMAL(15,2);
     
-    -- Get release date from MOVIES table
-    SELECT release_date INTO v_release_date 
-    FROM MOVIES 
-    WHERE movie_id = p_movie_id;
-    
-    -- Get total collection from BOX_OFFICE table
-    SELECT total_collection INTO v_total_collection 
-    FROM BOX_OFFICE 
-    WHERE movie_id = p_movie_id;
+    -- Get release date and total collection in one lookup
+    SELECT m.release_date, bo.total_collection
+    INTO v_release_date, v_total_collection
+    FROM MOVIES m
+    LEFT JOIN BOX_OFFICE bo ON m.movie_id = bo.movie_id
+    WHERE m.movie_id = p_movie_id;
     
     -- Determine status based on conditions
     IF v_release_date IS NULL THEN
@@ -119,6 +118,7 @@ END //
 -- Input: Actor ID
 -- Output: Count of movies
 -- Returns: INT
+-- Note: Set-based equivalent is vw_actor_stats.movie_count
 -- ========================================================
 CREATE FUNCTION fn_get_actor_movie_count(p_actor_id INT)
 RETURNS INT
@@ -185,6 +185,7 @@ END //
 -- Input: Movie ID
 -- Output: Net profit amount
 -- Returns: DECIMAL(15,2)
+-- Note: Set-based equivalent is vw_movie_financials.net_profit
 -- ========================================================
 CREATE FUNCTION fn_calculate_total_profit(p_movie_id INT)
 RETURNS DECIMAL(15,2)
@@ -195,15 +196,12 @@ BEGIN
     DECLARE v_collection DECIMAL(15,2);
     DECLARE v_profit DECIMAL(15,2);
     
-    -- Get budget from MOVIES table
-    SELECT budget INTO v_budget
-    FROM MOVIES
-    WHERE movie_id = p_movie_id;
-    
-    -- Get total collection from BOX_OFFICE table
-    SELECT total_collection INTO v_collection
-    FROM BOX_OFFICE
-    WHERE movie_id = p_movie_id;
+    -- Get budget and total collection in one lookup
+    SELECT m.budget, bo.total_collection
+    INTO v_budget, v_collection
+    FROM MOVIES m
+    LEFT JOIN BOX_OFFICE bo ON m.movie_id = bo.movie_id
+    WHERE m.movie_id = p_movie_id;
     
     -- Calculate profit (Collection - Budget)
     SET v_profit = COALESCE(v_collection, 0) - COALESCE(v_budget, 0);
@@ -218,6 +216,7 @@ END //
 -- Input: Movie ID
 -- Output: Boolean (1 = Yes, 0 = No)
 -- Returns: INT (0 or 1)
+-- Note: Set-based equivalent is vw_movie_financials.is_profitable
 -- ========================================================
 CREATE FUNCTION fn_is_profitable(p_movie_id INT)
 RETURNS INT
@@ -244,6 +243,7 @@ END //
 -- Input: Actor ID
 -- Output: Average rating
 -- Returns: DECIMAL(3,1)
+-- Note: Set-based equivalent is vw_actor_stats.average_rating
 -- ========================================================
 CREATE FUNCTION fn_get_actor_average_rating(p_actor_id INT)
 RETURNS DECIMAL(3,1)
@@ -4,46 +4,48 @@
 -- ========================================================
 
 -- VIEW 1: Movie Summary with Performance Metrics
+-- Reads the materialized MOVIE_SUMMARY; the status depends on CURDATE()
+-- so it is derived inline (same rules as fn_get_movie_status, without
+-- its two lookups per row)
 CREATE VIEW vw_movie_summary AS
 SELECT 
-    m.movie_id,
-    m.title,
-    l.language_name,
-    p.name AS producer_name,
-    m.release_date,
-    m.budget,
-    bo.total_collection,
-    bo.domestic_collection,
-    bo.intl_collection,
-    (bo.total_collection - m.budget) AS net_profit,
-    m.imdb_rating,
-    COUNT(DISTINCT mc.actor_id) AS actor_count,
-    fn_get_movie_status(m.movie_id) AS movie_status
-FROM MOVIES m
-LEFT JOIN LANGUAGES l ON m.language_id = l.language_id
-LEFT JOIN PRODUCERS p ON m.producer_id = p.producer_id
-LEFT JOIN BOX_OFFICE bo ON m.movie_id = bo.movie_id
-LEFT JOIN MOVIE_CAST mc ON m.movie_id = mc.movie_id
-GROUP BY m.movie_id;
+    ms.movie_id,
+    ms.title,
+    ms.language_name,
+    ms.producer_name,
+    ms.release_date,
+    ms.budget,
+    ms.total_collection,
+    ms.domestic_collection,
+    ms.intl_collection,
+    ms.net_profit,
+    ms.imdb_rating,
+    ms.actor_count,
+    CASE
+        WHEN ms.release_date IS NULL THEN 'Not Scheduled'
+        WHEN ms.release_date > CURDATE() THEN 'Upcoming'
+        WHEN ms.release_date = CURDATE() THEN 'Releasing Today'
+        WHEN ms.total_collection IS NULL THEN 'Released (Collection Pending)'
+        ELSE 'Released'
+    END AS movie_status
+FROM MOVIE_SUMMARY ms;
 
 
 -- VIEW 2: Top Movies by Collection
 CREATE VIEW vw_top_movies_by_collection AS
 SELECT 
-    m.title,
-    l.language_name,
-    m.release_date,
-    bo.total_collection,
-    bo.domestic_collection,
-    bo.intl_collection,
-    m.budget,
-    ROUND(((bo.total_collection - m.budget) / m.budget * 100), 2) AS profit_percentage,
-    m.imdb_rating
-FROM MOVIES m
-JOIN LANGUAGES l ON m.language_id = l.language_id
-JOIN BOX_OFFICE bo ON m.movie_id = bo.movie_id
-WHERE bo.total_collection IS NOT NULL
-ORDER BY bo.total_collection DESC;
+    ms.title,
+    ms.language_name,
+    ms.release_date,
+    ms.total_collection,
+    ms.domestic_collection,
+    ms.intl_collection,
+    ms.budget,
+    ms.profit_percentage,
+    ms.imdb_rating
+FROM MOVIE_SUMMARY ms
+WHERE ms.total_collection IS NOT NULL
+ORDER BY ms.total_collection DESC;
 
 
 -- VIEW 3: Actor Filmography
@@ -80,6 +82,48 @@ LEFT JOIN MOVIES m ON mc.movie_id = m.movie_id
 GROUP BY pc.crew_id
 ORDER BY pc.crew_id;
 
+
+-- VIEW 5: Movie Financials (set-based fn_get_movie_status,
+-- fn_calculate_total_profit, fn_is_profitable)
+-- One MOVIES -> BOX_OFFICE join instead of two or three correlated
+-- lookups per row; reads live data, unlike MOVIE_SUMMARY
+CREATE VIEW vw_movie_financials AS
+SELECT 
+    m.movie_id,
+    m.title,
+    m.release_date,
+    m.budget,
+    bo.total_collection,
+    COALESCE(bo.total_collection, 0) - COALESCE(m.budget, 0) AS net_profit,
+    CASE WHEN COALESCE(bo.total_collection, 0) - COALESCE(m.budget, 0) > 0
+         THEN 1 ELSE 0 END AS is_profitable,
+    CASE WHEN m.budget = 0 OR m.budget IS NULL THEN 0
+         ELSE ROUND((bo.total_collection - m.budget) / m.budget * 100, 2)
+    END AS profit_percentage,
+    CASE
+        WHEN m.release_date IS NULL THEN 'Not Scheduled'
+        WHEN m.release_date > CURDATE() THEN 'Upcoming'
+        WHEN m.release_date = CURDATE() THEN 'Releasing Today'
+        WHEN bo.total_collection IS NULL THEN 'Released (Collection Pending)'
+        ELSE 'Released'
+    END AS movie_status
+FROM MOVIES m
+LEFT JOIN BOX_OFFICE bo ON m.movie_id = bo.movie_id;
+
+
+-- VIEW 6: Actor Stats (set-based fn_get_actor_movie_count,
+-- fn_get_actor_average_rating)
+CREATE VIEW vw_actor_stats AS
+SELECT 
+    a.actor_id,
+    a.name,
+    COUNT(DISTINCT mc.movie_id) AS movie_count,
+    COALESCE(ROUND(AVG(m.imdb_rating), 1), 0) AS average_rating
+FROM ACTORS a
+LEFT JOIN MOVIE_CAST mc ON a.actor_id = mc.actor_id
+LEFT JOIN MOVIES m ON mc.movie_id = m.movie_id
+GROUP BY a.actor_id, a.name;
+
 -- ========================================================
 -- Database Created Successfully!
 -- ========================================================
@@ -87,5 +131,5 @@ ORDER BY pc.crew_id;
 -- Procedures: 5 (with transactions, nested queries, joins)
 -- Functions: 3 (business logic calculations)
 -- Triggers: 5 (audit logging, validation, updates)
--- Views: 4 (reporting and analysis)
+-- Views: 6 (reporting and analysis)
 -- ========================================================
\ No newline at end of file
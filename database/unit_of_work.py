@@ -0,0 +1,171 @@
+"""
+Request-scoped unit of work
+
+A UnitOfWork checks out a single pooled connection the first time it is
+used and runs every statement of the request on it inside one transaction.
+Handlers that check for a row and then modify it no longer pay for several
+pool checkouts, and the check and the write can no longer interleave with
+another request's transaction.
+"""
+from database import connection
+from database.async_connection import held_connections, run_in_executor
+from database.metrics import query_metrics
+import mysql.connector
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class UnitOfWork:
+    """One connection, one transaction; commit or rollback explicitly"""
+
+    def __init__(self):
+        self.connection = None
+
+    def _get_connection(self):
+        if self.connection is None:
+            self.connection = connection.get_db_connection()
+        return self.connection
+
+    def execute(self, query, params=None, fetch=True):
+        """Run a statement in the current transaction (no implicit commit)"""
+        conn = self._get_connection()
+        cursor = conn.cursor(dictionary=True)
+        try:
+            with query_metrics.timed(query, params) as timing:
+                cursor.execute(query, params or ())
+                if fetch:
+                    rows = cursor.fetchall()
+                    timing.rows = len(rows)
+                    return rows
+                timing.rows = cursor.rowcount
+            return {"affected_rows": cursor.rowcount, "last_id": cursor.lastrowid}
+        except mysql.connector.Error as err:
+            logger.error(f"Database error: {err}")
+            raise
+        finally:
+            cursor.close()
+
+    def execute_many(self, query, seq_params):
+        """Run a statement for every parameter tuple (multi-row INSERTs are
+        sent as a single statement by the driver); no implicit commit"""
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        try:
+            with query_metrics.timed(query) as timing:
+                cursor.executemany(query, seq_params)
+                timing.rows = cursor.rowcount
+            return {"affected_rows": cursor.rowcount, "last_id": cursor.lastrowid}
+        except mysql.connector.Error as err:
+            logger.error(f"Database error: {err}")
+            raise
+        finally:
+            cursor.close()
+
+    def fetch_one(self, query, params=None):
+        """Run a query and return its first row, or None"""
+        rows = self.execute(query, params)
+        return rows[0] if rows else None
+
+    def call_procedure(self, proc_name, params=None):
+        """Call a stored procedure in the current transaction"""
+        conn = self._get_connection()
+        cursor = conn.cursor(dictionary=True)
+        try:
+            with query_metrics.timed(f"CALL {proc_name}") as timing:
+                cursor.callproc(proc_name, params or ())
+                results = []
+                for result in cursor.stored_results():
+                    results.extend(result.fetchall())
+                timing.rows = len(results)
+            return results
+        except mysql.connector.Error as err:
+            logger.error(f"Procedure error: {err}")
+            raise
+        finally:
+            cursor.close()
+
+    def commit(self):
+        if self.connection is not None:
+            self.connection.commit()
+
+    def rollback(self):
+        if self.connection is not None:
+            self.connection.rollback()
+
+    def close(self):
+        """Roll back anything uncommitted and return the connection"""
+        if self.connection is None:
+            return
+        try:
+            if self.connection.in_transaction:
+                self.connection.rollback()
+        finally:
+            self.connection.close()
+            self.connection = None
+
+
+class AsyncUnitOfWork:
+    """Awaitable facade over UnitOfWork that runs on the DB thread pool"""
+
+    def __init__(self):
+        self._uow = UnitOfWork()
+        self._holding = False
+
+    async def _run(self, func, *args):
+        """Run a statement, first waiting (on the loop) for a held-connection slot"""
+        if not self._holding:
+            await held_connections.acquire()
+            self._holding = True
+        return await run_in_executor(func, *args)
+
+    async def execute(self, query, params=None, fetch=True):
+        return await self._run(self._uow.execute, query, params, fetch)
+
+    async def execute_many(self, query, seq_params):
+        return await self._run(self._uow.execute_many, query, seq_params)
+
+    async def fetch_one(self, query, params=None):
+        return await self._run(self._uow.fetch_one, query, params)
+
+    async def call_procedure(self, proc_name, params=None):
+        return await self._run(self._uow.call_procedure, proc_name, params)
+
+    async def commit(self):
+        await run_in_executor(self._uow.commit)
+
+    async def rollback(self):
+        await run_in_executor(self._uow.rollback)
+
+    async def close(self):
+        try:
+            await run_in_executor(self._uow.close)
+        finally:
+            if self._holding:
+                self._holding = False
+                held_connections.release()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        try:
+            if exc_type is None:
+                await self.commit()
+            else:
+                await self.rollback()
+        finally:
+            await self.close()
+
+
+async def get_unit_of_work():
+    """FastAPI dependency: one connection per request, released afterwards.
+
+    Handlers must call ``await uow.commit()`` before returning; anything left
+    uncommitted is rolled back when the request finishes.
+    """
+    uow = AsyncUnitOfWork()
+    try:
+        yield uow
+    finally:
+        await uow.close()
@@ -100,6 +100,11 @@ class APIService {
         return this.get(API_CONFIG.ENDPOINTS.MOVIE_DETAILS.replace('{id}', id));
     }
 
+    // Batch lookup: one request for many ids
+    async getMoviesByIds(ids) {
+        return this.get(API_CONFIG.ENDPOINTS.MOVIES, { ids: ids.join(',') });
+    }
+
     async getMovieProfitAnalysis(id) {
         return this.get(API_CONFIG.ENDPOINTS.MOVIE_PROFIT.replace('{id}', id));
     }
@@ -180,6 +185,10 @@ class APIService {
         return this.get(API_CONFIG.ENDPOINTS.PROFIT_ANALYSIS, { limit });
     }
 
+    async getDashboardSummary(topN = 10) {
+        return this.get(API_CONFIG.ENDPOINTS.ANALYTICS_SUMMARY, { top_n: topN });
+    }
+
     // ACTORS (to be implemented in backend)
     async getActors(params = {}) {
         return this.get(API_CONFIG.ENDPOINTS.ACTORS, params);
@@ -1,6 +1,8 @@
 // Box Office Module
 
 const BoxOffice = {
+    movieTitles: {},
+
     async init() {
         await this.render();
         await this.loadBoxOffice();
@@ -25,7 +27,7 @@ const BoxOffice = {
                         <table class="table table-hover">
                             <thead>
                                 <tr>
-                                    <th>Movie ID</th>
+                                    <th>Movie</th>
                                     <th>Domestic Collection</th>
                                     <th>International Collection</th>
                                     <th>Total Collection</th>
@@ -114,6 +116,10 @@ const BoxOffice = {
         showLoading();
         try {
             const records = await api.getBoxOfficeRecords();
+            // Resolve every row's movie title with one batched request
+            const movieIds = [...new Set(records.map(r => r.movie_id))];
+            const movies = movieIds.length ? await api.getMoviesByIds(movieIds) : [];
+            this.movieTitles = Object.fromEntries(movies.map(m => [m.movie_id, m.title]));
             this.renderTable(records);
         } catch (error) {
             console.error('Error:', error);
@@ -132,7 +138,7 @@ const BoxOffice = {
 
         tbody.innerHTML = records.map(r => `
             <tr>
-                <td>${r.movie_id}</td>
+                <td>${r.movie_id}${this.movieTitles[r.movie_id] ? ` - ${sanitizeHTML(this.movieTitles[r.movie_id])}` : ''}</td>
                 <td>${formatCurrencyCrores(r.domestic_collection)}</td>
                 <td>${formatCurrencyCrores(r.international_collection)}</td>
                 <td><strong>${formatCurrencyCrores(r.total_collection)}</strong></td>
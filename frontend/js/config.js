@@ -20,6 +20,7 @@ const API_CONFIG = {
         // Analytics
         TOP_MOVIES: '/api/analytics/top-movies',
         PROFIT_ANALYSIS: '/api/analytics/profit-analysis',
+        ANALYTICS_SUMMARY: '/api/analytics/summary',
 
         // Actors (to be implemented)
         ACTORS: '/api/actors',
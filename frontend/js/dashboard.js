@@ -5,8 +5,18 @@ const Dashboard = {
 
     async init() {
         await this.render();
-        await this.loadStatistics();
-        await this.loadCharts();
+
+        let summary;
+        try {
+            summary = await api.getDashboardSummary(10);
+        } catch (error) {
+            console.error('Error loading dashboard summary:', error);
+            showToast('Failed to load statistics', 'Error', 'error');
+            return;
+        }
+
+        this.loadStatistics(summary);
+        this.loadCharts(summary);
     },
 
     async render() {
@@ -117,54 +127,18 @@ const Dashboard = {
         document.getElementById('content-area').innerHTML = content;
     },
 
-    async loadStatistics() {
-        try {
-            // Load movies
-            const movies = await api.getMovies();
-            const producers = await api.getProducers();
-            const boxOffice = await api.getBoxOfficeRecords();
-
-            // Calculate statistics
-            const totalMovies = movies.length || 0;
-            const totalProducers = producers.length || 0;
-
-            let totalCollection = 0;
-            let totalRating = 0;
-            let ratingCount = 0;
-
-            if (boxOffice && boxOffice.length) {
-                totalCollection = boxOffice.reduce((sum, record) => {
-                    return sum + (parseFloat(record.total_collection) || 0);
-                }, 0);
-            }
-
-            if (movies && movies.length) {
-                movies.forEach(movie => {
-                    if (movie.imdb_rating) {
-                        totalRating += parseFloat(movie.imdb_rating);
-                        ratingCount++;
-                    }
-                });
-            }
-
-            const avgRating = ratingCount > 0 ? (totalRating / ratingCount).toFixed(1) : 0;
-
-            // Update UI
-            document.getElementById('total-movies').textContent = totalMovies;
-            document.getElementById('total-collection').textContent = formatCurrencyCrores(totalCollection);
-            document.getElementById('total-producers').textContent = totalProducers;
-            document.getElementById('avg-rating').textContent = avgRating;
+    loadStatistics(summary) {
+        const totals = summary.totals || {};
 
-            // Load recent movies
-            await this.loadRecentMovies(movies.slice(0, 5));
+        document.getElementById('total-movies').textContent = totals.total_movies || 0;
+        document.getElementById('total-collection').textContent = formatCurrencyCrores(totals.total_collection || 0);
+        document.getElementById('total-producers').textContent = totals.total_producers || 0;
+        document.getElementById('avg-rating').textContent = totals.avg_rating ? parseFloat(totals.avg_rating).toFixed(1) : 0;
 
-        } catch (error) {
-            console.error('Error loading statistics:', error);
-            showToast('Failed to load statistics', 'Error', 'error');
-        }
+        this.loadRecentMovies(summary.recent_movies);
     },
 
-    async loadRecentMovies(movies) {
+    loadRecentMovies(movies) {
         const tbody = document.getElementById('recent-movies-tbody');
 
         if (!movies || movies.length === 0) {
@@ -180,7 +154,7 @@ const Dashboard = {
             <tr>
                 <td><strong>${sanitizeHTML(movie.title)}</strong></td>
                 <td>${formatDate(movie.release_date)}</td>
-                <td><span class="badge bg-secondary">${movie.language_id || '-'}</span></td>
+                <td><span class="badge bg-secondary">${sanitizeHTML(movie.language_name || '-')}</span></td>
                 <td>${formatCurrencyCrores(movie.budget)}</td>
                 <td>${getRatingStars(movie.imdb_rating)}</td>
                 <td><span class="badge bg-info">Released</span></td>
@@ -188,22 +162,15 @@ const Dashboard = {
         `).join('');
     },
 
-    async loadCharts() {
-        try {
-            await Promise.all([
-                this.loadTopMoviesChart(),
-                this.loadLanguageChart(),
-                this.loadProfitChart(),
-                this.loadGenreChart()
-            ]);
-        } catch (error) {
-            console.error('Error loading charts:', error);
-        }
+    loadCharts(summary) {
+        this.loadTopMoviesChart(summary.top_by_collection);
+        this.loadLanguageChart(summary.by_language);
+        this.loadProfitChart(summary.top_profitable);
+        this.loadGenreChart(summary.by_genre);
     },
 
-    async loadTopMoviesChart() {
+    loadTopMoviesChart(data) {
         try {
-            const data = await api.getTopMovies(10);
 
             if (!data || data.length === 0) {
                 return;
@@ -223,7 +190,7 @@ const Dashboard = {
                     labels: data.map(item => item.title || 'Unknown'),
                     datasets: [{
                         label: 'Total Collection (Crores)',
-                        data: data.map(item => (item.total_collection || 0) / 10000000),
+                        data: data.map(item => (parseFloat(item.total_collection) || 0) / 10000000),
                         backgroundColor: 'rgba(54, 162, 235, 0.7)',
                         borderColor: 'rgba(54, 162, 235, 1)',
                         borderWidth: 1
@@ -253,29 +220,15 @@ const Dashboard = {
         }
     },
 
-    async loadLanguageChart() {
+    loadLanguageChart(data) {
         try {
-            const movies = await api.getMovies();
-            const boxOffice = await api.getBoxOfficeRecords();
-
-            // Create map of movie_id to total_collection
-            const collectionMap = {};
-            boxOffice.forEach(record => {
-                collectionMap[record.movie_id] = record.total_collection || 0;
-            });
-
-            // Aggregate by language
-            const languageData = {};
-            movies.forEach(movie => {
-                const lang = movie.language_id || 'Unknown';
-                if (!languageData[lang]) {
-                    languageData[lang] = 0;
-                }
-                languageData[lang] += collectionMap[movie.movie_id] || 0;
-            });
+            if (!data || data.length === 0) {
+                return;
+            }
 
-            const labels = Object.keys(languageData);
-            const values = Object.values(languageData).map(v => v / 10000000);
+            // Aggregated per language on the server
+            const labels = data.map(item => item.language_name || 'Unknown');
+            const values = data.map(item => (parseFloat(item.total_collection) || 0) / 10000000);
 
             const ctx = document.getElementById('languageChart');
             if (!ctx) return;
@@ -317,9 +270,8 @@ const Dashboard = {
         }
     },
 
-    async loadProfitChart() {
+    loadProfitChart(data) {
         try {
-            const data = await api.getProfitAnalysis(10);
 
             if (!data || data.length === 0) {
                 return;
@@ -337,10 +289,10 @@ const Dashboard = {
                 data: {
                     labels: data.map(item => item.title || 'Unknown'),
                     datasets: [{
-                        label: 'Profit Margin (%)',
-                        data: data.map(item => parseFloat(item.profit_margin) || 0),
+                        label: 'Profit (%)',
+                        data: data.map(item => parseFloat(item.profit_percentage) || 0),
                         backgroundColor: data.map(item => {
-                            const margin = parseFloat(item.profit_margin) || 0;
+                            const margin = parseFloat(item.profit_percentage) || 0;
                             return margin > 0 ? 'rgba(75, 192, 192, 0.7)' : 'rgba(255, 99, 132, 0.7)';
                         }),
                         borderWidth: 1
@@ -359,7 +311,7 @@ const Dashboard = {
                             beginAtZero: true,
                             title: {
                                 display: true,
-                                text: 'Profit Margin (%)'
+                                text: 'Profit (%)'
                             }
                         }
                     }
@@ -370,9 +322,8 @@ const Dashboard = {
         }
     },
 
-    async loadGenreChart() {
+    loadGenreChart(genres) {
         try {
-            const genres = await api.getGenres();
 
             if (!genres || genres.length === 0) {
                 return;
@@ -385,10 +336,8 @@ const Dashboard = {
                 this.charts.genre.destroy();
             }
 
-            // For now, just show genre names
-            // In a real scenario, you'd join with movie_genres to get counts
             const labels = genres.map(g => g.genre_name);
-            const values = genres.map(() => Math.floor(Math.random() * 50) + 10); // Placeholder
+            const values = genres.map(g => g.movie_count || 0);
 
             this.charts.genre = new Chart(ctx, {
                 type: 'pie',
@@ -4,6 +4,8 @@ const Movies = {
     currentPage: 1,
     totalPages: 1,
     filters: {},
+    languageNames: {},
+    producerNames: {},
 
     async init() {
         await this.render();
@@ -200,6 +202,7 @@ const Movies = {
         try {
             // Load languages
             const languages = await api.getLanguages();
+            this.languageNames = Object.fromEntries(languages.map(l => [l.language_id, l.language_name]));
             const languageSelects = document.querySelectorAll('#movie-language, #filter-language');
             languageSelects.forEach(select => {
                 const isFilter = select.id === 'filter-language';
@@ -211,6 +214,7 @@ const Movies = {
 
             // Load producers
             const producers = await api.getProducers();
+            this.producerNames = Object.fromEntries(producers.map(p => [p.producer_id, p.name]));
             const producerSelects = document.querySelectorAll('#movie-producer, #filter-producer');
             producerSelects.forEach(select => {
                 const isFilter = select.id === 'filter-producer';
@@ -267,11 +271,11 @@ const Movies = {
                 <td>${movie.movie_id}</td>
                 <td><strong>${sanitizeHTML(movie.title)}</strong></td>
                 <td>${formatDate(movie.release_date)}</td>
-                <td><span class="badge bg-secondary">${movie.language_id || '-'}</span></td>
+                <td><span class="badge bg-secondary">${this.languageNames[movie.language_id] || movie.language_id || '-'}</span></td>
                 <td>${formatDuration(movie.duration)}</td>
                 <td>${formatCurrencyCrores(movie.budget)}</td>
                 <td>${getRatingStars(movie.imdb_rating)}</td>
-                <td>${movie.producer_id || '-'}</td>
+                <td>${sanitizeHTML(this.producerNames[movie.producer_id] || '') || movie.producer_id || '-'}</td>
                 <td class="action-buttons">
                     <button class="btn btn-sm btn-info" onclick="Movies.viewDetails(${movie.movie_id})"
                             title="View Details">
@@ -405,7 +409,7 @@ const Movies = {
                         <div class="row mt-4">
                             <div class="col-md-6">
                                 <p><strong>Release Date:</strong> ${formatDate(details.movie.release_date)}</p>
-                                <p><strong>Language:</strong> ${details.movie.language_id}</p>
+                                <p><strong>Language:</strong> ${details.movie.language_name || details.movie.language_id}</p>
                                 <p><strong>Duration:</strong> ${formatDuration(details.movie.duration)}</p>
                                 <p><strong>Certification:</strong> ${details.movie.certification || '-'}</p>
                             </div>
@@ -413,7 +417,7 @@ const Movies = {
                                 <p><strong>Budget:</strong> ${formatCurrencyCrores(details.movie.budget)}</p>
                                 <p><strong>OTT Rights:</strong> ${formatCurrencyCrores(details.movie.ott_rights_value)}</p>
                                 <p><strong>Rating:</strong> ${getRatingStars(details.movie.imdb_rating)}</p>
-                                <p><strong>Producer:</strong> ${details.movie.producer_id}</p>
+                                <p><strong>Producer:</strong> ${sanitizeHTML(details.movie.producer_name || '') || details.movie.producer_id || '-'}</p>
                             </div>
                         </div>
 
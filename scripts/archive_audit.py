@@ -0,0 +1,32 @@
+"""
+Audit partition maintenance
+
+Runs the same job as the API's background archiver once: creates the
+upcoming monthly partitions of MOVIE_AUDIT, BOX_OFFICE_AUDIT and
+ACTIVITY_LOG and moves partitions older than the retention period to
+gzipped NDJSON under AUDIT_ARCHIVE_DIR.
+
+    python -m scripts.archive_audit
+    python -m scripts.archive_audit --retention-months 6 --premake-months 2
+"""
+import argparse
+import json
+from app.services.audit_archive import run_maintenance
+from app.utils.serialization import json_default
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Archive expired audit partitions")
+    parser.add_argument("--retention-months", type=int, help="Defaults to AUDIT_RETENTION_MONTHS")
+    parser.add_argument("--premake-months", type=int, help="Defaults to AUDIT_PARTITION_PREMAKE_MONTHS")
+    args = parser.parse_args()
+
+    report = run_maintenance(retention_months=args.retention_months,
+                             premake_months=args.premake_months)
+    if report is None:
+        raise SystemExit("Audit maintenance is already running elsewhere")
+    print(json.dumps(report, indent=2, default=json_default))
+
+
+if __name__ == "__main__":
+    main()
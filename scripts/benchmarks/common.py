@@ -0,0 +1,117 @@
+"""
+Shared helpers for the benchmark scripts
+
+The load driver uses only the standard library so the benchmarks can run
+from any machine that can reach the API, without installing extra tools.
+"""
+import json
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+
+def percentile(samples, pct):
+    """Return the pct-th percentile of a list of numbers (nearest rank)"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100.0 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def summarize(latencies, elapsed, errors=0):
+    """Build the standard result dict from per-request latencies in seconds"""
+    count = len(latencies)
+    return {
+        "requests": count,
+        "errors": errors,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(count / elapsed, 1) if elapsed > 0 else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+    }
+
+
+def http_request(url, method="GET", body=None, headers=None, timeout=30):
+    """Send one request and return (status, latency_seconds)"""
+    status, latency, _ = http_json(url, method, body, headers, timeout, decode=False)
+    return status, latency
+
+
+def http_json(url, method="GET", body=None, headers=None, timeout=30, decode=True):
+    """Send one request and return (status, latency_seconds, decoded JSON body or None)"""
+    data = json.dumps(body).encode() if body is not None else None
+    request = urllib.request.Request(url, data=data, method=method)
+    request.add_header("Content-Type", "application/json")
+    for key, value in (headers or {}).items():
+        request.add_header(key, value)
+
+    payload = None
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            raw = response.read()
+            status = response.status
+    except urllib.error.HTTPError as err:
+        raw, status = b"", err.code
+    except (urllib.error.URLError, OSError):
+        raw, status = b"", 0
+    latency = time.perf_counter() - start
+    if decode and raw:
+        try:
+            payload = json.loads(raw)
+        except ValueError:
+            pass
+    return status, latency, payload
+
+
+def run_requests(make_request, concurrency, total_requests, headers=None, on_response=None):
+    """Fire total_requests built by make_request(i) -> (url, method, body) with a fixed
+    number of in-flight requests; on_response(i, status, payload) sees decoded bodies"""
+    latencies = []
+    errors = 0
+
+    def worker(i):
+        url, method, body = make_request(i)
+        if on_response is None:
+            return i, *http_request(url, method=method, body=body, headers=headers), None
+        return i, *http_json(url, method=method, body=body, headers=headers)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for i, status, latency, payload in pool.map(worker, range(total_requests)):
+            if 200 <= status < 400:
+                latencies.append(latency)
+            else:
+                errors += 1
+            if on_response is not None:
+                on_response(i, status, payload)
+    elapsed = time.perf_counter() - start
+
+    return summarize(latencies, elapsed, errors)
+
+
+def run_load(url, concurrency, total_requests, method="GET", body=None, headers=None):
+    """Fire total_requests at url with a fixed number of in-flight requests"""
+    return run_requests(lambda _: (url, method, body), concurrency, total_requests, headers=headers)
+
+
+def time_block(func, repeat=1):
+    """Run func repeat times and return the list of wall-clock durations"""
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+def print_table(rows, columns):
+    """Print a list of dicts as a fixed-width table"""
+    widths = {c: max(len(c), *(len(str(r.get(c, ""))) for r in rows)) for c in columns}
+    print("  ".join(c.ljust(widths[c]) for c in columns))
+    print("  ".join("-" * widths[c] for c in columns))
+    for row in rows:
+        print("  ".join(str(row.get(c, "")).ljust(widths[c]) for c in columns))
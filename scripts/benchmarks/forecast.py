@@ -0,0 +1,107 @@
+"""
+Forecasting benchmark: training time and batch inference throughput (CPU)
+
+Trains the collection forecaster on synthetic movies (or, with --db, on the
+configured database) and reports:
+
+* training   - wall-clock time of train_model (holdout fit + full refit)
+               for each training-set size
+* inference  - movies scored per second for each batch size, both from
+               prepared feature columns and end to end from API inputs
+               (FeatureBatch.from_inputs + predict)
+
+No database is needed unless --db is given.
+
+    python -m scripts.benchmarks.forecast --rows 1000,10000,100000 --batches 1,100,10000
+"""
+import argparse
+import numpy as np
+from app.models.database_models import ForecastInput
+from app.services.forecast_service import FeatureBatch, load_training_batch, train_model
+from scripts.benchmarks.common import percentile, print_table, time_block
+
+LANGUAGES = 12
+GENRES = 15
+ACTORS = 2000
+
+
+def synthetic_batch(rows, seed=0):
+    """Movies whose log collection depends on budget, cast, language, genre and month"""
+    rng = np.random.default_rng(seed)
+    budget = np.exp(rng.normal(17, 1.2, rows))
+    screens = rng.integers(200, 5000, rows).astype(np.float64)
+    cast_count = rng.integers(1, 15, rows).astype(np.float64)
+    popularity_mean = rng.uniform(2, 9, rows)
+    language = rng.integers(1, LANGUAGES + 1, rows)
+    month = rng.integers(1, 13, rows)
+    genre_rows = np.repeat(np.arange(rows), 2)
+    genre_ids = rng.integers(1, GENRES + 1, rows * 2)
+
+    log_target = (0.9 * np.log(budget) + 0.3 * np.log(screens) + 0.15 * popularity_mean
+                  + 0.05 * language + 0.2 * (month == 11) + rng.normal(0, 0.4, rows))
+    opening = np.exp(log_target - 1.5 + rng.normal(0, 0.2, rows))
+    numeric = {
+        "budget": budget, "opening_weekend": opening, "release_screens": screens,
+        "cast_count": cast_count, "cast_popularity_mean": popularity_mean,
+        "cast_popularity_max": np.minimum(popularity_mean + rng.uniform(0, 1, rows), 10),
+    }
+    return FeatureBatch(numeric, language, month, genre_rows, genre_ids), np.exp(log_target)
+
+
+def synthetic_inputs(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    return [
+        ForecastInput(ref=str(i), budget=float(rng.uniform(1e6, 5e8)),
+                      language_id=int(rng.integers(1, LANGUAGES + 1)),
+                      genre_ids=rng.integers(1, GENRES + 1, 2).tolist(),
+                      actor_ids=rng.integers(1, ACTORS + 1, 5).tolist(),
+                      release_screens=int(rng.integers(200, 5000)))
+        for i in range(rows)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Forecast training and inference benchmark")
+    parser.add_argument("--rows", default="1000,10000,100000", help="Training-set sizes")
+    parser.add_argument("--batches", default="1,100,1000,10000", help="Inference batch sizes")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--alpha", type=float, default=1.0)
+    parser.add_argument("--db", action="store_true", help="Train on the configured database")
+    args = parser.parse_args()
+
+    if args.db:
+        batch, target = load_training_batch()
+        training = {len(batch): (batch, target)}
+    else:
+        training = {n: synthetic_batch(n) for n in map(int, args.rows.split(","))}
+
+    rows = []
+    model = None
+    for size, (batch, target) in training.items():
+        samples = time_block(lambda: train_model(batch, target, args.alpha), repeat=args.repeat)
+        model = train_model(batch, target, args.alpha)
+        rows.append({"rows": size, "features": len(model.weights),
+                     "p50_ms": round(percentile(samples, 50) * 1000, 2),
+                     "r2_log": model.metrics["r2_log"], "mape": model.metrics["mape"]})
+    print("Training")
+    print_table(rows, ["rows", "features", "p50_ms", "r2_log", "mape"])
+
+    popularity = {actor_id: 5.0 for actor_id in range(1, ACTORS + 1)}
+    rows = []
+    for size in map(int, args.batches.split(",")):
+        batch, _ = synthetic_batch(size, seed=1)
+        inputs = synthetic_inputs(size, seed=1)
+        paths = {
+            "columns": lambda: model.predict(batch),
+            "inputs": lambda: model.predict(FeatureBatch.from_inputs(inputs, popularity)),
+        }
+        for path, func in paths.items():
+            p50 = percentile(time_block(func, repeat=args.repeat), 50)
+            rows.append({"batch": size, "path": path, "p50_ms": round(p50 * 1000, 3),
+                         "movies_per_s": round(size / p50) if p50 > 0 else None})
+    print("\nInference")
+    print_table(rows, ["batch", "path", "p50_ms", "movies_per_s"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Bulk ingest throughput benchmark
+
+Generates a synthetic movies file and loads it three ways, reporting
+rows/sec for each:
+
+* validate  - parse + Pydantic validation only (no database)
+* bulk      - BulkLoader: multi-row executemany, one transaction per batch
+* per-row   - POST /api/movies once per row (optional, needs --base-url;
+              limited to --per-row-sample rows and extrapolated)
+
+    python -m scripts.benchmarks.ingest --rows 100000 --batch-size 1000
+    python -m scripts.benchmarks.ingest --rows 100000 --base-url http://localhost:8001
+
+The generated movies reference --language-id, which must exist.
+"""
+import argparse
+import csv
+import os
+import random
+import tempfile
+import time
+from app.services.ingest_service import load_file
+from scripts.benchmarks.common import http_request, print_table
+
+COLUMNS = ["title", "release_date", "language_id", "duration", "certification",
+           "budget", "imdb_rating", "plot_summary"]
+
+
+def generate(path, rows, language_id, seed=42):
+    rng = random.Random(seed)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(COLUMNS)
+        for i in range(rows):
+            writer.writerow([
+                f"Bench Movie {i}",
+                f"{rng.randint(1990, 2024)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+                language_id,
+                rng.randint(90, 200),
+                rng.choice(["U", "UA", "A"]),
+                rng.randint(1, 500) * 1000000,
+                round(rng.uniform(1, 10), 1),
+                "Synthetic row generated by the ingest benchmark",
+            ])
+
+
+def time_load(path, batch_size, dry_run):
+    with open(path, "rb") as f:
+        report = load_file("movies", f, "csv", batch_size=batch_size, dry_run=dry_run)
+    return report
+
+
+def time_per_row(base_url, path, sample):
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        start = time.perf_counter()
+        count = 0
+        for row in reader:
+            if count >= sample:
+                break
+            body = {k: (v or None) for k, v in row.items()}
+            http_request(f"{base_url}/api/movies", method="POST", body=body)
+            count += 1
+    return count, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk ingest throughput benchmark")
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--language-id", type=int, default=1)
+    parser.add_argument("--base-url", help="Also time per-row POST /api/movies against this API")
+    parser.add_argument("--per-row-sample", type=int, default=1000)
+    parser.add_argument("--skip-bulk", action="store_true", help="Only time validation")
+    args = parser.parse_args()
+
+    fd, path = tempfile.mkstemp(suffix=".csv")
+    os.close(fd)
+    try:
+        generate(path, args.rows, args.language_id)
+        results = []
+
+        report = time_load(path, args.batch_size, dry_run=True)
+        results.append({"mode": "validate", "rows": report["rows"],
+                        "elapsed_s": report["elapsed_s"], "rows_per_sec": report["rows_per_sec"]})
+
+        if not args.skip_bulk:
+            report = time_load(path, args.batch_size, dry_run=False)
+            results.append({"mode": f"bulk (batch {args.batch_size})", "rows": report["inserted"],
+                            "elapsed_s": report["elapsed_s"], "rows_per_sec": report["rows_per_sec"]})
+
+        if args.base_url:
+            count, elapsed = time_per_row(args.base_url, path, args.per_row_sample)
+            results.append({"mode": "per-row POST", "rows": count, "elapsed_s": round(elapsed, 3),
+                            "rows_per_sec": round(count / elapsed, 1) if elapsed else None})
+
+        print_table(results, ["mode", "rows", "elapsed_s", "rows_per_sec"])
+    finally:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Movie detail latency benchmark: sp_get_movie_details vs composite query
+
+Loads the details of a sample of movies through both paths against the
+configured database (.env) and reports p50/p95/p99 latency per path:
+
+* procedure  - CALL sp_get_movie_details (three result sets, plus the
+               fn_get_movie_status lookups per movie)
+* composite  - the single JSON_ARRAYAGG statement behind
+               GET /api/movies/{id}/details
+* batch      - the same statement for --batch-size ids at once, reported
+               per movie
+
+    python -m scripts.benchmarks.movie_details --sample 50 --repeat 20
+"""
+import argparse
+import random
+from app.services.movie_service import MOVIE_DETAILS_SQL
+from database import connection
+from scripts.benchmarks.common import percentile, print_table, time_block
+
+
+def composite(ids):
+    placeholders = ", ".join(["%s"] * len(ids))
+    return connection.execute_query(MOVIE_DETAILS_SQL.format(ids=placeholders), tuple(ids))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Movie detail latency benchmark")
+    parser.add_argument("--sample", type=int, default=50, help="movies to sample")
+    parser.add_argument("--repeat", type=int, default=20, help="loads per movie and path")
+    parser.add_argument("--batch-size", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    movie_ids = [row["movie_id"] for row in connection.execute_query("SELECT movie_id FROM MOVIES")]
+    if not movie_ids:
+        raise SystemExit("No movies in the database")
+    random.seed(args.seed)
+    sample = random.sample(movie_ids, min(args.sample, len(movie_ids)))
+
+    samples = {"procedure": [], "composite": [], "batch": []}
+    for movie_id in sample:
+        samples["procedure"] += time_block(
+            lambda: connection.call_procedure_results("sp_get_movie_details", (movie_id,)),
+            repeat=args.repeat)
+        samples["composite"] += time_block(lambda: composite([movie_id]), repeat=args.repeat)
+
+    for start in range(0, len(sample), args.batch_size):
+        ids = sample[start:start + args.batch_size]
+        samples["batch"] += [duration / len(ids)
+                             for duration in time_block(lambda: composite(ids), repeat=args.repeat)]
+
+    rows = [{
+        "path": path,
+        "loads": len(durations),
+        "p50_ms": round(percentile(durations, 50) * 1000, 3),
+        "p95_ms": round(percentile(durations, 95) * 1000, 3),
+        "p99_ms": round(percentile(durations, 99) * 1000, 3),
+    } for path, durations in samples.items()]
+    print_table(rows, ["path", "loads", "p50_ms", "p95_ms", "p99_ms"])
+
+
+if __name__ == "__main__":
+    main()
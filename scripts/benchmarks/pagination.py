@@ -0,0 +1,70 @@
+"""
+Offset vs keyset pagination benchmark
+
+Walks a list endpoint page by page in both modes and reports the latency of
+pages at increasing depth. Offset pages slow down linearly with depth;
+keyset pages should stay flat.
+
+    python -m scripts.benchmarks.pagination --endpoint /api/movies --pages 200
+"""
+import argparse
+import time
+import urllib.request
+from scripts.benchmarks.common import print_table
+
+CURSOR_HEADER = "X-Next-Cursor"
+
+
+def fetch(url):
+    start = time.perf_counter()
+    with urllib.request.urlopen(url, timeout=60) as response:
+        response.read()
+        cursor = response.headers.get(CURSOR_HEADER)
+    return time.perf_counter() - start, cursor
+
+
+def walk(base_url, endpoint, page_size, pages, mode):
+    """Return per-page latencies (seconds) for one full walk"""
+    separator = "&" if "?" in endpoint else "?"
+    offset_param = "offset" if endpoint.startswith(("/api/actors", "/api/crew")) else "skip"
+    latencies = []
+    cursor = None
+    for page in range(pages):
+        url = f"{base_url}{endpoint}{separator}limit={page_size}"
+        if mode == "offset":
+            url += f"&{offset_param}={page * page_size}"
+        elif cursor:
+            url += f"&cursor={cursor}"
+        elapsed, cursor = fetch(url)
+        latencies.append(elapsed)
+        if mode == "keyset" and not cursor:
+            break
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offset vs keyset pagination benchmark")
+    parser.add_argument("--base-url", default="http://localhost:8001")
+    parser.add_argument("--endpoint", default="/api/movies")
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--pages", type=int, default=200)
+    args = parser.parse_args()
+
+    results = {mode: walk(args.base_url, args.endpoint, args.page_size, args.pages, mode)
+               for mode in ("offset", "keyset")}
+
+    rows = []
+    depth = 1
+    while depth <= args.pages:
+        row = {"page": depth, "row_offset": (depth - 1) * args.page_size}
+        for mode, latencies in results.items():
+            if depth <= len(latencies):
+                row[f"{mode}_ms"] = round(latencies[depth - 1] * 1000, 2)
+        rows.append(row)
+        depth *= 2
+
+    print_table(rows, ["page", "row_offset", "offset_ms", "keyset_ms"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Per-row scalar functions vs set-based view benchmark
+
+Computes status, net profit and profitability for the first N movies two
+ways and reports the latency of each at every catalogue size:
+
+* functions  - fn_get_movie_status / fn_calculate_total_profit /
+               fn_is_profitable called per row (correlated lookups)
+* set-based  - the same columns from vw_movie_financials (one join)
+
+Both are aggregated server-side so transfer time does not mask the
+difference. If the catalogue is smaller than a requested size, synthetic
+movies (titled "bench-fn-...") are inserted first and removed afterwards
+unless --keep is given. Run it against a scratch database.
+
+    python -m scripts.benchmarks.scalar_functions --sizes 10000,100000 --repeat 5
+"""
+import argparse
+import random
+from database import connection
+from database.unit_of_work import UnitOfWork
+from scripts.benchmarks.common import percentile, print_table, time_block
+
+TITLE_PREFIX = "bench-fn-"
+
+FUNCTIONS_SQL = """
+SELECT COUNT(fn_get_movie_status(m.movie_id)) AS rows_scanned,
+       SUM(fn_calculate_total_profit(m.movie_id)) AS net_profit,
+       SUM(fn_is_profitable(m.movie_id)) AS profitable
+FROM (SELECT movie_id FROM MOVIES ORDER BY movie_id LIMIT %s) m
+"""
+
+SET_BASED_SQL = """
+SELECT COUNT(f.movie_status) AS rows_scanned,
+       SUM(f.net_profit) AS net_profit,
+       SUM(f.is_profitable) AS profitable
+FROM (SELECT movie_id FROM MOVIES ORDER BY movie_id LIMIT %s) m
+JOIN vw_movie_financials f ON f.movie_id = m.movie_id
+"""
+
+
+def movie_count():
+    return connection.execute_query("SELECT COUNT(*) AS n FROM MOVIES")[0]["n"]
+
+
+def seed(rows, language_id, batch_size=5000):
+    """Insert `rows` synthetic movies, about half of them with collections"""
+    rng = random.Random(42)
+    uow = UnitOfWork()
+    try:
+        for start in range(0, rows, batch_size):
+            count = min(batch_size, rows - start)
+            result = uow.execute_many(
+                "INSERT INTO MOVIES (title, release_date, language_id, budget) "
+                "VALUES (%s, %s, %s, %s)",
+                [(f"{TITLE_PREFIX}{start + i}",
+                  f"{rng.randint(1990, 2030)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+                  language_id, rng.randint(1, 500) * 10 ** 6) for i in range(count)])
+            first_id = result["last_id"]
+            uow.execute_many(
+                "INSERT INTO BOX_OFFICE (movie_id, domestic_collection, intl_collection) "
+                "VALUES (%s, %s, %s)",
+                [(first_id + i, rng.randint(0, 800) * 10 ** 6, rng.randint(0, 200) * 10 ** 6)
+                 for i in range(count) if rng.random() < 0.5])
+            uow.commit()
+    finally:
+        uow.close()
+
+
+def cleanup():
+    connection.execute_query("DELETE FROM MOVIES WHERE title LIKE %s", (f"{TITLE_PREFIX}%",), fetch=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scalar function vs set-based benchmark")
+    parser.add_argument("--sizes", default="10000,100000")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--language-id", type=int, default=1)
+    parser.add_argument("--keep", action="store_true", help="keep the synthetic movies")
+    args = parser.parse_args()
+
+    sizes = sorted(int(size) for size in args.sizes.split(","))
+    missing = sizes[-1] - movie_count()
+    if missing > 0:
+        print(f"Seeding {missing} synthetic movies...")
+        seed(missing, args.language_id)
+
+    rows = []
+    try:
+        for size in sizes:
+            paths = {"functions": FUNCTIONS_SQL, "set-based": SET_BASED_SQL}
+            medians = {}
+            for path, sql in paths.items():
+                samples = time_block(lambda: connection.execute_query(sql, (size,)), repeat=args.repeat)
+                medians[path] = percentile(samples, 50)
+                rows.append({
+                    "movies": size,
+                    "path": path,
+                    "p50_ms": round(medians[path] * 1000, 1),
+                    "p95_ms": round(percentile(samples, 95) * 1000, 1),
+                })
+            rows[-1]["speedup"] = f"{medians['functions'] / medians['set-based']:.1f}x"
+    finally:
+        if missing > 0 and not args.keep:
+            cleanup()
+
+    print_table(rows, ["movies", "path", "p50_ms", "p95_ms", "speedup"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Search latency benchmark: LIKE '%term%' vs FULLTEXT vs in-process index
+
+Runs each search term through the three paths against the configured
+database (.env) and reports median and p95 latency per path.
+
+    python -m scripts.benchmarks.search --terms "dhoom,bahubali,khan" --repeat 50
+"""
+import argparse
+from database import connection
+from app.services.search_service import SearchIndex, fulltext_condition
+from scripts.benchmarks.common import percentile, print_table, time_block
+
+LIKE_SQL = "SELECT movie_id, title FROM MOVIES WHERE title LIKE %s LIMIT 20"
+FULLTEXT_SQL = "SELECT movie_id, title FROM MOVIES WHERE {condition} LIMIT 20"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Search latency benchmark")
+    parser.add_argument("--terms", default="dhoom,bahubali,khan,love,raja")
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    index = SearchIndex(ttl=10 ** 9)
+    build = time_block(index.rebuild)[0]
+    print(f"In-process index built in {build:.2f}s: {index.stats()}")
+
+    rows = []
+    for term in args.terms.split(","):
+        condition, params = fulltext_condition(("title",), term)
+        paths = {
+            "like": lambda: connection.execute_query(LIKE_SQL, (f"%{term}%",)),
+            "fulltext": lambda: connection.execute_query(
+                FULLTEXT_SQL.format(condition=condition), tuple(params)),
+            "index": lambda: index.search(term, kinds={"movie"}),
+        }
+        for path, func in paths.items():
+            samples = time_block(func, repeat=args.repeat)
+            rows.append({
+                "term": term,
+                "path": path,
+                "p50_ms": round(percentile(samples, 50) * 1000, 3),
+                "p95_ms": round(percentile(samples, 95) * 1000, 3),
+            })
+
+    print_table(rows, ["term", "path", "p50_ms", "p95_ms"])
+
+
+if __name__ == "__main__":
+    main()
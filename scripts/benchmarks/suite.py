@@ -0,0 +1,306 @@
+"""
+Benchmark suite: every router at fixed concurrency, with a JSON report
+
+Runs each scenario below (reads across all routers, stored-procedure
+endpoints, analytics, search, graph, audit, export and a create / update /
+delete cycle on rows it creates itself) for the same number of requests at
+one concurrency level, and records throughput and p50/p95/p99 per
+scenario. Request sequences are derived from --seed and ids discovered
+through the API, so two runs against the same seeded database
+(scripts/seed_data.py) issue identical requests and their reports can be
+diffed:
+
+    python -m scripts.seed_data --movies 100000 --truncate --as-of 2026-01-01
+    python -m uvicorn app.main:app --port 8001
+    python -m scripts.benchmarks.suite --out bench-1.4.json
+    python -m scripts.benchmarks.suite --out bench-1.5.json --compare bench-1.4.json
+
+Rows created by the write scenarios ("bench-suite-..." movies and actors)
+are deleted by the delete scenarios at the end of the run. Each scenario
+is warmed up first (--warmup requests, not recorded) so lazily built
+indexes and caches do not count against the first scenario that needs them.
+"""
+import argparse
+import json
+import platform
+import random
+import subprocess
+import sys
+from datetime import date, datetime, timedelta
+from scripts.benchmarks.common import http_json, print_table, run_requests
+
+PREFIX = "bench-suite-"
+# Expensive scenarios run this share of --requests (at least MIN_REQUESTS)
+MIN_REQUESTS = 5
+COLUMNS = ["scenario", "group", "requests", "errors", "throughput_rps", "p50_ms", "p95_ms", "p99_ms"]
+
+# name, group, method, path, body, share of --requests. Paths and bodies are
+# filled per request: {movie} {actor} {crew} {producer} {box} {language} {genre}
+# {word} {movies} (20 ids) come from the dataset; {new_movie} {new_box} {new_actor}
+# {i} from the rows created by the write scenarios.
+SCENARIOS = [
+    ("movies.list", "crud", "GET", "/api/movies?limit=20", None, 1),
+    ("movies.list_by_language", "crud", "GET", "/api/movies?language_id={language}&limit=20", None, 1),
+    ("movies.search_title", "crud", "GET", "/api/movies?title={word}&limit=20", None, 1),
+    ("movies.get", "crud", "GET", "/api/movies/{movie}", None, 1),
+    ("movies.get_many", "crud", "GET", "/api/movies?ids={movies}", None, 1),
+    ("movies.box_office", "crud", "GET", "/api/movies/{movie}/box-office", None, 1),
+    ("producers.list", "crud", "GET", "/api/producers?limit=20", None, 1),
+    ("producers.get", "crud", "GET", "/api/producers/{producer}", None, 1),
+    ("genres.list", "crud", "GET", "/api/genres", None, 1),
+    ("genres.get", "crud", "GET", "/api/genres/{genre}", None, 1),
+    ("languages.list", "crud", "GET", "/api/languages", None, 1),
+    ("languages.get", "crud", "GET", "/api/languages/{language}", None, 1),
+    ("actors.list", "crud", "GET", "/api/actors?limit=20", None, 1),
+    ("actors.get", "crud", "GET", "/api/actors/{actor}", None, 1),
+    ("actors.filmography", "crud", "GET", "/api/actors/{actor}/filmography", None, 1),
+    ("crew.list", "crud", "GET", "/api/crew?limit=20", None, 1),
+    ("crew.get", "crud", "GET", "/api/crew/{crew}", None, 1),
+    ("crew.projects", "crud", "GET", "/api/crew/{crew}/projects", None, 1),
+    ("box_office.list", "crud", "GET", "/api/box-office?limit=20", None, 1),
+    ("box_office.get", "crud", "GET", "/api/box-office/{box}", None, 1),
+    ("box_office.batch", "crud", "GET", "/api/box-office:batch?movie_ids={movies}", None, 1),
+    ("box_office.timeseries", "timeseries", "GET", "/api/box-office/{movie}/timeseries?granularity=week", None, 1),
+    ("movies.details", "procedures", "GET", "/api/movies/{movie}/details", None, 1),
+    ("movies.details_batch", "procedures", "GET", "/api/movies/details:batch?ids={movies}", None, 1),
+    ("movies.profit_analysis", "procedures", "GET", "/api/movies/{movie}/profit-analysis", None, 1),
+    ("analytics.producer", "procedures", "GET", "/api/analytics/producers/{producer}", None, 1),
+    ("analytics.summary", "analytics", "GET", "/api/analytics/summary", None, 1),
+    ("analytics.languages", "analytics", "GET", "/api/analytics/languages", None, 1),
+    ("analytics.top_actors", "analytics", "GET", "/api/analytics/top-actors", None, 1),
+    ("analytics.top_movies", "analytics", "GET", "/api/analytics/top-movies", None, 1),
+    ("analytics.top_profitable", "analytics", "GET", "/api/analytics/profit-analysis", None, 1),
+    ("analytics.rankings", "analytics", "GET",
+     "/api/analytics/rankings?metric=total_collection&k=20&language_id={language}", None, 1),
+    ("analytics.distribution", "analytics", "GET", "/api/analytics/distribution?metric=profit_percentage", None, 1),
+    ("analytics.groups", "analytics", "GET", "/api/analytics/groups/language", None, 1),
+    ("analytics.movie_standing", "analytics", "GET", "/api/analytics/movies/{movie}", None, 1),
+    ("search", "search", "GET", "/api/search?q={word}", None, 1),
+    ("graph.collaborators", "graph", "GET", "/api/graph/actor/{actor}/collaborators", None, 1),
+    ("graph.path", "graph", "GET", "/api/graph/path?from_id={actor}&to_id={actor2}", None, 1),
+    ("graph.pairs", "graph", "GET", "/api/graph/pairs", None, 1),
+    ("forecast.movie", "forecast", "GET", "/api/forecast/movies/{movie}", None, 1),
+    ("audit.movie", "audit", "GET", "/api/audit/movie-audit?movie_id={movie}&limit=50", None, 1),
+    ("audit.activity", "audit", "GET", "/api/audit/activity-log?limit=100", None, 1),
+    ("export.box_office", "export", "GET", "/api/export/box-office?format=csv", None, 0.02),
+    ("movies.create", "writes", "POST", "/api/movies", "movie", 1),
+    ("movies.update", "writes", "PUT", "/api/movies/{new_movie}", "movie", 1),
+    ("movie_cast.create", "writes", "POST", "/api/movie-cast", "cast", 1),
+    ("box_office.update", "writes", "PUT", "/api/box-office/{new_box}", "box_office", 1),
+    ("box_office.timeseries_write", "writes", "POST", "/api/box-office/{new_movie}/timeseries", "daily", 1),
+    ("actors.create", "writes", "POST", "/api/actors", "actor", 1),
+    ("actors.update", "writes", "PUT", "/api/actors/{new_actor}", "actor", 1),
+    ("actors.delete", "writes", "DELETE", "/api/actors/{new_actor}", None, 1),
+    ("movies.delete", "writes", "DELETE", "/api/movies/{new_movie}", None, 1),
+]
+
+
+class Dataset:
+    """Ids and search words discovered through the API"""
+
+    def __init__(self, base_url):
+        self.base_url = base_url
+        self.movies = self._ids("/api/movies?limit=1000", "movie_id")
+        self.actors = self._ids("/api/actors?limit=1000", "actor_id")
+        self.crew = self._ids("/api/crew?limit=1000", "crew_id")
+        self.producers = self._ids("/api/producers?limit=500", "producer_id")
+        self.boxes = self._ids("/api/box-office?limit=1000&collection_status=confirmed", "box_id")
+        self.languages = self._ids("/api/languages", "language_id")
+        self.genres = self._ids("/api/genres", "genre_id")
+        titles = self._get("/api/movies?limit=1000") or []
+        self.words = sorted({word for row in titles for word in row["title"].split() if len(word) > 3})
+        models = self._get("/api/forecast/models") or {}
+        self.forecast_model = models.get("active")
+        # Filled by the write scenarios
+        self.new_movies, self.new_boxes, self.new_actors = [], [], []
+
+    def _get(self, path):
+        status, _, payload = http_json(self.base_url + path)
+        return payload if status == 200 else None
+
+    def _ids(self, path, key):
+        return sorted(row[key] for row in self._get(path) or [])
+
+    def missing(self):
+        return [name for name in ("movies", "actors", "crew", "producers", "boxes", "languages", "genres", "words")
+                if not getattr(self, name)]
+
+
+def _body(kind, rng, data, i):
+    if kind == "movie":
+        return {"title": f"{PREFIX}{i}", "language_id": rng.choice(data.languages),
+                "release_date": (date(2020, 1, 3) + timedelta(weeks=rng.randrange(300))).isoformat(),
+                "duration": rng.randrange(90, 180), "certification": "UA",
+                "budget": round(rng.uniform(1e7, 2e9), 2), "imdb_rating": round(rng.uniform(3, 9), 1),
+                "producer_id": rng.choice(data.producers), "plot_summary": "Benchmark movie"}
+    if kind == "cast":
+        return {"movie_id": data.new_movies[i % len(data.new_movies)],
+                "actor_id": data.actors[(i // len(data.new_movies)) % len(data.actors)],
+                "role_type": "Supporting", "screen_time_minutes": rng.randrange(5, 60)}
+    if kind == "box_office":
+        box = i % len(data.new_boxes)
+        return {"movie_id": data.new_boxes[box][0], "domestic_collection": round(rng.uniform(1e7, 5e9), 2),
+                "intl_collection": round(rng.uniform(0, 1e9), 2), "release_screens": rng.randrange(100, 5000),
+                "collection_status": "updated"}
+    if kind == "daily":
+        start = date(2024, 1, 5) + timedelta(days=7 * i)
+        return [{"day": (start + timedelta(days=d)).isoformat(), "domestic": round(rng.uniform(1e5, 1e8), 2),
+                 "intl": round(rng.uniform(0, 1e7), 2), "screens": rng.randrange(100, 3000)} for d in range(7)]
+    if kind == "actor":
+        return {"name": f"{PREFIX}{i}", "gender": rng.choice(("Male", "Female")),
+                "popularity_score": round(rng.uniform(0, 10), 1), "nationality": "Indian"}
+    return None
+
+
+def build_requests(scenario, data, count, seed, base_url):
+    """The scenario's (url, method, body) list, identical for the same seed and dataset"""
+    name, _, method, path, body_kind, _ = scenario
+    rng = random.Random(f"{seed}:{name}")
+    requests = []
+    for i in range(count):
+        values = {
+            "movie": rng.choice(data.movies), "actor": rng.choice(data.actors),
+            "actor2": rng.choice(data.actors), "crew": rng.choice(data.crew),
+            "producer": rng.choice(data.producers), "box": rng.choice(data.boxes),
+            "language": rng.choice(data.languages), "genre": rng.choice(data.genres),
+            "word": rng.choice(data.words), "movies": ",".join(map(str, rng.sample(data.movies, min(20, len(data.movies))))),
+            "i": i,
+        }
+        if "{new_movie}" in path:
+            values["new_movie"] = data.new_movies[i % len(data.new_movies)]
+        if "{new_box}" in path:
+            values["new_box"] = data.new_boxes[i % len(data.new_boxes)][1]
+        if "{new_actor}" in path:
+            values["new_actor"] = data.new_actors[i % len(data.new_actors)]
+        requests.append((base_url + path.format(**values), method, _body(body_kind, rng, data, i)))
+    return requests
+
+
+def _prepare(name, data, base_url):
+    """Reason to skip a scenario, or None; looks up box office rows of the created movies"""
+    if name.startswith("forecast.") and data.forecast_model is None:
+        return "no active forecast model (POST /api/forecast/train)"
+    needs = {"movies.update": data.new_movies, "movie_cast.create": data.new_movies,
+             "box_office.timeseries_write": data.new_movies, "movies.delete": data.new_movies,
+             "actors.update": data.new_actors, "actors.delete": data.new_actors}
+    if name in needs and not needs[name]:
+        return "no rows created"
+    if name == "box_office.update":
+        for movie_id in data.new_movies:
+            status, _, payload = http_json(f"{base_url}/api/movies/{movie_id}/box-office")
+            if status == 200:
+                data.new_boxes.append((movie_id, payload["box_id"]))
+        if not data.new_boxes:
+            return "created movies have no box office rows"
+    return None
+
+
+def _collector(name, data):
+    """on_response hook recording ids created by a write scenario"""
+    target, key = {"movies.create": (data.new_movies, "movie_id"),
+                   "actors.create": (data.new_actors, "actor_id")}.get(name, (None, None))
+    if target is None:
+        return None
+
+    def collect(_, status, payload):
+        if 200 <= status < 300 and isinstance(payload, dict) and payload.get(key):
+            target.append(payload[key])
+    return collect
+
+
+def _git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def compare(report, baseline, threshold):
+    """Rows of per-scenario changes against a previous report; regressions beyond threshold % flagged"""
+    rows = []
+    for name, new in report["scenarios"].items():
+        old = baseline.get("scenarios", {}).get(name)
+        if not old or "p95_ms" not in old or "p95_ms" not in new:
+            continue
+        p95 = (new["p95_ms"] - old["p95_ms"]) / old["p95_ms"] * 100 if old["p95_ms"] else 0.0
+        rps = ((new["throughput_rps"] - old["throughput_rps"]) / old["throughput_rps"] * 100
+               if old["throughput_rps"] else 0.0)
+        rows.append({"scenario": name, "p95_old": old["p95_ms"], "p95_new": new["p95_ms"],
+                     "p95_change": f"{p95:+.1f}%", "rps_old": old["throughput_rps"],
+                     "rps_new": new["throughput_rps"], "rps_change": f"{rps:+.1f}%",
+                     "regression": "yes" if p95 > threshold or rps < -threshold else ""})
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark every router at fixed concurrency")
+    parser.add_argument("--base-url", default="http://localhost:8001")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=200, help="Recorded requests per scenario")
+    parser.add_argument("--warmup", type=int, default=10, help="Unrecorded requests per read scenario")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--group", action="append", dest="groups", help="Only these groups (repeatable)")
+    parser.add_argument("--no-writes", action="store_true", help="Skip the write scenarios")
+    parser.add_argument("--out", help="Write the JSON report here")
+    parser.add_argument("--compare", help="Previous JSON report to diff against")
+    parser.add_argument("--threshold", type=float, default=10.0,
+                        help="Flag p95 increases / throughput drops beyond this percentage")
+    parser.add_argument("--fail-on-regression", action="store_true",
+                        help="Exit with status 1 if --compare flags a regression")
+    args = parser.parse_args()
+
+    data = Dataset(args.base_url)
+    missing = data.missing()
+    if missing:
+        sys.exit(f"No {', '.join(missing)} found at {args.base_url}; seed the database first "
+                 f"(python -m scripts.seed_data)")
+
+    report = {
+        "meta": {
+            "started_at": datetime.now().isoformat(timespec="seconds"), "base_url": args.base_url,
+            "git_revision": _git_revision(), "python": platform.python_version(),
+            "concurrency": args.concurrency, "requests": args.requests, "warmup": args.warmup,
+            "seed": args.seed, "snapshot": data._get("/api/analytics/snapshot"),
+        },
+        "scenarios": {},
+    }
+    for scenario in SCENARIOS:
+        name, group, method, _, _, share = scenario
+        if (args.groups and group not in args.groups) or (args.no_writes and group == "writes"):
+            continue
+        reason = _prepare(name, data, args.base_url)
+        if reason:
+            report["scenarios"][name] = {"group": group, "skipped": reason}
+            print(f"{name}: skipped ({reason})")
+            continue
+        count = max(MIN_REQUESTS, int(args.requests * share))
+        if method == "GET" and args.warmup:
+            warmup = build_requests(scenario, data, args.warmup, f"warmup-{args.seed}", args.base_url)
+            run_requests(warmup.__getitem__, args.concurrency, len(warmup))
+        requests = build_requests(scenario, data, count, args.seed, args.base_url)
+        result = run_requests(requests.__getitem__, args.concurrency, count,
+                              on_response=_collector(name, data))
+        report["scenarios"][name] = {"group": group, "method": method, **result}
+        print(f"{name}: {result['throughput_rps']} req/s, p95 {result['p95_ms']} ms, {result['errors']} errors")
+
+    report["meta"]["pool"] = data._get("/health/pool")
+    ran = [{"scenario": name, **values} for name, values in report["scenarios"].items() if "skipped" not in values]
+    print()
+    print_table(ran, COLUMNS)
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            rows = compare(report, json.load(f), args.threshold)
+        print(f"\nAgainst {args.compare}")
+        print_table(rows, ["scenario", "p95_old", "p95_new", "p95_change",
+                           "rps_old", "rps_new", "rps_change", "regression"])
+        if args.fail_on_regression and any(row["regression"] for row in rows):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""
+Write-throughput benchmark: trigger-validated vs constraint-validated writes
+
+Inserts cast, crew and box office rows one transaction per row (as the API
+does) and reports inserts/sec for two write paths:
+
+* legacy   - the BEFORE INSERT duplicate/validation triggers that used to
+             guard MOVIE_CAST and MOVIE_CREW are re-created for the run,
+             and box office creates do the old SELECT ... FOR UPDATE and
+             duplicate check before the INSERT
+* current  - constraints only; the INSERT is the whole write
+
+Synthetic movies, actors and crew ("bench-wr-...") are created for the run
+and removed afterwards. Run it against a scratch database.
+
+    python -m scripts.benchmarks.write_throughput --rows 2000
+"""
+import argparse
+import time
+from database.unit_of_work import UnitOfWork
+from scripts.benchmarks.common import print_table
+
+PREFIX = "bench-wr-"
+
+LEGACY_TRIGGERS = {
+    "tr_prevent_duplicate_cast": """
+CREATE TRIGGER tr_prevent_duplicate_cast
+BEFORE INSERT ON MOVIE_CAST
+FOR EACH ROW
+BEGIN
+    DECLARE v_count INT;
+    SELECT COUNT(*) INTO v_count FROM MOVIE_CAST
+    WHERE movie_id = NEW.movie_id AND actor_id = NEW.actor_id;
+    IF v_count > 0 THEN
+        SIGNAL SQLSTATE '45000'
+        SET MESSAGE_TEXT = 'Error: This actor is already added to this movie!';
+    END IF;
+END""",
+    "tr_validate_movie_cast": """
+CREATE TRIGGER tr_validate_movie_cast
+BEFORE INSERT ON MOVIE_CAST
+FOR EACH ROW
+BEGIN
+    IF NEW.screen_time_minutes < 0 THEN
+        SIGNAL SQLSTATE '45000'
+        SET MESSAGE_TEXT = 'Error: Screen time cannot be negative!';
+    END IF;
+    IF NEW.role_type NOT IN ('Lead', 'Supporting', 'Cameo') THEN
+        SIGNAL SQLSTATE '45000'
+        SET MESSAGE_TEXT = 'Error: Invalid role type! Must be Lead, Supporting, or Cameo.';
+    END IF;
+END""",
+    "tr_prevent_duplicate_crew": """
+CREATE TRIGGER tr_prevent_duplicate_crew
+BEFORE INSERT ON MOVIE_CREW
+FOR EACH ROW
+BEGIN
+    DECLARE v_count INT;
+    SELECT COUNT(*) INTO v_count FROM MOVIE_CREW
+    WHERE movie_id = NEW.movie_id AND crew_id = NEW.crew_id;
+    IF v_count > 0 THEN
+        SIGNAL SQLSTATE '45000'
+        SET MESSAGE_TEXT = 'Error: This crew member is already added to this movie!';
+    END IF;
+END""",
+}
+
+
+def setup(uow, rows, language_id):
+    """Create `rows` movies and a pool of actors/crew; return their ids"""
+    movies = uow.execute_many(
+        "INSERT INTO MOVIES (title, language_id) VALUES (%s, %s)",
+        [(f"{PREFIX}{i}", language_id) for i in range(rows)])
+    actors = uow.execute_many(
+        "INSERT INTO ACTORS (name) VALUES (%s)", [(f"{PREFIX}{i}",) for i in range(rows)])
+    crew = uow.execute_many(
+        "INSERT INTO PRODUCTION_CREW (name, role) VALUES (%s, 'Other')",
+        [(f"{PREFIX}{i}",) for i in range(rows)])
+    uow.commit()
+    return ([movies["last_id"] + i for i in range(rows)],
+            [actors["last_id"] + i for i in range(rows)],
+            [crew["last_id"] + i for i in range(rows)])
+
+
+def reset(uow, movie_ids):
+    placeholders = ", ".join(["%s"] * len(movie_ids))
+    for table in ("MOVIE_CAST", "MOVIE_CREW", "BOX_OFFICE"):
+        uow.execute(f"DELETE FROM {table} WHERE movie_id IN ({placeholders})",
+                    tuple(movie_ids), fetch=False)
+    uow.commit()
+
+
+def cleanup(uow):
+    for table, column in (("MOVIES", "title"), ("ACTORS", "name"), ("PRODUCTION_CREW", "name")):
+        uow.execute(f"DELETE FROM {table} WHERE {column} LIKE %s", (f"{PREFIX}%",), fetch=False)
+    uow.commit()
+
+
+def set_legacy_triggers(uow, enabled):
+    for name, ddl in LEGACY_TRIGGERS.items():
+        uow.execute(f"DROP TRIGGER IF EXISTS {name}", fetch=False)
+        if enabled:
+            uow.execute(ddl, fetch=False)
+
+
+def timed_inserts(uow, statements):
+    """Run (sql, params) statements one transaction each; return inserts/sec"""
+    start = time.perf_counter()
+    for steps in statements:
+        for sql, params in steps:
+            uow.execute(sql, params, fetch=False)
+        uow.commit()
+    elapsed = time.perf_counter() - start
+    return round(len(statements) / elapsed, 1) if elapsed else None
+
+
+def run(uow, mode, movie_ids, actor_ids, crew_ids):
+    cast = [[("INSERT INTO MOVIE_CAST (movie_id, actor_id, role_type, screen_time_minutes) "
+              "VALUES (%s, %s, 'Lead', 120)", (m, a))] for m, a in zip(movie_ids, actor_ids)]
+    crew = [[("INSERT INTO MOVIE_CREW (movie_id, crew_id) VALUES (%s, %s)", (m, c))]
+            for m, c in zip(movie_ids, crew_ids)]
+    box_office = []
+    for movie_id in movie_ids:
+        steps = []
+        if mode == "legacy":
+            steps += [("SELECT movie_id FROM MOVIES WHERE movie_id = %s FOR UPDATE", (movie_id,)),
+                      ("SELECT box_id FROM BOX_OFFICE WHERE movie_id = %s", (movie_id,))]
+        steps.append(("INSERT INTO BOX_OFFICE (movie_id, domestic_collection, intl_collection) "
+                      "VALUES (%s, 1000000, 500000)", (movie_id,)))
+        box_office.append(steps)
+
+    return {
+        "mode": mode,
+        "cast_per_s": timed_inserts(uow, cast),
+        "crew_per_s": timed_inserts(uow, crew),
+        "box_office_per_s": timed_inserts(uow, box_office),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write-throughput benchmark")
+    parser.add_argument("--rows", type=int, default=2000, help="inserts per table and mode")
+    parser.add_argument("--language-id", type=int, default=1)
+    args = parser.parse_args()
+
+    uow = UnitOfWork()
+    results = []
+    try:
+        movie_ids, actor_ids, crew_ids = setup(uow, args.rows, args.language_id)
+        for mode in ("legacy", "current"):
+            set_legacy_triggers(uow, enabled=mode == "legacy")
+            results.append(run(uow, mode, movie_ids, actor_ids, crew_ids))
+            reset(uow, movie_ids)
+    finally:
+        set_legacy_triggers(uow, enabled=False)
+        cleanup(uow)
+        uow.close()
+
+    legacy, current = results if len(results) == 2 else (None, None)
+    if legacy and current:
+        results.append({key: f"{current[key] / legacy[key]:.2f}x" if key != "mode" else "speedup"
+                        for key in legacy})
+    print_table(results, ["mode", "cast_per_s", "crew_per_s", "box_office_per_s"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""
+Streaming bulk importer
+
+Loads a CSV or JSONL file straight into the configured database (.env)
+using the same validation and batched writes as POST /api/bulk/{kind}.
+The file is read incrementally, so memory stays flat for large files.
+
+    python -m scripts.import_data movies releases_2024.csv
+    python -m scripts.import_data cast cast.jsonl --batch-size 5000
+    python -m scripts.import_data box-office collections.csv --dry-run
+
+Entities: movies, actors, crew, box-office, box-office-daily, cast,
+movie-crew. Exits with status 1 if any row was rejected.
+"""
+import argparse
+import json
+import os
+import sys
+from app.services.ingest_service import BULK_ENTITIES, DEFAULT_BATCH_SIZE, FORMATS, load_file
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk import CSV/JSONL data")
+    parser.add_argument("kind", choices=sorted(BULK_ENTITIES))
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=FORMATS,
+                        help="Defaults to the file extension (.csv, otherwise jsonl)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--dry-run", action="store_true", help="Validate only, write nothing")
+    args = parser.parse_args()
+
+    fmt = args.format or ("csv" if os.path.splitext(args.path)[1].lower() == ".csv" else "jsonl")
+    with open(args.path, "rb") as f:
+        report = load_file(args.kind, f, fmt, batch_size=args.batch_size, dry_run=args.dry_run)
+
+    for error in report["errors"]:
+        print(f"line {error['line']}: {error['error']}", file=sys.stderr)
+    summary = {k: v for k, v in report.items() if k != "errors"}
+    print(json.dumps(summary, indent=2))
+    sys.exit(1 if report["failed"] else 0)
+
+
+if __name__ == "__main__":
+    main()
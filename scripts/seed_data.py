@@ -0,0 +1,604 @@
+"""
+Deterministic synthetic data generator
+
+Fills the database with a realistic-looking Indian film catalogue at any
+scale: producers, actors and crew, movies with genres, cast and crew,
+statistics, box office (plus daily collections for a sample of releases)
+and the audit / activity history the triggers and audit pipeline would
+have written. The same --seed, --movies and --as-of always produce the
+same rows, whatever the --batch-size, so benchmark runs can be compared
+across releases.
+
+Distributions:
+
+* releases per language follow current industry shares (Hindi, Telugu and
+  Tamil lead), grow ~4% a year since 1990, land on Fridays and cluster
+  around festival months
+* actors, crew and producers belong to one industry; each movie draws its
+  people from a Zipf-Mandelbrot popularity curve, so a few stars appear in many
+  films (popularity_score follows the same rank)
+* budgets are log-normal per industry and inflate over time; collections
+  scale with budget and star power with heavy-tailed luck, so there are
+  blockbusters and flops
+* every movie has a BOX_OFFICE row as the API creates one; upcoming
+  releases stay pending
+* created_at / audit timestamps spread over the --history-days before
+  --as-of, so every audit partition has rows
+
+Writes go straight to the configured database (.env) with multi-row
+INSERTs. For the load, the session skips the audit triggers (the history
+is generated instead) and foreign-key / unique checks (the generator keeps
+the data consistent); summaries are rebuilt at the end. --sql writes the
+same rows as an SQL script instead, for loading elsewhere (it assumes the
+reference rows of 01_create_tables.sql and an otherwise empty database).
+
+    python -m scripts.seed_data --movies 10000
+    python -m scripts.seed_data --movies 1000000 --seed 7 --truncate
+    python -m scripts.seed_data --movies 2000 --sql seed.sql
+"""
+import argparse
+import math
+import time
+from datetime import date, datetime, timedelta
+import numpy as np
+
+# name, share of releases, budget relative to Hindi, domestic share of gross, region
+LANGUAGES = (
+    ("Hindi", 0.30, 1.00, 0.80, "Mumbai"),
+    ("Telugu", 0.18, 0.75, 0.88, "Hyderabad"),
+    ("Tamil", 0.17, 0.65, 0.82, "Chennai"),
+    ("Malayalam", 0.11, 0.22, 0.75, "Kochi"),
+    ("Kannada", 0.09, 0.30, 0.92, "Bengaluru"),
+    ("Marathi", 0.06, 0.10, 0.95, "Pune"),
+    ("Punjabi", 0.05, 0.12, 0.60, "Chandigarh"),
+    ("English", 0.04, 0.40, 0.55, "Mumbai"),
+)
+# Language ids as assigned by the INSERT in 01_create_tables.sql (used by --sql)
+SCHEMA_LANGUAGES = ("Hindi", "Tamil", "Telugu", "Kannada", "Malayalam", "Marathi", "Punjabi", "English")
+GENRES = ("Drama", "Action", "Comedy", "Romance", "Thriller", "Family", "Horror", "Musical")
+GENRE_WEIGHTS = (0.26, 0.20, 0.16, 0.13, 0.11, 0.07, 0.04, 0.03)
+# Releases per month (festival seasons: Sankranti, Eid, Independence Day, Diwali, Christmas)
+MONTH_WEIGHTS = (1.3, 0.8, 0.8, 1.0, 0.9, 1.1, 0.9, 1.2, 1.0, 1.3, 1.4, 1.3)
+CERTIFICATIONS = (("UA", 0.50), ("U", 0.30), ("A", 0.20))
+CREW_ROLES = (
+    # role, chance a movie credits one, share of the crew pool
+    ("Director", 1.0, 0.22), ("Music Director", 1.0, 0.12), ("Cinematographer", 1.0, 0.14),
+    ("Editor", 1.0, 0.12), ("Writer", 0.7, 0.16), ("Choreographer", 0.5, 0.10),
+    ("Producer", 0.3, 0.08), ("Other", 0.4, 0.06),
+)
+SPECIALTIES = {
+    "Director": "Feature films", "Music Director": "Film scores and songs",
+    "Cinematographer": "Digital and film photography", "Editor": "Feature editing",
+    "Writer": "Screenplay and dialogue", "Choreographer": "Song and dance sequences",
+    "Producer": "Line production", "Other": "Production design",
+}
+
+FIRST_NAMES = {
+    "north": {"Male": ("Aarav", "Rohan", "Vikram", "Arjun", "Kabir", "Rajesh", "Amit", "Sanjay",
+                       "Rahul", "Varun", "Ishaan", "Manoj", "Harpreet", "Gurdeep", "Siddharth", "Ayaan"),
+              "Female": ("Priya", "Ananya", "Kavya", "Neha", "Pooja", "Riya", "Simran", "Aditi",
+                         "Meera", "Sonali", "Ishita", "Tanvi", "Jaspreet", "Madhuri", "Kiara", "Sana")},
+    "south": {"Male": ("Karthik", "Surya", "Vijay", "Arun", "Prabhas", "Mahesh", "Dulquer", "Rakshit",
+                       "Venkatesh", "Naveen", "Srinivas", "Harish", "Fahadh", "Yash", "Dhanush", "Nani"),
+              "Female": ("Lakshmi", "Divya", "Keerthy", "Samantha", "Nayanthara", "Anjali", "Revathi",
+                         "Shruti", "Meenakshi", "Parvathy", "Rashmika", "Sai", "Nithya", "Trisha",
+                         "Aishwarya", "Sruthi")},
+}
+SURNAMES = {
+    "north": ("Sharma", "Kapoor", "Khanna", "Malhotra", "Verma", "Gupta", "Singh", "Chopra", "Mehta",
+              "Joshi", "Deshmukh", "Kulkarni", "Gill", "Sandhu", "Bhatt", "Saxena", "Rao", "Patil"),
+    "south": ("Reddy", "Iyer", "Nair", "Menon", "Pillai", "Naidu", "Krishnan", "Raju", "Gowda",
+              "Shetty", "Varma", "Subramaniam", "Kumar", "Rao", "Hegde", "Chandran", "Murthy", "Das"),
+}
+SOUTH = {"Tamil", "Telugu", "Kannada", "Malayalam"}
+TITLE_WORDS = ("Dil", "Pyaar", "Raja", "Veer", "Kaal", "Sultan", "Dost", "Safar", "Zindagi", "Baazi",
+               "Toofan", "Mehboob", "Sitara", "Shakti", "Yodha", "Badal", "Samundar", "Raat", "Chand",
+               "Kahani", "Mitti", "Aag", "Junoon", "Dhadkan", "Anjaan", "Nayak", "Vettai", "Kadhal",
+               "Simham", "Bhairava", "Kireedam", "Mazhai", "Ranam", "Premam", "Jigarthanda", "Vikramarkudu")
+PLOT_SUBJECTS = ("a village schoolteacher", "an honest police officer", "an estranged son",
+                 "a struggling musician", "a young cricketer", "a fearless journalist", "a retired soldier",
+                 "a small-town dreamer", "a family of farmers", "a gangster seeking redemption")
+PLOT_CONFLICTS = ("takes on a corrupt politician", "falls in love across a family feud",
+                  "chases a dream in Mumbai", "uncovers a decades-old secret", "fights to save the land",
+                  "must win one last match", "returns home after twenty years", "plans an impossible heist")
+
+MOVIES_PER_CHUNK = 1000     # part of the seed's definition: changing it changes the data
+FIRST_YEAR = 1990
+UPCOMING_SHARE = 0.03
+DAILY_DAYS = 35
+USER_IDS = (1, 2, 3, 4)     # users seeded by 01_create_tables.sql
+
+TABLES = {
+    "PRODUCERS": ("producer_id", "name", "company", "phone", "email", "start_date", "region",
+                  "created_by", "created_at"),
+    "ACTORS": ("actor_id", "name", "gender", "date_of_birth", "nationality", "popularity_score",
+               "email", "created_at", "updated_at"),
+    "PRODUCTION_CREW": ("crew_id", "name", "role", "specialty", "experience_years", "email",
+                        "created_at"),
+    "MOVIES": ("movie_id", "title", "release_date", "language_id", "duration", "certification",
+               "budget", "ott_rights_value", "poster_url", "plot_summary", "imdb_rating",
+               "producer_id", "created_by", "created_at", "updated_at"),
+    "MOVIE_STATISTICS": ("movie_id", "total_reviews", "average_rating", "viewer_count"),
+    "MOVIE_GENRES": ("movie_id", "genre_id"),
+    "BOX_OFFICE": ("box_id", "movie_id", "domestic_collection", "intl_collection", "opening_weekend",
+                   "profit_margin", "release_screens", "collection_status", "updated_by",
+                   "created_at", "updated_at"),
+    "MOVIE_CAST": ("movie_id", "actor_id", "role_name", "role_type", "screen_time_minutes",
+                   "created_at"),
+    "MOVIE_CREW": ("movie_id", "crew_id", "role_description", "created_at"),
+    "BOX_OFFICE_DAILY": ("movie_id", "day", "domestic", "intl", "screens"),
+    "MOVIE_AUDIT": ("movie_id", "old_title", "new_title", "old_budget", "new_budget",
+                    "old_release_date", "new_release_date", "modified_by", "modification_reason",
+                    "modified_at", "operation_type"),
+    "BOX_OFFICE_AUDIT": ("box_id", "movie_id", "old_domestic", "new_domestic", "old_intl", "new_intl",
+                         "old_margin", "new_margin", "modified_by", "modified_at", "operation_type"),
+    "ACTIVITY_LOG": ("user_id", "action", "table_name", "record_id", "details", "action_timestamp"),
+}
+# Tables emptied by --truncate (reference tables and USERS are kept)
+GENERATED_TABLES = ("ACTIVITY_LOG", "BOX_OFFICE_AUDIT", "MOVIE_AUDIT", "BOX_OFFICE_DAILY",
+                    "MOVIE_CREW", "MOVIE_CAST", "BOX_OFFICE", "MOVIE_GENRES", "MOVIE_STATISTICS",
+                    "MOVIES", "PRODUCTION_CREW", "ACTORS", "PRODUCERS", "SUMMARY_REFRESH_QUEUE",
+                    "MOVIE_SUMMARY", "ACTOR_SUMMARY", "PRODUCER_SUMMARY", "LANGUAGE_SUMMARY")
+# TRUNCATE fires no delete triggers; record it so the list ETags change
+TRUNCATED_MARK = ("INSERT INTO TABLE_DELETIONS (table_name) VALUES "
+                  + ", ".join(f"('{table}')" for table in GENERATED_TABLES)
+                  + " ON DUPLICATE KEY UPDATE deleted_at = CURRENT_TIMESTAMP(6)")
+# Tables given explicit ids so other rows can reference them
+ID_COLUMNS = {"PRODUCERS": "producer_id", "ACTORS": "actor_id", "PRODUCTION_CREW": "crew_id",
+              "MOVIES": "movie_id", "BOX_OFFICE": "box_id"}
+
+
+class Pool:
+    """Ids drawn with Zipf-Mandelbrot weights 1 / (rank + offset): the first ids are the stars.
+
+    The offset grows with the pool (`spread` of its size), so the biggest
+    names keep a plausible filmography whatever the catalogue size.
+    """
+
+    def __init__(self, ids, spread):
+        self.ids = np.asarray(ids, dtype=np.int64)
+        offset = max(1.0, len(self.ids) * spread)
+        weights = 1.0 / (np.arange(len(self.ids)) + offset)
+        self.cumulative = np.cumsum(weights) / weights.sum()
+
+    def draw(self, rng, size):
+        index = np.searchsorted(self.cumulative, rng.random(size), side="right")
+        return self.ids[np.minimum(index, len(self.ids) - 1)]
+
+
+def _choice(rng, options, weights, size=None):
+    weights = np.asarray(weights, dtype=np.float64)
+    return rng.choice(len(options), size=size, p=weights / weights.sum())
+
+
+def _money(value):
+    return None if value is None else round(float(value), 2)
+
+
+def _name(rng, language, gender):
+    region = "south" if language in SOUTH else "north"
+    first = FIRST_NAMES[region][gender]
+    last = SURNAMES[region]
+    return f"{first[rng.integers(len(first))]} {last[rng.integers(len(last))]}"
+
+
+def _popularity(rank):
+    """Score for the rank-th most cast person of an industry (0 = biggest star)"""
+    return 9.8 - 2.2 * math.log10(1 + rank)
+
+
+def _instant(rng, start, end):
+    """Uniform datetime in [start, end], to the second"""
+    span = max(int((end - start).total_seconds()), 0)
+    return start + timedelta(seconds=int(rng.integers(0, span + 1)))
+
+
+class Catalogue:
+    """People pools and reference ids shared by every chunk of movies"""
+
+    def __init__(self, seed, movies, as_of, history_days, daily_fraction, offsets,
+                 language_ids, genre_ids, user_ids):
+        self.seed = seed
+        self.movies = movies
+        self.daily_fraction = daily_fraction
+        self.as_of = as_of
+        self.history_start = as_of - timedelta(days=history_days)
+        self.offsets = offsets
+        self.language_ids = language_ids
+        self.genre_ids = genre_ids
+        self.user_ids = user_ids
+        self.actors = None
+        self.actor_pools, self.crew_pools, self.producer_pools = {}, {}, {}
+        self.actor_popularity = {}
+
+    def _people(self, table, count, stream):
+        """Split `count` people into per-industry blocks of ids (first id = biggest name)"""
+        rng = np.random.default_rng([self.seed, stream])
+        next_id = self.offsets[table] + 1
+        members = {}
+        for name, share, *_ in LANGUAGES:
+            size = max(3, round(count * share))
+            members[name] = list(range(next_id, next_id + size))
+            next_id += size
+        return rng, members
+
+    def people_rows(self):
+        """Yield (table, rows) for producers, actors and crew"""
+        n_actors = max(200, int(self.movies * 0.4))
+        n_crew = max(300, int(self.movies * 0.3))
+        n_producers = max(40, self.movies // 40)
+
+        rng, members = self._people("PRODUCERS", n_producers, 1)
+        regions = {name: region for name, *_, region in LANGUAGES}
+        rows = []
+        for language, producer_id in ((name, i) for name, ids in members.items() for i in ids):
+            person = _name(rng, language, "Male" if rng.random() < 0.8 else "Female")
+            suffix = ("Films", "Productions", "Studios", "Entertainment", "Pictures")[rng.integers(5)]
+            rows.append((producer_id, person, f"{person.split()[-1]} {suffix}",
+                         f"+91 9{rng.integers(100000000, 999999999)}", f"producer{producer_id}@example.in",
+                         date(int(rng.integers(1970, 2021)), int(rng.integers(1, 13)), 1), regions[language],
+                         self.user_ids[0], _instant(rng, self.history_start, self.history_start + timedelta(days=1))))
+        self.producer_pools = {name: Pool(ids, spread=0.1) for name, ids in members.items()}
+        yield "PRODUCERS", rows
+
+        rng, members = self._people("ACTORS", n_actors, 2)
+        rank = {actor_id: r for ids in members.values() for r, actor_id in enumerate(ids)}
+        rows = []
+        for language, actor_id in ((name, i) for name, ids in members.items() for i in ids):
+            gender = "Male" if rng.random() < 0.58 else "Female"
+            score = min(10.0, max(0.5, _popularity(rank[actor_id]) + rng.normal(0, 0.3)))
+            self.actor_popularity[actor_id] = round(score, 1)
+            created = _instant(rng, self.history_start, self.history_start + timedelta(days=1))
+            rows.append((actor_id, _name(rng, language, gender), gender,
+                         date(int(rng.integers(1945, 2004)), int(rng.integers(1, 13)), int(rng.integers(1, 29))),
+                         "Indian" if rng.random() < 0.97 else "British", round(score, 1),
+                         f"actor{actor_id}@example.in", created, created))
+        self.actor_pools = {name: Pool(ids, spread=0.01) for name, ids in members.items()}
+        # Cross-industry casting still favours the biggest names of each industry
+        self.actors = Pool(sorted(rank, key=rank.get), spread=0.01)
+        yield "ACTORS", rows
+
+        rng = np.random.default_rng([self.seed, 3])
+        rows = []
+        crew_id = self.offsets["PRODUCTION_CREW"]
+        for language, share, *_ in LANGUAGES:
+            for role, _, role_share in CREW_ROLES:
+                size = max(3, int(n_crew * share * role_share))
+                ids = list(range(crew_id + 1, crew_id + size + 1))
+                crew_id += size
+                self.crew_pools[(language, role)] = Pool(ids, spread=0.05)
+                for member in ids:
+                    rows.append((member, _name(rng, language, "Male" if rng.random() < 0.75 else "Female"),
+                                 role, SPECIALTIES[role], int(rng.integers(1, 41)),
+                                 f"crew{member}@example.in",
+                                 _instant(rng, self.history_start, self.history_start + timedelta(days=1))))
+        yield "PRODUCTION_CREW", rows
+
+    def chunks(self):
+        return math.ceil(self.movies / MOVIES_PER_CHUNK)
+
+    def chunk_rows(self, index):
+        """Rows of every movie table for the index-th chunk of movies"""
+        rng = np.random.default_rng([self.seed, 100, index])
+        first = index * MOVIES_PER_CHUNK
+        count = min(MOVIES_PER_CHUNK, self.movies - first)
+        tables = {table: [] for table in TABLES
+                  if table not in ("PRODUCERS", "ACTORS", "PRODUCTION_CREW")}
+
+        years = np.arange(FIRST_YEAR, self.as_of.year + 1)
+        year_weights = 1.04 ** (years - FIRST_YEAR)
+        languages = _choice(rng, LANGUAGES, [share for _, share, *_ in LANGUAGES], size=count)
+        release_years = years[_choice(rng, years, year_weights, size=count)]
+        months = _choice(rng, MONTH_WEIGHTS, MONTH_WEIGHTS, size=count) + 1
+        # Spread creation over the history window in id order, as a live catalogue grows
+        span = (self.as_of - self.history_start).total_seconds()
+        created = [self.history_start + timedelta(seconds=int(span * (first + i + rng.random()) / self.movies))
+                   for i in range(count)]
+
+        for i in range(count):
+            movie_id = self.offsets["MOVIES"] + first + i + 1
+            box_id = self.offsets["BOX_OFFICE"] + first + i + 1
+            language, _, budget_scale, domestic_share, _ = LANGUAGES[languages[i]]
+            language_id = self.language_ids[language]
+            created_at = created[i]
+
+            upcoming = rng.random() < UPCOMING_SHARE
+            if upcoming:
+                release = self.as_of.date() + timedelta(days=int(rng.integers(7, 180)))
+            else:
+                release = date(int(release_years[i]), int(months[i]), int(rng.integers(1, 29)))
+                release = min(release, self.as_of.date() - timedelta(days=1))
+            release += timedelta(days=(4 - release.weekday()) % 7)    # Friday releases
+            if not upcoming and release >= self.as_of.date():
+                release -= timedelta(days=7)
+
+            inflation = 1.06 ** (release.year - self.as_of.year)
+            budget = float(np.clip(rng.lognormal(math.log(2.5e8 * budget_scale * inflation), 0.9), 5e6, 6e9))
+            title = " ".join(TITLE_WORDS[w] for w in rng.integers(len(TITLE_WORDS), size=int(rng.integers(1, 4))))
+            if rng.random() < 0.06:
+                title += f" {int(rng.integers(2, 4))}"
+            plot = (f"{PLOT_SUBJECTS[rng.integers(len(PLOT_SUBJECTS))].capitalize()} "
+                    f"{PLOT_CONFLICTS[rng.integers(len(PLOT_CONFLICTS))]}.")
+            duration = int(np.clip(rng.normal(110 if language == "English" else 145, 18), 80, 210))
+            certification = CERTIFICATIONS[_choice(rng, CERTIFICATIONS, [w for _, w in CERTIFICATIONS])][0]
+            producer_id = int(self.producer_pools[language].draw(rng, 1)[0])
+            created_by = self.user_ids[int(rng.integers(len(self.user_ids)))]
+
+            # Cast: two leads, then supporting roles and cameos; 10% from other industries
+            pool = self.actor_pools[language]
+            size = int(rng.integers(4, 13))
+            actors = pool.draw(rng, size)
+            outsiders = rng.random(size) < 0.1
+            actors[outsiders] = self.actors.draw(rng, int(outsiders.sum()))
+            actors = list(dict.fromkeys(actors.tolist()))
+            star_power = float(np.mean([self.actor_popularity[a] for a in actors[:2]]))
+
+            # Final budget after revisions; the audit trail replays them
+            revisions = [budget]
+            for _ in range(int(rng.integers(0, 3))):
+                revisions.append(revisions[-1] * float(rng.uniform(1.0, 1.25)))
+            budget = revisions[-1]
+
+            released = not upcoming and release <= self.as_of.date()
+            rating = None
+            if released:
+                luck = rng.normal(0, 0.8)
+                gross = budget * math.exp(0.15 * (star_power - 5) + luck - 0.1)
+                share = float(np.clip(rng.normal(domestic_share, 0.05), 0.3, 1.0))
+                domestic, intl = gross * share, gross * (1 - share)
+                opening = domestic * float(rng.uniform(0.2, 0.45))
+                screens = int(np.clip(math.exp(math.log(budget) * 0.55 - 3.6 + rng.normal(0, 0.25)), 50, 8000))
+                margin = max(0.0, min(100.0, (gross - budget) / gross * 100)) if gross else 0.0
+                rating = round(float(np.clip(rng.normal(6.2, 1.1) + 0.3 * luck, 1.0, 9.8)), 1)
+                status = "confirmed" if (self.as_of.date() - release).days > 90 else "updated"
+            ott = _money(budget * rng.uniform(0.1, 0.45)) if release.year >= 2015 else None
+            updated_at = created_at
+
+            # Audit trail: creation, then budget revisions between creation and as-of
+            audit_times = sorted(_instant(rng, created_at, self.as_of) for _ in revisions[1:])
+            tables["MOVIE_AUDIT"].append((movie_id, None, title, None, _money(revisions[0]), None, release,
+                                          "System", "Movie Created", created_at, "INSERT"))
+            tables["ACTIVITY_LOG"].append((created_by, "CREATE", "MOVIES", movie_id,
+                                           f"Movie added: {title}", created_at))
+            for old, new, at in zip(revisions, revisions[1:], audit_times):
+                tables["MOVIE_AUDIT"].append((movie_id, title, title, _money(old), _money(new), release, release,
+                                              "System", "Budget revised", at, "UPDATE"))
+                tables["ACTIVITY_LOG"].append((created_by, "UPDATE", "MOVIES", movie_id,
+                                               f"Movie updated: {title}", at))
+                updated_at = at
+
+            tables["MOVIES"].append((movie_id, title, release, language_id, duration, certification,
+                                     _money(budget), ott, f"https://img.example.in/posters/{movie_id}.jpg",
+                                     plot, rating, producer_id, created_by, created_at, updated_at))
+            tables["MOVIE_STATISTICS"].append((movie_id, int(rng.integers(0, 5000)) if released else 0, rating,
+                                               int(rng.lognormal(11, 1.5)) if released else 0))
+            for genre in sorted(set(_choice(rng, GENRES, GENRE_WEIGHTS, size=int(rng.integers(1, 4))).tolist())):
+                tables["MOVIE_GENRES"].append((movie_id, self.genre_ids[GENRES[genre]]))
+
+            for position, actor_id in enumerate(actors):
+                if position < 2:
+                    role_type, minutes = "Lead", int(rng.integers(70, min(duration, 150)))
+                elif rng.random() < 0.8:
+                    role_type, minutes = "Supporting", int(rng.integers(10, 60))
+                else:
+                    role_type, minutes = "Cameo", int(rng.integers(2, 10))
+                gender = "Female" if rng.random() < 0.5 else "Male"
+                character = _name(rng, language, gender).split()[0]
+                tables["MOVIE_CAST"].append((movie_id, actor_id, character, role_type, minutes, created_at))
+            for role, chance, _ in CREW_ROLES:
+                if rng.random() < chance:
+                    crew_id = int(self.crew_pools[(language, role)].draw(rng, 1)[0])
+                    tables["MOVIE_CREW"].append((movie_id, crew_id, role, created_at))
+
+            # Box office: pending on creation, running then final figures after release
+            tables["BOX_OFFICE_AUDIT"].append((box_id, movie_id, None, None, None, None, None, None,
+                                               "System", created_at, "INSERT"))
+            if not released:
+                tables["BOX_OFFICE"].append((box_id, movie_id, None, None, None, None, None, "pending",
+                                             None, created_at, created_at))
+                continue
+            first_update = max(created_at, datetime.combine(release + timedelta(days=3), datetime.min.time()))
+            first_update = min(first_update, self.as_of)
+            final_update = _instant(rng, first_update, self.as_of)
+            updated_by = self.user_ids[int(rng.integers(len(self.user_ids)))]
+            running = float(rng.uniform(0.4, 0.8))
+            tables["BOX_OFFICE_AUDIT"].append((box_id, movie_id, None, _money(domestic * running), None,
+                                               _money(intl * running), None, None, "System",
+                                               first_update, "UPDATE"))
+            tables["BOX_OFFICE_AUDIT"].append((box_id, movie_id, _money(domestic * running), _money(domestic),
+                                               _money(intl * running), _money(intl), None, _money(margin),
+                                               "System", final_update, "UPDATE"))
+            tables["ACTIVITY_LOG"].append((updated_by, "UPDATE", "BOX_OFFICE", box_id,
+                                           f"Collections updated for movie {movie_id}", final_update))
+            tables["BOX_OFFICE"].append((box_id, movie_id, _money(domestic), _money(intl), _money(opening),
+                                         _money(margin), screens, status, updated_by, created_at, final_update))
+
+            if rng.random() < self.daily_fraction:
+                tables["BOX_OFFICE_DAILY"].extend(_daily(rng, movie_id, release, domestic, intl, screens,
+                                                         self.as_of.date()))
+        return tables
+
+
+def _daily(rng, movie_id, release, domestic, intl, screens, as_of):
+    """Daily collections decaying from the opening weekend, with weekend bumps"""
+    days = [release + timedelta(days=d) for d in range(DAILY_DAYS)]
+    days = [day for day in days if day <= as_of]
+    if not days:
+        return []
+    weights = np.array([math.exp(-d / 8) * (1.6 if day.weekday() >= 4 else 1.0)
+                        for d, day in enumerate(days)]) * rng.uniform(0.85, 1.15, len(days))
+    weights /= weights.sum()
+    return [(movie_id, day, _money(domestic * 0.95 * w), _money(intl * 0.95 * w),
+             max(1, int(screens * math.exp(-d / 20))))
+            for d, (day, w) in enumerate(zip(days, weights))]
+
+
+def reference_ids(query):
+    """Language and genre ids by name, and the user ids, read with `query(sql) -> rows`"""
+    languages = {row["language_name"]: row["language_id"]
+                 for row in query("SELECT language_id, language_name FROM LANGUAGES")}
+    genres = {row["genre_name"]: row["genre_id"] for row in query("SELECT genre_id, genre_name FROM GENRES")}
+    missing = [name for name, *_ in LANGUAGES if name not in languages] + \
+              [name for name in GENRES if name not in genres]
+    if missing:
+        raise SystemExit(f"Reference rows missing (run 01_create_tables.sql first): {', '.join(missing)}")
+    users = tuple(row["user_id"] for row in query("SELECT user_id FROM USERS ORDER BY user_id"))
+    return languages, genres, users or (None,)
+
+
+def id_offsets(query):
+    """Highest existing id of each table given explicit ids"""
+    return {table: query(f"SELECT COALESCE(MAX({column}), 0) AS id FROM {table}")[0]["id"]
+            for table, column in ID_COLUMNS.items()}
+
+
+class DatabaseSink:
+    """Batched multi-row INSERTs into the configured database"""
+
+    def __init__(self, batch_size):
+        from database.unit_of_work import UnitOfWork
+        self.batch_size = batch_size
+        self.uow = UnitOfWork()
+
+    def reference_ids(self):
+        return reference_ids(self.uow.execute)
+
+    def offsets(self):
+        return id_offsets(self.uow.execute)
+
+    def begin(self, truncate):
+        for statement in ("SET @app_audit = 1", "SET FOREIGN_KEY_CHECKS = 0", "SET UNIQUE_CHECKS = 0"):
+            self.uow.execute(statement, fetch=False)
+        if truncate:
+            for table in GENERATED_TABLES:
+                self.uow.execute(f"TRUNCATE TABLE {table}", fetch=False)
+            self.uow.execute(TRUNCATED_MARK, fetch=False)
+            self.uow.commit()
+
+    def write(self, table, rows):
+        columns = TABLES[table]
+        sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(['%s'] * len(columns))})"
+        for start in range(0, len(rows), self.batch_size):
+            self.uow.execute_many(sql, rows[start:start + self.batch_size])
+        self.uow.commit()
+
+    def finish(self, rebuild_summaries):
+        try:
+            for statement in ("SET UNIQUE_CHECKS = 1", "SET FOREIGN_KEY_CHECKS = 1", "SET @app_audit = NULL"):
+                self.uow.execute(statement, fetch=False)
+            if rebuild_summaries:
+                print("Rebuilding analytics summaries...")
+                self.uow.call_procedure("sp_rebuild_summaries")
+                self.uow.commit()
+        finally:
+            # Session settings were changed; never hand this connection back to the pool
+            if self.uow.connection is not None:
+                self.uow.connection.invalidate()
+                self.uow.connection = None
+            self.uow.close()
+
+
+def _literal(value):
+    if value is None:
+        return "NULL"
+    if isinstance(value, (int, float)):
+        return repr(value)
+    if isinstance(value, datetime):
+        return f"'{value.isoformat(sep=' ')}'"
+    if isinstance(value, date):
+        return f"'{value.isoformat()}'"
+    return "'" + str(value).replace("\\", "\\\\").replace("'", "''") + "'"
+
+
+class SqlFileSink:
+    """The same rows as an SQL script of multi-row INSERTs"""
+
+    def __init__(self, path, batch_size):
+        self.batch_size = batch_size
+        self.file = open(path, "w", encoding="utf-8")
+
+    def reference_ids(self):
+        return ({name: i + 1 for i, name in enumerate(SCHEMA_LANGUAGES)},
+                {name: i + 1 for i, name in enumerate(GENRES)}, USER_IDS)
+
+    def offsets(self):
+        return {table: 0 for table in ID_COLUMNS}
+
+    def begin(self, truncate):
+        self.file.write("-- Generated by scripts/seed_data.py\n"
+                        "SET @app_audit = 1;\nSET FOREIGN_KEY_CHECKS = 0;\nSET UNIQUE_CHECKS = 0;\n")
+        if truncate:
+            self.file.writelines(f"TRUNCATE TABLE {table};\n" for table in GENERATED_TABLES)
+            self.file.write(f"{TRUNCATED_MARK};\n")
+
+    def write(self, table, rows):
+        columns = ", ".join(TABLES[table])
+        for start in range(0, len(rows), self.batch_size):
+            values = ",\n".join("(" + ", ".join(map(_literal, row)) + ")"
+                                for row in rows[start:start + self.batch_size])
+            self.file.write(f"INSERT INTO {table} ({columns}) VALUES\n{values};\n")
+
+    def finish(self, rebuild_summaries):
+        self.file.write("SET UNIQUE_CHECKS = 1;\nSET FOREIGN_KEY_CHECKS = 1;\nSET @app_audit = NULL;\n")
+        if rebuild_summaries:
+            self.file.write("CALL sp_rebuild_summaries();\n")
+        self.file.close()
+
+
+def generate(sink, movies, seed=42, as_of=None, history_days=540, daily_fraction=0.05,
+             truncate=False, rebuild_summaries=True):
+    """Write the catalogue for `seed` through `sink`; returns rows written per table"""
+    counts = dict.fromkeys(TABLES, 0)
+    start = time.perf_counter()
+    sink.begin(truncate)
+    try:
+        # Offsets are read after --truncate so a fresh load always starts at id 1
+        languages, genres, users = sink.reference_ids()
+        as_of = datetime.combine(as_of or date.today(), datetime.min.time())
+        catalogue = Catalogue(seed, movies, as_of, history_days, daily_fraction,
+                              sink.offsets(), languages, genres, users)
+        for table, rows in catalogue.people_rows():
+            sink.write(table, rows)
+            counts[table] += len(rows)
+        for index in range(catalogue.chunks()):
+            for table, rows in catalogue.chunk_rows(index).items():
+                sink.write(table, rows)
+                counts[table] += len(rows)
+            done = min((index + 1) * MOVIES_PER_CHUNK, movies)
+            if (index + 1) % 10 == 0 or done == movies:
+                elapsed = time.perf_counter() - start
+                print(f"{done}/{movies} movies, {sum(counts.values())} rows, "
+                      f"{sum(counts.values()) / elapsed:,.0f} rows/s")
+    finally:
+        sink.finish(rebuild_summaries=rebuild_summaries)
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a deterministic synthetic catalogue")
+    parser.add_argument("--movies", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--as-of", type=date.fromisoformat, default=date.today(),
+                        help="Date the history ends (default today); fix it for identical data")
+    parser.add_argument("--history-days", type=int, default=540,
+                        help="Window of created_at and audit timestamps before --as-of")
+    parser.add_argument("--daily-fraction", type=float, default=0.05,
+                        help="Share of released movies with daily collections")
+    parser.add_argument("--batch-size", type=int, default=2000, help="Rows per INSERT")
+    parser.add_argument("--truncate", action="store_true", help="Empty the generated tables first")
+    parser.add_argument("--no-summaries", action="store_true", help="Skip sp_rebuild_summaries")
+    parser.add_argument("--sql", help="Write an SQL script to this path instead of the database")
+    args = parser.parse_args()
+
+    sink = SqlFileSink(args.sql, args.batch_size) if args.sql else DatabaseSink(args.batch_size)
+    start = time.perf_counter()
+    counts = generate(sink, args.movies, args.seed, args.as_of, args.history_days, args.daily_fraction,
+                      truncate=args.truncate, rebuild_summaries=not args.no_summaries)
+
+    for table, count in counts.items():
+        print(f"{table:<18} {count:>12,}")
+    print(f"Done in {time.perf_counter() - start:.1f}s (seed {args.seed}, as of {args.as_of})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,533 @@
+"""
+Database bootstrap and bulk load
+
+Creates the database (.env) and applies database/schema/*.sql without the
+mysql client. Each file is split into statements the way the client does
+it (DELIMITER blocks, quoted strings, comments), and every statement is
+made safe to re-run, so the tool can bring a fresh, partial or complete
+database up to date:
+
+* tables: CREATE TABLE IF NOT EXISTS; reference rows: INSERT IGNORE
+* secondary indexes: added only if missing
+* functions, procedures and triggers: dropped and re-created from the files
+* views: CREATE OR REPLACE
+
+Data can be loaded in the same run: --movies generates the
+scripts/seed_data.py catalogue, --data-dir loads CSV files (one per table,
+e.g. the GET /api/export/{dataset} output), and 02_insert_data.sql is
+applied if it has content. The load happens before the triggers and the
+secondary indexes are in place: rows go in through LOAD DATA LOCAL INFILE
+(multi-row INSERTs if the server has local_infile off) with foreign-key
+and unique checks off, each table's indexes are then built in one ALTER,
+the MOVIE_AUDIT / BOX_OFFICE_AUDIT rows the insert triggers would have
+written are backfilled with one INSERT ... SELECT per id range, and
+summaries are rebuilt once. Loads only run into an empty MOVIES table
+unless --append is given, so re-running the command is safe.
+
+    python -m scripts.setup_database
+    python -m scripts.setup_database --movies 1000000 --as-of 2026-01-01
+    python -m scripts.setup_database --data-dir exports/ --method insert
+    python -m scripts.setup_database --dry-run
+"""
+import argparse
+import csv
+import os
+import re
+import tempfile
+import time
+from datetime import date, datetime
+import mysql.connector
+from app.services.audit_archive import AUDIT_LOGS, PARTITIONS_SQL, future_partitions_sql
+from config import get_settings
+from scripts import seed_data
+
+settings = get_settings()
+
+SCHEMA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "database", "schema")
+TABLES_FILE = "01_create_tables.sql"
+DATA_FILE = "02_insert_data.sql"
+TRIGGERS_FILE = "03_create_triggers.sql"
+# Applied before any data; the triggers file runs after the load
+ROUTINE_FILES = ("05_create_functions.sql", "04_create_procedures.sql", "06_create_views.sql")
+
+DELIMITER_COMMAND = re.compile(r"^\s*DELIMITER\s+(\S+)\s*$", re.IGNORECASE)
+CREATE_TABLE = re.compile(r"^CREATE\s+TABLE\s+(?!IF\s+NOT\s+EXISTS\b)", re.IGNORECASE)
+CREATE_INDEX = re.compile(r"^CREATE\s+(?:(UNIQUE|FULLTEXT|SPATIAL)\s+)?INDEX\s+(\w+)\s+ON\s+(\w+)\s*(\(.*\))$",
+                          re.IGNORECASE | re.DOTALL)
+CREATE_ROUTINE = re.compile(r"^CREATE\s+(?:DEFINER\s*=\s*\S+\s+)?(PROCEDURE|FUNCTION|TRIGGER)\s+(\w+)",
+                            re.IGNORECASE)
+CREATE_VIEW = re.compile(r"^CREATE\s+(?:OR\s+REPLACE\s+)?VIEW\b", re.IGNORECASE)
+INSERT_INTO = re.compile(r"^INSERT\s+INTO\b", re.IGNORECASE)
+
+# CSV files named after an export dataset; any other file is <table name>.csv
+EXPORT_TABLES = {"movies": "MOVIES", "box-office": "BOX_OFFICE", "cast": "MOVIE_CAST",
+                 "crew": "MOVIE_CREW", "movie-audit": "MOVIE_AUDIT",
+                 "box-office-audit": "BOX_OFFICE_AUDIT", "activity-log": "ACTIVITY_LOG"}
+# Rows per LOAD DATA file / INSERT statement
+INFILE_BATCH = 200000
+INSERT_BATCH = 2000
+# Movies per audit backfill statement
+BACKFILL_RANGE = 50000
+
+# What tr_movie_insert_audit / tr_box_office_insert_audit write, for rows
+# loaded while the triggers were absent (existing INSERT audit rows are kept)
+AUDIT_BACKFILLS = (
+    ("MOVIE_AUDIT", """
+        INSERT INTO MOVIE_AUDIT (movie_id, new_title, new_budget, new_release_date, modified_by,
+                                 modification_reason, modified_at, operation_type)
+        SELECT m.movie_id, m.title, m.budget, m.release_date, 'System', 'Movie Created',
+               COALESCE(m.created_at, CURRENT_TIMESTAMP), 'INSERT'
+        FROM MOVIES m
+        WHERE m.movie_id BETWEEN %s AND %s
+          AND NOT EXISTS (SELECT 1 FROM MOVIE_AUDIT a
+                          WHERE a.movie_id = m.movie_id AND a.operation_type = 'INSERT')"""),
+    ("BOX_OFFICE_AUDIT", """
+        INSERT INTO BOX_OFFICE_AUDIT (box_id, movie_id, new_domestic, new_intl, new_margin,
+                                      modified_by, modified_at, operation_type)
+        SELECT bo.box_id, bo.movie_id, bo.domestic_collection, bo.intl_collection, bo.profit_margin,
+               'System', COALESCE(bo.created_at, CURRENT_TIMESTAMP), 'INSERT'
+        FROM BOX_OFFICE bo
+        WHERE bo.movie_id BETWEEN %s AND %s
+          AND NOT EXISTS (SELECT 1 FROM BOX_OFFICE_AUDIT a
+                          WHERE a.movie_id = bo.movie_id AND a.operation_type = 'INSERT')"""),
+)
+
+
+def split_statements(text, path="<sql>"):
+    """(line, statement) pairs of an SQL script, split the way the mysql client does.
+
+    Honours DELIMITER commands and never splits inside quotes or comments;
+    comments before a statement are dropped.
+    """
+    statements = []
+    delimiter = ";"
+    buffer, head, start = [], 0, None
+    quote, in_comment = None, False
+
+    def emit():
+        nonlocal buffer, head, start
+        if start is not None:
+            statements.append((start, "".join(buffer[head:]).strip()))
+        buffer, head, start = [], 0, None
+
+    for number, line in enumerate(text.splitlines(), 1):
+        command = DELIMITER_COMMAND.match(line) if quote is None and not in_comment else None
+        if command:
+            if start is not None:
+                raise ValueError(f"{path}:{number}: DELIMITER inside the statement starting at line {start}")
+            buffer, delimiter = [], command.group(1)
+            continue
+        i = 0
+        while i < len(line):
+            char = line[i]
+            if in_comment:
+                end = line.find("*/", i)
+                if end < 0:
+                    buffer.append(line[i:])
+                    break
+                buffer.append(line[i:end + 2])
+                in_comment = False
+                i = end + 2
+            elif quote:
+                if char == "\\" and quote != "`":
+                    buffer.append(line[i:i + 2])
+                    i += 2
+                    continue
+                if char == quote and line.startswith(quote * 2, i):
+                    buffer.append(quote * 2)
+                    i += 2
+                    continue
+                if char == quote:
+                    quote = None
+                buffer.append(char)
+                i += 1
+            elif line.startswith(delimiter, i):
+                emit()
+                i += len(delimiter)
+            elif line.startswith("/*", i):
+                in_comment = True
+                buffer.append("/*")
+                i += 2
+            elif char == "#" or (line.startswith("--", i) and line[i + 2:i + 3] in ("", " ", "\t")):
+                buffer.append(line[i:])
+                break
+            else:
+                if start is None and not char.isspace():
+                    start, head = number, len(buffer)
+                if char in "'\"`":
+                    quote = char
+                buffer.append(char)
+                i += 1
+        buffer.append("\n")
+    if quote or in_comment:
+        raise ValueError(f"{path}: unterminated {'string' if quote else 'comment'} at end of file")
+    emit()
+    return statements
+
+
+def read_statements(path):
+    with open(path, encoding="utf-8") as f:
+        return split_statements(f.read(), os.path.basename(path))
+
+
+def _tsv(value):
+    """A value in LOAD DATA's default (tab-separated, backslash-escaped) format"""
+    if value is None:
+        return "\\N"
+    if isinstance(value, datetime):
+        return value.isoformat(sep=" ")
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, str):
+        return value.replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n")
+    return str(value)
+
+
+class BulkLoader:
+    """seed_data sink writing through LOAD DATA LOCAL INFILE or multi-row INSERTs"""
+
+    def __init__(self, connection, method, batch_size=None):
+        self.connection = connection
+        self.method = method
+        self.batch_size = batch_size or (INFILE_BATCH if method == "infile" else INSERT_BATCH)
+        self.cursor = connection.cursor(dictionary=True)
+        self._buffers = {}    # table -> [temp file, columns, buffered rows]
+        self._columns = {}
+
+    def query(self, sql, params=None):
+        self.cursor.execute(sql, params or ())
+        return self.cursor.fetchall() if self.cursor.with_rows else []
+
+    def reference_ids(self):
+        return seed_data.reference_ids(self.query)
+
+    def offsets(self):
+        return seed_data.id_offsets(self.query)
+
+    def begin(self, truncate=False):
+        for statement in ("SET @app_audit = 1", "SET FOREIGN_KEY_CHECKS = 0", "SET UNIQUE_CHECKS = 0"):
+            self.query(statement)
+        if truncate:
+            for table in seed_data.GENERATED_TABLES:
+                self.query(f"TRUNCATE TABLE {table}")
+
+    def write(self, table, rows, columns=None):
+        columns = columns or seed_data.TABLES[table]
+        if self.method == "insert":
+            sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(['%s'] * len(columns))})"
+            for start in range(0, len(rows), self.batch_size):
+                self.cursor.executemany(sql, rows[start:start + self.batch_size])
+            self.connection.commit()
+            return
+        buffer = self._buffers.get(table)
+        if buffer is None:
+            buffer = self._buffers[table] = [tempfile.NamedTemporaryFile(
+                "w", encoding="utf-8", suffix=".tsv", delete=False), columns, 0]
+        buffer[0].writelines("\t".join(map(_tsv, row)) + "\n" for row in rows)
+        buffer[2] += len(rows)
+        if buffer[2] >= self.batch_size:
+            self._flush(table)
+
+    def _flush(self, table):
+        file, columns, _ = self._buffers.pop(table)
+        file.close()
+        try:
+            self.query(f"LOAD DATA LOCAL INFILE %s INTO TABLE {table} CHARACTER SET utf8mb4 "
+                       f"({', '.join(columns)})", (file.name,))
+            self.connection.commit()
+        finally:
+            os.unlink(file.name)
+
+    def writable_columns(self, table):
+        """Columns of `table` that accept values (generated columns excluded)"""
+        if table not in self._columns:
+            rows = self.query("SELECT COLUMN_NAME AS name, EXTRA AS extra FROM information_schema.COLUMNS "
+                              "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s", (table,))
+            self._columns[table] = {row["name"].lower() for row in rows
+                                    if "GENERATED" not in (row["extra"] or "").upper()}
+        return self._columns[table]
+
+    def load_csv(self, table, path):
+        """Load a CSV file with a header row; empty fields are NULL, unknown columns ignored"""
+        with open(path, newline="", encoding="utf-8") as f:
+            header = next(csv.reader(f), None)
+            first = f.readline() if header else ""
+        if not header:
+            return 0
+        writable = self.writable_columns(table)
+        if not writable:
+            raise SystemExit(f"{path}: no table {table}")
+        keep = [i for i, name in enumerate(header) if name.lower() in writable]
+        columns = [header[i] for i in keep]
+
+        if self.method == "infile":
+            targets = ", ".join(f"@c{i}" for i in range(len(header)))
+            assignments = ", ".join(f"{header[i]} = NULLIF(@c{i}, '')" for i in keep)
+            terminator = "\\r\\n" if first.endswith("\r\n") else "\\n"
+            self.query(f"LOAD DATA LOCAL INFILE %s INTO TABLE {table} CHARACTER SET utf8mb4 "
+                       f"FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '\"' ESCAPED BY '' "
+                       f"LINES TERMINATED BY '{terminator}' IGNORE 1 LINES ({targets}) SET {assignments}",
+                       (path,))
+            loaded = self.cursor.rowcount
+            self.connection.commit()
+            return loaded
+
+        loaded, batch = 0, []
+        with open(path, newline="", encoding="utf-8") as f:
+            reader = csv.reader(f)
+            next(reader)
+            for record in reader:
+                batch.append(tuple(record[i] if record[i] != "" else None for i in keep))
+                if len(batch) >= self.batch_size:
+                    self.write(table, batch, columns)
+                    loaded += len(batch)
+                    batch = []
+        if batch:
+            self.write(table, batch, columns)
+            loaded += len(batch)
+        return loaded
+
+    def finish(self, rebuild_summaries=False):
+        for table in list(self._buffers):
+            self._flush(table)
+        for statement in ("SET UNIQUE_CHECKS = 1", "SET FOREIGN_KEY_CHECKS = 1", "SET @app_audit = NULL"):
+            self.query(statement)
+        if rebuild_summaries:
+            self.cursor.callproc("sp_rebuild_summaries")
+            for result in self.cursor.stored_results():
+                result.fetchall()
+            self.connection.commit()
+
+
+class Bootstrap:
+    """Applies the schema files and runs the load phases on one connection"""
+
+    def __init__(self, schema_dir, dry_run=False):
+        self.schema_dir = schema_dir
+        self.dry_run = dry_run
+        self.connection = None
+        self.cursor = None
+        self.indexes = []     # (table, name, kind, columns) from CREATE INDEX statements
+
+    def connect(self, recreate=False, local_infile=False):
+        if self.dry_run:
+            return
+        options = dict(host=settings.DB_HOST, port=settings.DB_PORT, user=settings.DB_USER,
+                       password=settings.DB_PASSWORD, ssl_disabled=True, autocommit=True)
+        server = mysql.connector.connect(**options)
+        try:
+            cursor = server.cursor()
+            if recreate:
+                cursor.execute(f"DROP DATABASE IF EXISTS `{settings.DB_NAME}`")
+            cursor.execute(f"CREATE DATABASE IF NOT EXISTS `{settings.DB_NAME}` CHARACTER SET utf8mb4")
+        finally:
+            server.close()
+        self.connection = mysql.connector.connect(database=settings.DB_NAME,
+                                                  allow_local_infile=local_infile, **options)
+        self.cursor = self.connection.cursor(dictionary=True)
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+
+    def run(self, sql, params=None, where=""):
+        if self.dry_run:
+            print(f"{where:<32} {sql.strip().splitlines()[0][:90]}")
+            return []
+        try:
+            self.cursor.execute(sql, params)
+            return self.cursor.fetchall() if self.cursor.with_rows else []
+        except mysql.connector.Error as err:
+            raise SystemExit(f"{where or 'setup'}: {err}\n{sql.strip()[:500]}")
+
+    def value(self, sql, default=None):
+        rows = [] if self.dry_run else self.run(sql)
+        return next(iter(rows[0].values())) if rows else default
+
+    def path(self, name):
+        return os.path.join(self.schema_dir, name)
+
+    def apply(self, name):
+        """Run one schema file, each statement in its re-runnable form; indexes are collected"""
+        path = self.path(name)
+        for line, sql in read_statements(path):
+            where = f"{name}:{line}"
+            index = CREATE_INDEX.match(sql)
+            routine = CREATE_ROUTINE.match(sql)
+            if index:
+                kind, index_name, table, columns = index.groups()
+                self.indexes.append((table, index_name, (kind or "").upper(), columns))
+                continue
+            if routine:
+                self.run(f"DROP {routine.group(1).upper()} IF EXISTS {routine.group(2)}", where=where)
+            elif CREATE_TABLE.match(sql):
+                sql = CREATE_TABLE.sub("CREATE TABLE IF NOT EXISTS ", sql, count=1)
+            elif CREATE_VIEW.match(sql):
+                sql = CREATE_VIEW.sub("CREATE OR REPLACE VIEW", sql, count=1)
+            elif INSERT_INTO.match(sql) and name == TABLES_FILE:
+                sql = INSERT_INTO.sub("INSERT IGNORE INTO", sql, count=1)
+            self.run(sql, where=where)
+
+    def drop_triggers(self):
+        for line, sql in read_statements(self.path(TRIGGERS_FILE)):
+            routine = CREATE_ROUTINE.match(sql)
+            if routine and routine.group(1).upper() == "TRIGGER":
+                self.run(f"DROP TRIGGER IF EXISTS {routine.group(2)}", where=f"{TRIGGERS_FILE}:{line}")
+
+    def create_indexes(self):
+        """Add the missing secondary indexes, one ALTER per table (FULLTEXT ones separately)"""
+        existing = set()
+        if not self.dry_run:
+            existing = {(row["table_name"].lower(), row["index_name"].lower()) for row in self.run(
+                "SELECT DISTINCT TABLE_NAME AS table_name, INDEX_NAME AS index_name "
+                "FROM information_schema.STATISTICS WHERE TABLE_SCHEMA = DATABASE()")}
+        pending = {}
+        for table, name, kind, columns in self.indexes:
+            if (table.lower(), name.lower()) not in existing:
+                pending.setdefault(table, []).append((name, kind, columns))
+        for table, indexes in pending.items():
+            plain = [f"ADD {kind + ' ' if kind else ''}INDEX {name} {columns}"
+                     for name, kind, columns in indexes if kind != "FULLTEXT"]
+            if plain:
+                self.run(f"ALTER TABLE {table} {', '.join(plain)}", where=f"indexes:{table}")
+            # InnoDB builds one FULLTEXT index per ALTER
+            for name, kind, columns in indexes:
+                if kind == "FULLTEXT":
+                    self.run(f"ALTER TABLE {table} ADD FULLTEXT INDEX {name} {columns}", where=f"indexes:{table}")
+        return sum(len(indexes) for indexes in pending.values())
+
+    def create_audit_partitions(self, months, now=None):
+        """Split the audit tables' monthly partitions off p_future, from the current month on"""
+        created = 0
+        for table, _, _, _ in AUDIT_LOGS.values():
+            parts = [row for row in self.run(PARTITIONS_SQL, (table,), where=f"{table} partitions")
+                     if row["name"]]
+            if not parts:
+                continue
+            sql, names = future_partitions_sql(table, parts, now or datetime.now(), months)
+            if sql:
+                self.run(sql, where=f"{table} partitions")
+                created += len(names)
+        return created
+
+    def backfill_audits(self, first_movie_id):
+        last = self.value("SELECT COALESCE(MAX(movie_id), 0) FROM MOVIES", 0)
+        written = 0
+        for low in range(first_movie_id, last + 1, BACKFILL_RANGE):
+            for table, sql in AUDIT_BACKFILLS:
+                self.run(sql, (low, low + BACKFILL_RANGE - 1), where=f"backfill:{table}")
+                written += max(self.cursor.rowcount, 0)
+        return written
+
+    def rebuild_summaries(self):
+        if self.dry_run:
+            print(f"{'summaries':<32} CALL sp_rebuild_summaries()")
+            return
+        self.cursor.callproc("sp_rebuild_summaries")
+        for result in self.cursor.stored_results():
+            result.fetchall()
+
+
+def _load_method(bootstrap, requested):
+    """infile if the server allows LOAD DATA LOCAL, else insert"""
+    enabled = bootstrap.value("SELECT @@GLOBAL.local_infile", 0)
+    if requested == "infile" and not enabled:
+        raise SystemExit("The server has local_infile off (SET GLOBAL local_infile = 1), or use --method insert")
+    if requested == "auto":
+        if not enabled:
+            print("local_infile is off on the server; loading with multi-row INSERTs")
+        return "infile" if enabled else "insert"
+    return requested
+
+
+def _csv_files(data_dir):
+    files = []
+    for name in sorted(os.listdir(data_dir)):
+        stem, extension = os.path.splitext(name)
+        if extension.lower() == ".csv":
+            files.append((EXPORT_TABLES.get(stem, stem.upper().replace("-", "_")),
+                          os.path.abspath(os.path.join(data_dir, name))))
+    return files
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Create the database, apply the schema and bulk load data")
+    parser.add_argument("--schema-dir", default=SCHEMA_DIR)
+    parser.add_argument("--recreate", action="store_true", help="Drop the database first")
+    parser.add_argument("--movies", type=int, default=0, help="Generate and load this many movies (seed_data)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--as-of", type=date.fromisoformat, default=date.today())
+    parser.add_argument("--history-days", type=int, default=540)
+    parser.add_argument("--daily-fraction", type=float, default=0.05)
+    parser.add_argument("--data-dir", help="Load <table>.csv / export-named CSV files from this directory")
+    parser.add_argument("--method", choices=("auto", "infile", "insert"), default="auto")
+    parser.add_argument("--batch-size", type=int, help=f"Rows per LOAD DATA file ({INFILE_BATCH}) "
+                                                        f"or INSERT ({INSERT_BATCH})")
+    parser.add_argument("--append", action="store_true", help="Load even if MOVIES already has rows")
+    parser.add_argument("--dry-run", action="store_true", help="Print the schema statements, connect to nothing")
+    args = parser.parse_args()
+
+    data_file = os.path.join(args.schema_dir, DATA_FILE)
+    has_data_file = os.path.exists(data_file) and any(read_statements(data_file))
+    wants_load = bool(args.movies or args.data_dir or has_data_file)
+    bootstrap = Bootstrap(args.schema_dir, dry_run=args.dry_run)
+    start = time.perf_counter()
+
+    def phase(name, detail=""):
+        nonlocal start
+        print(f"{name:<10} {time.perf_counter() - start:7.1f}s  {detail}")
+        start = time.perf_counter()
+
+    bootstrap.connect(recreate=args.recreate, local_infile=wants_load and args.method != "insert")
+    try:
+        bootstrap.apply(TABLES_FILE)
+        phase("tables")
+        created = bootstrap.create_audit_partitions(settings.AUDIT_PARTITION_PREMAKE_MONTHS)
+        phase("partitions", f"{created} audit partitions created")
+        for name in ROUTINE_FILES:
+            bootstrap.apply(name)
+        phase("routines", "functions, procedures, views")
+
+        loaded = False
+        if wants_load and not args.dry_run:
+            first_movie_id = bootstrap.value("SELECT COALESCE(MAX(movie_id), 0) FROM MOVIES", 0) + 1
+            if first_movie_id > 1 and not args.append:
+                print("MOVIES already has rows; skipping the data load (--append to load anyway)")
+            else:
+                loaded = True
+                bootstrap.drop_triggers()
+                method = _load_method(bootstrap, args.method)
+                loader = BulkLoader(bootstrap.connection, method, args.batch_size)
+                if has_data_file:
+                    loader.begin()
+                    for line, sql in read_statements(data_file):
+                        bootstrap.run(sql, where=f"{DATA_FILE}:{line}")
+                    loader.finish()
+                    phase("data", DATA_FILE)
+                if args.data_dir:
+                    loader.begin()
+                    try:
+                        for table, path in _csv_files(args.data_dir):
+                            print(f"  {os.path.basename(path)} -> {table}: {loader.load_csv(table, path):,} rows")
+                    finally:
+                        loader.finish()
+                    phase("data", f"{args.data_dir} ({method})")
+                if args.movies:
+                    counts = seed_data.generate(loader, args.movies, args.seed, args.as_of, args.history_days,
+                                                args.daily_fraction, rebuild_summaries=False)
+                    phase("data", f"{sum(counts.values()):,} generated rows ({method})")
+
+        phase("indexes", f"{bootstrap.create_indexes()} created")
+        if loaded:
+            phase("audits", f"{bootstrap.backfill_audits(first_movie_id):,} rows backfilled")
+        bootstrap.apply(TRIGGERS_FILE)
+        phase("triggers")
+        if loaded:
+            bootstrap.rebuild_summaries()
+            phase("summaries")
+    finally:
+        bootstrap.close()
+
+
+if __name__ == "__main__":
+    main()
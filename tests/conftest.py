@@ -0,0 +1,12 @@
+"""
+Test settings
+
+The modules under test read ``config.get_settings()`` at import time, which
+requires the database settings. Pool connections are opened lazily, so
+none of these tests touch a database.
+"""
+import os
+
+for name, value in {"DB_HOST": "localhost", "DB_USER": "test", "DB_PASSWORD": "test",
+                    "DB_NAME": "indian_movies_test"}.items():
+    os.environ.setdefault(name, value)
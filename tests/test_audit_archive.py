@@ -0,0 +1,67 @@
+from datetime import datetime
+from app.services import audit_archive
+from app.services.audit_archive import future_partitions_sql
+
+NOW = datetime(2028, 3, 14, 9, 30)
+
+
+def part(name, upper_bound):
+    return {"name": name, "approx_rows": 0, "upper_bound": upper_bound}
+
+
+def test_fresh_schema_gets_a_catch_up_partition_then_months_from_now():
+    parts = [part("p_history", datetime(2026, 1, 1)), part("p_future", None)]
+    sql, created = future_partitions_sql("MOVIE_AUDIT", parts, NOW, 2)
+    assert created == ["p202601", "p202803", "p202804", "p202805"]
+    assert sql.startswith("ALTER TABLE MOVIE_AUDIT REORGANIZE PARTITION p_future INTO (")
+    assert "PARTITION p202601 VALUES LESS THAN (UNIX_TIMESTAMP('2028-03-01 00:00:00'))" in sql
+    assert sql.endswith("PARTITION p_future VALUES LESS THAN MAXVALUE)")
+
+
+def test_only_missing_months_are_added():
+    parts = [part("p_history", datetime(2028, 1, 1)), part("p202801", datetime(2028, 2, 1)),
+             part("p202802", datetime(2028, 3, 1)), part("p202803", datetime(2028, 4, 1)),
+             part("p_future", None)]
+    assert future_partitions_sql("ACTIVITY_LOG", parts, NOW, 1)[1] == ["p202804"]
+    assert future_partitions_sql("ACTIVITY_LOG", parts, NOW, 0) == (None, [])
+
+
+def test_without_catch_all_partitions_are_added():
+    parts = [part("p202803", datetime(2028, 4, 1))]
+    sql, created = future_partitions_sql("MOVIE_AUDIT", parts, NOW, 1)
+    assert created == ["p202804"] and sql.startswith("ALTER TABLE MOVIE_AUDIT ADD PARTITION (")
+
+
+class LockConnection:
+    def __init__(self, granted):
+        self.granted = granted
+        self.statements = []
+        self.closed = False
+
+    def cursor(self):
+        return self
+
+    def execute(self, sql, params=None):
+        self.statements.append(sql)
+
+    def fetchone(self):
+        return (1 if self.granted else 0,)
+
+    def close(self):
+        self.closed = True
+
+
+def test_maintenance_skips_while_another_process_holds_the_lock(monkeypatch):
+    lock = LockConnection(granted=False)
+    monkeypatch.setattr(audit_archive.connection.connection_pool, "connect_unpooled", lambda: lock)
+    monkeypatch.setattr(audit_archive, "_maintain", lambda *args: {"ran": True})
+    assert audit_archive.run_maintenance() is None
+    assert lock.closed and lock.statements == ["SELECT GET_LOCK(%s, 0)"]
+
+
+def test_maintenance_releases_the_lock(monkeypatch):
+    lock = LockConnection(granted=True)
+    monkeypatch.setattr(audit_archive.connection.connection_pool, "connect_unpooled", lambda: lock)
+    monkeypatch.setattr(audit_archive, "_maintain", lambda *args: {"ran": True})
+    assert audit_archive.run_maintenance() == {"ran": True}
+    assert lock.statements[-1] == "DO RELEASE_LOCK(%s)" and lock.closed
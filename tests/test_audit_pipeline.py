@@ -0,0 +1,108 @@
+import asyncio
+import json
+import os
+from app.services import audit_pipeline as audit_module
+from app.services.audit_pipeline import AuditPipeline
+
+OTHER_PID = 999999
+
+
+def journal(tmp_path):
+    return str(tmp_path / "audit" / "journal.jsonl")
+
+
+def read_events(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def record(pipeline, *record_ids):
+    async def main():
+        for record_id in record_ids:
+            await pipeline.activity("UPDATE", "MOVIES", record_id, "edited")
+    asyncio.run(main())
+
+
+def crash(pipeline):
+    """Drop the pipeline's journal lock as an exiting process would"""
+    pipeline._lock_file.close()
+
+
+def test_recording_returns_once_journalled(tmp_path):
+    spill_path = journal(tmp_path)
+    pipeline = AuditPipeline(spill_path=spill_path)
+    record(pipeline, 1, 2)
+    events = read_events(f"{spill_path}.{os.getpid()}")
+    assert [event["row"]["record_id"] for event in events] == [1, 2]
+    assert pipeline.depth == 2
+
+
+def test_rotate_moves_journal_into_segment(tmp_path):
+    spill_path = journal(tmp_path)
+    pipeline = AuditPipeline(spill_path=spill_path)
+    record(pipeline, 1, 2, 3)
+    pipeline._rotate()
+
+    segment = f"{spill_path}.{os.getpid()}.000000"
+    assert pipeline.stats()["segments"] == 1 and pipeline.depth == 3
+    assert [event["row"]["record_id"] for event in read_events(segment)] == [1, 2, 3]
+    path, events = pipeline._segments[0]
+    assert path == segment and len(events) == 3
+    assert not os.path.exists(f"{spill_path}.{os.getpid()}")
+
+    record(pipeline, 4)
+    pipeline._rotate()
+    assert [path for path, _ in pipeline._segments] == [segment, f"{spill_path}.{os.getpid()}.000001"]
+
+
+def test_rotate_with_nothing_pending_keeps_no_segment(tmp_path):
+    pipeline = AuditPipeline(spill_path=journal(tmp_path))
+    pipeline._rotate()
+    assert pipeline.depth == 0 and not list(tmp_path.rglob("journal.jsonl.*"))
+
+
+def test_recover_replays_own_leftovers(tmp_path):
+    spill_path = journal(tmp_path)
+    crashed = AuditPipeline(spill_path=spill_path)
+    record(crashed, 1)
+    crashed._rotate()
+    record(crashed, 2)
+    with open(f"{spill_path}.{os.getpid()}", "a", encoding="utf-8") as f:
+        f.write('{"table": "ACTIVITY_LOG", "row": {"re')  # torn by the crash
+    crash(crashed)
+
+    restarted = AuditPipeline(spill_path=spill_path)
+    restarted.recover()
+    prefix = f"{spill_path}.{os.getpid()}"
+    assert restarted.replayed == 2 and restarted.depth == 2
+    assert [path for path, _ in restarted._segments] == [f"{prefix}.000000", f"{prefix}.000001"]
+    assert [events[0]["row"]["record_id"] for _, events in restarted._segments] == [1, 2]
+
+    restarted.recover()
+    assert restarted.replayed == 2
+
+    record(restarted, 3)
+    restarted._rotate()
+    assert restarted._segments[-1][0] == f"{prefix}.000002"
+
+
+def test_recover_adopts_exited_workers_but_not_live_ones(tmp_path, monkeypatch):
+    spill_path = journal(tmp_path)
+    for pid, record_id in ((OTHER_PID, 1), (OTHER_PID + 1, 2)):
+        monkeypatch.setattr(audit_module.os, "getpid", lambda pid=pid: pid)
+        worker = AuditPipeline(spill_path=spill_path)
+        record(worker, record_id)
+        if pid == OTHER_PID:
+            crash(worker)
+        else:
+            live = worker
+    monkeypatch.undo()
+
+    restarted = AuditPipeline(spill_path=spill_path)
+    restarted.recover()
+    assert restarted.replayed == 1
+    assert restarted._segments[0][0] == f"{spill_path}.{os.getpid()}.000000"
+    assert restarted._segments[0][1][0]["row"]["record_id"] == 1
+    assert not os.path.exists(f"{spill_path}.{OTHER_PID}.lock")
+    assert read_events(f"{spill_path}.{OTHER_PID + 1}")[0]["row"]["record_id"] == 2
+    crash(live)
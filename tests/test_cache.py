@@ -0,0 +1,67 @@
+import asyncio
+import pytest
+from app.utils import cache
+from app.utils.cache import TTLCache, cached
+
+
+@pytest.fixture
+def response_cache(monkeypatch):
+    fresh = TTLCache(max_entries=16, ttl=60)
+    monkeypatch.setattr(cache, "response_cache", fresh)
+    monkeypatch.setattr(cache.settings, "CACHE_ENABLED", True)
+    return fresh
+
+
+def test_hit_after_miss(response_cache):
+    calls = []
+
+    @cached("movie", key="movie_id")
+    async def get_movie(movie_id):
+        calls.append(movie_id)
+        return {"movie_id": movie_id}
+
+    async def main():
+        await get_movie(movie_id=1)
+        await get_movie(movie_id=1)
+    asyncio.run(main())
+    assert calls == [1]
+
+
+@pytest.mark.parametrize("entity", [1, None])
+def test_load_overtaken_by_invalidation_is_not_stored(response_cache, entity):
+    title = {"value": "Old"}
+
+    @cached("movie", key="movie_id")
+    async def get_movie(movie_id):
+        loaded = title["value"]
+        await asyncio.sleep(0)  # a write commits and invalidates meanwhile
+        title["value"] = "New"
+        cache.invalidate("movie", entity=entity)
+        return {"title": loaded}
+
+    async def main():
+        first = await get_movie(movie_id=1)
+        second = await get_movie(movie_id=1)
+        return first, second
+    first, second = asyncio.run(main())
+    assert first == {"title": "Old"} and second == {"title": "New"}
+    assert response_cache.stats()["namespaces"]["movie"]["stale_loads"] == 2
+
+
+def test_other_entities_do_not_spoil_a_load(response_cache):
+    key = ("movie", 1, ())
+    load = response_cache.begin_load(key)
+    response_cache.invalidate("movie", 2)
+    response_cache.invalidate("movie_details", 1)
+    response_cache.set(key, "value", load=load)
+    assert response_cache.get(key) == (True, "value")
+
+
+def test_failed_load_is_forgotten(response_cache):
+    @cached("movie", key="movie_id")
+    async def get_movie(movie_id):
+        raise LookupError(movie_id)
+
+    with pytest.raises(LookupError):
+        asyncio.run(get_movie(movie_id=1))
+    assert not response_cache._loads
@@ -0,0 +1,93 @@
+from datetime import date
+import numpy as np
+import pytest
+from app.models.database_models import ForecastInput
+from app.services.forecast_service import (
+    MIN_TRAINING_ROWS, FeatureBatch, ForecastModel, train_model,
+)
+
+
+def _row(movie_id, budget, language_id=1, month=1, cast_count=3, popularity=7.0):
+    return {"movie_id": movie_id, "budget": budget, "language_id": language_id,
+            "release_month": month, "opening_weekend": None, "release_screens": 1000,
+            "cast_count": cast_count, "cast_popularity_mean": popularity,
+            "cast_popularity_max": popularity}
+
+
+def test_from_rows_aligns_genres_with_unsorted_movies():
+    rows = [_row(30, 1e8), _row(10, 2e8), _row(20, None)]
+    genres = [{"movie_id": 10, "genre_id": 1}, {"movie_id": 30, "genre_id": 2},
+              {"movie_id": 10, "genre_id": 3}, {"movie_id": 99, "genre_id": 4}]
+    batch = FeatureBatch.from_rows(rows, genres)
+    assert len(batch) == 3
+    assert np.isnan(batch.numeric["budget"][2])
+    # Row positions follow `rows`; the genre of an unknown movie is dropped
+    assert sorted(zip(batch.genre_rows.tolist(), batch.genre_ids.tolist())) == [(0, 2), (1, 1), (1, 3)]
+
+
+def test_take_remaps_genre_rows():
+    batch = FeatureBatch.from_rows([_row(1, 1e8), _row(2, 2e8), _row(3, 3e8)],
+                                   [{"movie_id": 1, "genre_id": 5}, {"movie_id": 3, "genre_id": 6}])
+    sub = batch.take(np.array([2, 1]))
+    assert sub.numeric["budget"].tolist() == [3e8, 2e8]
+    assert list(zip(sub.genre_rows.tolist(), sub.genre_ids.tolist())) == [(0, 6)]
+
+
+def test_from_inputs_aggregates_cast_popularity():
+    inputs = [ForecastInput(budget=1e8, language_id=2, release_date=date(2026, 11, 1),
+                            genre_ids=[1, 2], actor_ids=[1, 2, 3]),
+              ForecastInput()]
+    batch = FeatureBatch.from_inputs(inputs, {1: 6.0, 2: 8.0})
+    assert batch.numeric["cast_count"][0] == 3
+    assert batch.numeric["cast_popularity_mean"][0] == pytest.approx(7.0)
+    assert batch.numeric["cast_popularity_max"][0] == 8.0
+    assert np.isnan(batch.numeric["cast_count"][1])
+    assert batch.language_id.tolist() == [2, -1]
+    assert batch.release_month.tolist() == [11, 0]
+    assert batch.genre_rows.tolist() == [0, 0]
+
+
+def _training_set(count, seed=1):
+    rng = np.random.default_rng(seed)
+    budgets = rng.uniform(1e7, 3e8, count)
+    rows = [_row(i, budgets[i], language_id=1 + i % 3, month=1 + i % 12) for i in range(count)]
+    genres = [{"movie_id": i, "genre_id": 1 + i % 4} for i in range(count)]
+    # Collections are exactly 2x the budget, so log(collection) is linear in log(budget)
+    return FeatureBatch.from_rows(rows, genres), 2 * budgets
+
+
+def test_ridge_recovers_a_linear_relation():
+    batch, target = _training_set(60)
+    model = ForecastModel(alpha=1e-3).fit(batch, target)
+    predicted, low, high = model.predict(batch)
+    np.testing.assert_allclose(predicted, target, rtol=0.05)
+    assert np.all(low <= predicted) and np.all(predicted <= high)
+
+
+def test_stronger_regularisation_shrinks_weights():
+    batch, target = _training_set(60)
+    weak = ForecastModel(alpha=1e-3).fit(batch, target)
+    strong = ForecastModel(alpha=1e3).fit(batch, target)
+    assert np.linalg.norm(strong.weights) < np.linalg.norm(weak.weights)
+
+
+def test_unknown_values_are_imputed():
+    batch, target = _training_set(60)
+    model = ForecastModel().fit(batch, target)
+    unseen = FeatureBatch.from_inputs([ForecastInput(language_id=42, genre_ids=[99])], {})
+    predicted, _, _ = model.predict(unseen)
+    assert np.isfinite(predicted).all()
+
+
+def test_model_round_trips_through_dict():
+    batch, target = _training_set(30)
+    model = train_model(batch, target, alpha=1.0, version=3)
+    restored = ForecastModel.from_dict(model.to_dict())
+    np.testing.assert_allclose(restored.predict(batch)[0], model.predict(batch)[0])
+    assert restored.version == 3 and set(model.metrics) >= {"mape", "rows"}
+
+
+def test_train_needs_enough_rows():
+    batch, target = _training_set(MIN_TRAINING_ROWS - 1)
+    with pytest.raises(ValueError):
+        train_model(batch, target)
@@ -0,0 +1,76 @@
+import numpy as np
+from app.services.graph_service import CollaborationGraph, _csr, _gather
+
+
+def test_csr_groups_columns_by_row():
+    rows = np.array([2, 0, 2, 1, 0])
+    columns = np.array([20, 0, 21, 10, 1])
+    pointer, ordered = _csr(rows, columns, 4)
+    assert pointer.tolist() == [0, 2, 3, 5, 5]
+    assert ordered.tolist() == [0, 1, 10, 20, 21]
+
+
+def test_gather_concatenates_adjacency_lists():
+    pointer, columns = _csr(np.array([2, 0, 2, 1, 0]), np.array([20, 0, 21, 10, 1]), 4)
+    values, source = _gather(pointer, columns, np.array([2, 3, 0]))
+    assert values.tolist() == [20, 21, 0, 1]
+    assert source.tolist() == [0, 0, 2, 2]
+
+
+def test_gather_of_nothing():
+    pointer, columns = _csr(np.array([0]), np.array([5]), 1)
+    values, source = _gather(pointer, columns, np.array([], dtype=np.int64))
+    assert len(values) == 0 and len(source) == 0
+
+
+def _credit(kind, person_id, movie_id, role="actor"):
+    return {"kind": kind, "person_id": person_id, "name": f"{kind}-{person_id}",
+            "role": role, "movie_id": movie_id}
+
+
+def _graph(credits, movies):
+    graph = CollaborationGraph()
+    for movie_id, gross in movies.items():
+        graph._movie({"movie_id": movie_id, "title": f"Movie {movie_id}", "total_collection": gross})
+    graph._publish(*graph._credits(credits))
+    return graph
+
+
+# actor 1 - movie 10 - actor 2 - movie 11 - director 7 - movie 12 - actor 3
+GRAPH = _graph(
+    [_credit("actor", 1, 10), _credit("actor", 2, 10),
+     _credit("actor", 2, 11), _credit("crew", 7, 11, "Director"),
+     _credit("crew", 7, 12, "Director"), _credit("actor", 3, 12),
+     _credit("actor", 4, 13)],
+    {10: 100.0, 11: 50.0, 12: None, 13: 10.0},
+)
+
+
+def _chain(result):
+    return [(step["type"], step["id"]) if "type" in step else ("movie", step["movie_id"])
+            for step in result["path"]]
+
+
+def test_path_shortest_chain():
+    result = GRAPH.path(("actor", 1), ("actor", 3))
+    assert result["degrees"] == 3
+    assert _chain(result) == [("actor", 1), ("movie", 10), ("actor", 2), ("movie", 11),
+                              ("crew", 7), ("movie", 12), ("actor", 3)]
+
+
+def test_path_to_self_and_unreachable():
+    assert GRAPH.path(("actor", 1), ("actor", 1))["degrees"] == 0
+    assert GRAPH.path(("actor", 1), ("actor", 4)) is None
+    assert GRAPH.path(("actor", 1), ("actor", 99)) is None
+
+
+def test_path_respects_depth_and_role():
+    assert GRAPH.path(("actor", 1), ("actor", 3), max_depth=2) is None
+    # The only route passes through a director
+    assert GRAPH.path(("actor", 1), ("actor", 3), role="actor") is None
+
+
+def test_collaborators_ranked_by_shared_movies():
+    result = GRAPH.collaborators("actor", 2)
+    assert [(c["type"], c["id"], c["shared_movies"]) for c in result] == [("actor", 1, 1), ("crew", 7, 1)]
+    assert result[0]["combined_gross"] == 100.0
@@ -0,0 +1,118 @@
+import io
+import pytest
+from mysql.connector import errorcode
+from mysql.connector.errors import IntegrityError
+from app.services.ingest_service import BulkLoader, iter_records
+
+
+def test_iter_records_csv():
+    stream = io.StringIO("name, gender,email\nAamir,Male,\nKajol,,kajol@example.com\n")
+    assert list(iter_records(stream, "csv")) == [
+        (2, {"name": "Aamir", "gender": "Male", "email": None}),
+        (3, {"name": "Kajol", "gender": None, "email": "kajol@example.com"}),
+    ]
+
+
+def test_iter_records_jsonl_reports_bad_lines_in_place():
+    stream = io.StringIO('{"name": "Aamir"}\n\n{not json}\n{"name": "Kajol"}\n')
+    records = list(iter_records(stream, "jsonl"))
+    assert [line for line, _ in records] == [1, 3, 4]
+    assert isinstance(records[1][1], ValueError) and "Invalid JSON" in str(records[1][1])
+    assert records[2][1] == {"name": "Kajol"}
+
+
+def test_iter_records_rejects_unknown_format():
+    with pytest.raises(ValueError):
+        list(iter_records(io.StringIO(""), "xml"))
+
+
+def test_unknown_entity():
+    with pytest.raises(ValueError):
+        BulkLoader("studios")
+
+
+def test_dry_run_reports_invalid_records_by_line():
+    records = [(1, {"name": "Aamir", "popularity_score": 9.1}),
+               (2, {"name": "", "popularity_score": 5}),
+               (3, ValueError("Invalid JSON: Expecting value")),
+               (4, ["not", "an", "object"]),
+               (5, {"name": "Kajol", "popularity_score": 11})]
+    report = BulkLoader("actors", batch_size=10, dry_run=True).load(records)
+    assert (report["rows"], report["inserted"], report["failed"], report["batches"]) == (5, 1, 4, 1)
+    assert [error["line"] for error in report["errors"]] == [2, 3, 4, 5]
+    assert "name" in report["errors"][0]["error"]
+    assert report["errors"][2]["error"] == "Record must be an object"
+
+
+def test_reported_errors_are_capped():
+    records = [(line, {"name": ""}) for line in range(1, 11)]
+    report = BulkLoader("actors", dry_run=True, max_errors=3).load(records)
+    assert report["failed"] == 10 and len(report["errors"]) == 3
+
+
+class BatchRejectingUnitOfWork:
+    """Fails the multi-row INSERT, then accepts every row except `duplicates`"""
+
+    def __init__(self, duplicates):
+        self.duplicates = duplicates
+        self.statements = []
+
+    def execute_many(self, query, seq_params):
+        raise IntegrityError(msg="Duplicate entry in batch", errno=errorcode.ER_DUP_ENTRY)
+
+    def execute(self, query, params=None, fetch=True):
+        self.statements.append(query)
+        if params and params[1] in self.duplicates:
+            raise IntegrityError(msg="Duplicate entry '1-2' for key 'uq_cast_movie_actor'",
+                                 errno=errorcode.ER_DUP_ENTRY)
+        return {"affected_rows": 1, "last_id": 1}
+
+    def commit(self):
+        self.statements.append("COMMIT")
+
+    def rollback(self):
+        self.statements.append("ROLLBACK")
+
+
+def test_failed_batch_is_retried_row_by_row():
+    loader = BulkLoader("cast")
+    uow = BatchRejectingUnitOfWork(duplicates={2})
+    batch = [(line, {"movie_id": 1, "actor_id": line, "role_name": None, "role_type": "Lead",
+                     "screen_time_minutes": None}) for line in (1, 2, 3)]
+    loader._flush(uow, batch)
+    assert (loader.report["inserted"], loader.report["failed"]) == (2, 1)
+    assert loader.report["errors"] == [
+        {"line": 2, "error": "Error: This actor is already added to this movie!"}]
+    assert uow.statements.count("ROLLBACK TO SAVEPOINT bulk_row") == 1
+    assert uow.statements[-1] == "COMMIT"
+
+
+class SingleRowUnitOfWork:
+    """Hands out AUTO_INCREMENT ids with gaps, as concurrent inserts leave them"""
+
+    def __init__(self):
+        self.next_id = 10
+        self.side_rows = {}
+
+    def execute(self, query, params=None, fetch=True):
+        self.next_id += 2
+        return {"affected_rows": 1, "last_id": self.next_id}
+
+    def execute_many(self, query, seq_params):
+        self.side_rows[query.split()[2]] = list(seq_params)
+
+    def commit(self):
+        pass
+
+
+def test_side_rows_use_each_rows_own_id():
+    loader = BulkLoader("actors")
+    uow = SingleRowUnitOfWork()
+    batch = [(line, {"name": name, "gender": None, "date_of_birth": None, "nationality": None,
+                     "popularity_score": 5.0, "email": None})
+             for line, name in ((1, "Aamir"), (2, "Kajol"))]
+    loader._flush(uow, batch)
+    assert loader.report["inserted"] == 2
+    assert [(record_id, details.split(" |")[0])
+            for _, record_id, details in uow.side_rows["ACTIVITY_LOG"]] == [
+        (12, "New actor added: Aamir"), (14, "New actor added: Kajol")]
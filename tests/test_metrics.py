@@ -0,0 +1,26 @@
+import pytest
+from database.metrics import fingerprint, normalize
+
+
+@pytest.mark.parametrize("statement, shape", [
+    ("SELECT * FROM MOVIES WHERE movie_id = 42", "SELECT * FROM MOVIES WHERE movie_id = ?"),
+    ("SELECT *\n  FROM MOVIES\n WHERE title = 'Don''t'", "SELECT * FROM MOVIES WHERE title = ?"),
+    ("SELECT * FROM MOVIES WHERE title = \"Dhoom 2\"", "SELECT * FROM MOVIES WHERE title = ?"),
+    ("SELECT * FROM MOVIES WHERE movie_id IN (%s, %s, %s)", "SELECT * FROM MOVIES WHERE movie_id IN (?+)"),
+    ("SELECT * FROM MOVIES WHERE movie_id IN (1, 2)", "SELECT * FROM MOVIES WHERE movie_id IN (?+)"),
+    ("INSERT INTO GENRES (genre_name) VALUES (%(name)s)", "INSERT INTO GENRES (genre_name) VALUES (?)"),
+    ("INSERT INTO T (a, b) VALUES (%s, %s), (%s, %s), (%s, %s)", "INSERT INTO T (a, b) VALUES (?+)"),
+    ("SELECT budget * -1.5 FROM MOVIES LIMIT 10", "SELECT budget * ? FROM MOVIES LIMIT ?"),
+])
+def test_normalize(statement, shape):
+    assert normalize(statement) == shape
+
+
+def test_identifiers_with_digits_are_kept():
+    assert normalize("SELECT col1 FROM t2 WHERE x = 3") == "SELECT col1 FROM t2 WHERE x = ?"
+
+
+def test_fingerprint_is_stable_per_shape():
+    first = fingerprint(normalize("SELECT * FROM ACTORS WHERE actor_id = 1"))
+    second = fingerprint(normalize("SELECT * FROM ACTORS WHERE actor_id = 2"))
+    assert first == second and len(first) == 12
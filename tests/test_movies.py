@@ -0,0 +1,36 @@
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.services.movie_service import MAX_BATCH_IDS, parse_ids
+
+# Not used as a context manager: startup (pool, audit pipeline) never runs,
+# so only requests rejected before reaching the database are exercised here
+client = TestClient(app)
+
+
+@pytest.mark.parametrize("path", ["/api/movies", "/api/producers", "/api/genres", "/api/box-office"])
+@pytest.mark.parametrize("query", ["limit=0", "limit=1001", "skip=-1", "limit=ten"])
+def test_list_endpoints_reject_bad_paging(path, query):
+    assert client.get(f"{path}?{query}").status_code == 422
+
+
+@pytest.mark.parametrize("ids, message", [("1,x", "Invalid id: x"), ("0", "Invalid id: 0"),
+                                          (" , ", "No ids given")])
+def test_details_batch_rejects_bad_ids(ids, message):
+    response = client.get("/api/movies/details:batch", params={"ids": ids})
+    assert response.status_code == 400 and response.json()["detail"] == message
+
+
+def test_parse_ids_keeps_order_and_drops_duplicates():
+    assert parse_ids("3, 1,3,,2") == [3, 1, 2]
+
+
+def test_parse_ids_is_capped():
+    with pytest.raises(ValueError, match=f"At most {MAX_BATCH_IDS}"):
+        parse_ids(",".join(str(i) for i in range(1, MAX_BATCH_IDS + 2)))
+
+
+@pytest.mark.parametrize("path", ["/api/analytics/top-movies", "/api/analytics/profit-analysis"])
+@pytest.mark.parametrize("limit", [0, -5, 101])
+def test_rankings_reject_out_of_range_limits(path, limit):
+    assert client.get(path, params={"limit": limit}).status_code == 422
@@ -0,0 +1,47 @@
+from datetime import datetime
+from decimal import Decimal
+import pytest
+from fastapi import HTTPException, Response
+from app.utils.pagination import (
+    NEXT_CURSOR_HEADER, decode_cursor, encode_cursor, keyset_condition, paginate,
+)
+
+ROWS = [{"created_at": datetime(2026, 1, 3 - i), "movie_id": 10 - i} for i in range(3)]
+
+
+def test_cursor_round_trip():
+    values = [datetime(2026, 1, 2, 3, 4, 5), 42, Decimal("1.50"), "Dhoom"]
+    assert decode_cursor(encode_cursor(values), 4) == ["2026-01-02 03:04:05", 42, "1.50", "Dhoom"]
+
+
+@pytest.mark.parametrize("cursor", ["%%%", encode_cursor([1]), "bm90IGpzb24"])
+def test_decode_cursor_rejects_bad_tokens(cursor):
+    with pytest.raises(HTTPException) as exc:
+        decode_cursor(cursor, 2)
+    assert exc.value.status_code == 400
+
+
+def test_keyset_condition_seeks_past_cursor():
+    condition, params = keyset_condition(("m.created_at", "m.movie_id"), encode_cursor(["2026-01-01", 7]))
+    assert condition == "((m.created_at < %s) OR (m.created_at = %s AND m.movie_id < %s))"
+    assert params == ["2026-01-01", "2026-01-01", 7]
+
+
+def test_paginate_trims_look_ahead_row_and_sets_cursor():
+    response = Response()
+    page = paginate(list(ROWS), 2, response, ("created_at", "movie_id"))
+    assert page == ROWS[:2]
+    assert decode_cursor(response.headers[NEXT_CURSOR_HEADER], 2) == ["2026-01-02 00:00:00", 9]
+
+
+def test_paginate_last_page_has_no_cursor():
+    response = Response()
+    assert paginate(list(ROWS), 3, response, ("created_at", "movie_id")) == ROWS
+    assert NEXT_CURSOR_HEADER not in response.headers
+
+
+@pytest.mark.parametrize("limit", [0, -1])
+def test_paginate_empty_page(limit):
+    response = Response()
+    assert paginate(list(ROWS), limit, response, ("created_at", "movie_id")) == []
+    assert NEXT_CURSOR_HEADER not in response.headers
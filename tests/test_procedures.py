@@ -0,0 +1,33 @@
+import os
+import re
+from scripts.setup_database import read_statements
+
+SCHEMA_DIR = os.path.join(os.path.dirname(__file__), os.pardir, "database", "schema")
+ROUTINE = re.compile(r"^CREATE\s+(PROCEDURE|FUNCTION|TRIGGER)\s+(\w+)", re.IGNORECASE)
+
+
+def _routines(name):
+    found = {}
+    for line, sql in read_statements(os.path.join(SCHEMA_DIR, name)):
+        match = ROUTINE.match(sql)
+        if match:
+            found[match.group(2)] = (line, sql)
+    return found
+
+
+def test_procedures_are_complete_statements():
+    procedures = _routines("04_create_procedures.sql")
+    assert {"sp_refresh_summaries", "sp_rebuild_summaries"} <= set(procedures)
+    for name, (line, sql) in procedures.items():
+        assert re.search(r"\bEND$", sql), f"{name} (line {line}) is cut short"
+        assert sql.upper().count("BEGIN") <= sql.upper().count("END"), name
+
+
+def test_trigger_count_matches_header():
+    path = os.path.join(SCHEMA_DIR, "03_create_triggers.sql")
+    with open(path, encoding="utf-8") as f:
+        declared = int(re.search(r"TRIGGERS \((\d+) Triggers\)", f.read()).group(1))
+    triggers = _routines("03_create_triggers.sql")
+    assert len(triggers) == declared
+    assert {"tr_movie_deleted", "tr_box_office_deleted", "tr_actor_deleted",
+            "tr_producer_deleted"} <= set(triggers)
@@ -0,0 +1,45 @@
+import os
+import pytest
+from scripts.setup_database import read_statements, split_statements
+
+SCHEMA_DIR = os.path.join(os.path.dirname(__file__), os.pardir, "database", "schema")
+
+
+def test_splits_on_semicolons_with_line_numbers():
+    text = "-- header\nCREATE TABLE A (id INT);\n\nINSERT INTO A VALUES (1);\nSELECT 1"
+    assert split_statements(text) == [
+        (2, "CREATE TABLE A (id INT)"),
+        (4, "INSERT INTO A VALUES (1)"),
+        (5, "SELECT 1"),
+    ]
+
+
+def test_ignores_delimiters_in_quotes_and_comments():
+    text = ("INSERT INTO A VALUES ('a;b', \"c;d\", 'it''s; fine', 'back\\'slash;');\n"
+            "/* not; here */ SELECT `odd;name` FROM A; -- trailing; comment\n")
+    statements = [sql for _, sql in split_statements(text)]
+    assert statements[0] == "INSERT INTO A VALUES ('a;b', \"c;d\", 'it''s; fine', 'back\\'slash;')"
+    assert statements[1].endswith("SELECT `odd;name` FROM A")
+    assert len(statements) == 2
+
+
+def test_honours_delimiter_command():
+    text = ("DELIMITER //\n"
+            "CREATE PROCEDURE p()\nBEGIN\n    SELECT 1;\n    SELECT 2;\nEND //\n"
+            "DELIMITER ;\n"
+            "SELECT 3;\n")
+    assert split_statements(text) == [
+        (2, "CREATE PROCEDURE p()\nBEGIN\n    SELECT 1;\n    SELECT 2;\nEND"),
+        (8, "SELECT 3"),
+    ]
+
+
+def test_delimiter_inside_statement_is_an_error():
+    with pytest.raises(ValueError, match="script.sql:2"):
+        split_statements("SELECT 1\nDELIMITER //\n", "script.sql")
+
+
+@pytest.mark.parametrize("name", sorted(f for f in os.listdir(SCHEMA_DIR) if f.endswith(".sql")))
+def test_schema_files_split_cleanly(name):
+    for line, sql in read_statements(os.path.join(SCHEMA_DIR, name)):
+        assert sql and not sql.upper().startswith("DELIMITER"), f"{name}:{line}"